@@ -7,7 +7,9 @@ Purpose: Provides main logging window and a crap ton more.
 """
 
 import datetime
+import functools
 import importlib
+import inspect
 import locale
 import logging
 import os
@@ -23,6 +25,9 @@ from logging.handlers import RotatingFileHandler
 from pathlib import Path
 from shutil import copyfile
 
+# For --profile-startup, taken before the slow imports below.
+IMPORTS_STARTED = time.perf_counter()
+
 import notctyparser
 
 if sys.platform == "darwin":
@@ -71,15 +76,14 @@ from PyQt6.QtWidgets import (
 
 import not1mm.actions
 from not1mm import fsutils
-from not1mm.bandmap import BandMapWindow
-from not1mm.chat import ChatWindow
-from not1mm.checkwindow import CheckWindow
-from not1mm.clusterwindow import ClusterWindow
-from not1mm.dxcc_tracker import DXCCWindow
 from not1mm.lib import catppuccin
 from not1mm.lib.about import About
+from not1mm.lib.call_history import parse_call_history
+from not1mm.lib.contest_state import DUPE_KEYS, ContestState
+from not1mm.lib.cty_index import CtyIndex, load_cty_index
 from not1mm.lib.cwinterface import CW
 from not1mm.lib.database import DataBase
+from not1mm.lib.dock_registry import DockRegistry
 from not1mm.lib.edit_macro import EditMacro
 from not1mm.lib.edit_rove import Rove
 from not1mm.lib.edit_station import EditStation
@@ -102,25 +106,21 @@ from not1mm.lib.i18n import (
     load_ui,
     retranslate_all,
 )
+from not1mm.lib.keystroke import CALLCHANGED_DEBOUNCE, LatencyStats
 from not1mm.lib.multicast import Multicast
 from not1mm.lib.n1mm import N1MM
 from not1mm.lib.new_contest import NewContest
 from not1mm.lib.preferences import Preferences
 from not1mm.lib.select_contest import SelectContest
 from not1mm.lib.settings import Settings
+from not1mm.lib.startup_profile import StartupProfile
 from not1mm.lib.super_check_partial import SCP
 from not1mm.lib.version import __version__
 from not1mm.lib.versiontest import VersionTest
-from not1mm.logwindow import LogWindow
 from not1mm.lookupservice import LookupService
 from not1mm.radio import Radio
-from not1mm.ratewindow import RateWindow
-from not1mm.rotator import RotatorWindow
 from not1mm.rtc_service import RTCService
-from not1mm.statistics import StatsWindow
-from not1mm.vfo import VfoWindow
 from not1mm.voice_keying import Voice, has_output_device
-from not1mm.zone_tracker import ZoneWindow
 
 poll_time = datetime.datetime.now(tz=datetime.UTC)
 
@@ -130,7 +130,7 @@ class MainWindow(QtWidgets.QMainWindow):
     The main window
     """
 
-    ctyfile: typing.ClassVar = {}
+    cty_index = CtyIndex()
     contact: typing.ClassVar = {}
     contest = None
     contest_settings: typing.ClassVar = {}
@@ -150,6 +150,7 @@ class MainWindow(QtWidgets.QMainWindow):
     configuration_dialog = None
     dbname = fsutils.USER_DATA_PATH, "/ham.db"
     radio_state: typing.ClassVar = {}
+    rig_status: typing.ClassVar = {}
     worked_list: typing.ClassVar = {}
     cw_entry_visible = False
     last_focus = None
@@ -171,6 +172,7 @@ class MainWindow(QtWidgets.QMainWindow):
     rig_control = None
     log_window = None
     check_window = None
+    chat_window = None
     bandmap_window = None
     cluster_window = None
     vfo_window = None
@@ -198,10 +200,14 @@ class MainWindow(QtWidgets.QMainWindow):
 
     server_commands: typing.ClassVar = []
 
-    def __init__(self, splash):
+    def __init__(self, splash, startup_profile: StartupProfile = None):
         super().__init__()
         logger.info("MainWindow: __init__")
         self.splash = splash
+        self.startup_profile = startup_profile
+        if self.startup_profile:
+            self.startup_profile.begin("Building main window.")
+        self.dock_registry = DockRegistry()
         self.dock_loc = {
             "Top": Qt.DockWidgetArea.TopDockWidgetArea,
             "Right": Qt.DockWidgetArea.RightDockWidgetArea,
@@ -299,6 +305,15 @@ class MainWindow(QtWidgets.QMainWindow):
         self.server_message_watch_timer = QtCore.QTimer()
         self.server_message_watch_timer.timeout.connect(self.check_udp_queue)
         self.server_message_watch_timer.start(1000)
+        self.auto_cq_timer = QtCore.QTimer()
+        self.auto_cq_timer.timeout.connect(self.check_auto_cq)
+        self.auto_cq_timer.start(250)
+        self.keystroke_latency = LatencyStats()
+        self.pending_callchanged = ""
+        self.callchanged_timer = QtCore.QTimer()
+        self.callchanged_timer.setSingleShot(True)
+        self.callchanged_timer.setInterval(CALLCHANGED_DEBOUNCE)
+        self.callchanged_timer.timeout.connect(self.send_callchanged)
         self.inputs_dict = {
             self.callsign: "callsign",
             self.sent: "sent",
@@ -317,6 +332,7 @@ class MainWindow(QtWidgets.QMainWindow):
         self.server_channel.ready_read_connect(self.server_message)
         self.ft8 = FT8Watcher()
         self.ft8.set_callback(None)
+        self.ft8.set_decode_callback(self.ft8_decodes)
         self.mscp = SCP(fsutils.APP_DATA_PATH)
         self.next_field = self.other_2
         self.dupe_indicator.hide()
@@ -692,16 +708,15 @@ class MainWindow(QtWidgets.QMainWindow):
         self.show_splash_msg("Loading CTY file.")
 
         try:
-            with open(
-                fsutils.APP_DATA_PATH / "cty.json", "rt", encoding="utf-8"
-            ) as c_file:
-                self.ctyfile = loads(c_file.read())
+            self.cty_index = load_cty_index(fsutils.APP_DATA_PATH / "cty.json")
         except (OSError, JSONDecodeError, TypeError):
             logger.critical("There was an error parsing the BigCity file.")
             self.show_message_box(
                 "There ws an error parsing the BigCity file.", blocking=False
             )
 
+        self.contest_state = ContestState()
+
         self.show_splash_msg("Reading preferences.")
         self.pref = Preferences.load()
 
@@ -762,128 +777,12 @@ class MainWindow(QtWidgets.QMainWindow):
             old_Qt = False
 
         # Featureset for wayland if pyqt is older than 6.8
-        dockfeatures = (
-            QtWidgets.QDockWidget.DockWidgetFeature.DockWidgetClosable
-            | QtWidgets.QDockWidget.DockWidgetFeature.DockWidgetMovable
-        )
-
-        self.show_splash_msg("Setting up BandMapWindow.")
-        self.bandmap_window = BandMapWindow(self.actionBandmap)
-        self.bandmap_window.setObjectName("bandmap-window")
-        if os.environ.get("WAYLAND_DISPLAY") and old_Qt is True:
-            self.bandmap_window.setFeatures(dockfeatures)
-        self.addDockWidget(Qt.DockWidgetArea.LeftDockWidgetArea, self.bandmap_window)
-        self.bandmap_window.hide()
-        self.bandmap_window.cluster_expire.connect(self.cluster_expire_updated)
-        self.bandmap_window.message.connect(self.dockwidget_message)
-        self.bandmap_window.bandmapwindow_closed.connect(self.launch_bandmap_window)
-
-        self.show_splash_msg("Setting up CheckWindow.")
-        self.check_window = CheckWindow(self.actionCheck_Window)
-        self.check_window.setObjectName("check-window")
-        if os.environ.get("WAYLAND_DISPLAY") and old_Qt is True:
-            self.check_window.setFeatures(dockfeatures)
-        self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, self.check_window)
-        self.check_window.hide()
-        self.check_window.message.connect(self.dockwidget_message)
-        self.check_window.checkwindow_closed.connect(self.launch_check_window)
-
-        self.show_splash_msg("Setting up RateWindow.")
-        self.rate_window = RateWindow(self.actionRate_Window)
-        self.rate_window.setObjectName("rate-window")
-        if os.environ.get("WAYLAND_DISPLAY") and old_Qt is True:
-            self.rate_window.setFeatures(dockfeatures)
-        self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, self.rate_window)
-        self.rate_window.hide()
-        self.rate_window.message.connect(self.dockwidget_message)
-        self.rate_window.ratewindow_closed.connect(self.launch_rate_window)
-
-        self.show_splash_msg("Setting up StatisticsWindow.")
-        self.statistics_window = StatsWindow(self.actionStatistics)
-        self.statistics_window.setObjectName("statistics-window")
+        self.dock_features = None
         if os.environ.get("WAYLAND_DISPLAY") and old_Qt is True:
-            self.statistics_window.setFeatures(dockfeatures)
-        self.addDockWidget(
-            Qt.DockWidgetArea.RightDockWidgetArea, self.statistics_window
-        )
-        self.statistics_window.hide()
-        self.statistics_window.message.connect(self.dockwidget_message)
-        self.statistics_window.statisticswindow_closed.connect(self.launch_stats_window)
-
-        self.show_splash_msg("Setting up GroupChatWindow.")
-        self.chat_window = ChatWindow(self.actionGroup_Chat)
-        self.chat_window.setObjectName("chat-window")
-        if os.environ.get("WAYLAND_DISPLAY") and old_Qt is True:
-            self.chat_window.setFeatures(dockfeatures)
-        self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, self.chat_window)
-        self.chat_window.hide()
-        self.chat_window.message.connect(self.dockwidget_message)
-        self.chat_window.chatwindow_closed.connect(self.launch_chat_window)
-
-        self.show_splash_msg("Setting up DXCCWindow.")
-        self.dxcc_window = DXCCWindow(self.actionDXCC)
-        self.dxcc_window.setObjectName("dxcc-window")
-        if os.environ.get("WAYLAND_DISPLAY") and old_Qt is True:
-            self.dxcc_window.setFeatures(dockfeatures)
-        self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, self.dxcc_window)
-        self.dxcc_window.hide()
-        self.dxcc_window.message.connect(self.dockwidget_message)
-        self.dxcc_window.dxcc_trackerwindow_closed.connect(self.launch_dxcc_window)
-
-        self.show_splash_msg("Setting up ZoneWindow.")
-        self.zone_window = ZoneWindow(self.actionZone)
-        self.zone_window.setObjectName("zone-window")
-        if os.environ.get("WAYLAND_DISPLAY") and old_Qt is True:
-            self.zone_window.setFeatures(dockfeatures)
-        self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, self.zone_window)
-        self.zone_window.hide()
-        self.zone_window.message.connect(self.dockwidget_message)
-        self.zone_window.zone_trackerwindow_closed.connect(self.launch_zone_window)
-
-        self.show_splash_msg("Setting up RotatorWindow.")
-        self.rotator_window = RotatorWindow(
-            self.actionRotator,
-            host=self.pref.get("rotctld_address", "127.0.0.1"),
-            port=self.pref.get("rotctld_port", 4533),
-        )
-
-        self.rotator_window.setObjectName("rotator-window")
-        if os.environ.get("WAYLAND_DISPLAY") and old_Qt is True:
-            self.rotator_window.setFeatures(dockfeatures)
-        self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, self.rotator_window)
-        self.rotator_window.hide()
-        self.rotator_window.message.connect(self.dockwidget_message)
-        self.rotator_window.set_mygrid(self.station.get("GridSquare", ""))
-        self.rotator_window.rotatorwindow_closed.connect(self.launch_rotator_window)
-
-        self.show_splash_msg("Setting up VFOWindow.")
-        self.vfo_window = VfoWindow(self.actionVFO)
-        self.vfo_window.setObjectName("vfo-window")
-        if os.environ.get("WAYLAND_DISPLAY") and old_Qt is True:
-            self.vfo_window.setFeatures(dockfeatures)
-        self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, self.vfo_window)
-        self.vfo_window.hide()
-        self.vfo_window.vfowindow_closed.connect(self.launch_vfo)
-
-        self.show_splash_msg("Setting up LogWindow.")
-        self.log_window = LogWindow(self.actionLog_Window)
-        self.log_window.setObjectName("log-window")
-        if os.environ.get("WAYLAND_DISPLAY") and old_Qt is True:
-            self.log_window.setFeatures(dockfeatures)
-        self.addDockWidget(Qt.DockWidgetArea.TopDockWidgetArea, self.log_window)
-        self.log_window.hide()
-        self.log_window.message.connect(self.dockwidget_message)
-        self.log_window.logwindow_closed.connect(self.launch_log_window)
-
-        self.show_splash_msg("Setting up ClusterWindow.")
-        self.cluster_window = ClusterWindow(self.actionCluster, parent=self)
-        self.cluster_window.setObjectName("cluster-window")
-        if os.environ.get("WAYLAND_DISPLAY") and old_Qt is True:
-            self.cluster_window.setFeatures(dockfeatures)
-        self.addDockWidget(Qt.DockWidgetArea.TopDockWidgetArea, self.cluster_window)
-        self.cluster_window.hide()
-        self.cluster_window.message.connect(self.dockwidget_message)
-        self.cluster_window.clusterwindow_closed.connect(self.launch_cluster_window)
+            self.dock_features = (
+                QtWidgets.QDockWidget.DockWidgetFeature.DockWidgetClosable
+                | QtWidgets.QDockWidget.DockWidgetFeature.DockWidgetMovable
+            )
 
         self.clearinputs()
         self.show_splash_msg("Loading contest.")
@@ -899,93 +798,15 @@ class MainWindow(QtWidgets.QMainWindow):
         if self.settings.value("geometry") is not None:
             self.restoreGeometry(self.settings.value("geometry"))
 
-        self.actionLog_Window.setChecked(self.pref.get("logwindow", False))
-        if self.actionLog_Window.isChecked():
-            self.log_window.show()
-        else:
-            self.log_window.hide()
-
-        self.actionBandmap.setChecked(self.pref.get("bandmapwindow", False))
-        if self.actionBandmap.isChecked():
-            self.bandmap_window.show()
-            self.bandmap_window.setActive(True)
-        else:
-            self.bandmap_window.hide()
-            self.bandmap_window.setActive(False)
-
-        self.actionCluster.setChecked(self.pref.get("clusterwindow", False))
-        if self.actionCluster.isChecked():
-            self.cluster_window.show()
-        else:
-            self.cluster_window.hide()
-
-        self.actionGroup_Chat.setChecked(self.pref.get("chatwindow", False))
-        if self.actionGroup_Chat.isChecked():
-            self.chat_window.show()
-            self.chat_window.setActive(True)
-        else:
-            self.chat_window.hide()
-            self.chat_window.setActive(False)
-
-        self.actionCheck_Window.setChecked(self.pref.get("checkwindow", False))
-        if self.actionCheck_Window.isChecked():
-            self.check_window.show()
-            self.check_window.setActive(True)
-        else:
-            self.check_window.hide()
-            self.check_window.setActive(False)
-
-        self.actionRate_Window.setChecked(self.pref.get("ratewindow", False))
-        if self.actionRate_Window.isChecked():
-            self.rate_window.show()
-            self.rate_window.setActive(True)
-        else:
-            self.rate_window.hide()
-            self.rate_window.setActive(False)
-
-        self.actionStatistics.setChecked(self.pref.get("statisticswindow", False))
-        if self.actionStatistics.isChecked():
-            self.statistics_window.show()
-            self.statistics_window.setActive(True)
-            self.statistics_window.get_run_and_total_qs()
-        else:
-            self.statistics_window.hide()
-            self.statistics_window.setActive(False)
-
-        self.actionDXCC.setChecked(self.pref.get("dxccwindow", False))
-        if self.actionDXCC.isChecked():
-            self.dxcc_window.show()
-            self.dxcc_window.setActive(True)
-            self.dxcc_window.get_log()
-        else:
-            self.dxcc_window.hide()
-            self.dxcc_window.setActive(False)
-
-        self.actionZone.setChecked(self.pref.get("zonewindow", False))
-        if self.actionZone.isChecked():
-            self.zone_window.show()
-            self.zone_window.setActive(True)
-            self.zone_window.get_log()
-        else:
-            self.zone_window.hide()
-            self.zone_window.setActive(False)
-
-        self.actionRotator.setChecked(self.pref.get("rotatorwindow", False))
-        if self.actionRotator.isChecked():
-            self.rotator_window.show()
-            self.rotator_window.setActive(True)
-        else:
-            self.rotator_window.hide()
-            self.rotator_window.setActive(False)
-
-        self.actionVFO.setChecked(self.pref.get("vfowindow", False))
-        if self.actionVFO.isChecked():
-            self.vfo_window.show()
-        else:
-            self.vfo_window.hide()
+        self.show_splash_msg("Setting up dock windows.")
+        # The launchers build the windows left open last time.
+        for spec in self.dock_registry.specs.values():
+            getattr(self, spec.action).setChecked(self.pref.get(spec.pref, False))
+            getattr(self, spec.launcher)()
 
         self.cwspeed_spinbox_changed()
 
+        self.show_splash_msg("Checking for a newer version.")
         if not DEBUG_ENABLED and VersionTest(__version__).test():
             self.show_message_box(
                 "There is a newer version of not1mm available.\n"
@@ -1070,6 +891,15 @@ class MainWindow(QtWidgets.QMainWindow):
         """checks the UDP datagram queue."""
 
         self.check_for_stale_commands()
+        if self.udp_fifo.empty():
+            return
+        # Server replies arrive in bursts, commit the dirty flag clears they
+        # cause in one go.
+        with self.database.transaction():
+            self.process_udp_queue()
+
+    def process_udp_queue(self) -> None:
+        """Handle the queued server datagrams."""
         while not self.udp_fifo.empty():
             datagram = self.udp_fifo.get()
             try:
@@ -1174,7 +1004,8 @@ class MainWindow(QtWidgets.QMainWindow):
                 # print(f"Got {json_data.get('cmd')} {json_data=}")
                 # self.display_chat(json_data.get("sender"), json_data.get("message"))
                 # {"cmd": "CHAT", "sender": "N2CQR", "message": "I worked your mama on 80 meters."}
-                self.chat_window.msg_from_main(json_data)
+                # Built hidden if need be, so the chat is there when opened.
+                self.dock_window("chat_window").msg_from_main(json_data)
                 continue
 
             if json_data.get("cmd") == "GROUPQUERY":
@@ -1209,46 +1040,21 @@ class MainWindow(QtWidgets.QMainWindow):
             self.database.delete_callhistory()
 
             try:
+                start = time.perf_counter()
                 with open(
                     filename, "rt", encoding="utf-8", errors="ignore"
                 ) as file_descriptor:
-                    lines = file_descriptor.readlines()
-                    substring_to_find = "!!Order!!"
-                    found_index = -1  # Initialize to -1 to indicate not found
-
-                    for index, item in enumerate(lines):
-                        if substring_to_find in item and "#" not in item:
-                            found_index = index
-                            break  # Exit the loop once found
-
-                    if found_index != -1:
-                        item_names = lines[found_index].strip().split(",")
-                        # ['!!Order!!', 'Call', 'Sect', 'State', 'CK', 'UserText', '']
-                        item_names = item_names[1:]
-                        # ['Call', 'Sect', 'State', 'CK', 'UserText', '']
-                        lines = lines[found_index + 1 :]
-                        group_list = []
-                        for line in lines:
-                            if line.startswith("#"):
-                                continue
-                            group = {}
-                            fields = line.strip().split(",")
-                            # ['4U1WB','MDC','DC','89','']
-                            number_of_fields = len(fields)
-                            count = 0
-                            try:
-                                for item in item_names:
-                                    if item == "":
-                                        continue
-                                    if count < number_of_fields:
-                                        group[item] = fields[count]
-                                    else:
-                                        group[item] = ""
-                                    count += 1
-                                group_list.append(group)
-                            except IndexError:
-                                ...
-                        self.database.add_callhistory_items(group_list)
+                    loaded = self.database.load_callhistory(
+                        parse_call_history(file_descriptor)
+                    )
+                elapsed = time.perf_counter() - start
+                logger.info(
+                    "Loaded %d call history entries from %s in %.2fs, %.0f/s",
+                    loaded,
+                    filename,
+                    elapsed,
+                    loaded / elapsed if elapsed else 0,
+                )
             except FileNotFoundError as err:
                 self.show_message_box(f"{err}", blocking=False)
 
@@ -1297,8 +1103,27 @@ class MainWindow(QtWidgets.QMainWindow):
             ...
             # self.save_contact()
 
+    def write_startup_profile(self) -> None:
+        """
+        Once the main window is up, write where the time of starting went,
+        for --profile-startup, to startup_profile.txt in the data directory.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        """
+        self.startup_profile.finish()
+        path = fsutils.USER_DATA_PATH / "startup_profile.txt"
+        self.startup_profile.write(path, self.dock_registry.report())
+
     def show_splash_msg(self, msg: str) -> None:
-        """Show text message in the splash window."""
+        """Show text message in the splash window, starting a profiled step."""
+        if self.startup_profile:
+            self.startup_profile.begin(msg)
         self.splash.showMessage(
             msg,
             alignment=Qt.AlignmentFlag.AlignBottom | Qt.AlignmentFlag.AlignCenter,
@@ -1306,6 +1131,54 @@ class MainWindow(QtWidgets.QMainWindow):
         )
         QCoreApplication.processEvents()
 
+    def dock_window(self, name: str) -> QtWidgets.QDockWidget:
+        """
+        The dock window held in attribute name, importing its module and
+        building it the first time it is asked for.
+
+        Parameters
+        ----------
+        name : str
+        The MainWindow attribute of the window, e.g. "bandmap_window".
+
+        Returns
+        -------
+        QtWidgets.QDockWidget
+        The window, hidden if it was just built.
+        """
+        window = getattr(self, name)
+        if window is not None:
+            return window
+        spec = self.dock_registry.specs[name]
+        action = getattr(self, spec.action)
+        if name == "rotator_window":
+            window = self.dock_registry.create(
+                name,
+                action,
+                host=self.pref.get("rotctld_address", "127.0.0.1"),
+                port=self.pref.get("rotctld_port", 4533),
+            )
+        elif name == "cluster_window":
+            window = self.dock_registry.create(name, action, parent=self)
+        else:
+            window = self.dock_registry.create(name, action)
+        window.setObjectName(spec.object_name)
+        if self.dock_features is not None:
+            window.setFeatures(self.dock_features)
+        # Put it where the saved window state says, if it says.
+        if not self.restoreDockWidget(window):
+            self.addDockWidget(spec.area, window)
+        window.hide()
+        setattr(self, name, window)
+        if hasattr(window, "message"):
+            window.message.connect(self.dockwidget_message)
+        getattr(window, spec.closed).connect(getattr(self, spec.launcher))
+        if name == "bandmap_window":
+            window.cluster_expire.connect(self.cluster_expire_updated)
+        if name == "rotator_window":
+            window.set_mygrid(self.station.get("GridSquare", ""))
+        return window
+
     def dockwidget_message(self, msg: dict) -> None:
         """incomming signals from widgets"""
         if msg:
@@ -1345,14 +1218,26 @@ class MainWindow(QtWidgets.QMainWindow):
 
             # TODO
             if msg.get("cmd", "") in ["CONTACTCHANGED", "DELETE", "DELETED"]:
+                update = msg.copy()
+                contact = None
+                if msg.get("cmd", "") == "CONTACTCHANGED":
+                    contact = self.database.fetch_contact_by_uuid(msg.get("ID", ""))
+                update["delta"], recalculated = self.contest_state.edit(
+                    msg.get("ID", ""), contact, self.recalculate_mults_since
+                )
+                self.worked_list = self.contest_state.worked_list()
+                self.send_worked_list()
+                # The edit first, the re-scoring may touch the edited contact.
                 if self.statistics_window:
-                    self.statistics_window.msg_from_main(msg)
+                    self.statistics_window.msg_from_main(update)
                 if self.dxcc_window:
-                    self.dxcc_window.msg_from_main(msg)
+                    self.dxcc_window.msg_from_main(update)
                 if self.zone_window:
-                    self.zone_window.msg_from_main(msg)
+                    self.zone_window.msg_from_main(update)
                 if self.rate_window:
-                    self.rate_window.msg_from_main(msg)
+                    self.rate_window.msg_from_main(update)
+                if recalculated["added"]:
+                    self.send_log_update(recalculated)
                 self.check_dupe(self.callsign.text())
 
             if msg.get("cmd", "") == "GETCOLUMNS":
@@ -1386,7 +1271,7 @@ class MainWindow(QtWidgets.QMainWindow):
                 return
 
             if msg.get("cmd", "") == "GETWORKEDLIST":
-                result = self.database.get_calls_and_bands()
+                result = self.contest_state.worked_list()
                 cmd = {}
                 cmd["cmd"] = "WORKED"
                 cmd["worked"] = result
@@ -1404,7 +1289,7 @@ class MainWindow(QtWidgets.QMainWindow):
                 msg["call"] = self.callsign.text()
                 self.check_window.msg_from_main(msg)
 
-            if msg.get("cmd", "") == "DX" and self.bandmap_window:
+            if msg.get("cmd", "") in ("DX", "DXSPOTS") and self.bandmap_window:
                 self.bandmap_window.msg_from_main(msg)
 
             # '{"cmd": "LOOKUP_RESPONSE", "station": "fredo", "result": {"call": "K6GTE", "aliases": "KM6HQI", "dxcc": "291", "nickname": "Mike", "fname": "Michael C", "name": "Bridak", "addr1": "2854 W Bridgeport Ave", "addr2": "Anaheim", "state": "CA", "zip": "92804", "country": "United States", "lat": "33.825460", "lon": "-117.987510", "grid": "DM13at", "county": "Orange", "ccode": "271", "fips": "06059", "land": "United States", "efdate": "2021-01-13", "expdate": "2027-11-07", "class": "G", "codes": "HVIE", "email": "michael.bridak@gmail.com", "u_views": "3049", "bio": "7232", "biodate": "2023-04-10 17:56:55", "image": "https://cdn-xml.qrz.com/e/k6gte/qsl.png", "imageinfo": "285:545:99376", "moddate": "2021-04-08 21:41:07", "MSA": "5945", "AreaCode": "714", "TimeZone": "Pacific", "GMTOffset": "-8", "DST": "Y", "eqsl": "0", "mqsl": "1", "cqzone": "3", "ituzone": "6", "born": "1967", "lotw": "1", "user": "K6GTE", "geoloc": "geocode", "name_fmt": "Michael C \\"Mike\\" Bridak"}}'
@@ -1412,6 +1297,9 @@ class MainWindow(QtWidgets.QMainWindow):
             if (
                 msg.get("cmd", "") == "LOOKUP_RESPONSE"
                 and msg.get("result", None) is not None
+                # The operator may have moved on to another call.
+                and msg.get("call", self.callsign.text().strip().upper())
+                == self.callsign.text().strip().upper()
             ):
                 fname = msg.get("result", {}).get("fname", "")
                 name = msg.get("result", {}).get("name", "")
@@ -1436,7 +1324,10 @@ class MainWindow(QtWidgets.QMainWindow):
                             f"distance {int(kilometers * 0.621371)}mi {kilometers}km"
                             f" {msg.get('result', {}).get('name_fmt', '')}"
                         )
-                        self.rotator_window.set_requested_azimuth(float(heading))
+                        if self.rotator_window is not None:
+                            self.rotator_window.set_requested_azimuth(
+                                float(heading)
+                            )
 
             if (
                 msg.get("cmd", "") == "CHAT"
@@ -1466,6 +1357,40 @@ class MainWindow(QtWidgets.QMainWindow):
         self.pref["cluster_expire"] = int(number)
         Preferences.save()
 
+    def ft8_decodes(self, spots: list) -> None:
+        """
+        Put the stations WSJT-X decoded since the last frame on the bandmap,
+        which colors the worked ones. Those a contact with now would dupe
+        get DUPE in their comment.
+
+        Parameters
+        ----------
+        spots : list
+        Spot dicts made by wsjtx.DecodeQueue.
+
+        Returns
+        -------
+        None
+        """
+        if not self.bandmap_window:
+            return
+        now = datetime.datetime.now(datetime.UTC).isoformat(" ")[:19]
+        for spot in spots:
+            isdupe = self.contest_state.is_dupe(
+                {
+                    "Call": spot["dx"],
+                    "Band": get_logged_band(str(int(spot["freq"] * 1000))),
+                    "Mode": spot["mode"],
+                    "TS": now,
+                }
+            )
+            if isdupe:
+                spot["comment"] += " DUPE"
+        # Decodes are tens of Hz apart, each must not clear the others.
+        self.bandmap_window.msg_from_main(
+            {"cmd": "DXSPOTS", "spots": spots, "clear_freq": False}
+        )
+
     def fldigi_qso(self, result: str) -> None:
         """
         gets called when there is a new fldigi qso logged.
@@ -1878,6 +1803,7 @@ class MainWindow(QtWidgets.QMainWindow):
                 "current_database", "ham.db"
             )
             self.database = DataBase(self.dbname, fsutils.APP_DATA_PATH)
+            self.contest_state.clear()
             self.contact = self.database.empty_contact.copy()
             self.previous_contact = self.contact
             self.station = self.database.fetch_station()
@@ -1923,6 +1849,7 @@ class MainWindow(QtWidgets.QMainWindow):
                 "current_database", "ham.db"
             )
             self.database = DataBase(self.dbname, fsutils.MODULE_PATH)
+            self.contest_state.clear()
             self.contact = self.database.empty_contact.copy()
             self.previous_contact = self.contact
             self.station = self.database.fetch_station()
@@ -2030,7 +1957,7 @@ class MainWindow(QtWidgets.QMainWindow):
         Preferences.save()
         logger.debug("Selected contest: %s", f"{contest}")
         self.load_contest()
-        self.worked_list = self.database.get_calls_and_bands()
+        self.worked_list = self.contest_state.worked_list()
         self.send_worked_list()
 
     def refill_dropdown(self, target, source) -> None:
@@ -2176,6 +2103,7 @@ class MainWindow(QtWidgets.QMainWindow):
             if self.contest_settings:
                 try:
                     self.database.current_contest = self.pref.get("contest")
+                    self.contest_state.load(self.database)
                     if self.contest_settings.get("ContestName"):
                         """Reset these in case a contest disabled them"""
                         self.other_1.setStyleSheet("text-transform: uppercase;")
@@ -2183,14 +2111,16 @@ class MainWindow(QtWidgets.QMainWindow):
                         """Reset this too, in case user set it"""
                         self.RoverLocation = ""
                         """Inform check window in case this is a change of contest"""
-                        self.check_window.database.current_contest = self.pref.get(
-                            "contest"
-                        )
+                        if self.check_window:
+                            self.check_window.database.current_contest = (
+                                self.pref.get("contest")
+                            )
 
                         self.contest = doimp(self.contest_settings.get("ContestName"))
                         logger.debug("Loaded Contest Name = %s", self.contest.name)
                         self.set_window_title()
                         self.contest.init_contest(self)
+                        self.contest_state.set_dupe_key(self.dupe_key_function())
                         self.hide_band_mode(
                             self.contest_settings.get("ModeCategory", "")
                         )
@@ -2319,10 +2249,9 @@ class MainWindow(QtWidgets.QMainWindow):
                 cty.dump(fsutils.APP_DATA_PATH / "cty.json")
                 self.show_message_box("cty file updated.", blocking=False)
                 try:
-                    with open(
-                        fsutils.APP_DATA_PATH / "cty.json", "rt", encoding="utf-8"
-                    ) as ctyfile:
-                        self.ctyfile = loads(ctyfile.read())
+                    self.cty_index = load_cty_index(
+                        fsutils.APP_DATA_PATH / "cty.json"
+                    )
                 except (OSError, JSONDecodeError, TypeError) as err:
                     logger.critical(
                         f"There was an error {err} parsing the BigCity file."
@@ -2423,9 +2352,42 @@ class MainWindow(QtWidgets.QMainWindow):
 
     def recalculate_mults(self) -> None:
         """Recalculate Multipliers"""
-        self.contest.recalculate_mults(self)
+        with self.database.transaction():
+            self.contest.recalculate_mults(self)
+        self.send_log_update(self.contest_state.load(self.database))
         self.clearinputs()
 
+    def recalculate_mults_since(self, time_stamp: str) -> dict:
+        """
+        After an edit or delete, recalculate the multipliers of the contacts
+        logged at or after time_stamp. Only plugins whose recalculate_mults
+        accepts since, i.e. use plugin_common.recalculate_multipliers, can
+        do that cheaply, the others are left to the Recalculate Mults menu.
+
+        Parameters
+        ----------
+        time_stamp : str
+        The earliest time stamp touched by the edit.
+
+        Returns
+        -------
+        dict
+        The ContestState delta of the contacts that changed.
+        """
+        delta = {"added": [], "removed": []}
+        recalculate = getattr(self.contest, "recalculate_mults", None)
+        if (
+            not time_stamp
+            or recalculate is None
+            or "since" not in inspect.signature(recalculate).parameters
+        ):
+            return delta
+        for contact in recalculate(self, since=time_stamp):
+            change = self.contest_state.change(contact)
+            delta["added"].extend(change["added"])
+            delta["removed"].extend(change["removed"])
+        return delta
+
     def mark_all_dirty(self) -> None:
         """Mark all contacts dirty"""
         self.database.make_all_dirty()
@@ -2443,8 +2405,8 @@ class MainWindow(QtWidgets.QMainWindow):
         self.pref["logwindow"] = self.actionLog_Window.isChecked()
         Preferences.save()
         if self.actionLog_Window.isChecked():
-            self.log_window.show()
-        else:
+            self.dock_window("log_window").show()
+        elif self.log_window:
             self.log_window.hide()
 
     def launch_bandmap_window(self) -> None:
@@ -2452,9 +2414,18 @@ class MainWindow(QtWidgets.QMainWindow):
         self.pref["bandmapwindow"] = self.actionBandmap.isChecked()
         Preferences.save()
         if self.actionBandmap.isChecked():
-            self.bandmap_window.show()
+            self.dock_window("bandmap_window").show()
             self.bandmap_window.setActive(True)
-        else:
+            # Only radio changes are passed on, so catch it up now.
+            if self.radio_state.get("vfoa"):
+                cmd = {}
+                cmd["cmd"] = "RADIO_STATE"
+                cmd["band"] = self.radio_state.get("band", "")
+                cmd["vfoa"] = self.radio_state.get("vfoa")
+                cmd["mode"] = self.radio_state.get("mode", "")
+                cmd["bw"] = str(self.radio_state.get("bw", "0"))
+                self.bandmap_window.msg_from_main(cmd)
+        elif self.bandmap_window:
             self.bandmap_window.hide()
             self.bandmap_window.setActive(False)
 
@@ -2463,8 +2434,8 @@ class MainWindow(QtWidgets.QMainWindow):
         self.pref["clusterwindow"] = self.actionCluster.isChecked()
         Preferences.save()
         if self.actionCluster.isChecked():
-            self.cluster_window.show()
-        else:
+            self.dock_window("cluster_window").show()
+        elif self.cluster_window:
             self.cluster_window.hide()
 
     def launch_check_window(self) -> None:
@@ -2472,9 +2443,9 @@ class MainWindow(QtWidgets.QMainWindow):
         self.pref["checkwindow"] = self.actionCheck_Window.isChecked()
         Preferences.save()
         if self.actionCheck_Window.isChecked():
-            self.check_window.show()
+            self.dock_window("check_window").show()
             self.check_window.setActive(True)
-        else:
+        elif self.check_window:
             self.check_window.hide()
             self.check_window.setActive(False)
 
@@ -2483,9 +2454,9 @@ class MainWindow(QtWidgets.QMainWindow):
         self.pref["ratewindow"] = self.actionRate_Window.isChecked()
         Preferences.save()
         if self.actionRate_Window.isChecked():
-            self.rate_window.show()
+            self.dock_window("rate_window").show()
             self.rate_window.setActive(True)
-        else:
+        elif self.rate_window:
             self.rate_window.hide()
             self.rate_window.setActive(False)
 
@@ -2494,10 +2465,10 @@ class MainWindow(QtWidgets.QMainWindow):
         self.pref["statisticswindow"] = self.actionStatistics.isChecked()
         Preferences.save()
         if self.actionStatistics.isChecked():
-            self.statistics_window.show()
+            self.dock_window("statistics_window").show()
             self.statistics_window.setActive(True)
             self.statistics_window.get_run_and_total_qs()
-        else:
+        elif self.statistics_window:
             self.statistics_window.hide()
             self.statistics_window.setActive(False)
 
@@ -2506,10 +2477,10 @@ class MainWindow(QtWidgets.QMainWindow):
         self.pref["dxccwindow"] = self.actionDXCC.isChecked()
         Preferences.save()
         if self.actionDXCC.isChecked():
-            self.dxcc_window.show()
+            self.dock_window("dxcc_window").show()
             self.dxcc_window.setActive(True)
             self.dxcc_window.get_log()
-        else:
+        elif self.dxcc_window:
             self.dxcc_window.hide()
             self.dxcc_window.setActive(False)
 
@@ -2518,10 +2489,10 @@ class MainWindow(QtWidgets.QMainWindow):
         self.pref["zonewindow"] = self.actionZone.isChecked()
         Preferences.save()
         if self.actionZone.isChecked():
-            self.zone_window.show()
+            self.dock_window("zone_window").show()
             self.zone_window.setActive(True)
             self.zone_window.get_log()
-        else:
+        elif self.zone_window:
             self.zone_window.hide()
             self.zone_window.setActive(False)
 
@@ -2530,9 +2501,9 @@ class MainWindow(QtWidgets.QMainWindow):
         self.pref["rotatorwindow"] = self.actionRotator.isChecked()
         Preferences.save()
         if self.actionRotator.isChecked():
-            self.rotator_window.show()
+            self.dock_window("rotator_window").show()
             self.rotator_window.setActive(True)
-        else:
+        elif self.rotator_window:
             self.rotator_window.hide()
             self.rotator_window.setActive(False)
 
@@ -2541,8 +2512,8 @@ class MainWindow(QtWidgets.QMainWindow):
         self.pref["vfowindow"] = self.actionVFO.isChecked()
         Preferences.save()
         if self.actionVFO.isChecked():
-            self.vfo_window.show()
-        else:
+            self.dock_window("vfo_window").show()
+        elif self.vfo_window:
             self.vfo_window.hide()
 
     def launch_chat_window(self) -> None:
@@ -2550,9 +2521,9 @@ class MainWindow(QtWidgets.QMainWindow):
         self.pref["chatwindow"] = self.actionGroup_Chat.isChecked()
         Preferences.save()
         if self.actionGroup_Chat.isChecked():
-            self.chat_window.show()
+            self.dock_window("chat_window").show()
             self.chat_window.setActive(True)
-        else:
+        elif self.chat_window:
             self.chat_window.hide()
             self.chat_window.setActive(False)
 
@@ -2635,19 +2606,7 @@ class MainWindow(QtWidgets.QMainWindow):
         return : dict
         {'entity': 'European Russia', 'cq': 16, 'itu': 29, 'continent': 'EU', 'lat': 53.65, 'long': -41.37, 'tz': 4.0, 'len': 2, 'primary_pfx': 'UA', 'exact_match': False}
         """
-        callsign = callsign.upper()
-        for count in reversed(range(len(callsign))):
-            searchitem = callsign[: count + 1]
-            result = {
-                key: val for key, val in self.ctyfile.items() if key == searchitem
-            }
-            if not result:
-                continue
-            if result.get(searchitem).get("exact_match"):
-                if searchitem == callsign:
-                    return result
-                continue
-            return result
+        return self.cty_index.lookup(callsign)
 
     def cwspeed_spinbox_changed(self) -> None:
         """
@@ -2746,7 +2705,7 @@ class MainWindow(QtWidgets.QMainWindow):
                 self.cluster_window.msg_from_main(cmd)
 
     def get_sn(self) -> None:
-        """Generate a serial number."""
+        """Generate a serial number, one past the highest in the log."""
         # {
         #     "cmd": "GET_SN",
         #     "Operator": "K6GTE",
@@ -2769,10 +2728,7 @@ class MainWindow(QtWidgets.QMainWindow):
                 except OSError as err:
                     logger.warning("%s", err)
         else:
-            result = self.database.get_serial()
-            self.current_sn = str(result.get("serial_nr", "1"))
-            if self.current_sn == "None":
-                self.current_sn = "1"
+            self.current_sn = str(self.contest_state.next_serial())
 
     def process_key_bindings(self, event: QKeyEvent, obj=None) -> bool:
         """
@@ -3021,6 +2977,9 @@ class MainWindow(QtWidgets.QMainWindow):
         self.dupe_indicator.hide()
         self.callsign.setStyleSheet("")
         self.contact = self.database.empty_contact.copy()
+        if self.radio_state.get("vfoa"):
+            # The radio only reports changes, the band carries over.
+            self.contact["Band"] = get_logged_band(str(self.radio_state["vfoa"]))
         self.heading_distance.setText("")
         self.history_info.setText("")
         self.dx_entity.setText("")
@@ -3209,7 +3168,10 @@ class MainWindow(QtWidgets.QMainWindow):
                 logger.debug("%s", f"{self.n1mm.contact_info}")
                 self.n1mm.send_contact_info()
 
-        self.database.log_contact(self.contact)
+        if self.database.log_contact(self.contact):
+            delta = self.contest_state.add(self.contact)
+        else:
+            delta = {"added": [], "removed": []}
         if not self.pref["run_state"]:  # in S&P mode, put the contact into the bandmap
             self.mark_spot(comment=self.current_mode)
 
@@ -3228,12 +3190,28 @@ class MainWindow(QtWidgets.QMainWindow):
                 self.server_channel.send_as_json(self.contact)
             except OSError as err:
                 logger.warning("%s", err)
-        self.worked_list = self.database.get_calls_and_bands()
+        self.worked_list = self.contest_state.worked_list()
         self.send_worked_list()
         self.clearinputs()
         self.update_rtc_xml()
+        self.send_log_update(delta)
+
+    def send_log_update(self, delta: dict) -> None:
+        """
+        Tell the dock windows the log changed.
+
+        Parameters
+        ----------
+        delta : dict
+        The ContestState delta describing the change.
+
+        Returns
+        -------
+        None
+        """
         cmd = {}
         cmd["cmd"] = "UPDATELOG"
+        cmd["delta"] = delta
         if self.log_window:
             self.log_window.msg_from_main(cmd)
         if self.check_window:
@@ -3551,13 +3529,12 @@ class MainWindow(QtWidgets.QMainWindow):
         Processed macro.
         """
 
-        if self.current_sn is not None:
+        if self.current_sn is not None and self.current_sn != "REQUESTED":
             next_serial = str(self.current_sn)
         else:
             next_serial = ""
 
-        result = self.database.get_last_serial()
-        prev_serial = str(result.get("serial_nr", "1")).zfill(3)
+        prev_serial = str(self.contest_state.last_serial()).zfill(3)
         macro = macro.upper()
         macro = macro.replace(  # handle EXCH first so it can contain more macros
             "{EXCH}", self.contest_settings.get("SentExchange", "xxx")
@@ -3707,9 +3684,7 @@ class MainWindow(QtWidgets.QMainWindow):
 
         logger.debug("Function Key: %s", function_key.text())
         if self._is_phone_mode():
-            self.voice_output_available = has_output_device(
-                self.pref.get("sounddevice", "default")
-            )
+            self.voice_output_available = self.voice_process.output_available()
             if not self.voice_output_available:
                 self.show_CW_macros()
                 logger.warning("No available output sound device for voice keying.")
@@ -3904,6 +3879,7 @@ class MainWindow(QtWidgets.QMainWindow):
                 int(self.pref.get("CAT_port", 0000)),
             )
         self.rig_control.delta = int(self.pref.get("CAT_polldelta", 555))
+        self.rig_status = {}
         self.rig_control.moveToThread(self.radio_thread)
         self.radio_thread.started.connect(self.rig_control.run)
         self.radio_thread.finished.connect(self.rig_control.deleteLater)
@@ -4017,7 +3993,7 @@ class MainWindow(QtWidgets.QMainWindow):
         else:
             self.server_icon.hide()
 
-        if isinstance(self.rotator_window, RotatorWindow):
+        if self.rotator_window is not None:
             self.rotator_window.set_host_port(
                 host=self.pref.get(
                     "rotctld_address",
@@ -4283,7 +4259,9 @@ class MainWindow(QtWidgets.QMainWindow):
         if self.auto_cq is True:
             self.stop_cw()
             self.voice_process.stop_voice()
-        self.get_sn()
+        latency = self.keystroke_latency
+        with latency.measure("serial"):
+            self.get_sn()
         if self.pref.get("sandpqsy") is True and self.radioButton_sp.isChecked():
             self.sandpfreq = int(self.radio_state.get("vfoa", 0))
         text = self.callsign.text()
@@ -4327,26 +4305,53 @@ class MainWindow(QtWidgets.QMainWindow):
                 if "CQ WW" in self.contest.name or "IARU HF" in self.contest.name:
                     self.contest.prefill(self)
             return
-        cmd = {}
-        cmd["cmd"] = "CALLCHANGED"
-        cmd["call"] = stripped_text
-        if self.bandmap_window:
-            self.bandmap_window.msg_from_main(cmd)
-        if self.log_window:
-            self.log_window.msg_from_main(cmd)
-        if self.check_window:
-            self.check_window.msg_from_main(cmd)
+        self.pending_callchanged = stripped_text
+        if stripped_text:
+            self.callchanged_timer.start()
+        else:
+            self.callchanged_timer.stop()
+            self.send_callchanged()
         self.dupe_indicator.hide()
         self.callsign.setStyleSheet("")
         if len(stripped_text) >= 3:
-            self.check_callsign(stripped_text)
-            self.check_dupe(stripped_text)
+            with latency.measure("cty"):
+                self.check_callsign(stripped_text)
+            with latency.measure("dupe"):
+                self.check_dupe(stripped_text)
         if (
             self.contest
             and self.use_call_history
             and hasattr(self.contest, "populate_history_info_line")
         ):
-            self.contest.populate_history_info_line(self)
+            with latency.measure("history"):
+                self.contest.populate_history_info_line(self)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("keystroke %s", latency.summary())
+
+    def send_callchanged(self) -> None:
+        """
+        Tell the bandmap, log and check windows the call has changed.
+        Called by callchanged_timer once typing pauses, or straight away
+        when the callsign field is cleared.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        """
+        cmd = {}
+        cmd["cmd"] = "CALLCHANGED"
+        cmd["call"] = self.pending_callchanged
+        with self.keystroke_latency.measure("callchanged"):
+            if self.bandmap_window:
+                self.bandmap_window.msg_from_main(cmd)
+            if self.log_window:
+                self.log_window.msg_from_main(cmd)
+            if self.check_window:
+                self.check_window.msg_from_main(cmd)
 
     def change_freq(self, stripped_text: str) -> None:
         """
@@ -4575,16 +4580,18 @@ class MainWindow(QtWidgets.QMainWindow):
             except OSError as err:
                 logger.warning("%s", err)
         else:
-            if self.contest.dupe_type == 1:
-                result = self.database.check_dupe(call)
-            if self.contest.dupe_type == 2:
-                result = self.database.check_dupe_on_band(call, band)
-            if self.contest.dupe_type == 3:
-                result = self.database.check_dupe_on_band_mode(call, band, mode)
-            if self.contest.dupe_type == 4:
-                result = {"isdupe": False}
-            if self.contest.dupe_type == 5:
-                result = {"isdupe": False}  # in case contest has no function.
+            result = {"isdupe": False}
+            isdupe = self.contest_state.is_dupe(
+                {
+                    "Call": call,
+                    "Band": band,
+                    "Mode": mode,
+                    "TS": datetime.datetime.now(datetime.UTC).isoformat(" ")[:19],
+                }
+            )
+            if isdupe is not None:
+                result = {"isdupe": isdupe}
+            elif self.contest.dupe_type == 5:
                 if not hasattr(self.contest, "check_dupe"):
                     result = self.contest.specific_contest_check_dupe(self, call)
 
@@ -4599,6 +4606,24 @@ class MainWindow(QtWidgets.QMainWindow):
                 self.dupe_indicator.hide()
                 self.callsign.setStyleSheet("")
 
+    def dupe_key_function(self):
+        """
+        The ContestState dupe key function for the loaded contest's dupe
+        type. None for no dupes, or for a dupe type 5 contest without a
+        dupe_key function, whose specific_contest_check_dupe decides.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        function or None
+        """
+        if self.contest.dupe_type == 5 and hasattr(self.contest, "dupe_key"):
+            return functools.partial(self.contest.dupe_key, self)
+        return DUPE_KEYS.get(self.contest.dupe_type)
+
     def setmode(self, mode: str) -> None:
         """Call when the mode changes."""
         if mode in ("CW", "CW-U", "CW-L", "CWR", "CW-R"):
@@ -4694,14 +4719,11 @@ class MainWindow(QtWidgets.QMainWindow):
                         logger.debug("Destination: %s", str(destination_file))
                         destination_file.write_bytes(child.read_bytes())
 
-    def poll_radio(self, the_dict: dict) -> None:
+    def check_auto_cq(self) -> None:
         """
-        Gets called by thread worker radio.py
-        Passing in a dictionary object with the
-        vfo freq, mode, bandwidth, and online state of the radio.
+        Gets called by auto_cq_timer. Advances the auto CQ progress bar and
+        sends the CQ when it is time.
         """
-        # This section has nothing to do with polling the radio
-        # It's here because it gets called often enough to be useful.
         if self.auto_cq is True:
             now = datetime.datetime.now(tz=datetime.UTC)
             total_duration = self.auto_cq_time - self.auto_cq_then
@@ -4723,8 +4745,15 @@ class MainWindow(QtWidgets.QMainWindow):
             if now > self.server_seen:
                 self.server_icon.setPixmap(self.redserver)
 
-        # The following pertains to radio polling.
+    def poll_radio(self, the_dict: dict) -> None:
+        """
+        Gets called by thread worker radio.py
+        Passing in a dictionary object with the changed ones of the
+        vfo freq, mode, bandwidth, and online state of the radio.
+        """
         logger.debug(f"{the_dict=}")
+        self.rig_status.update(the_dict)
+        the_dict = self.rig_status
         info_dirty = False
         vfo = the_dict.get("vfoa", "")
         mode = the_dict.get("mode", "")
@@ -5087,6 +5116,9 @@ class MainWindow(QtWidgets.QMainWindow):
         # https://www.adif.org/315/ADIF_315.htm
         logger.debug("******ADIF IMPORT*****")
         self.contest.imp_adif(self)
+        self.send_log_update(self.contest_state.load(self.database))
+        self.worked_list = self.contest_state.worked_list()
+        self.send_worked_list()
 
     def load_fonts_from_dir(self, directory: str) -> str:
         """
@@ -5177,10 +5209,16 @@ def run() -> None:
 
     # families = load_fonts_from_dir(os.fspath(fsutils.APP_DATA_PATH))
     # logger.info(f"font families {families}")
-    window = MainWindow(splash)
+    startup_profile = None
+    if "--profile-startup" in sys.argv:
+        startup_profile = StartupProfile(IMPORTS_STARTED)
+    window = MainWindow(splash, startup_profile)
     window.callsign.setFocus()
     splash.finish(window)
     window.show()
+    if startup_profile:
+        startup_profile.begin("Showing main window.")
+        QtCore.QTimer.singleShot(0, window.write_startup_profile)
     logger.debug(
         f"\nResolved OS file system paths:\nAPP_DATA_PATH {fsutils.APP_DATA_PATH}\nMODULE_PATH {fsutils.MODULE_PATH}\nUSER_DATA_PATH {fsutils.USER_DATA_PATH}\nCONFIG_PATH {fsutils.CONFIG_PATH}\nLOG_FILE {fsutils.LOG_FILE}"
     )
@@ -228,22 +228,26 @@ def EXCH_DECR(self) -> None:
 
 def ROTATE(self) -> None:
     """Rotate antenna towards current contact"""
-    self.rotator_window.the_eye_of_sauron()
+    if self.rotator_window:
+        self.rotator_window.the_eye_of_sauron()
 
 
 def ROTATE_LP(self) -> None:
     """Rotate antenna to long-path bearing of contact"""
-    self.rotator_window.rotate_long_path()
+    if self.rotator_window:
+        self.rotator_window.rotate_long_path()
 
 
 def ROTATE_LEFT(self) -> None:
     """Rotate antenna 30° left (counter-clockwise)"""
-    self.rotator_window.rotate_left()
+    if self.rotator_window:
+        self.rotator_window.rotate_left()
 
 
 def ROTATE_RIGHT(self) -> None:
     """Rotate antenna 30° right (clockwise)"""
-    self.rotator_window.rotate_right()
+    if self.rotator_window:
+        self.rotator_window.rotate_right()
 
 
 def CLEAR_INPUTS(self) -> None:
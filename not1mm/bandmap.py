@@ -9,7 +9,6 @@ Purpose: Onscreen widget to show realtime spots from an AR cluster.
 
 import logging
 import platform
-import sqlite3
 from datetime import UTC, datetime
 from decimal import Decimal
 
@@ -19,9 +18,10 @@ from PyQt6.QtGui import QColor, QFont
 from PyQt6.QtWidgets import QDockWidget, QStyle
 
 from not1mm import fsutils
-from not1mm.lib.ham_utility import band2banddef, khz2banddef
+from not1mm.lib.ham_utility import band2banddef
 from not1mm.lib.i18n import load_ui
 from not1mm.lib.preferences import Preferences
+from not1mm.lib.spot_store import SpotStore, is_marked
 
 # from not1mm.lib.multicast import Multicast
 
@@ -29,288 +29,29 @@ logger = logging.getLogger(__name__)
 
 PIXELSPERSTEP = 10
 UPDATE_INTERVAL = 2000
-CLEAR_FREQ = 0.1  # 100 Hz
 
 
-class Database:
-    """
-    An in memory Database class to hold spots.
-    """
-
-    def __init__(self) -> None:
-        self.db = sqlite3.connect(":memory:")
-        self.db.row_factory = self.row_factory
-        self.cursor = self.db.cursor()
-        sql_command = (
-            "create table spots ("
-            "callsign VARCHAR(15) NOT NULL, "
-            "ts DATETIME NOT NULL, "
-            "freq DOUBLE NOT NULL, "  # in kHz
-            "mode VARCHAR(6), "
-            "spotter VARCHAR(15) NOT NULL, "
-            "comment VARCHAR(45));"
-        )
-        self.cursor.execute(sql_command)
-
-        self.cursor.execute("CREATE INDEX spot_call_index ON spots (callsign);")
-        self.cursor.execute("CREATE INDEX spot_freq_index ON spots (freq);")
-        self.cursor.execute("CREATE INDEX spot_ts_index ON spots (ts);")
-
-        self.db.commit()
-
-    @staticmethod
-    def row_factory(cursor, row):
-        """
-        cursor.description:
-        (name, type_code, display_size,
-        internal_size, precision, scale, null_ok)
-        row: (value, value, ...)
-        """
-        return {
-            col[0]: row[idx]
-            for idx, col in enumerate(
-                cursor.description,
-            )
-        }
-
-    def get_like_calls(self, call: str) -> dict:
-        """
-        Returns spots where the spotted callsigns contain the supplied string.
-
-        Parameters
-        ----------
-        call : str
-        The callsign to search for.
-
-        Returns
-        -------
-        a dict like:
-
-        {'K5TUX': [14.0, 21.0], 'N2CQR': [14.0], 'NE4RD': [14.0]}
-        """
-        try:
-            self.cursor.execute(
-                f"select distinct callsign from spots where callsign like '%{call}%' ORDER by callsign ASC;"
-            )
-            result = self.cursor.fetchall()
-            return result
-        except sqlite3.OperationalError as exception:
-            logger.debug("%s", exception)
-            return {}
-
-    def addspot(self, spot: dict, clear_freq=False) -> None:
-        """
-        Add spot to database, replacing any previous spots with the same call
-        on the same band.
-
-        Parameters
-        ----------
-        spot: Dict
-        A dict of the form: {'ts': datetime, 'callsign': str, 'freq': float,
-        'band': str,'mode': str,'spotter': str, 'comment': str}
-
-        clear_freq: bool
-        If True, delete any previous spots around this frequency.
-
-        Returns
-        -------
-        Nothing.
-        """
-
-        if "band" in spot:
-            band = band2banddef(spot.get("band", ""), unknown_band=True)
-        else:
-            band = khz2banddef(spot.get("freq"), unknown_band=True)
-
-        try:
-            delete_call_q = (
-                "delete from spots where callsign = ? and freq between ? and ?"
-            )
-            if "MARKED" not in spot.get("comment", ""):
-                # new spot is not MARKED, don't overwrite any MARKED spot
-                delete_call_q += " and comment not like '%MARKED%'"
-            self.cursor.execute(
-                delete_call_q, (spot.get("callsign"), band.start, band.end)
-            )
-
-            if clear_freq:
-                clear_freq_q = "delete from spots where freq between ? and ?"
-                if "MARKED" not in spot.get("comment", ""):
-                    clear_freq_q += " and comment not like '%MARKED%'"
-                clear_freq_q += ";"
-                self.cursor.execute(
-                    clear_freq_q,
-                    (spot.get("freq") - CLEAR_FREQ, spot.get("freq") + CLEAR_FREQ),
-                )
-
-            self.cursor.execute(
-                "INSERT INTO spots(callsign, ts, freq, mode, spotter, comment) VALUES(?, ?, ?, ?, ?, ?)",
-                (
-                    spot["callsign"],
-                    spot.get(
-                        "ts",
-                        datetime.now(UTC).replace(second=0, microsecond=0, tzinfo=None),
-                    ),
-                    spot["freq"],
-                    spot.get("mode", None),
-                    spot.get("spotter", platform.node()),
-                    spot.get("comment", ""),
-                ),
-            )
-            self.db.commit()
-        except sqlite3.IntegrityError:
-            ...
-
-    def markspot(self, spot: dict, clear_freq=False) -> None:
-        "..."
-        print(f"{spot=}")
-        the_UTC_time = datetime.now(UTC).isoformat(" ")[:19].split()[1]
-        ts = "2099-01-01 " + the_UTC_time
-        try:
-            self.cursor.execute(
-                f"update spots set ts='{ts}', comment='{spot.get('comment', '')}' where freq='{spot.get('freq', '')}' and callsign='{spot.get('callsign', '')}';"
-            )
-            self.db.commit()
-        except sqlite3.IntegrityError:
-            ...
-
-    def getspots(self) -> list:
-        """
-        Return a list of spots, sorted by the ascending frequency of the spot.
-
-        Parameters
-        ----------
-        None
-
-        Returns
-        -------
-        a list of dicts.
-        """
-        try:
-            self.cursor.execute("select * from spots order by freq ASC;")
-            return self.cursor.fetchall()
-        except sqlite3.OperationalError:
-            return ()
-
-    def getspotsinband(self, start: float, end: float) -> list:
-        """
-        Returns spots in a list of dicts where the spotted frequency
-        is in the range defined, in ascending order.
-
-        Parameters
-        ----------
-        start : float
-        The start frequency.
-        end : float
-        The end frequency.
-
-        Returns
-        -------
-        A list of dicts.
-        """
-        self.cursor.execute(
-            "select * from spots where freq >= ? and freq <= ? order by freq ASC;",
-            (start, end),
-        )
-        return self.cursor.fetchall()
-
-    def get_next_spot(self, current: float, limit: float) -> dict:
-        """
-        Return a list of dict where freq range is defined by current and limit.
-        The list is sorted by the ascending frequency of the spot.
-
-        Parameters
-        ----------
-        current : float
-        The current frequency.
-        limit : float
-        The limit frequency.
-
-        Returns
-        -------
-        A dict of the spot.
-        """
-        self.cursor.execute(
-            "select * from spots where freq > ? and freq <= ? order by freq ASC;",
-            (current, limit),
-        )
-        return self.cursor.fetchone()
-
-    def get_matching_spot(self, dx: str, start: float, end: float) -> dict:
-        """
-        Return the first spot matching supplied dx partial callsign.
-
-        Parameters
-        ----------
-        dx : str
-        The dx partial callsign.
-        start : float
-        The start frequency.
-        end : float
-        The end frequency.
-
-        Returns
-        -------
-        A dict of the spot.
-        """
-
-        self.cursor.execute(
-            "select * from spots where freq >= ? and freq <= ? and callsign like ?;",
-            (start, end, f"%{dx}%"),
-        )
-        return self.cursor.fetchone()
-
-    def get_prev_spot(self, current: float, limit: float) -> dict:
-        """
-        Return a list of dict where freq range is defined in descending order.
-
-        Parameters
-        ----------
-        current : float
-        The current frequency.
-        limit : float
-        The limit frequency.
-
-        Returns
-        -------
-        A list of dicts.
-        """
-        self.cursor.execute(
-            "select * from spots where freq < ? and freq >= ? order by freq DESC;",
-            (current, limit),
-        )
-        return self.cursor.fetchone()
-
-    def delete_spot(self, call: str, freq: float) -> None:
-        """
-        Delete a spot identified by call and frequency.
-        """
-        self.cursor.execute(
-            "delete from spots where callsign = ? and freq = ?", (call, freq)
-        )
-        self.db.commit()
-
-    def delete_spots(self, minutes: int) -> None:
-        """
-        Delete spots older than the specified number of minutes.
-
-        Parameters
-        ----------
-        minutes : int
-        The number of minutes to delete.
-
-        Returns
-        -------
-        None
-        """
-        self.cursor.execute(
-            "delete from spots where ts < datetime('now', ?) and comment not like '%MARKED%';",
-            (f"-{minutes} minutes",),
-        )
-
-    def delete_marks(self) -> None:
-        """Delete marked spots."""
-        self.cursor.execute("delete from spots where ts > datetime('now');")
+def spot_flag(comment: str) -> str:
+    """The symbols shown after a spotted call, picked from the spot comment."""
+    # ⌾ ⦿ 🗼 ⛯ ⊕ ⊞ ⁙ ⁘ ⁕ ⌖ Ⓟ ✦ 🄿 🄿 Ⓢ 🅂 🏔
+    flag = " @"
+    if "CW" in comment:
+        flag = " ○"
+    if "NCDXF B" in comment:
+        flag = " 🗼"
+    if "BCN " in comment:
+        flag = " 🗼"
+    if "FT8" in comment:
+        flag = " ⦿"
+    if "FT4" in comment:
+        flag = " ⦿"
+    if "RTTY" in comment:
+        flag = " ⌾"
+    if "POTA" in comment:
+        flag += "[P]"
+    if "SOTA" in comment:
+        flag += "[S]"
+    return flag
 
 
 class BandMapScene(QtWidgets.QGraphicsScene):
@@ -392,8 +133,6 @@ class BandMapWindow(QDockWidget):
     rxMark = []  # noqa: RUF012
     rx_freq = None
     something = None
-    lineitemlist = []  # noqa: RUF012
-    textItemList = []  # noqa: RUF012
     connected = False
     test_for_data = None
     bandwidth = 0
@@ -437,7 +176,9 @@ class BandMapWindow(QDockWidget):
         self.clearmarkedButton.setIcon(icon)
         self.zoominButton.clicked.connect(self.zoom_in)
         self.zoomoutButton.clicked.connect(self.zoom_out)
-        self.spots = Database()
+        self.spots = SpotStore()
+        self.spot_items = {}
+        self.drawn_version = None
         self.bandmap_scene = BandMapScene(self)
         self.bandmap_scene.setFont(self.thefont)
         self.bandmap_scene.clear()
@@ -504,6 +245,14 @@ class BandMapWindow(QDockWidget):
             self.spots.addspot(spot, clear_freq=True)
             self.update_stations()
             return
+        if packet.get("cmd", "") == "DXSPOTS":
+            # FT8 decodes come with clear_freq False, they sit Hz apart.
+            clear_freq = packet.get("clear_freq", True)
+            for spot in packet.get("spots", []):
+                spot["callsign"] = spot.get("dx", "")  # rename field
+                self.spots.addspot(spot, clear_freq=clear_freq)
+            self.update_stations()
+            return
         if packet.get("cmd", "") == "MARKDX":
             dx = packet.get("dx", "")
             freq = packet.get("freq", 0.0)
@@ -537,6 +286,7 @@ class BandMapWindow(QDockWidget):
         if packet.get("cmd", "") == "WORKED":
             self.worked_list = packet.get("worked", {})
             logger.debug("%s", f"{self.worked_list}")
+            self.drawn_version = None
             self.update_stations()
             return
         if packet.get("cmd", "") == "CALLCHANGED":
@@ -586,6 +336,10 @@ class BandMapWindow(QDockWidget):
                 cmd["freq"] = items[0].property("freq")
                 cmd["spot"] = items[0].toPlainText().split()[0]
                 self.message.emit(cmd)
+        if items:
+            # Items now outlive a redraw, deselect so the next click on the
+            # same spot tunes again.
+            self.bandmap_scene.clearSelection()
 
     def request_workedlist(self):
         """Request worked call list from logger"""
@@ -741,12 +495,16 @@ class BandMapWindow(QDockWidget):
             currentPolygon.append(self.bandmap_scene.addPolygon(poly, pen, brush))
 
     def update_stations(self):
-        """doc"""
+        """
+        Bring the spot items in line with the spot store. Only items whose
+        spot appeared, moved, changed or went away are touched.
+        """
         self.update_timer.setInterval(UPDATE_INTERVAL)
         if self.active is False or not self.isVisible():
             return
-        self.clear_all_callsign_from_scene()
         self.spot_aging()
+        if self.drawn_version == self.spots.version:
+            return
         step, _digits = self.determine_step_digits()
 
         result = self.spots.getspotsinband(self.currentBand.start, self.currentBand.end)
@@ -754,59 +512,38 @@ class BandMapWindow(QDockWidget):
             f"{len(result)} spots in range {self.currentBand.start} - {self.currentBand.end}"
         )
 
-        entity = ""
-        if result:
-            # ⌾ ⦿ 🗼 ⛯ ⊕ ⊞ ⁙ ⁘ ⁕ ⌖ Ⓟ ✦ 🄿 🄿 Ⓢ 🅂 🏔
-            min_y = 0.0
-            for items in result:
-                flag = " @"
-                if "CW" in items.get("comment"):
-                    flag = " ○"
-                if "NCDXF B" in items.get("comment"):
-                    flag = " 🗼"
-                if "BCN " in items.get("comment"):
-                    flag = " 🗼"
-                if "FT8" in items.get("comment"):
-                    flag = " ⦿"
-                if "FT4" in items.get("comment"):
-                    flag = " ⦿"
-                if "RTTY" in items.get("comment"):
-                    flag = " ⌾"
-                if "POTA" in items.get("comment"):
-                    flag += "[P]"
-                if "SOTA" in items.get("comment"):
-                    flag += "[S]"
-
-                pen_color = self.text_color
-                if "MARKED" in items.get("comment"):
-                    setdarkmode = self.is_it_dark()
-                    if setdarkmode is True:
-                        pen_color = self.dark_marked_color
-                    else:
-                        pen_color = self.light_marked_color
-                if items.get("callsign") in self.worked_list:
-                    call_bandlist = self.worked_list.get(items.get("callsign"))
-                    if self.currentBand.band_mhz in call_bandlist:
-                        pen_color = self.worked_color
-                freq_y = (
-                    (items.get("freq") - self.currentBand.start) / step
-                ) * PIXELSPERSTEP
-                text_y = max(min_y + 5, freq_y)
-                self.lineitemlist.append(
-                    self.bandmap_scene.addLine(
-                        22, freq_y, 55, text_y, QtGui.QPen(pen_color)
-                    )
-                )
-                text = self.bandmap_scene.addText(
-                    items.get("callsign")
-                    + flag
-                    + entity
-                    + " "
-                    + items.get("ts").split()[1][:-3]
+        if self.is_it_dark():
+            marked_color = self.dark_marked_color
+        else:
+            marked_color = self.light_marked_color
+        shown = {}
+        min_y = 0.0
+        for items in result:
+            pen_color = self.text_color
+            if is_marked(items):
+                pen_color = marked_color
+            if items.get("callsign") in self.worked_list:
+                call_bandlist = self.worked_list.get(items.get("callsign"))
+                if self.currentBand.band_mhz in call_bandlist:
+                    pen_color = self.worked_color
+            freq_y = (
+                (items.get("freq") - self.currentBand.start) / step
+            ) * PIXELSPERSTEP
+            text_y = max(min_y + 5, freq_y)
+            label = (
+                items.get("callsign")
+                + spot_flag(items.get("comment"))
+                + " "
+                + items.get("ts").split()[1][:-3]
+            )
+            line, text = self.spot_items.pop(items["id"], (None, None))
+            if text is None:
+                line = self.bandmap_scene.addLine(
+                    22, freq_y, 55, text_y, QtGui.QPen(pen_color)
                 )
+                text = self.bandmap_scene.addText(label)
                 text.setFont(self.thefont)
                 text.document().setDocumentMargin(0)
-                text.setPos(60, text_y - (text.boundingRect().height() / 2))
                 text.setFlags(
                     QtWidgets.QGraphicsItem.GraphicsItemFlag.ItemIsFocusable
                     | QtWidgets.QGraphicsItem.GraphicsItemFlag.ItemIsSelectable
@@ -814,10 +551,30 @@ class BandMapWindow(QDockWidget):
                 )
                 text.setProperty("callsign", items.get("callsign"))
                 text.setProperty("freq", items.get("freq"))
+            else:
+                spot_line = QtCore.QLineF(22, freq_y, 55, text_y)
+                if line.line() != spot_line:
+                    line.setLine(spot_line)
+                if line.pen().color() != pen_color:
+                    line.setPen(QtGui.QPen(pen_color))
+                if text.toPlainText() != label:
+                    text.setPlainText(label)
+            if text.toolTip() != items.get("comment"):
                 text.setToolTip(items.get("comment"))
+            if text.defaultTextColor() != pen_color:
                 text.setDefaultTextColor(pen_color)
-                min_y = text_y + text.boundingRect().height() / 2
-                self.textItemList.append(text)
+            height = text.boundingRect().height()
+            position = QtCore.QPointF(60, text_y - (height / 2))
+            if text.pos() != position:
+                text.setPos(position)
+            min_y = text_y + height / 2
+            shown[items["id"]] = (line, text)
+
+        for line, text in self.spot_items.values():
+            self.bandmap_scene.removeItem(line)
+            self.bandmap_scene.removeItem(text)
+        self.spot_items = shown
+        self.drawn_version = self.spots.version
 
     def determine_step_digits(self):
         """doc"""
@@ -849,12 +606,11 @@ class BandMapWindow(QDockWidget):
 
     def clear_all_callsign_from_scene(self) -> None:
         """Remove callsigns from the scene."""
-        for items in self.textItemList:
-            self.bandmap_scene.removeItem(items)
-        self.textItemList.clear()
-        for items in self.lineitemlist:
-            self.bandmap_scene.removeItem(items)
-        self.lineitemlist.clear()
+        for line, text in self.spot_items.values():
+            self.bandmap_scene.removeItem(line)
+            self.bandmap_scene.removeItem(text)
+        self.spot_items = {}
+        self.drawn_version = None
 
     def clear_freq_mark(self, currentPolygon) -> None:
         """Remove frequency marks from the scene."""
@@ -18,6 +18,7 @@ from rapidfuzz.distance import Levenshtein
 from not1mm import fsutils
 from not1mm.lib.database import DataBase
 from not1mm.lib.i18n import load_ui
+from not1mm.lib.keystroke import KeystrokeWorker
 from not1mm.lib.preferences import Preferences
 from not1mm.lib.super_check_partial import SCP
 
@@ -60,6 +61,10 @@ class CheckWindow(QDockWidget):
 
         load_ui(self, fsutils.APP_DATA_PATH / "checkwindow.ui")
         self.mscp = SCP(fsutils.APP_DATA_PATH)
+        self.keystroke_seq = 0
+        self.worker = KeystrokeWorker()
+        self.worker.finished.connect(self.matches_found)
+        self.worker.start()
         self._udpwatch = None
         self.udp_fifo = queue.Queue()
 
@@ -82,6 +87,7 @@ class CheckWindow(QDockWidget):
         if packet.get("cmd", "") == "CALLCHANGED":
             call = packet.get("call", "")
             self.call = call
+            self.keystroke_seq += 1
             self.master_list(call)
             self.log_list(call)
             return
@@ -132,13 +138,16 @@ class CheckWindow(QDockWidget):
         -------
         None
         """
+        self.worker.cancel("scp")
+        self.worker.cancel("log")
         self.populate_layout(self.masterLayout, [])
         self.populate_layout(self.qsoLayout, [])
         self.populate_layout(self.dxcLayout, [])
 
     def master_list(self, call: str) -> None:
         """
-        Get MASTER.SCP matches to call and display in list.
+        Have the worker find the MASTER.SCP matches to call, they are
+        displayed by matches_found.
 
         Parameters
         ----------
@@ -149,12 +158,12 @@ class CheckWindow(QDockWidget):
         -------
         None
         """
-        self.populate_layout(self.masterLayout, [])
-        self.populate_layout(self.masterLayout, self.mscp.super_check(call))
+        self.worker.submit("scp", self.keystroke_seq, self.mscp.super_check, call)
 
     def log_list(self, call: str) -> None:
         """
-        Get log matches to call and display in list.
+        Have the worker find the log matches to call, they are displayed
+        by matches_found.
 
         Parameters
         ----------
@@ -165,10 +174,48 @@ class CheckWindow(QDockWidget):
         -------
         None
         """
-        self.populate_layout(self.qsoLayout, [])
-        if call:
-            result = self.database.get_like_calls_and_bands(call)
-            self.populate_layout(self.qsoLayout, result)
+        if not call:
+            self.worker.cancel("log")
+            self.populate_layout(self.qsoLayout, [])
+            return
+        self.worker.submit(
+            "log",
+            self.keystroke_seq,
+            self.find_log_matches,
+            self.dbname,
+            self.database.current_contest,
+            call,
+        )
+
+    def find_log_matches(self, dbname, contest: int, call: str) -> list:
+        """Calls in the log like call. Runs on the worker thread."""
+        database = self.worker.database(dbname, fsutils.APP_DATA_PATH, contest)
+        return database.get_like_calls_and_bands(call)
+
+    def matches_found(self, stage: str, seq: int, matches: list) -> None:
+        """
+        Display matches the worker found, unless the call has changed
+        since.
+
+        Parameters
+        ----------
+        stage : str
+        "scp" or "log", the list the matches are for
+        seq : int
+        The keystroke the matches are for
+        matches : list
+        The matching calls
+
+        Returns
+        -------
+        None
+        """
+        if not self.worker.accept(stage, seq):
+            return
+        if stage == "scp":
+            self.populate_layout(self.masterLayout, matches)
+        elif stage == "log":
+            self.populate_layout(self.qsoLayout, matches)
 
     def telnet_list(self, spots: list) -> None:
         """
@@ -7,19 +7,21 @@ Purpose: Standalone dock widget for DX cluster traffic.
 """
 
 import logging
-import re
 from datetime import UTC, datetime
 
-from PyQt6 import QtGui, QtNetwork
+from PyQt6 import QtCore, QtGui, QtNetwork
 from PyQt6.QtCore import pyqtSignal
 from PyQt6.QtWidgets import QDockWidget
 
 from not1mm import fsutils
+from not1mm.lib.cluster_ingest import WWV_LINE, SpotIngest, parse_spot
 from not1mm.lib.i18n import load_ui
 from not1mm.lib.preferences import Preferences
 
 logger = logging.getLogger(__name__)
 
+FRAME_INTERVAL = 16  # ms, spots and console lines are flushed once per frame
+
 
 class ClusterWindow(QDockWidget):
     """The Cluster window."""
@@ -54,12 +56,37 @@ class ClusterWindow(QDockWidget):
         self.socket.disconnected.connect(self.cluster_disconnected)
         self.socket.errorOccurred.connect(self.cluster_socket_error)
 
+        self.ingest = SpotIngest()
+        self.pending_lines = []
+        self.frame_timer = QtCore.QTimer()
+        self.frame_timer.setSingleShot(True)
+        self.frame_timer.setInterval(FRAME_INTERVAL)
+        self.frame_timer.timeout.connect(self.flush_frame)
+
     def append_message(self, message: str) -> None:
+        """Queue a line for the console, it is shown with the next frame."""
+        self.pending_lines.append(message)
+        if not self.frame_timer.isActive():
+            self.frame_timer.start()
+
+    def flush_frame(self) -> None:
+        """Show the queued console lines and pass the queued spots on."""
+        spots = self.ingest.drain()
+        if spots:
+            self.message.emit({"cmd": "DXSPOTS", "spots": spots})
+            logger.debug("cluster ingest %s", self.ingest.stats())
+
+        if not self.pending_lines:
+            return
+        lines, self.pending_lines = self.pending_lines, []
         sb = self.clusterOutput.verticalScrollBar()
         # tolerance of 4 px to account for overscroll/elastic scrolling
         at_bottom = sb.value() >= sb.maximum() - 4
 
-        self.clusterOutput.append(message)
+        self.clusterOutput.setUpdatesEnabled(False)
+        for line in lines:
+            self.clusterOutput.append(line)
+        self.clusterOutput.setUpdatesEnabled(True)
 
         if at_bottom:
             sb.setValue(sb.maximum())
@@ -159,30 +186,17 @@ class ClusterWindow(QDockWidget):
                 pass
 
             if "DX de" in data:
-                parts = data.split()
-                spotter = parts[2]
-                freq = parts[3]
-                dx = parts[4]
-                _time = parts[-1]
-                comment = " ".join(parts[5:-1])
-                spot = {}
-                spot["cmd"] = "DX"
-                spot["ts"] = datetime.now(UTC).isoformat(" ")[:19]
-                spot["dx"] = dx
-                spot["spotter"] = spotter
-                spot["comment"] = comment
-                logger.debug(f"{spot}")
-                try:
-                    spot["freq"] = float(freq)
-                    self.message.emit(spot)
-                except ValueError:
+                spot = parse_spot(data)
+                if spot:
+                    logger.debug(f"{spot}")
+                    self.ingest.push(spot)
+                    if not self.frame_timer.isActive():
+                        self.frame_timer.start()
+                else:
                     logger.debug(f"couldn't parse freq from datablock {data}")
 
             # wwv data
-            if match := re.search(
-                r"(\d{2}-\w{3}-\d{4})\s+(\d+)\s+(\d+)\s+(\d+)\s+(\d+)\s+(.*?)\s+<(\w+)>",
-                data,
-            ):
+            if match := WWV_LINE.search(data):
                 cmd = {}
                 cmd["cmd"] = "SPACEWEATHER"
                 cmd["date"] = match.group(1)
@@ -1,5 +1,4 @@
 import logging
-from json import loads
 from json.decoder import JSONDecodeError
 
 from PyQt6 import QtWidgets
@@ -8,6 +7,12 @@ from PyQt6.QtGui import QBrush, QColor
 from PyQt6.QtWidgets import QDockWidget
 
 from not1mm import fsutils
+from not1mm.lib.cty_index import CtyIndex, load_cty_index
+from not1mm.lib.contest_state import (
+    apply_band_table_delta,
+    band_table_from_rows,
+    band_table_rows,
+)
 from not1mm.lib.database import DataBase
 from not1mm.lib.i18n import load_ui
 from not1mm.lib.preferences import Preferences
@@ -17,10 +22,11 @@ logger = logging.getLogger(__name__)
 
 class DXCCWindow(QDockWidget):
     message = pyqtSignal(dict)
-    ctyfile = {}  # noqa: RUF012
+    cty_index = CtyIndex()
     dbname = None
     db = None
     model = None
+    band_table = None
     pref = {}  # noqa: RUF012
     columns = {  # noqa: RUF012
         0: "DXCC",
@@ -64,10 +70,7 @@ class DXCCWindow(QDockWidget):
 
     def load_cty_data(self):
         try:
-            with open(
-                fsutils.APP_DATA_PATH / "cty.json", "rt", encoding="utf-8"
-            ) as c_file:
-                self.ctyfile = loads(c_file.read())
+            self.cty_index = load_cty_index(fsutils.APP_DATA_PATH / "cty.json")
         except (OSError, JSONDecodeError, TypeError):
             logger.critical("There was an error parsing the BigCity file.")
 
@@ -85,7 +88,7 @@ class DXCCWindow(QDockWidget):
         {'entity': 'European Russia', 'cq': 16, 'itu': 29, 'continent': 'EU', 'lat': 53.65, 'long': -41.37, 'tz': 4.0, 'len': 2, 'primary_pfx': 'UA', 'exact_match': False}
         """
 
-        result = self.ctyfile.get(dxcc, {})
+        result = self.cty_index.get(dxcc, {})
         return result.get("entity", "")
 
     def get_log(self):
@@ -98,11 +101,15 @@ class DXCCWindow(QDockWidget):
         # ]
         if not self.active:
             return
-        result = self.database.fetch_dxcc_by_band_count()
+        if self.band_table is None:
+            self.band_table = band_table_from_rows(
+                self.database.fetch_dxcc_by_band_count(), "CountryPrefix"
+            )
+        result = band_table_rows(self.band_table)
         self.dxcc_table.setRowCount(0)
         for row_number, row_data in enumerate(result):
             self.dxcc_table.insertRow(row_number)
-            for column, data in enumerate(row_data.values()):
+            for column, data in enumerate(row_data):
                 item = QtWidgets.QTableWidgetItem(str(data))
                 if column == 0:
                     item.setToolTip(self.dxcc_lookup(data))
@@ -163,11 +170,26 @@ class DXCCWindow(QDockWidget):
         self.database = DataBase(self.dbname, fsutils.APP_DATA_PATH)
         self.database.current_contest = self.pref.get("contest", 0)
         self.contact = self.database.empty_contact
+        self.band_table = None
         self.get_log()
 
     def msg_from_main(self, msg):
         """Process messages from the main window"""
 
+        if msg.get("cmd", "") in (
+            "UPDATELOG",
+            "CONTACTCHANGED",
+            "DELETE",
+            "DELETED",
+        ):
+            delta = msg.get("delta")
+            if self.band_table is not None and delta and not delta.get("reset"):
+                apply_band_table_delta(self.band_table, "CountryPrefix", delta)
+            else:
+                self.band_table = None
+        if msg.get("cmd", "") == "NEWDB":
+            self.band_table = None
+
         if self.active is True and self.isVisible():
             if msg.get("cmd", "") in (
                 "UPDATELOG",
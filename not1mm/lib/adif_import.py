@@ -0,0 +1,185 @@
+"""
+Reading ADIF files into contacts.
+
+Logs merged after a multi-op or SO2R contest run to tens of thousands of
+QSOs, so a file is read as a stream: read_records yields one record at a
+time and contact_from_adif maps it onto a DXLOG contact, leaving the
+caller to store them in batches.
+
+Bytes beyond 7-bit ASCII are dropped from the file before it is parsed.
+"""
+
+import logging
+import re
+import uuid
+from decimal import Decimal
+
+import adif_io
+
+from not1mm.lib.ham_utility import get_adif_band, get_not1mm_band
+
+logger = logging.getLogger(__name__)
+
+NON_ASCII = bytes(range(128, 256))
+
+FIELD = re.compile(r"<((eor)|(\w+)\:(\d+)(\:[^>]+)?)>", re.IGNORECASE)
+HEADER_FIELD = re.compile(r"<((eoh)|(\w+)\:(\d+)(\:[^>]+)?)>", re.IGNORECASE)
+END_OF_RECORD = re.compile(r"<eor>", re.IGNORECASE)
+
+# DXLOG field: the ADIF fields it is read from, first present wins.
+FIELDS = {
+    "SNT": ("SNT", "RST_SENT"),
+    "RCV": ("RCV", "RST_RCVD"),
+    "CountryPrefix": ("COUNTRYPREFIX", "PFX"),
+    "StationPrefix": ("STATIONPREFIX",),
+    "QTH": ("QTH",),
+    "Name": ("NAME",),
+    "Comment": ("COMMENT",),
+    "NR": ("NR", "SRX_STRING"),
+    "Sect": ("SECT", "ARRL_SECT"),
+    "Prec": ("PREC",),
+    "CK": ("CK",),
+    "ZN": ("ZN", "CQZ"),
+    "SentNr": ("SENTNR", "STX_STRING"),
+    "Points": ("POINTS", "APP_N1MM_POINTS"),
+    "IsMultiplier1": ("APP_N1MM_MULT1",),
+    "IsMultiplier2": ("APP_N1MM_MULT2",),
+    "Power": ("POWER", "TX_PWR"),
+    "WPXPrefix": ("WPXPREFIX",),
+    "Exchange1": ("EXCHANGE1", "CLASS", "APP_N1MM_EXCHANGE1"),
+    "RadioNR": ("RADIONR", "APP_N1MM_RADIONR"),
+    "isMultiplier3": ("ISMULTIPLIER3", "APP_N1MM_MULT3"),
+    "MiscText": ("MISCTEXT",),
+    "IsRunQSO": ("ISRUNQSO",),
+    "ContactType": ("CONTACTTYPE",),
+    "Run1Run2": ("RUN1RUN2", "APP_N1MM_RUN1RUN2"),
+    "GridSquare": ("GRIDSQUARE",),
+    "Operator": ("OPERATOR", "STATION_CALLSIGN"),
+    "Continent": ("CONTINENT", "APP_N1MM_CONTINENT"),
+    "RoverLocation": ("ROVERLOCATION",),
+    "RadioInterfaced": ("RADIOINTERFACED", "APP_N1MM_RADIOINTERFACED"),
+    "NetworkedCompNr": ("NETWORKEDCOMPNR",),
+    "NetBiosName": ("NETBIOSNAME", "APP_N1MM_NETBIOSNAME", "N3FJP_COMPUTERNAME"),
+    "IsOriginal": ("ISORIGINAL", "APP_N1MM_ISORIGINAL"),
+    "CLAIMEDQSO": ("CLAIMEDQSO", "APP_N1MM_CLAIMEDQSO"),
+}
+
+# What a contact gets when its record has none of the fields.
+DEFAULTS = {"RadioNR": 1, "Run1Run2": 1}
+
+
+class AdifImportError(Exception):
+    """A record that can not be imported, the message says why."""
+
+
+def ascii_text(data: bytes) -> str:
+    """The 7-bit ASCII characters of data."""
+    return data.translate(None, NON_ASCII).decode("ascii")
+
+
+def count_records(text: str) -> int:
+    """How many records text holds."""
+    return len(END_OF_RECORD.findall(text))
+
+
+def read_records(text: str):
+    """
+    Yield the records of ADIF text one at a time, parsed the way
+    adif_io.read_from_string does it, as dicts keyed by upper case field
+    name. A plain dict is read far faster than an adif_io.QSO.
+    """
+    cursor = 0
+    if text and text[0] != "<":
+        while True:
+            match = HEADER_FIELD.search(text, cursor)
+            if not match:
+                raise adif_io.AdifHeaderWithoutEOHError(
+                    "<EOF> marker missing after ADIF header."
+                )
+            cursor = match.end(0)
+            if match.group(2):
+                break
+            cursor += int(match.group(4))
+    record = {}
+    match = FIELD.search(text, cursor)
+    while match:
+        cursor = match.end(0)
+        if match.group(2):
+            yield record
+            record = {}
+        else:
+            field = match.group(3).upper()
+            value = text[cursor : cursor + int(match.group(4))]
+            if field in record:
+                raise adif_io.AdifDuplicateFieldError(
+                    f"Duplication in qso {record}, {field} previously "
+                    f'"{record[field]}", now "{value}".'
+                )
+            record[field] = value
+            cursor += len(value)
+        match = FIELD.search(text, cursor)
+
+
+def frequency(record) -> float | None:
+    """The frequency of record in MHz, from FREQ or else BAND."""
+    if record.get("FREQ"):
+        try:
+            return float(record.get("FREQ"))
+        except ValueError:
+            return None
+    if record.get("BAND"):
+        return get_not1mm_band(str(record.get("BAND")).lower()) or None
+    return None
+
+
+def contact_from_adif(record, empty: dict, number: int) -> dict:
+    """
+    A new contact, starting from empty, holding what record says. number
+    is the record's place in the file, for the messages of AdifImportError
+    raised for a record without time, call, frequency or mode.
+    """
+    contact = dict(empty)
+    try:
+        contact["TS"] = adif_io.time_on(record).strftime("%Y-%m-%d %H:%M:%S")
+    except (KeyError, ValueError) as exception:
+        raise AdifImportError(
+            f"Date/time not found in QSO #{number}.\nImport cancelled."
+        ) from exception
+
+    contact["Call"] = record.get("CALL")
+    if not contact["Call"]:
+        raise AdifImportError(
+            f"Callsign not found in QSO #{number}.\nImport cancelled."
+        )
+
+    freq_mhz = frequency(record)
+    if freq_mhz is None:
+        raise AdifImportError(
+            f"Frequency not found in QSO #{number}.\nImport cancelled."
+        )
+    contact["Freq"] = freq_mhz * 1000.0
+    # ADIF Band is in Meters (eg, "20m"), not1mm is in (float) MHz
+    contact["Band"] = get_not1mm_band(str(record.get("BAND")).lower()) or (
+        get_not1mm_band(get_adif_band(Decimal(str(freq_mhz))))
+    )
+    if record.get("QSXFREQ"):
+        contact["QSXFreq"] = float(record.get("QSXFREQ")) * 1000.0
+    else:
+        contact["QSXFreq"] = 0.0
+
+    contact["Mode"] = record.get("MODE") or record.get("SUBMODE")
+    if not contact["Mode"]:
+        raise AdifImportError(
+            f"Valid Mode not found in QSO #{number}.\nImport cancelled."
+        )
+
+    for field, names in FIELDS.items():
+        for name in names:
+            if record.get(name):
+                contact[field] = record.get(name)
+                break
+        else:
+            if field in DEFAULTS:
+                contact[field] = DEFAULTS[field]
+    contact["ID"] = uuid.uuid4().hex
+    return contact
@@ -0,0 +1,132 @@
+"""
+Azimuthal equidistant projection of the world map for the rotator window.
+
+The projection is computed for every output pixel at once with numpy: the
+inverse mapping gives, for each pixel of the output disc, the latitude and
+longitude it shows, which is turned into a pixel of the equirectangular
+source map. Source pixels are then gathered in one indexing operation from
+a view straight onto the QImage's buffer, no per pixel Qt calls.
+
+MapProjector runs the same thing on a worker thread, so a new grid square
+does not stall the GUI while its map is built.
+"""
+
+import logging
+import math
+
+import numpy as np
+from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtGui import QImage
+
+logger = logging.getLogger(__name__)
+
+
+def image_array(image: QImage) -> np.ndarray:
+    """
+    A (height, width) uint32 view of a 32 bit QImage's pixels, 0xAARRGGBB.
+    The view shares the image's memory, keep the image alive while using it.
+    """
+    height, width = image.height(), image.width()
+    buffer = image.constBits()
+    buffer.setsize(image.sizeInBytes())
+    rows = np.frombuffer(buffer, dtype=np.uint32).reshape(
+        height, image.bytesPerLine() // 4
+    )
+    return rows[:, :width]
+
+
+def array_image(pixels: np.ndarray) -> QImage:
+    """An ARGB32 QImage holding a copy of a (height, width) uint32 array."""
+    pixels = np.ascontiguousarray(pixels, dtype=np.uint32)
+    height, width = pixels.shape
+    image = QImage(pixels.data, width, height, width * 4, QImage.Format.Format_ARGB32)
+    return image.copy()
+
+
+def source_pixel_indexes(
+    width: int,
+    height: int,
+    center_lat_deg: float,
+    center_lon_deg: float,
+    output_size: int,
+) -> tuple:
+    """
+    For every pixel of an output_size square azimuthal equidistant map
+    centered on the given point, the (row, column) of the equirectangular
+    source pixel it shows and a mask of the pixels inside the globe.
+    """
+    lat0 = math.radians(center_lat_deg)
+    lon0 = math.radians(center_lon_deg)
+    sin_lat = math.sin(lat0)
+    cos_lat = math.cos(lat0)
+
+    radius = output_size / 2
+    steps = np.arange(output_size, dtype=np.float64)
+    dx = ((steps - radius) / radius)[np.newaxis, :]
+    dy = ((radius - steps) / radius)[:, np.newaxis]  # +Y upwards
+
+    rho = np.sqrt(dx * dx + dy * dy)
+    inside = rho <= 1.0
+    center = rho == 0
+    safe_rho = np.where(center, 1.0, rho)
+
+    # rho scaled to the angular (great circle) distance
+    c = rho * math.pi
+    sin_c = np.sin(c)
+    cos_c = np.cos(c)
+
+    lat = np.arcsin(
+        np.clip(cos_c * sin_lat + (dy * sin_c * cos_lat / safe_rho), -1.0, 1.0)
+    )
+    lon = lon0 + np.arctan2(dx * sin_c, rho * cos_lat * cos_c - dy * sin_lat * sin_c)
+    lat = np.where(center, lat0, lat)
+    lon = np.where(center, lon0, lon)
+
+    lon_deg = np.degrees(lon)
+    lat_deg = np.degrees(lat)
+    lon_deg = np.where(lon_deg < -180, lon_deg + 360, lon_deg)
+    lon_deg = np.where(lon_deg > 180, lon_deg - 360, lon_deg)
+
+    src_x = (((lon_deg + 180.0) / 360.0) * width).astype(np.int64)
+    src_y = (((90 - lat_deg) / 180.0) * height).astype(np.int64)
+    src_x = np.clip(src_x, 0, width - 1)
+    src_y = np.clip(src_y, 0, height - 1)
+    return src_y, src_x, inside
+
+
+def project_map(
+    source_img: QImage,
+    center_lat_deg: float,
+    center_lon_deg: float,
+    output_size: int = 600,
+) -> QImage:
+    """Project an equirectangular world map onto a disc centered on lat/lon."""
+    source = source_img.convertToFormat(QImage.Format.Format_ARGB32)
+    src_y, src_x, inside = source_pixel_indexes(
+        source.width(), source.height(), center_lat_deg, center_lon_deg, output_size
+    )
+    pixels = np.where(inside, image_array(source)[src_y, src_x], np.uint32(0))
+    return array_image(pixels)
+
+
+class MapProjector(QObject):
+    """
+    Builds and caches projected maps on the thread it is moved to. projected
+    is emitted for every request, with a null QImage when it failed.
+    """
+
+    projected = pyqtSignal(str, QImage)
+
+    def project(
+        self, grid: str, source_file: str, lat: float, lon: float, size: int, cache: str
+    ) -> None:
+        """Project source_file for grid, save it to cache and emit projected."""
+        source = QImage()
+        if not source.load(source_file):
+            logger.error("unable to load map %s", source_file)
+            self.projected.emit(grid, QImage())
+            return
+        the_map = project_map(source, lat, lon, output_size=size)
+        if not the_map.save(cache, "PNG"):
+            logger.warning("unable to cache map %s", cache)
+        self.projected.emit(grid, the_map)
@@ -0,0 +1,42 @@
+"""
+Reading N1MM call history files.
+
+A call history file is comma separated text. Comment lines start with '#',
+and the first uncommented '!!Order!!' line names the columns of the lines
+that follow:
+
+    !!Order!!,Call,Name,Loc1,UserText,
+    K6GTE,Mike,DM13,
+
+Files for the weekly contests run to tens of thousands of lines, so they are
+read as a stream, one row at a time, and never held in memory whole.
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+ORDER = "!!Order!!"
+
+
+def parse_call_history(lines):
+    """
+    Yield one dict per station in the call history lines, an open file or
+    any iterable of strings. Missing trailing fields are empty strings,
+    lines without a call are skipped.
+
+    {'Call': 'K6GTE', 'Name': 'Mike', 'Loc1': 'DM13', 'UserText': ''}
+    """
+    item_names = None
+    for line in lines:
+        if item_names is None:
+            if ORDER in line and "#" not in line:
+                item_names = [name for name in line.strip().split(",")[1:] if name]
+            continue
+        if line.startswith("#"):
+            continue
+        fields = line.strip().split(",")
+        fields += [""] * (len(item_names) - len(fields))
+        row = dict(zip(item_names, fields))
+        if row.get("Call"):
+            yield row
@@ -21,6 +21,7 @@ curl -d "<?xml version='1.0'?><methodCall><methodName>rig.cwio_send</methodName>
 import http
 import logging
 import socket
+import threading
 import xmlrpc.client
 
 from not1mm.lib.cat_interface import CAT
@@ -30,6 +31,31 @@ if __name__ == "__main__":
 
 logger = logging.getLogger("cat_flrig")
 
+# Seconds to wait on flrig before calling it offline.
+FLRIG_TIMEOUT = 2.0
+
+
+class KeepAliveTransport(xmlrpc.client.Transport):
+    """
+    One HTTP connection to flrig, kept open from request to request and
+    shared by the poll thread and the main window, one request at a time.
+    A failed request closes it and the next one connects again.
+    """
+
+    def __init__(self, timeout: float = FLRIG_TIMEOUT) -> None:
+        super().__init__()
+        self.timeout = timeout
+        self.lock = threading.Lock()
+
+    def make_connection(self, host):
+        connection = super().make_connection(host)
+        connection.timeout = self.timeout
+        return connection
+
+    def request(self, host, handler, request_body, verbose=False):
+        with self.lock:
+            return super().request(host, handler, request_body, verbose)
+
 
 class FlrigCAT(CAT):
     """CAT control via flrig"""
@@ -52,10 +78,15 @@ class FlrigCAT(CAT):
         super().__init__(host, port)
         self.server = None
         self.interface = "flrig"
+        # False once flrig turns system.multicall down.
+        self.multicall = True
+        self.mode_list = None
 
         target = f"http://{self.host}:{self.port}"
         logger.debug("%s", target)
-        self.server = xmlrpc.client.ServerProxy(target)
+        self.server = xmlrpc.client.ServerProxy(
+            target, transport=KeepAliveTransport()
+        )
         self.online = True
         try:
             _ = self.server.main.get_version()
@@ -134,6 +165,47 @@ class FlrigCAT(CAT):
             self.online = False
             logger.debug("%s", f"{exception}")
 
+    def get_state(self) -> tuple:
+        """
+        (vfo, mode, bandwidth) asked of flrig in a single system.multicall
+        request, rather than a request for each.
+        """
+        if not self.multicall:
+            return super().get_state()
+        batch = xmlrpc.client.MultiCall(self.server)
+        batch.rig.get_vfo()
+        batch.rig.get_mode()
+        batch.rig.get_bw()
+        try:
+            self.online = True
+            results = batch()
+        except xmlrpc.client.Fault as exception:
+            logger.debug("multicall not supported, polling one by one: %s", exception)
+            self.multicall = False
+            return super().get_state()
+        except (
+            ConnectionRefusedError,
+            http.client.BadStatusLine,
+            http.client.CannotSendRequest,
+            http.client.ResponseNotReady,
+            TimeoutError,
+            OSError,
+        ) as exception:
+            self.online = False
+            logger.debug("get_state_flrig: %s", f"{exception}")
+            return "", "", ""
+        state = []
+        for index in range(3):
+            try:
+                state.append(results[index])
+            except (xmlrpc.client.Fault, IndexError) as exception:
+                self.online = False
+                logger.debug("get_state_flrig: %s", f"{exception}")
+                state.append("")
+        vfo, mode, bandwidth = state
+        logger.debug(f"{vfo=} {mode=} {bandwidth=}")
+        return vfo, mode, bandwidth[0] if bandwidth else ""
+
     def get_vfo(self) -> str:
         """Poll the radio for current vfo using the interface"""
         try:
@@ -236,11 +308,14 @@ class FlrigCAT(CAT):
         return "0"
 
     def get_mode_list(self):
-        "Get a list of modes supported by the radio"
+        "Get a list of modes supported by the radio, asked of flrig once"
+        if self.mode_list:
+            return self.mode_list
         try:
             self.online = True
             mode_list = self.server.rig.get_modes()
             logger.debug(f"{mode_list=}")
+            self.mode_list = mode_list
             return mode_list
         except (
             ConnectionRefusedError,
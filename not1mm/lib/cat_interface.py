@@ -30,6 +30,7 @@ class CAT:
         Exposed methods are:
 
         reinit()
+        get_state()
         get_vfo() set_vfo()
         get_mode() set_mode()
         get_power() set_power()
@@ -71,6 +72,13 @@ class CAT:
     def get_bw(self):
         """Get current vfo bandwidth"""
 
+    def get_state(self) -> tuple:
+        """
+        (vfo, mode, bandwidth) for the poll loop. Backends able to fetch
+        them in one request to the rig control program override this.
+        """
+        return self.get_vfo(), self.get_mode(), self.get_bw()
+
     def get_power(self):
         """Get power level from rig"""
 
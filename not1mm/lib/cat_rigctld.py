@@ -37,6 +37,7 @@ class RigctldCAT(CAT):
         super().__init__(host, port)
         self.rigctrlsocket = None
         self._sock_lock = threading.RLock()  # reentrant (same thread can reacquire)
+        self._buffer = bytearray()  # received, not yet returned reply bytes
         self.rigctld_bw = "0"
         self.interface = "rigctld"
         self.sync_vfos = False
@@ -54,6 +55,7 @@ class RigctldCAT(CAT):
         commands ("f VFOA 1810000"). The advantage is this lets us get/set the
         inactive VFO without flickering the display.
         """
+        self._buffer.clear()
         try:
             logger.debug("Connecting to rigctrld %s %d", self.host, self.port)
             self.rigctrlsocket = socket.socket()
@@ -79,6 +81,16 @@ class RigctldCAT(CAT):
         The reply is expected to end with "RPRT N" which is guaranteed in the
         extended response protocol (prefix="+").
         """
+        return self.rigctld_batch([command], prefix, auto_reinit)[0]
+
+    def rigctld_batch(self, commands: list, prefix="+", auto_reinit=True) -> list:
+        """Send commands to rigctld in one write and return their replies.
+
+        rigctld answers the commands of a connection in the order they
+        arrive, each reply ending with its "RPRT N" line, so the n-th reply
+        read belongs to the n-th command sent. The whole batch costs one
+        round trip. If the exchange fails every reply is "".
+        """
         with self._sock_lock:  # protect against other threads sending commands
             if (
                 not self.online
@@ -87,23 +99,40 @@ class RigctldCAT(CAT):
             ) and auto_reinit:
                 self.reinit()
             if not self.online:
-                return ""
+                return [""] * len(commands)
             try:
-                logger.debug("> %s", command)
-                self.rigctrlsocket.send(bytes(prefix + command + "\n", "utf-8"))
-                report = ""
-                while "RPRT" not in report:  # read until we get "RPRT X" from rigctld
-                    thegrab = self.rigctrlsocket.recv(1024).decode()
-                    if thegrab == "":  # socket closed
-                        break
-                    report += thegrab
-                logger.debug("< %s", report)
-                return report
+                payload = "".join(f"{prefix}{command}\n" for command in commands)
+                logger.debug("> %s", payload)
+                self.rigctrlsocket.sendall(payload.encode())
+                replies = [self._read_reply() for _ in commands]
+                logger.debug("< %s", replies)
+                return replies
             except (TimeoutError, OSError, UnicodeDecodeError) as exception:
                 self.online = False
                 logger.info("%s", f"{exception}")
                 self.rigctrlsocket = None
-        return ""
+                self._buffer.clear()
+        return [""] * len(commands)
+
+    def _read_reply(self) -> str:
+        """The next reply, up to and including its RPRT line."""
+        scanned = 0
+        while True:
+            mark = self._buffer.find(b"RPRT", scanned)
+            if mark != -1:
+                end = self._buffer.find(b"\n", mark)
+                if end != -1:
+                    reply = self._buffer[: end + 1].decode()
+                    del self._buffer[: end + 1]
+                    return reply
+                scanned = mark
+            else:
+                # A marker split across reads starts in the last 3 bytes.
+                scanned = max(0, len(self._buffer) - 3)
+            chunk = self.rigctrlsocket.recv(4096)
+            if not chunk:
+                raise ConnectionResetError("rigctld closed the connection")
+            self._buffer += chunk
 
     def rigctld_parse(self, report: str) -> dict:
         """Parse a extended response protocol message (prefix +) into fields.
@@ -139,12 +168,33 @@ class RigctldCAT(CAT):
 
     def get_active_vfo(self) -> str:
         """Get the currently selected VFO from rigctld."""
-        report = self.rigctld_parse(self.rigctld_command("v"))
+        return self._active_vfo(self.rigctld_command("v"))
+
+    def _active_vfo(self, report: str) -> str:
+        """Note the VFO named by a "v" reply, returns the active VFO."""
+        report = self.rigctld_parse(report)
         vfo = report.get("VFO", report.get("line", "")).strip().upper()
         if vfo in ("VFOA", "VFOB"):
             self.current_vfo = vfo
         return self.current_vfo
 
+    def active_vfo_batch(self, commands: list) -> list:
+        """Replies to commands, each run against the active VFO.
+
+        The active VFO is asked for in the same write, the commands go out
+        for the VFO it was last time. Only when it has changed since are
+        they sent again, for the new one.
+        """
+        guess = self.current_vfo
+        vfo_report, *replies = self.rigctld_batch(
+            ["v"] + [f"{command} {guess}" for command in commands]
+        )
+        if self._active_vfo(vfo_report) != guess:
+            replies = self.rigctld_batch(
+                [f"{command} {self.current_vfo}" for command in commands]
+            )
+        return replies
+
     def sendvoicememory(self, memoryspot=1):
         self.rigctld_command(f"\\send_voice_mem {memoryspot}")
 
@@ -160,10 +210,22 @@ class RigctldCAT(CAT):
         """Set CW speed via rigctld"""
         self.rigctld_command(f"L {self.get_active_vfo()} KEYSPD {speed}")
 
+    def get_state(self) -> tuple:
+        """vfo, mode and bandwidth in one round trip"""
+        freq_report, mode_report = self.active_vfo_batch(["f", "m"])
+        return (
+            self._frequency(freq_report),
+            self._mode(mode_report),
+            self.rigctld_bw,
+        )
+
     def get_vfo(self) -> str:
         """Poll the radio for current vfo using the interface"""
-        report = self.rigctld_parse(self.rigctld_command(f"f {self.get_active_vfo()}"))
-        freq = report.get("Frequency", "")
+        return self._frequency(self.active_vfo_batch(["f"])[0])
+
+    def _frequency(self, report: str) -> str:
+        """The frequency in a "f" reply, "" if there is none."""
+        freq = self.rigctld_parse(report).get("Frequency", "")
         if freq.isnumeric():
             return str(int(float(freq)))
         else:
@@ -173,7 +235,11 @@ class RigctldCAT(CAT):
         """Returns the current mode filter width of the radio"""
         # QMX 'DIGI-U DIGI-L CW-U CW-L' or 'LSB', 'USB', 'CW', 'FM', 'AM', 'FSK'
         # 7300 'AM CW USB LSB RTTY FM CWR RTTYR PKTLSB PKTUSB FM-D AM-D'
-        report = self.rigctld_parse(self.rigctld_command(f"m {self.get_active_vfo()}"))
+        return self._mode(self.active_vfo_batch(["m"])[0])
+
+    def _mode(self, report: str) -> str:
+        """The mode in a "m" reply, noting its passband as the bandwidth."""
+        report = self.rigctld_parse(report)
         # get_mode:|Mode: CW|Passband: 500|RPRT 0
         self.rigctld_bw = report.get("Passband", "0")
         return report.get("Mode", "")
@@ -192,7 +258,7 @@ class RigctldCAT(CAT):
 
     def get_ptt(self) -> str:
         """Get PTT state"""
-        report = self.rigctld_parse(self.rigctld_command(f"t {self.get_active_vfo()}"))
+        report = self.rigctld_parse(self.active_vfo_batch(["t"])[0])
         return report.get("PTT", "0")
 
     def get_mode_list(self) -> list:
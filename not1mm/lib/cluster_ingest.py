@@ -0,0 +1,151 @@
+"""
+Parsing and batching of DX cluster spots.
+
+A skimmer fed cluster can deliver hundreds of "DX de" lines a minute, often
+several for the same station from different skimmers. SpotIngest sits
+between the cluster socket and the bandmap: lines are parsed with a
+compiled pattern, queued, and handed over as one batch per UI frame.
+Within a batch only the newest spot of a call on a band survives, and a
+spot repeating the call, band and frequency of one passed on less than
+DEDUPE_SECONDS ago is dropped.
+
+stats() reports spots/sec received, duplicates dropped and how long spots
+waited in the queue.
+"""
+
+import logging
+import re
+import time
+from collections import deque
+from datetime import UTC, datetime
+
+from not1mm.lib.ham_utility import khz2banddef
+
+logger = logging.getLogger(__name__)
+
+DEDUPE_SECONDS = 30
+DEDUPE_FREQ = 0.1  # kHz, re-spots closer than this are the same spot
+RATE_WINDOW = 10  # seconds the spots/sec figure is averaged over
+
+DX_SPOT = re.compile(
+    r"DX de\s+(?P<spotter>[^\s:]+:?)\s*(?P<freq>\d+(?:\.\d*)?)\s+(?P<dx>\S+)"
+    r"\s*(?P<comment>.*?)(?:\s*\b\d{4}Z(?:\s+\S+)?)?$"
+)
+WWV_LINE = re.compile(
+    r"(\d{2}-\w{3}-\d{4})\s+(\d+)\s+(\d+)\s+(\d+)\s+(\d+)\s+(.*?)\s+<(\w+)>"
+)
+
+
+def parse_spot(line: str) -> dict | None:
+    """
+    Turn a "DX de" line into a DX command for the bandmap.
+
+    DX de W3LPL-#:   14025.0  K5TUX        CW 25 dB 23 WPM CQ     1530Z
+
+    becomes {'cmd': 'DX', 'ts': '2024-01-01 15:30:12', 'dx': 'K5TUX',
+    'spotter': 'W3LPL-#:', 'comment': 'CW 25 dB 23 WPM CQ', 'freq': 14025.0}
+
+    Returns None for anything that is not a spot.
+    """
+    match = DX_SPOT.search(line)
+    if match is None:
+        return None
+    try:
+        freq = float(match.group("freq"))
+    except ValueError:
+        return None
+    return {
+        "cmd": "DX",
+        "ts": datetime.now(UTC).isoformat(" ")[:19],
+        "dx": match.group("dx"),
+        "spotter": match.group("spotter"),
+        "comment": " ".join((match.group("comment") or "").split()),
+        "freq": freq,
+    }
+
+
+class SpotIngest:
+    """Queue of parsed spots, drained once per UI frame."""
+
+    def __init__(self, dedupe_seconds=DEDUPE_SECONDS, clock=time.monotonic) -> None:
+        self.dedupe_seconds = dedupe_seconds
+        self.clock = clock
+        self.pending = {}
+        self.first_pending = None
+        self.recent = {}
+        self.arrivals = deque()
+        self.received = 0
+        self.duplicates = 0
+        self.passed = 0
+        self.batches = 0
+        self.last_latency = 0.0
+        self.max_latency = 0.0
+        self.total_latency = 0.0
+
+    def __len__(self) -> int:
+        return len(self.pending)
+
+    def push(self, spot: dict) -> bool:
+        """Queue spot, returns False if it was dropped as a duplicate."""
+        now = self.clock()
+        self.received += 1
+        self.arrivals.append(now)
+        while self.arrivals and self.arrivals[0] < now - RATE_WINDOW:
+            self.arrivals.popleft()
+
+        key = (spot["dx"], khz2banddef(spot["freq"], unknown_band=True).name)
+        sent = self.recent.get(key)
+        if (
+            sent is not None
+            and now - sent[0] < self.dedupe_seconds
+            and abs(sent[1] - spot["freq"]) < DEDUPE_FREQ
+        ):
+            self.duplicates += 1
+            return False
+        if key in self.pending:
+            # A newer spot of the same station on the same band wins.
+            self.duplicates += 1
+            del self.pending[key]
+        if not self.pending:
+            self.first_pending = now
+        self.pending[key] = spot
+        return True
+
+    def drain(self) -> list:
+        """The queued spots in arrival order, emptying the queue."""
+        if not self.pending:
+            return []
+        now = self.clock()
+        batch = list(self.pending.values())
+        for key, spot in self.pending.items():
+            self.recent[key] = (now, spot["freq"])
+        self.pending = {}
+        self.passed += len(batch)
+        self.batches += 1
+        self.last_latency = now - self.first_pending
+        self.max_latency = max(self.max_latency, self.last_latency)
+        self.total_latency += self.last_latency
+        if len(self.recent) > 4096:
+            self.recent = {
+                key: sent
+                for key, sent in self.recent.items()
+                if now - sent[0] < self.dedupe_seconds
+            }
+        return batch
+
+    def stats(self) -> dict:
+        """Counters for the log, latencies are in milliseconds."""
+        now = self.clock()
+        recent = sum(1 for arrival in self.arrivals if arrival >= now - RATE_WINDOW)
+        return {
+            "received": self.received,
+            "spots_per_sec": recent / RATE_WINDOW,
+            "duplicates": self.duplicates,
+            "passed": self.passed,
+            "batches": self.batches,
+            "last_latency_ms": self.last_latency * 1000,
+            "max_latency_ms": self.max_latency * 1000,
+            "mean_latency_ms": (
+                self.total_latency / self.batches * 1000 if self.batches else 0.0
+            ),
+        }
@@ -0,0 +1,432 @@
+"""
+In memory aggregates of the current contest's log.
+
+ContestState is seeded from DXLOG once when a contest is loaded and is then
+kept up to date as contacts are logged, edited or deleted, each costing a
+handful of dict updates. It holds the worked call/band map sent to the
+bandmap, dupe keys, band/mode counts, the serial numbers sent and the
+distinct values of the usual multiplier fields.
+
+Dupe checking hashes each contact with the dupe key function of the loaded
+contest, see set_dupe_key, so is_dupe is a set lookup with no query. Dupe
+types 1 to 3 use the keys in DUPE_KEYS, a dupe type 5 plugin can supply
+its own with a dupe_key(self, contact) function.
+
+Every change produces a delta:
+
+    {"added": [contact, ...], "removed": [contact, ...]}
+
+where the contacts are slim copies holding TRACKED_FIELDS. An edit is a
+removal of the old version plus an addition of the new one. Deltas are
+passed to subscribers and ride along in the UPDATELOG, CONTACTCHANGED and
+DELETED messages so the dock windows can update their own tallies instead
+of re-running aggregate queries. A delta of {"reset": True} means the
+state was reloaded and listeners should rebuild from scratch.
+"""
+
+import logging
+from collections import Counter
+
+from not1mm.lib.ham_utility import mode_class
+
+logger = logging.getLogger(__name__)
+
+TRACKED_FIELDS = (
+    "ID",
+    "TS",
+    "Call",
+    "Band",
+    "Mode",
+    "CountryPrefix",
+    "ZN",
+    "WPXPrefix",
+    "Sect",
+    "NR",
+    "SentNr",
+    "Points",
+    "IsMultiplier1",
+    "IsMultiplier2",
+    "IsRunQSO",
+    "Operator",
+)
+
+MULT_FIELDS = ("CountryPrefix", "ZN", "WPXPrefix", "Sect", "NR")
+
+
+def _as_number(value, kind, default):
+    """Coerce a value the way SQLite's column affinity would store it."""
+    try:
+        return kind(value)
+    except (TypeError, ValueError):
+        return default if value in (None, "") else value
+
+
+def _bump(counter: Counter, key, step: int) -> None:
+    """Add step to counter[key], dropping the key when it reaches zero."""
+    counter[key] += step
+    if counter[key] <= 0:
+        del counter[key]
+
+
+def slim_contact(contact: dict) -> dict:
+    """Copy the tracked fields of a contact, normalizing numeric columns."""
+    slim = {field: contact.get(field, "") for field in TRACKED_FIELDS}
+    slim["Band"] = _as_number(slim["Band"], float, 0.0)
+    slim["ZN"] = _as_number(slim["ZN"], int, 0)
+    slim["SentNr"] = _as_number(slim["SentNr"], int, 0)
+    slim["Points"] = _as_number(slim["Points"], int, 0)
+    slim["IsMultiplier1"] = _as_number(slim["IsMultiplier1"], int, 0)
+    slim["IsMultiplier2"] = _as_number(slim["IsMultiplier2"], int, 0)
+    slim["IsRunQSO"] = _as_number(slim["IsRunQSO"], int, 0)
+    slim["ModeClass"] = mode_class(slim["Mode"])
+    return slim
+
+
+def call_key(contact: dict) -> str:
+    """Dupe type 1, once per contest."""
+    return contact["Call"]
+
+
+def call_band_key(contact: dict) -> tuple:
+    """Dupe type 2, once per band."""
+    return (contact["Call"], contact["Band"])
+
+
+def call_band_mode_key(contact: dict) -> tuple:
+    """Dupe type 3, once per band and mode class."""
+    return (contact["Call"], contact["Band"], contact["ModeClass"])
+
+
+DUPE_KEYS = {1: call_key, 2: call_band_key, 3: call_band_mode_key}
+
+
+class ContestState:
+    """Incrementally maintained tallies for the loaded contest."""
+
+    def __init__(self) -> None:
+        self.listeners = []
+        self.dupe_key = None
+        self.clear()
+
+    def clear(self) -> None:
+        """Forget everything."""
+        self.contacts = {}
+        self.worked = {}
+        self.calls = Counter()
+        self.call_bands = Counter()
+        self.call_band_modes = Counter()
+        self.band_modes = Counter()
+        self.mults = {field: Counter() for field in MULT_FIELDS}
+        self.band_mults = {field: Counter() for field in MULT_FIELDS}
+        self.dupes = Counter()
+        self.serials = Counter()
+        self.max_serial = None
+        self.points = 0
+
+    def subscribe(self, callback) -> None:
+        """Call callback(delta) after every change."""
+        if callback not in self.listeners:
+            self.listeners.append(callback)
+
+    def unsubscribe(self, callback) -> None:
+        """Stop sending deltas to callback."""
+        if callback in self.listeners:
+            self.listeners.remove(callback)
+
+    def _notify(self, delta: dict) -> dict:
+        for callback in list(self.listeners):
+            try:
+                callback(delta)
+            except Exception as exception:  # pylint: disable=broad-exception-caught
+                logger.exception("contest state listener failed: %s", exception)
+        return delta
+
+    def load(self, database) -> dict:
+        """Seed the state with one pass over the current contest's contacts."""
+        self.clear()
+        for contact in database.fetch_all_contacts_asc():
+            self._add(slim_contact(contact))
+        logger.debug("contest state loaded %d contacts", len(self.contacts))
+        return self._notify({"reset": True})
+
+    def _count(self, slim: dict, step: int) -> None:
+        call = slim["Call"]
+        band = slim["Band"]
+        _bump(self.calls, call, step)
+        _bump(self.call_bands, (call, band), step)
+        _bump(self.call_band_modes, (call, band, slim["ModeClass"]), step)
+        _bump(self.band_modes, (band, slim["Mode"]), step)
+        self.points += slim["Points"] * step
+        for field in MULT_FIELDS:
+            _bump(self.mults[field], slim[field], step)
+            _bump(self.band_mults[field], (slim[field], band), step)
+        if self.dupe_key is not None:
+            key = self.dupe_key(slim)
+            if key is not None:
+                _bump(self.dupes, key, step)
+        self._count_serial(slim["SentNr"], step)
+
+    def _count_serial(self, serial, step: int) -> None:
+        if not isinstance(serial, int):
+            return
+        _bump(self.serials, serial, step)
+        if step > 0:
+            if self.max_serial is None or serial > self.max_serial:
+                self.max_serial = serial
+        elif serial == self.max_serial and serial not in self.serials:
+            self.max_serial = max(self.serials, default=None)
+
+    def _add(self, slim: dict) -> None:
+        if slim["ID"] in self.contacts:
+            self._remove(slim["ID"])
+        self.contacts[slim["ID"]] = slim
+        self._count(slim, 1)
+        self.worked.setdefault(slim["Call"], []).append(slim["Band"])
+
+    def _remove(self, unique_id: str) -> dict | None:
+        slim = self.contacts.pop(unique_id, None)
+        if slim is None:
+            return None
+        self._count(slim, -1)
+        bands = self.worked.get(slim["Call"], [])
+        if slim["Band"] in bands:
+            bands.remove(slim["Band"])
+        if not bands:
+            self.worked.pop(slim["Call"], None)
+        return slim
+
+    def add(self, contact: dict) -> dict:
+        """A contact was logged."""
+        slim = slim_contact(contact)
+        old = self._remove(slim["ID"])
+        self._add(slim)
+        return self._notify({"added": [slim], "removed": [old] if old else []})
+
+    def remove(self, unique_id: str) -> dict:
+        """A contact was deleted."""
+        old = self._remove(unique_id)
+        return self._notify({"added": [], "removed": [old] if old else []})
+
+    def change(self, contact: dict) -> dict:
+        """A contact was edited, contact being the complete new record."""
+        return self.add(contact)
+
+    def edit(self, unique_id: str, contact, recalculate=None) -> tuple:
+        """
+        A contact was edited, contact being the complete new record, or
+        deleted, contact None. recalculate(time_stamp) then re-scores the
+        contacts from the earliest time stamp touched on, returning their
+        delta. Returns the delta of the edit and that of the re-scoring, to
+        be applied in that order: the re-scored contact may be the edited
+        one, in its new place.
+        """
+        time_stamps = [self.contacts.get(unique_id, {}).get("TS", "")]
+        if contact:
+            delta = self.change(contact)
+            time_stamps.append(contact.get("TS", ""))
+        else:
+            delta = self.remove(unique_id)
+        recalculated = {"added": [], "removed": []}
+        earliest = min((ts for ts in time_stamps if ts), default="")
+        if recalculate is not None and earliest:
+            recalculated = recalculate(earliest)
+        return delta, recalculated
+
+    def worked_list(self) -> dict:
+        """
+        Returns a dict like:
+        {'K5TUX': [14.0, 21.0], 'N2CQR': [14.0], 'NE4RD': [14.0]}
+        """
+        return self.worked
+
+    def qso_count(self) -> int:
+        """Number of contacts in the contest."""
+        return len(self.contacts)
+
+    def call_worked(self, call: str, band=None, mode=None) -> bool:
+        """True if call was worked, optionally on band, or band and mode class."""
+        if band is None:
+            return call in self.calls
+        band = _as_number(band, float, 0.0)
+        if mode is None:
+            return (call, band) in self.call_bands
+        return (call, band, mode_class(mode)) in self.call_band_modes
+
+    def last_serial(self):
+        """The highest serial sent, None before the first contact."""
+        return self.max_serial
+
+    def next_serial(self) -> int:
+        """The serial to send next, one past the highest sent."""
+        if self.max_serial is None:
+            return 1
+        return self.max_serial + 1
+
+    def set_dupe_key(self, key_function) -> None:
+        """
+        Key contacts for dupe checking with key_function(slim contact), the
+        contacts with equal keys being dupes of each other. A key of None
+        leaves the contact out. None for key_function turns keying off.
+        """
+        self.dupe_key = key_function
+        self.dupes = Counter()
+        if key_function is None:
+            return
+        for slim in self.contacts.values():
+            key = key_function(slim)
+            if key is not None:
+                self.dupes[key] += 1
+        logger.debug("%d dupe keys", len(self.dupes))
+
+    def is_dupe(self, contact: dict) -> bool | None:
+        """
+        True if a contact with the key of contact is in the log. None when
+        there is no dupe key function or it has no key for contact, leaving
+        the answer to the contest plugin.
+        """
+        if self.dupe_key is None:
+            return None
+        key = self.dupe_key(slim_contact(contact))
+        if key is None:
+            return None
+        return key in self.dupes
+
+    def distinct_count(self, field: str, per_band: bool = False) -> int:
+        """Number of distinct values of a multiplier field, or field/band pairs."""
+        if per_band:
+            return len(self.band_mults[field])
+        return len(self.mults[field])
+
+
+TRACKER_BANDS = (1.8, 3.5, 7.0, 14.0, 21.0, 28.0)
+
+
+def band_table_from_rows(rows: list, key_field: str) -> dict:
+    """
+    Turn fetch_dxcc_by_band_count / fetch_zone_by_band_count rows into a
+    {key: [160m, 80m, 40m, 20m, 15m, 10m, Total]} table.
+    """
+    return {
+        row.get(key_field): [value for field, value in row.items() if field != key_field]
+        for row in rows
+    }
+
+
+def band_table_rows(table: dict) -> list:
+    """Table rows as [key, counts...] lists, numbers first, like GROUP BY."""
+
+    def sort_key(item):
+        key = item[0]
+        if isinstance(key, (int, float)):
+            return (0, key, "")
+        return (1, 0, str(key))
+
+    return [[key, *counts] for key, counts in sorted(table.items(), key=sort_key)]
+
+
+def apply_band_table_delta(
+    table: dict, key_field: str, delta: dict, bands=TRACKER_BANDS
+) -> None:
+    """
+    Apply a contest state delta to a table built by band_table_from_rows.
+    """
+    for step, contacts in (
+        (-1, delta.get("removed", [])),
+        (1, delta.get("added", [])),
+    ):
+        for contact in contacts:
+            key = contact.get(key_field)
+            row = table.setdefault(key, [0] * (len(bands) + 1))
+            if contact.get("Band") in bands:
+                row[bands.index(contact.get("Band"))] += step
+            row[-1] += step
+            if row[-1] <= 0:
+                del table[key]
+
+
+STATS_MODES = ("CW", "PH", "DI")
+
+
+class BandTally:
+    """Counts for one row of the statistics window."""
+
+    def __init__(self) -> None:
+        self.qs = 0
+        self.points = 0
+        self.calls = Counter()
+        self.wpx = Counter()
+        self.modes = Counter()
+
+    def count(self, slim: dict, qs: int, step: int) -> None:
+        """Add (step 1) or take away (step -1) qs contacts like slim."""
+        self.qs += qs * step
+        self.points += slim["Points"] * step
+        _bump(self.modes, slim["ModeClass"], qs * step)
+        if slim["Call"] is not None:
+            _bump(self.calls, slim["Call"], qs * step)
+        if slim["WPXPrefix"] is not None:
+            _bump(self.wpx, slim["WPXPrefix"], qs * step)
+
+    def row(self, label, wpx: int) -> list:
+        """[band, QSO, calls, CW, PH, DI, WPX, points]"""
+        return [
+            label,
+            self.qs,
+            len(self.calls),
+            *(self.modes[mode] for mode in STATS_MODES),
+            wpx,
+            self.points,
+        ]
+
+
+class BandSummary:
+    """
+    The band by QSO/calls/CW/PH/DI/WPX/points table of the statistics
+    window, seeded from fetch_band_summary and kept current with deltas.
+    """
+
+    def __init__(self) -> None:
+        self.clear()
+
+    def clear(self) -> None:
+        """Forget everything."""
+        self.bands = {}
+        self.total = BandTally()
+        self.band_wpx = Counter()
+
+    def _count(self, slim: dict, qs: int, step: int) -> None:
+        band = slim["Band"]
+        tally = self.bands.setdefault(band, BandTally())
+        tally.count(slim, qs, step)
+        if tally.qs <= 0:
+            del self.bands[band]
+        self.total.count(slim, qs, step)
+        if slim["WPXPrefix"] is not None:
+            _bump(self.band_wpx, (slim["WPXPrefix"], band), qs * step)
+
+    def load(self, rows: list) -> None:
+        """Seed from grouped rows carrying a qs count and summed Points."""
+        self.clear()
+        for row in rows:
+            self._count(slim_contact(row), row.get("qs", 1), 1)
+
+    def apply_delta(self, delta: dict) -> None:
+        """Follow a ContestState delta."""
+        for contact in delta.get("removed", []):
+            self._count(contact, 1, -1)
+        for contact in delta.get("added", []):
+            self._count(contact, 1, 1)
+
+    def rows(self) -> list:
+        """The band rows, highest band first, followed by the TOTAL row."""
+        return [
+            *(
+                self.bands[band].row(band, len(self.bands[band].wpx))
+                for band in sorted(
+                    self.bands,
+                    key=lambda band: (isinstance(band, str), band),
+                    reverse=True,
+                )
+            ),
+            self.total.row("TOTAL", len(self.band_wpx)),
+        ]
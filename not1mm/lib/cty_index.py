@@ -0,0 +1,112 @@
+"""Country resolution against the BigCTY data.
+
+The cty.json file maps prefixes (and a handful of exact callsigns) to
+entity information. Resolving a callsign means finding the longest key that
+prefixes it, skipping exact-match keys unless they equal the whole call.
+
+CtyIndex splits the table once at load time into an exact-call dict and a
+prefix dict, and records the longest prefix present, so a lookup is at most
+one hash probe per prefix length instead of a walk over the whole table.
+"""
+
+import logging
+from json import loads
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+_shared_indexes = {}
+
+
+class CtyIndex:
+    """Longest-prefix index over a loaded cty.json dict."""
+
+    def __init__(self, ctyfile: dict | None = None) -> None:
+        self.ctyfile = {}
+        self.exact = {}
+        self.prefixes = {}
+        self.max_prefix_len = 0
+        self.mtime = None
+        if ctyfile:
+            self.load(ctyfile)
+
+    @classmethod
+    def from_file(cls, filename: Path) -> "CtyIndex":
+        """Build an index from a cty.json file.
+
+        Raises OSError, JSONDecodeError or TypeError like the plain
+        json load the callers used to do.
+        """
+        filename = Path(filename)
+        with open(filename, "rt", encoding="utf-8") as c_file:
+            index = cls(loads(c_file.read()))
+        index.mtime = filename.stat().st_mtime
+        return index
+
+    def load(self, ctyfile: dict) -> None:
+        """(Re)build the index from a cty.json dict."""
+        exact = {}
+        prefixes = {}
+        for key, val in ctyfile.items():
+            if val.get("exact_match"):
+                exact[key] = val
+            else:
+                prefixes[key] = val
+        self.ctyfile = ctyfile
+        self.exact = exact
+        self.prefixes = prefixes
+        self.max_prefix_len = max((len(key) for key in prefixes), default=0)
+
+    def __len__(self) -> int:
+        return len(self.ctyfile)
+
+    def __bool__(self) -> bool:
+        return bool(self.ctyfile)
+
+    def get(self, key: str, default=None):
+        """Direct access to an entry by its cty key, e.g. a primary prefix."""
+        return self.ctyfile.get(key, default)
+
+    def lookup(self, callsign: str) -> dict | None:
+        """Lookup callsign in the cty data.
+
+        Parameters
+        ----------
+        callsign : str
+        callsign to lookup
+
+        Returns
+        -------
+        return : dict | None
+        {'UA': {'entity': 'European Russia', 'cq': 16, 'itu': 29, 'continent': 'EU', 'lat': 53.65, 'long': -41.37, 'tz': 4.0, 'len': 2, 'primary_pfx': 'UA', 'exact_match': False}}
+        """
+        if not callsign:
+            return None
+        callsign = callsign.upper()
+        result = self.exact.get(callsign)
+        if result is not None:
+            return {callsign: result}
+        prefixes = self.prefixes
+        for count in range(min(len(callsign), self.max_prefix_len), 0, -1):
+            searchitem = callsign[:count]
+            result = prefixes.get(searchitem)
+            if result is not None:
+                return {searchitem: result}
+        return None
+
+
+def load_cty_index(filename: Path) -> CtyIndex:
+    """Return a process wide CtyIndex for filename.
+
+    The main window, the DXCC tracker and the station dialog all resolve
+    against the same file, so they share one index. It is rebuilt when the
+    file's mtime changes, e.g. after a cty update.
+    """
+    filename = Path(filename)
+    mtime = filename.stat().st_mtime
+    index = _shared_indexes.get(filename)
+    if index is None or index.mtime != mtime:
+        logger.debug("building cty index from %s", filename)
+        index = CtyIndex.from_file(filename)
+        _shared_indexes[filename] = index
+    return index
@@ -11,6 +11,10 @@ GPL V3
 
 import logging
 import sqlite3
+from contextlib import contextmanager
+from itertools import islice
+
+from not1mm.lib.ham_utility import DIGITAL_MODES, PHONE_MODES, mode_class
 
 if __name__ == "__main__":
     print("I'm not the program you are looking for.")
@@ -18,6 +22,38 @@ if __name__ == "__main__":
 logger = logging.getLogger("database")
 
 
+def mode_class_sql(column: str = "Mode") -> str:
+    """SQL CASE expression matching ham_utility.mode_class()"""
+    phone = ", ".join(f"'{mode}'" for mode in PHONE_MODES)
+    digital = ", ".join(f"'{mode}'" for mode in DIGITAL_MODES)
+    return (
+        f"CASE WHEN upper({column}) IN ({phone}) THEN 'PH' "
+        f"WHEN upper({column}) LIKE 'CW%' THEN 'CW' "
+        f"WHEN upper({column}) IN ({digital}) THEN 'DI' "
+        "ELSE 'OTHER' END"
+    )
+
+
+# Indexes on DXLOG, (name, columns). Every query filters on ContestNR, so it
+# leads. The trailing columns make the count(*) dupe and mult checks covering.
+DXLOG_INDEXES = (
+    ("dxlog_call_band_mode", "ContestNR, Call, Band, ModeClass"),
+    ("dxlog_ts", "ContestNR, TS, IsRunQSO"),
+    ("dxlog_country", "ContestNR, CountryPrefix, TS, Band"),
+    ("dxlog_wpx", "ContestNR, WPXPrefix, TS"),
+    ("dxlog_sect", "ContestNR, Sect, TS, Band"),
+    ("dxlog_nr", "ContestNR, NR, TS"),
+    ("dxlog_zone", "ContestNR, ZN, Band"),
+    ("dxlog_mult1", "ContestNR, IsMultiplier1"),
+    ("dxlog_mult2", "ContestNR, IsMultiplier2"),
+    ("dxlog_dirty", "ContestNR, Dirty"),
+    ("dxlog_id", "ID"),
+)
+
+# Rows handed to executemany at a time when loading a call history file.
+CALLHISTORY_CHUNK = 5000
+
+
 class DataBase:
     """Database class for our database."""
 
@@ -26,6 +62,10 @@ class DataBase:
         logger.debug("Database: %s", database)
         self.app_data_dir = app_data_dir
         self.current_contest = current_contest
+        self.transaction_depth = 0
+        self._row_description = None
+        self._row_fields = ()
+        self.call_history = None
         self.empty_contact = {
             "TS": "",
             "Call": "",
@@ -73,39 +113,79 @@ class DataBase:
         }
         self.connect(database)
         self.create_dxlog_table()
-        self.update_dxlog_table()
         self.create_contest_table()
         self.create_contest_instance_table()
         self.create_station_table()
         self.create_callhistory_table()
+        self.migrate()
 
-    @staticmethod
-    def row_factory(cursor, row):
+    def row_factory(self, cursor, row):
         """
         Converts a row (value, value, ...) into a dict {colname: value, ...}
 
         cursor.description:
         (name, type_code, display_size,
         internal_size, precision, scale, null_ok)
+
+        The description tuple is the same object for every row of a result
+        set, so the column names are only pulled out of it once per query.
         """
-        return {
-            col[0]: row[idx]
-            for idx, col in enumerate(
-                cursor.description,
-            )
-        }
+        description = cursor.description
+        if description is not self._row_description:
+            self._row_description = description
+            self._row_fields = tuple(col[0] for col in description)
+        return dict(zip(self._row_fields, row))
 
     def connect(self, database):
+        """
+        Open the database in WAL mode. Readers in the dock windows no longer
+        block the logger's writes, and with synchronous=NORMAL a commit
+        appends to the WAL without an fsync. A power cut can lose the last
+        commits but never corrupts the file. Falls back to the rollback
+        journal where WAL is unavailable, e.g. some network file systems.
+        The statement cache is sized for the many distinct queries the
+        plugins and windows run, so they are compiled once per connection.
+        """
         self.database = database
         try:
-            self.conn = sqlite3.connect(database)
+            self.conn = sqlite3.connect(database, cached_statements=256)
             self.conn.row_factory = self.row_factory
             cursor = self.conn.cursor()
-            cursor.execute("PRAGMA journal_mode=DELETE")
+            result = cursor.execute("PRAGMA journal_mode=WAL;").fetchone()
+            if result.get("journal_mode", "").lower() == "wal":
+                cursor.execute("PRAGMA synchronous=NORMAL;")
+            else:
+                logger.warning("WAL not available for %s, using DELETE", database)
+                cursor.execute("PRAGMA journal_mode=DELETE;")
             self.conn.commit()
         except sqlite3.OperationalError as exception:
             logger.error("%s", exception)
 
+    @contextmanager
+    def transaction(self):
+        """
+        Group the writes made inside the with block into one commit.
+
+            with self.database.transaction():
+                for contact in contacts:
+                    self.database.log_contact(contact)
+
+        exec_sql_commit skips its per statement commit while a scope is
+        open. Scopes nest, only the outermost one commits. An exception
+        escaping the outermost scope rolls the whole batch back.
+        """
+        self.transaction_depth += 1
+        try:
+            yield self
+        except Exception:
+            self.transaction_depth -= 1
+            if self.transaction_depth == 0:
+                self.conn.rollback()
+            raise
+        self.transaction_depth -= 1
+        if self.transaction_depth == 0:
+            self.conn.commit()
+
     def exec_sql(self, query: str, params=()) -> dict:
         """Exec read query returning one dict"""
         try:
@@ -134,26 +214,29 @@ class DataBase:
 
     def exec_sql_commit(
         self, query: str, params=(), commit=True, error_logger=logger.error
-    ) -> None:
-        """Exec write query with database changes and commit"""
+    ) -> bool:
+        """Exec write query with database changes and commit, False on error"""
         try:
             logger.debug("%s", query)
             if params:
                 logger.debug("Parameters: %s", params)
             cursor = self.conn.cursor()
             cursor.execute(query, params)
-            if commit:
+            if commit and not self.transaction_depth:
                 self.conn.commit()
         except (sqlite3.OperationalError, sqlite3.IntegrityError) as exception:
             error_logger("%s", exception)
+            return False
+        return True
 
     def commit_it(self):
-        self.conn.commit()
+        if not self.transaction_depth:
+            self.conn.commit()
 
-    def exec_sql_insert(self, table: str, row: dict, commit=True) -> None:
+    def exec_sql_insert(self, table: str, row: dict, commit=True) -> bool:
         """Insert a dict into table columns"""
         if row == {}:
-            return
+            return False
 
         fields, values, placeholders = [], [], []
         for field, value in row.items():
@@ -161,7 +244,7 @@ class DataBase:
             values.append(value)
             placeholders.append("?")
 
-        self.exec_sql_commit(
+        return self.exec_sql_commit(
             f"insert into {table} ({', '.join(fields)}) values ({', '.join(placeholders)});",
             values,
             commit=commit,
@@ -258,11 +341,88 @@ class DataBase:
         )
         self.exec_sql_commit(sql_command)
 
-    def update_dxlog_table(self) -> None:
-        """update missing columns"""
-        logger.debug("Updating DXLOG Table")
-        sql_command = "ALTER TABLE DXLOG ADD dirty INTEGER DEFAULT 1;"
-        self.exec_sql_commit(sql_command, error_logger=logger.debug)
+    # Schema migrations, in order. The database's PRAGMA user_version is the
+    # number of steps already applied. Append new steps, never reorder them.
+    MIGRATIONS = (
+        "migrate_dirty_column",
+        "migrate_mode_class_column",
+        "migrate_dxlog_indexes",
+        "migrate_callhistory_index",
+    )
+
+    def schema_version(self) -> int:
+        """The number of migrations applied to this database."""
+        return self.exec_sql("PRAGMA user_version;").get("user_version", 0)
+
+    def migrate(self) -> None:
+        """
+        Apply the pending migrations. Each step runs in its own write
+        transaction together with its user_version bump, so a failed or
+        interrupted step leaves the database at the previous version and is
+        retried on the next start. Several windows open the same file, the
+        version is re-read under the write lock so a step only runs once.
+        """
+        for version, step in enumerate(self.MIGRATIONS, start=1):
+            try:
+                if self.conn.in_transaction:
+                    self.conn.commit()
+                cursor = self.conn.cursor()
+                cursor.execute("BEGIN IMMEDIATE;")
+                current = cursor.execute("PRAGMA user_version;").fetchone()
+                if current.get("user_version", 0) >= version:
+                    self.conn.rollback()
+                    continue
+                logger.info(
+                    "Migrating %s to schema %d, %s", self.database, version, step
+                )
+                getattr(self, step)(cursor)
+                cursor.execute(f"PRAGMA user_version = {version};")
+                self.conn.commit()
+            except sqlite3.Error as exception:
+                self.conn.rollback()
+                logger.error("Migration %d %s failed: %s", version, step, exception)
+                return
+
+    def table_columns(self, table: str) -> set:
+        """Lower cased column names of table"""
+        return {
+            row.get("name", "").lower()
+            for row in self.exec_sql_mult(f"PRAGMA table_info({table});")
+        }
+
+    def migrate_dirty_column(self, cursor) -> None:
+        """Databases created before server support lack the Dirty column."""
+        if "dirty" not in self.table_columns("DXLOG"):
+            cursor.execute("ALTER TABLE DXLOG ADD Dirty INTEGER DEFAULT 1;")
+
+    def migrate_mode_class_column(self, cursor) -> None:
+        """
+        Store the PH/CW/DI/OTHER class of Mode in ModeClass, so band/mode
+        dupe checks can use an index. Triggers keep it current for every
+        insert and update, whichever code path writes the row.
+        """
+        if "modeclass" not in self.table_columns("DXLOG"):
+            cursor.execute("ALTER TABLE DXLOG ADD ModeClass VARCHAR(5) DEFAULT '';")
+        cursor.execute(f"UPDATE DXLOG SET ModeClass = {mode_class_sql()};")
+        for event in ("INSERT", "UPDATE OF Mode, ModeClass"):
+            name = "dxlog_modeclass_" + event.split()[0].lower()
+            cursor.execute(f"DROP TRIGGER IF EXISTS {name};")
+            cursor.execute(
+                f"CREATE TRIGGER {name} AFTER {event} ON DXLOG BEGIN "
+                f"UPDATE DXLOG SET ModeClass = {mode_class_sql('NEW.Mode')} "
+                "WHERE rowid = NEW.rowid; END;"
+            )
+
+    def migrate_dxlog_indexes(self, cursor) -> None:
+        """Indexes for the dupe, multiplier and rate queries."""
+        for name, columns in DXLOG_INDEXES:
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON DXLOG ({columns});")
+
+    def migrate_callhistory_index(self, cursor) -> None:
+        """Call history is looked up by call on every callsign change."""
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS callhistory_call ON CALLHISTORY (Call);"
+        )
 
     def create_contest_table(self) -> None:
         """Creates the Contest table"""
@@ -382,13 +542,61 @@ class DataBase:
 
     def add_callhistory_item(self, history: dict) -> None:
         """Add an item to the call history db"""
+        self.call_history = None
         self.exec_sql_insert("CALLHISTORY", history)
 
     def add_callhistory_items(self, history_list: list) -> None:
         """Add a list of items to the call history db"""
-        for history in history_list:
-            self.exec_sql_insert("CALLHISTORY", history, commit=False)
-        self.commit_it()
+        self.load_callhistory(history_list)
+
+    def load_callhistory(self, rows, chunk_size=CALLHISTORY_CHUNK) -> int:
+        """
+        Stream call history rows, dicts like parse_call_history yields, into
+        CALLHISTORY in chunks of executemany within one transaction. The
+        columns are taken from the first row, those CALLHISTORY lacks are
+        dropped. Returns the number of rows stored, 0 if the load failed
+        and was rolled back.
+        """
+        rows = iter(rows)
+        self.call_history = None
+        first = next(rows, None)
+        if first is None:
+            return 0
+        known = self.table_columns("CALLHISTORY")
+        columns = [name for name in first if name.lower() in known]
+        if not columns:
+            logger.error("No call history columns in %s", list(first))
+            return 0
+        query = (
+            f"insert into CALLHISTORY ({', '.join(columns)}) "
+            f"values ({', '.join('?' for _ in columns)});"
+        )
+        stored = 0
+        try:
+            with self.transaction():
+                cursor = self.conn.cursor()
+                chunk = [first, *islice(rows, chunk_size - 1)]
+                while chunk:
+                    cursor.executemany(
+                        query, [[row.get(name) for name in columns] for row in chunk]
+                    )
+                    stored += len(chunk)
+                    chunk = list(islice(rows, chunk_size))
+        except sqlite3.Error as exception:
+            logger.error("%s", exception)
+            return 0
+        self.load_call_history_map()
+        return stored
+
+    def load_call_history_map(self) -> dict:
+        """
+        Read CALLHISTORY into the in memory map fetch_call_history answers
+        from, first row wins for a call listed twice.
+        """
+        self.call_history = {}
+        for row in self.exec_sql_mult("select * from CALLHISTORY order by rowid;"):
+            self.call_history.setdefault(row.get("Call"), row)
+        return self.call_history
 
     def get_contest_profile(self, contest: str):
         """get the contest profile"""
@@ -413,13 +621,41 @@ class DataBase:
         """returns a list of dicts with contests in the database."""
         return self.exec_sql_mult("select * from ContestInstance;")
 
-    def log_contact(self, contact: dict) -> None:
+    def log_contact(self, contact: dict) -> bool:
         """
         Inserts a contact into the db.
         pass in a dict object, see get_empty() for keys
+        Returns False if the insert failed.
         """
         logger.info("%s", contact)
-        self.exec_sql_insert("DXLOG", contact)
+        return self.exec_sql_insert("DXLOG", contact)
+
+    def log_contacts(self, contacts: list) -> int:
+        """
+        Inserts contacts, dicts with the keys of get_empty(), with one
+        executemany. Returns the number inserted. A failed insert raises
+        sqlite3.Error, so an enclosing transaction() rolls back.
+        """
+        if not contacts:
+            return 0
+        columns = list(self.empty_contact)
+        query = (
+            f"insert into DXLOG ({', '.join(columns)}) "
+            f"values ({', '.join('?' for _ in columns)});"
+        )
+        self.conn.cursor().executemany(
+            query,
+            [[contact.get(name) for name in columns] for contact in contacts],
+        )
+        self.commit_it()
+        return len(contacts)
+
+    def fetch_call_time_stamps(self) -> set:
+        """returns the (TS, Call) pairs of all contacts, in every contest."""
+        return {
+            (row["TS"], row["Call"])
+            for row in self.exec_sql_mult("select TS, Call from dxlog;")
+        }
 
     def change_contact(self, qso: dict) -> None:
         """Update an existing contact."""
@@ -444,10 +680,13 @@ class DataBase:
     def delete_callhistory(self) -> None:
         """Deletes all info from callhistory table."""
         self.exec_sql_commit("delete from CALLHISTORY;")
+        self.call_history = {}
 
     def fetch_call_history(self, call: str):
         """Returns call history values for matching a call."""
-        return self.exec_sql("select * from CALLHISTORY where call = ?;", (call,))
+        if self.call_history is None:
+            self.load_call_history_map()
+        return self.call_history.get(call)
 
     def fetch_all_contacts_asc(self) -> list:
         """returns a list of dicts with contacts in the database."""
@@ -456,6 +695,47 @@ class DataBase:
             (self.current_contest,),
         )
 
+    def fetch_band_summary(self) -> list:
+        """
+        returns one row per band, call, WPX prefix and mode with the number
+        of contacts in qs and their summed Points.
+        """
+        return self.exec_sql_mult(
+            "select Band, Call, WPXPrefix, Mode, count(*) as qs, "
+            "sum(Points) as Points from dxlog where ContestNR = ? "
+            "group by Band, Call, WPXPrefix, Mode;",
+            (self.current_contest,),
+        )
+
+    def fetch_rate_rows(self) -> list:
+        """returns ID, TS and IsRunQSO of every contact, oldest first."""
+        return self.exec_sql_mult(
+            "select ID, TS, IsRunQSO from dxlog where ContestNR = ? order by TS ASC;",
+            (self.current_contest,),
+        )
+
+    def fetch_contact_order(self, column: str = "TS") -> list:
+        """
+        returns ID and the value of column, as SortValue, of every contact
+        ordered by column, then by the order they were logged in.
+        """
+        if column.lower() not in self.table_columns("DXLOG"):
+            raise ValueError(f"DXLOG has no column {column}")
+        return self.exec_sql_mult(
+            f"select ID, {column} as SortValue from dxlog where ContestNR = ? "
+            f"order by {column}, rowid;",
+            (self.current_contest,),
+        )
+
+    def fetch_contacts_by_ids(self, ids: list) -> list:
+        """returns the contacts with these IDs, in no particular order."""
+        if not ids:
+            return []
+        placeholders = ", ".join("?" * len(ids))
+        return self.exec_sql_mult(
+            f"select * from dxlog where ID in ({placeholders});", tuple(ids)
+        )
+
     def fetch_all_dirty_contacts(self) -> list:
         """returns a list of dicts of contacts with dirty flag set in the database."""
         return self.exec_sql_mult(
@@ -717,47 +997,10 @@ class DataBase:
 
     def check_dupe_on_band_mode(self, call, band, mode) -> dict:
         """Checks if a call is dupe on band/mode"""
-        match mode:
-            case "LSB" | "USB" | "SSB" | "FM" | "AM":
-                mode_test = "PH"
-            case "CW" | "CW-U" | "CW-L" | "CWR" | "CW-R":
-                mode_test = "CW"
-            case (
-                "FT8"
-                | "FT4"
-                | "RTTY"
-                | "PSK31"
-                | "FSK441"
-                | "MSK144"
-                | "JT65"
-                | "JT9"
-                | "Q65"
-                | "PKTUSB"
-                | "PKTLSB"
-            ):
-                mode_test = "DI"
-            case _:
-                mode_test = "OTHER"
-        # end match
-
-        query = """
-                    select 
-                    count(*) as isdupe
-                    from (
-                            select
-                                CASE 
-                                    WHEN Mode IN ('LSB','USB','SSB','FM','AM') THEN 'PH' 
-                                    WHEN Mode like 'CW%' THEN 'CW' 
-                                    WHEN Mode In ('FT8','FT4','RTTY','PSK31','FSK441','MSK144','JT65','JT9','Q65', 'PKTUSB', 'PKTLSB') THEN 'DI' 
-                                    ELSE 'OTHER' 
-                                END mode,
-                                *
-                            from DXLOG
-                            ) as sortedmode
-
-                    where sortedmode.Call = ? and sortedmode.mode = ? and sortedmode.Band = ? and sortedmode.ContestNR = ?;
-                    """
-        return self.exec_sql(query, (call, mode_test, band, self.current_contest))
+        return self.exec_sql(
+            "select count(*) as isdupe from dxlog where Call = ? and Band = ? and ModeClass = ? and ContestNR = ?;",
+            (call, band, mode_class(mode), self.current_contest),
+        )
 
     def check_dupe_on_band(self, call, band) -> dict:
         """Checks if a call is dupe on band/mode"""
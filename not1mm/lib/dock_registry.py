@@ -0,0 +1,198 @@
+"""
+Dock windows, imported and built the first time they are shown.
+
+Importing every dock window module and building its widgets at startup
+costs seconds on slow machines, mostly for windows that stay closed. The
+registry knows how to make each one and makes it on demand, timing the
+import of its module and the construction of the window.
+"""
+
+import importlib
+import logging
+import time
+from dataclasses import dataclass
+
+from PyQt6.QtCore import Qt
+
+logger = logging.getLogger(__name__)
+
+LEFT = Qt.DockWidgetArea.LeftDockWidgetArea
+RIGHT = Qt.DockWidgetArea.RightDockWidgetArea
+TOP = Qt.DockWidgetArea.TopDockWidgetArea
+
+
+@dataclass(frozen=True)
+class DockSpec:
+    """How to make one dock window of the main window."""
+
+    name: str  # MainWindow attribute holding the window
+    module: str
+    class_name: str
+    action: str  # MainWindow menu action handed to the window
+    pref: str  # preference remembering if the window is shown
+    area: Qt.DockWidgetArea
+    closed: str  # signal the window emits when closed by the user
+    launcher: str  # MainWindow method showing or hiding the window
+
+    @property
+    def object_name(self) -> str:
+        """The object name dock states are saved under."""
+        return self.name.replace("_", "-")
+
+
+DOCK_WINDOWS = (
+    DockSpec(
+        "bandmap_window",
+        "not1mm.bandmap",
+        "BandMapWindow",
+        "actionBandmap",
+        "bandmapwindow",
+        LEFT,
+        "bandmapwindow_closed",
+        "launch_bandmap_window",
+    ),
+    DockSpec(
+        "check_window",
+        "not1mm.checkwindow",
+        "CheckWindow",
+        "actionCheck_Window",
+        "checkwindow",
+        RIGHT,
+        "checkwindow_closed",
+        "launch_check_window",
+    ),
+    DockSpec(
+        "rate_window",
+        "not1mm.ratewindow",
+        "RateWindow",
+        "actionRate_Window",
+        "ratewindow",
+        RIGHT,
+        "ratewindow_closed",
+        "launch_rate_window",
+    ),
+    DockSpec(
+        "statistics_window",
+        "not1mm.statistics",
+        "StatsWindow",
+        "actionStatistics",
+        "statisticswindow",
+        RIGHT,
+        "statisticswindow_closed",
+        "launch_stats_window",
+    ),
+    DockSpec(
+        "chat_window",
+        "not1mm.chat",
+        "ChatWindow",
+        "actionGroup_Chat",
+        "chatwindow",
+        RIGHT,
+        "chatwindow_closed",
+        "launch_chat_window",
+    ),
+    DockSpec(
+        "dxcc_window",
+        "not1mm.dxcc_tracker",
+        "DXCCWindow",
+        "actionDXCC",
+        "dxccwindow",
+        RIGHT,
+        "dxcc_trackerwindow_closed",
+        "launch_dxcc_window",
+    ),
+    DockSpec(
+        "zone_window",
+        "not1mm.zone_tracker",
+        "ZoneWindow",
+        "actionZone",
+        "zonewindow",
+        RIGHT,
+        "zone_trackerwindow_closed",
+        "launch_zone_window",
+    ),
+    DockSpec(
+        "rotator_window",
+        "not1mm.rotator",
+        "RotatorWindow",
+        "actionRotator",
+        "rotatorwindow",
+        RIGHT,
+        "rotatorwindow_closed",
+        "launch_rotator_window",
+    ),
+    DockSpec(
+        "vfo_window",
+        "not1mm.vfo",
+        "VfoWindow",
+        "actionVFO",
+        "vfowindow",
+        RIGHT,
+        "vfowindow_closed",
+        "launch_vfo",
+    ),
+    DockSpec(
+        "log_window",
+        "not1mm.logwindow",
+        "LogWindow",
+        "actionLog_Window",
+        "logwindow",
+        TOP,
+        "logwindow_closed",
+        "launch_log_window",
+    ),
+    DockSpec(
+        "cluster_window",
+        "not1mm.clusterwindow",
+        "ClusterWindow",
+        "actionCluster",
+        "clusterwindow",
+        TOP,
+        "clusterwindow_closed",
+        "launch_cluster_window",
+    ),
+)
+
+
+class DockRegistry:
+    """Makes dock windows on demand, keeping how long each one took."""
+
+    def __init__(self, specs=DOCK_WINDOWS, clock=time.perf_counter) -> None:
+        self.specs = {spec.name: spec for spec in specs}
+        self.clock = clock
+        # name -> (import ms, construct ms) of the windows made.
+        self.timings = {}
+
+    def window_class(self, name: str) -> tuple:
+        """The class of window name and the ms its import took."""
+        spec = self.specs[name]
+        started = self.clock()
+        module = importlib.import_module(spec.module)
+        return getattr(module, spec.class_name), (self.clock() - started) * 1000
+
+    def create(self, name: str, *args, **kwargs):
+        """Import and build window name, passing it args and kwargs."""
+        window_class, import_ms = self.window_class(name)
+        started = self.clock()
+        window = window_class(*args, **kwargs)
+        construct_ms = (self.clock() - started) * 1000
+        self.timings[name] = (import_ms, construct_ms)
+        logger.debug(
+            "%s: import %.1f ms, construct %.1f ms", name, import_ms, construct_ms
+        )
+        return window
+
+    def report(self) -> list:
+        """
+        Lines of the costs of each window. The modules of windows not made
+        are imported here so what deferring them saved can be shown.
+        """
+        lines = [f"{'Dock window':<20}{'import ms':>12}{'construct ms':>14}"]
+        for name in self.specs:
+            if name in self.timings:
+                import_ms, construct_ms = self.timings[name]
+                lines.append(f"{name:<20}{import_ms:>12.1f}{construct_ms:>14.1f}")
+            else:
+                import_ms = self.window_class(name)[1]
+                lines.append(f"{name:<20}{import_ms:>12.1f}{'deferred':>14}")
+        return lines
@@ -1,9 +1,8 @@
 """Edit Settings Dialog"""
 
-from json import loads
-
 from PyQt6 import QtWidgets
 
+from not1mm.lib.cty_index import CtyIndex, load_cty_index
 from not1mm.lib.ham_utility import gridtolatlon
 from not1mm.lib.i18n import load_ui
 
@@ -11,7 +10,7 @@ from not1mm.lib.i18n import load_ui
 class EditStation(QtWidgets.QDialog):
     """Edit Station Settings"""
 
-    cty_file = {}  # noqa: RUF012
+    cty_index = CtyIndex()
 
     def __init__(self, app_data_path):
         super().__init__(None)
@@ -19,10 +18,7 @@ class EditStation(QtWidgets.QDialog):
         self.buttonBox.clicked.connect(self.store)
         self.GridSquare.textEdited.connect(self.gridchanged)
         self.Call.textEdited.connect(self.call_changed)
-        with open(
-            app_data_path / "cty.json", "rt", encoding="utf-8"
-        ) as file_descriptor:
-            self.cty_file = loads(file_descriptor.read())
+        self.cty_index = load_cty_index(app_data_path / "cty.json")
 
     def store(self):
         """dialog magic"""
@@ -44,17 +40,4 @@ class EditStation(QtWidgets.QDialog):
 
     def cty_lookup(self):
         """Lookup callsign in cty.dat file"""
-        callsign = self.Call.text()
-        callsign = callsign.upper()
-        for count in reversed(range(len(callsign))):
-            searchitem = callsign[: count + 1]
-            result = {
-                key: val for key, val in self.cty_file.items() if key == searchitem
-            }
-            if not result:
-                continue
-            if result.get(searchitem).get("exact_match"):
-                if searchitem == callsign:
-                    return result
-                continue
-            return result
+        return self.cty_index.lookup(self.Call.text())
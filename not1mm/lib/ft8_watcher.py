@@ -6,12 +6,15 @@ GPL V3
 """
 
 import logging
-import struct
 
-from PyQt6 import QtNetwork
+from PyQt6 import QtCore, QtNetwork
+
+from not1mm.lib import wsjtx
 
 logger = logging.getLogger(__name__)
 
+FRAME_INTERVAL = 16  # ms, decoded spots are handed over once per frame
+
 
 class FT8Watcher:
     """Main Window"""
@@ -37,32 +40,21 @@ class FT8Watcher:
         logger.info(f"joinMulticastGroup result {join_result}")
 
         self.callback = None
+        self.decode_callback = None
+        self.decodes = wsjtx.DecodeQueue()
+        self.frame_timer = QtCore.QTimer()
+        self.frame_timer.setSingleShot(True)
+        self.frame_timer.setInterval(FRAME_INTERVAL)
+        self.frame_timer.timeout.connect(self.flush_decodes)
         self.udp_socket.readyRead.connect(self.on_udp_socket_ready_read)
 
     def set_callback(self, callback):
         """Set callback"""
         self.callback = callback
 
-    @staticmethod
-    def getint(bytestring):
-        """
-        Returns an int from a bigendian signed 4 byte string
-        """
-        return int.from_bytes(bytestring, byteorder="big", signed=True)
-
-    @staticmethod
-    def getuint(bytestring):
-        """
-        Returns an int from a bigendian unsigned 4 byte string
-        """
-        return int.from_bytes(bytestring, byteorder="big", signed=False)
-
-    @staticmethod
-    def getbool(bytestring):
-        """
-        Returns a bool from a 1 byte string
-        """
-        return bool.from_bytes(bytestring, byteorder="big", signed=False)
+    def set_decode_callback(self, callback):
+        """Set the callback taking each batch of spots made of decodes."""
+        self.decode_callback = callback
 
     def getvalue(self, item):
         """I don't remember what this does."""
@@ -71,70 +63,55 @@ class FT8Watcher:
         return "NOT_FOUND"
 
     def on_udp_socket_ready_read(self):
+        """Process the waiting WSJT-X datagrams."""
+        while self.udp_socket.hasPendingDatagrams():
+            datagram, _sender_host, _sender_port_number = (
+                self.udp_socket.readDatagram(self.udp_socket.pendingDatagramSize())
+            )
+            self.process_datagram(datagram)
+
+    def process_datagram(self, datagram: bytes) -> None:
         """
-        This will process incomming UDP log packets from WSJT-X.
-        I Hope...
+        Queue Decode messages as spots, note Status ones and pass the
+        record of a Logged ADIF message on to the callback.
         """
-        self.datadict = {}
-        datagram, _sender_host, _sender_port_number = self.udp_socket.readDatagram(
-            self.udp_socket.pendingDatagramSize()
-        )
-        logger.debug(f"{datagram=}")
-
-        if datagram[0:4] != b"\xad\xbc\xcb\xda":
+        message = wsjtx.decode_message(datagram)
+        if message is None:
             return  # bail if no wsjt-x magic number
-        version = self.getuint(datagram[4:8])
-        packettype = self.getuint(datagram[8:12])
-        uniquesize = self.getint(datagram[12:16])
-        unique = datagram[16 : 16 + uniquesize].decode()
-        payload = datagram[16 + uniquesize :]
-
-        if packettype == 0:  # Heartbeat
-            hbmaxschema = self.getuint(payload[0:4])
-            hbversion_len = self.getint(payload[4:8])
-            hbversion = payload[8 : 8 + hbversion_len].decode()
-            print(
-                f"heartbeat: sv:{version} p:{packettype} "
-                f"u:{unique}: ms:{hbmaxschema} av:{hbversion}"
-            )
-            return
+        packettype = message["type"]
 
-        if packettype == 1:  # Status
-            [dialfreq] = struct.unpack(">Q", payload[0:8])
-            modelen = self.getint(payload[8:12])
-            mode = payload[12 : 12 + modelen].decode()
-            payload = payload[12 + modelen :]
-            dxcalllen = self.getint(payload[0:4])
-            dxcall = payload[4 : 4 + dxcalllen].decode()
-            print(
-                f"Status: sv:{version} p:{packettype} u:{unique} df:{dialfreq} m:{mode} dxc:{dxcall}"
-            )
+        if packettype == wsjtx.DECODE:
+            if self.decode_callback and self.decodes.push(message):
+                if not self.frame_timer.isActive():
+                    self.frame_timer.start()
+            return
 
-            # if f"{dxcall}{self.band}{self.mode}" in self.dupdict:
-            #     self.ft8dupe = f"{dxcall} {self.band}M {self.mode} FT8 Dupe!"
+        if packettype == wsjtx.STATUS:
+            self.decodes.status(message)
             return
 
-        if packettype == 2:  # Decode commented out because we really don't care
+        if packettype == wsjtx.HEARTBEAT:
+            logger.debug(
+                "heartbeat: sv:%s u:%s ms:%s av:%s",
+                message["schema"],
+                message["id"],
+                message.get("max_schema"),
+                message.get("version"),
+            )
             return
 
-        if packettype != 12:
-            return  # bail if not logged ADIF
-        # if log packet it will contain this nugget.
-        gotcall = datagram.find(b"<call:")
-        if gotcall != -1:
-            datagram = datagram[gotcall:]  # strip everything else
-        else:
+        if packettype != wsjtx.LOGGED_ADIF:
+            return
+        datadict = wsjtx.adif_fields(message.get("adif", ""))
+        if datadict is None:
             return  # Otherwise we don't want to bother with this packet
-
-        data = datagram.decode()
-        splitdata = data.upper().split("<")
-
-        for data in splitdata:
-            if data:
-                tag = data.split(":")
-                if tag == ["EOR>"]:
-                    break
-                self.datadict[tag[0]] = tag[1].split(">")[1].strip()
-        # print(f"\n{self.datadict}\n")
+        self.datadict = datadict
         if self.callback:
             self.callback(self.datadict)
+
+    def flush_decodes(self) -> None:
+        """Hand the spots queued since the last frame to the decode callback."""
+        spots = self.decodes.drain()
+        if spots and self.decode_callback:
+            self.decode_callback(spots)
+            logger.debug("wsjt-x decodes %s", self.decodes.stats())
@@ -210,6 +210,37 @@ def get_not1mm_band(band: str) -> float:
     return b.band_mhz if b else 0.0
 
 
+PHONE_MODES = ("LSB", "USB", "SSB", "FM", "AM")
+DIGITAL_MODES = (
+    "FT8",
+    "FT4",
+    "RTTY",
+    "PSK31",
+    "FSK441",
+    "MSK144",
+    "JT65",
+    "JT9",
+    "Q65",
+    "PKTUSB",
+    "PKTLSB",
+)
+
+
+def mode_class(mode: str) -> str:
+    """Group a logged mode into the class used for band/mode dupe checks.
+
+    Returns one of "PH", "CW", "DI" or "OTHER".
+    """
+    mode = str(mode or "").upper()
+    if mode in PHONE_MODES:
+        return "PH"
+    if mode.startswith("CW"):
+        return "CW"
+    if mode in DIGITAL_MODES:
+        return "DI"
+    return "OTHER"
+
+
 def fakefreq(band_name: str, mode: str) -> str:
     """Return a sensible kHz-as-string frequency for cabrillo/ADIF when the rig is offline.
 
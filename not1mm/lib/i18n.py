@@ -17,11 +17,11 @@ re-apply the currently selected language to every open window.
 import logging
 from pathlib import Path
 
-from PyQt6 import QtCore, uic
 from PyQt6.QtCore import QLibraryInfo, QTranslator
 from PyQt6.QtWidgets import QApplication
 
 from not1mm import fsutils
+from not1mm.lib.ui_forms import form_class
 
 logger = logging.getLogger("i18n")
 
@@ -96,20 +96,16 @@ def install_language(app, language: str = "en_US") -> None:
 def load_ui(widget, ui_file: Path) -> object:
     """Load a .ui file into *widget*.
 
-    The UI is built with uic.loadUi exactly as the app always did, so every
-    named widget is an attribute of *widget*. The generated Ui class is also
-    retained on widget._ui so its retranslateUi() can be called later to
-    apply a new interface language without rebuilding the window.
+    The UI is built by the form class compiled from the file, see
+    ui_forms, and every named widget is made an attribute of *widget* as
+    uic.loadUi would. The form is retained on widget._ui so its
+    retranslateUi() can be called later to apply a new interface language
+    without rebuilding the window.
     """
-    uic.loadUi(ui_file, widget)
-    form_class, _ = uic.loadUiType(str(ui_file))
-    form = form_class()
-    for name in dir(widget):
-        if name.startswith("_"):
-            continue
-        value = getattr(widget, name)
-        if isinstance(value, QtCore.QObject):
-            setattr(form, name, value)
+    form = form_class(ui_file)()
+    form.setupUi(widget)
+    for name, value in vars(form).items():
+        setattr(widget, name, value)
     widget._ui = form
     return form
 
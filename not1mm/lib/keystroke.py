@@ -0,0 +1,173 @@
+"""
+Keeping the callsign field responsive while the operator types.
+
+The work a keystroke sets off falls in two kinds. The cheap part, tidying
+the text, the dupe check and the country lookup, is done at once in the
+main window. The costly part is the partial matching in the check and log
+windows, that waits until typing pauses for CALLCHANGED_DEBOUNCE ms and
+then runs on a KeystrokeWorker thread.
+
+Every job handed to the worker carries the sequence number of the keystroke
+it is for, and a stage name, e.g. "scp" or "log". Only the newest job of a
+stage is kept waiting: submitting another one cancels a job not yet
+started, and accept() turns away the result of one finished after a newer
+one was submitted. So a window only ever shows matches for what is in the
+callsign field, and never older ones after newer.
+
+LatencyStats keeps how long each stage took, both for the work done at
+once and for the worker's, queue wait included, to show in the debug log.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from PyQt6.QtCore import QObject, QThread, pyqtSignal
+from PyQt6.QtWidgets import QApplication
+
+from not1mm.lib.database import DataBase
+
+logger = logging.getLogger(__name__)
+
+CALLCHANGED_DEBOUNCE = 100  # ms of no typing before the match windows update
+
+
+class LatencyStats:
+    """Count, last, max and mean milliseconds taken by each named stage."""
+
+    def __init__(self) -> None:
+        self.stages = {}
+
+    def record(self, stage: str, elapsed_ms: float) -> None:
+        """Add one timing of stage."""
+        entry = self.stages.setdefault(
+            stage, {"count": 0, "last_ms": 0.0, "max_ms": 0.0, "total_ms": 0.0}
+        )
+        entry["count"] += 1
+        entry["last_ms"] = elapsed_ms
+        entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+        entry["total_ms"] += elapsed_ms
+
+    @contextmanager
+    def measure(self, stage: str):
+        """Time the body of the with statement as stage."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, (time.perf_counter() - start) * 1000)
+
+    def summary(self) -> dict:
+        """The timings by stage, with the mean worked out."""
+        return {
+            stage: {
+                "count": entry["count"],
+                "last_ms": entry["last_ms"],
+                "max_ms": entry["max_ms"],
+                "mean_ms": entry["total_ms"] / entry["count"],
+            }
+            for stage, entry in self.stages.items()
+        }
+
+
+class KeystrokeWorker(QObject):
+    """
+    Runs the newest job of each stage on its own thread and emits
+    finished(stage, seq, result). Call submit() and accept() from the
+    GUI thread. Until start() is called jobs wait for run_pending().
+    """
+
+    finished = pyqtSignal(str, int, object)
+    wake = pyqtSignal()
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.lock = threading.Lock()
+        self.pending = {}
+        self.latest = {}
+        self.databases = {}
+        self.thread = None
+        self.latency = LatencyStats()
+        self.stats = {"submitted": 0, "cancelled": 0, "stale": 0, "delivered": 0}
+
+    def start(self) -> None:
+        """Move to a thread of our own and start it."""
+        self.thread = QThread()
+        self.moveToThread(self.thread)
+        self.wake.connect(self.run_pending)
+        self.thread.start()
+        if QApplication.instance():
+            QApplication.instance().aboutToQuit.connect(self.stop)
+
+    def stop(self) -> None:
+        """Stop the thread, letting a job under way finish."""
+        if self.thread is not None and self.thread.isRunning():
+            with self.lock:
+                self.pending.clear()
+            self.thread.quit()
+            self.thread.wait(2000)
+
+    def submit(self, stage: str, seq: int, job, *args) -> None:
+        """Run job(*args) for keystroke seq, replacing any waiting for stage."""
+        with self.lock:
+            self.stats["submitted"] += 1
+            if stage in self.pending:
+                self.stats["cancelled"] += 1
+            self.pending[stage] = (seq, time.perf_counter(), job, args)
+        self.latest[stage] = (seq, time.perf_counter())
+        self.wake.emit()
+
+    def cancel(self, stage: str) -> None:
+        """Forget the job waiting for stage and any result still to come."""
+        with self.lock:
+            if self.pending.pop(stage, None) is not None:
+                self.stats["cancelled"] += 1
+        self.latest.pop(stage, None)
+
+    def run_pending(self) -> None:
+        """Run the waiting jobs, oldest keystroke first."""
+        while True:
+            with self.lock:
+                if not self.pending:
+                    return
+                stage = min(self.pending, key=lambda name: self.pending[name][0])
+                seq, submitted, job, args = self.pending.pop(stage)
+            started = time.perf_counter()
+            try:
+                result = job(*args)
+            except Exception:  # pylint: disable=broad-exception-caught
+                logger.exception("%s job for keystroke %d failed", stage, seq)
+                continue
+            finished = time.perf_counter()
+            with self.lock:
+                self.latency.record(f"{stage} wait", (started - submitted) * 1000)
+                self.latency.record(f"{stage} run", (finished - started) * 1000)
+            self.finished.emit(stage, seq, result)
+
+    def accept(self, stage: str, seq: int) -> bool:
+        """True when a finished job is the newest one submitted for stage."""
+        latest = self.latest.get(stage)
+        if latest is None or latest[0] != seq:
+            self.stats["stale"] += 1
+            return False
+        self.stats["delivered"] += 1
+        with self.lock:
+            self.latency.record(stage, (time.perf_counter() - latest[1]) * 1000)
+            summary = self.latency.summary()
+        logger.debug(
+            "%s %s run %s", stage, summary[stage], summary.get(f"{stage} run")
+        )
+        return True
+
+    def database(self, dbname, app_data_dir, contest: int) -> DataBase:
+        """
+        The worker's own connection to dbname, for use in jobs. An sqlite
+        connection stays on the thread that opened it.
+        """
+        database = self.databases.get(str(dbname))
+        if database is None:
+            database = DataBase(dbname, app_data_dir)
+            self.databases[str(dbname)] = database
+        database.current_contest = contest
+        return database
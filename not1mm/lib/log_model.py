@@ -0,0 +1,306 @@
+"""
+The table model behind the log window.
+
+A multi-op log runs to many thousands of contacts, far more than fit on
+screen. LogModel keeps only the contact IDs in display order, with the
+value each one is sorted on, and fetches whole contacts PAGE_SIZE at a time
+as the view asks for rows it is about to draw. Logging, editing or deleting
+a contact inserts, updates or removes that one row; reloading is left for
+a change of database or contest.
+
+The focused log, the contacts like the call being typed, is a handful of
+rows handed over whole with set_contacts, in a LogModel made with
+paged=False.
+
+Edits made in the view are not written to the model. They are passed on as
+contact_edited(contact), the contact with the edited field changed, for the
+log window to check and save, after which it calls update_contacts.
+"""
+
+import bisect
+import logging
+
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt, pyqtSignal
+
+logger = logging.getLogger(__name__)
+
+PAGE_SIZE = 200
+
+# (header, DXLOG field)
+COLUMNS = (
+    ("YYYY-MM-DD HH:MM:SS", "TS"),
+    ("Call", "Call"),
+    ("Freq (KHz)", "Freq"),
+    ("Mode", "Mode"),
+    ("Snt", "SNT"),
+    ("Rcv", "RCV"),
+    ("SentNr", "SentNr"),
+    ("RcvNr", "NR"),
+    ("Exchange1", "Exchange1"),
+    ("CK", "CK"),
+    ("Prec", "Prec"),
+    ("Name", "Name"),
+    ("Sect", "Sect"),
+    ("WPX", "WPXPrefix"),
+    ("Power", "Power"),
+    ("M1", "IsMultiplier1"),
+    ("ZN", "ZN"),
+    ("M2", "IsMultiplier2"),
+    ("PFX", "CountryPrefix"),
+    ("PTS", "Points"),
+    ("Comment", "Comment"),
+    ("Operator", "Operator"),
+)
+
+# Shown as a check mark, not text, and not edited in the table.
+MULT_FIELDS = ("IsMultiplier1", "IsMultiplier2")
+
+
+def order_key(value) -> tuple:
+    """Sort key putting mixed values in the order SQLite's ORDER BY does."""
+    if value is None:
+        return (0, 0)
+    if isinstance(value, (int, float)):
+        return (1, value)
+    if isinstance(value, bytes):
+        return (3, value)
+    return (2, value)
+
+
+def display_text(field: str, value) -> str:
+    """The text a field is shown as."""
+    if field in MULT_FIELDS or value is None:
+        return ""
+    if field == "Freq":
+        try:
+            return str(round(float(value), 2))
+        except ValueError:
+            return str(round(0.0, 2))
+    return str(value)
+
+
+class LogModel(QAbstractTableModel):
+    """
+    Contacts of the current contest, sorted on one field, oldest first by
+    default. Unless paged, only the contacts given to set_contacts.
+    """
+
+    contact_edited = pyqtSignal(dict)
+
+    def __init__(self, icon=None, paged=True) -> None:
+        super().__init__()
+        self.icon = icon
+        self.paged = paged
+        self.database = None
+        self.columns = list(COLUMNS)
+        self.sort_field = "TS"
+        self.descending = False
+        self.ids = []
+        self.keys = []
+        # ID -> its index in ids, kept in step with ids.
+        self.positions = {}
+        self.contacts = {}
+        self.pages_fetched = 0
+
+    def load(self, database) -> None:
+        """(Re)read the contact order from database, contacts come later."""
+        self.beginResetModel()
+        self.database = database
+        self.contacts = {}
+        order = database.fetch_contact_order(self.sort_field) if self.paged else []
+        self.ids = [row["ID"] for row in order]
+        self.keys = [order_key(row["SortValue"]) for row in order]
+        self._index_from(0)
+        self.endResetModel()
+        logger.debug("log model loaded %d contacts", len(self.ids))
+
+    def set_contacts(self, contacts: list) -> None:
+        """Show exactly these contacts, which are kept whole."""
+        self.beginResetModel()
+        self.contacts = {contact["ID"]: contact for contact in contacts}
+        ordered = sorted(
+            enumerate(contacts),
+            key=lambda item: (order_key(item[1].get(self.sort_field)), item[0]),
+        )
+        self.ids = [contact["ID"] for _, contact in ordered]
+        self.keys = [
+            order_key(contact.get(self.sort_field)) for _, contact in ordered
+        ]
+        self._index_from(0)
+        self.endResetModel()
+
+    def set_visible(self, headers) -> None:
+        """Show only the columns with these headers, in the usual order."""
+        self.beginResetModel()
+        self.columns = [column for column in COLUMNS if column[0] in headers]
+        self.endResetModel()
+
+    def column(self, header: str) -> int:
+        """The column showing header, -1 when hidden."""
+        for number, (name, _) in enumerate(self.columns):
+            if name == header:
+                return number
+        return -1
+
+    def row_of(self, unique_id: str) -> int:
+        """The display row of a contact, -1 when not shown."""
+        position = self.positions.get(unique_id)
+        if position is None:
+            return -1
+        return self._row(position, len(self.ids))
+
+    def _index_from(self, start: int) -> None:
+        """Bring positions up to date for ids from start on."""
+        if start == 0:
+            self.positions = {}
+        for position in range(start, len(self.ids)):
+            self.positions[self.ids[position]] = position
+
+    def _position(self, row: int) -> int:
+        """Where display row is kept in ids, which run in ascending order."""
+        return len(self.ids) - 1 - row if self.descending else row
+
+    def _row(self, position: int, length: int) -> int:
+        """The display row of position in ids of the given length."""
+        return length - 1 - position if self.descending else position
+
+    def contact(self, row: int) -> dict:
+        """The whole contact shown in row, fetching its page if need be."""
+        unique_id = self.ids[self._position(row)]
+        if unique_id not in self.contacts and self.paged:
+            self._fetch_page(self._position(row))
+        return self.contacts.get(unique_id, {"ID": unique_id})
+
+    def _fetch_page(self, position: int) -> None:
+        start = position - position % PAGE_SIZE
+        wanted = [
+            unique_id
+            for unique_id in self.ids[start : start + PAGE_SIZE]
+            if unique_id not in self.contacts
+        ]
+        for contact in self.database.fetch_contacts_by_ids(wanted):
+            self.contacts[contact["ID"]] = contact
+        self.pages_fetched += 1
+
+    def rowCount(self, parent=QModelIndex()) -> int:  # noqa: B008
+        return 0 if parent.isValid() else len(self.ids)
+
+    def columnCount(self, parent=QModelIndex()) -> int:  # noqa: B008
+        return 0 if parent.isValid() else len(self.columns)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if (
+            role == Qt.ItemDataRole.DisplayRole
+            and orientation == Qt.Orientation.Horizontal
+            and 0 <= section < len(self.columns)
+        ):
+            return self.columns[section][0]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        field = self.columns[index.column()][1]
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return display_text(field, self.contact(index.row()).get(field))
+        if role == Qt.ItemDataRole.DecorationRole and field in MULT_FIELDS:
+            if self.contact(index.row()).get(field):
+                return self.icon
+            return None
+        if role == Qt.ItemDataRole.TextAlignmentRole and field == "TS":
+            return Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignVCenter
+        return None
+
+    def flags(self, index):
+        flags = super().flags(index)
+        if index.isValid() and self.columns[index.column()][1] not in MULT_FIELDS:
+            flags |= Qt.ItemFlag.ItemIsEditable
+        return flags
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole) -> bool:
+        if not index.isValid() or role != Qt.ItemDataRole.EditRole:
+            return False
+        field = self.columns[index.column()][1]
+        contact = dict(self.contact(index.row()))
+        contact[field] = value.upper() if field == "Call" else value
+        self.contact_edited.emit(contact)
+        return True
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder) -> None:
+        if not 0 <= column < len(self.columns):
+            return
+        self.sort_field = self.columns[column][1]
+        self.descending = order == Qt.SortOrder.DescendingOrder
+        if self.paged and self.database is not None:
+            self.load(self.database)
+        else:
+            self.set_contacts(list(self.contacts.values()))
+
+    def remove_contacts(self, ids) -> None:
+        """Take the rows of these contacts out."""
+        for unique_id in ids:
+            position = self.positions.pop(unique_id, None)
+            if position is None:
+                continue
+            row = self._row(position, len(self.ids))
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self.ids[position]
+            del self.keys[position]
+            self._index_from(position)
+            self.contacts.pop(unique_id, None)
+            self.endRemoveRows()
+
+    def update_contacts(self, contacts: list) -> None:
+        """Add these whole contacts, or replace the rows they already have."""
+        for contact in contacts:
+            unique_id = contact["ID"]
+            key = order_key(contact.get(self.sort_field))
+            position = self.positions.get(unique_id)
+            if position is not None:
+                if self.keys[position] == key:
+                    self.contacts[unique_id] = contact
+                    row = self._row(position, len(self.ids))
+                    self.dataChanged.emit(
+                        self.index(row, 0), self.index(row, len(self.columns) - 1)
+                    )
+                    continue
+                self.remove_contacts([unique_id])
+            position = bisect.bisect_right(self.keys, key)
+            row = self._row(position, len(self.ids) + 1)
+            self.beginInsertRows(QModelIndex(), row, row)
+            self.ids.insert(position, unique_id)
+            self.keys.insert(position, key)
+            self._index_from(position)
+            self.contacts[unique_id] = contact
+            self.endInsertRows()
+
+    def refresh(self, ids) -> None:
+        """
+        Reread these contacts, dropping the ones no longer in the log. Unless
+        paged, only contacts already shown are updated.
+        """
+        if not self.paged:
+            ids = [unique_id for unique_id in ids if unique_id in self.contacts]
+        ids = list(ids)
+        found = []
+        for start in range(0, len(ids), PAGE_SIZE):
+            found += self.database.fetch_contacts_by_ids(
+                ids[start : start + PAGE_SIZE]
+            )
+        present = {contact["ID"] for contact in found}
+        self.remove_contacts(
+            [unique_id for unique_id in ids if unique_id not in present]
+        )
+        self.update_contacts(found)
+
+    def apply_delta(self, delta: dict) -> None:
+        """Follow a ContestState delta."""
+        if delta.get("reset"):
+            self.load(self.database)
+            return
+        self.refresh(
+            {
+                contact["ID"]: None
+                for contact in delta.get("removed", []) + delta.get("added", [])
+            }
+        )
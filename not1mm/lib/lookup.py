@@ -6,24 +6,27 @@ HamQTH
 """
 
 import logging
-from functools import lru_cache
 
 import requests
 import xmltodict
 
 logger = logging.getLogger("lookup")
 
+HAMDB_URL = "https://api.hamdb.org/"
+QRZ_URL = "https://xmldata.qrz.com/xml/134/"
+HAMQTH_URL = "https://www.hamqth.com/xml.php"
+
 
 class HamDBlookup:
     """
     Class manages HamDB lookups.
     """
 
-    def __init__(self) -> None:
-        self.url = "https://api.hamdb.org/"
+    def __init__(self, url: str = HAMDB_URL, session=None) -> None:
+        self.url = url
+        self.http = session or requests.Session()
         self.error = False
 
-    @lru_cache(maxsize=1000)
     def lookup(self, call: str) -> tuple:
         """
         Lookup a call on QRZ
@@ -62,7 +65,7 @@ class HamDBlookup:
 
         try:
             self.error = False
-            query_result = requests.get(
+            query_result = self.http.get(
                 self.url + call + "/xml/wfd_logger", timeout=10.0
             )
         except requests.exceptions.Timeout as exception:
@@ -108,7 +111,9 @@ class QRZlookup:
     Class manages QRZ lookups. Pass in a username and password at instantiation.
     """
 
-    def __init__(self, username: str, password: str) -> None:
+    def __init__(
+        self, username: str, password: str, url: str = QRZ_URL, session=None
+    ) -> None:
         self.session = False
         self.expiration = False
         self.error = (
@@ -116,7 +121,8 @@ class QRZlookup:
         )
         self.username = username
         self.password = password
-        self.qrzurl = "https://xmldata.qrz.com/xml/134/"
+        self.qrzurl = url
+        self.http = session or requests.Session()
         self.message = False
         self.lastresult = False
         self.getsession()
@@ -153,7 +159,7 @@ class QRZlookup:
         self.session = False
         try:
             payload = {"username": self.username, "password": self.password}
-            query_result = requests.get(self.qrzurl, params=payload, timeout=10.0)
+            query_result = self.http.get(self.qrzurl, params=payload, timeout=10.0)
             if query_result.status_code == 200:
                 try:
                     baseroot = xmltodict.parse(query_result.text)
@@ -195,7 +201,6 @@ class QRZlookup:
             self.session = False
             self.error = f"{exception}"
 
-    @lru_cache(maxsize=1000)
     def lookup(self, call: str) -> dict:
         """
         Lookup a call on QRZ
@@ -205,7 +210,9 @@ class QRZlookup:
         if self.session:
             payload = {"s": self.session, "callsign": call}
             try:
-                query_result = requests.get(self.qrzurl, params=payload, timeout=10.0)
+                query_result = self.http.get(
+                    self.qrzurl, params=payload, timeout=10.0
+                )
             except (
                 requests.exceptions.Timeout,
                 requests.exceptions.ConnectionError,
@@ -228,7 +235,7 @@ class QRZlookup:
                 self.getsession()
                 if self.session:
                     payload = {"s": self.session, "callsign": call}
-                    query_result = requests.get(
+                    query_result = self.http.get(
                         self.qrzurl, params=payload, timeout=3.0
                     )
                     baseroot = xmltodict.parse(query_result.text)
@@ -239,11 +246,14 @@ class QRZlookup:
 class HamQTH:
     """HamQTH lookup"""
 
-    def __init__(self, username: str, password: str) -> None:
+    def __init__(
+        self, username: str, password: str, url: str = HAMQTH_URL, session=None
+    ) -> None:
         """initialize HamQTH lookup"""
         self.username = username
         self.password = password
-        self.url = "https://www.hamqth.com/xml.php"
+        self.url = url
+        self.http = session or requests.Session()
         self.session = False
         self.error = False
         self.getsession()
@@ -255,7 +265,7 @@ class HamQTH:
         self.session = False
         payload = {"u": self.username, "p": self.password}
         try:
-            query_result = requests.get(self.url, params=payload, timeout=2.0)
+            query_result = self.http.get(self.url, params=payload, timeout=2.0)
         except (requests.exceptions.Timeout, requests.exceptions.ConnectionError):
             self.error = True
             return
@@ -278,7 +288,6 @@ class HamQTH:
                 self.error = session.get("error")
         logger.info("session: %s", self.session)
 
-    @lru_cache(maxsize=1000)
     def lookup(self, call: str) -> dict:
         """
         Lookup a call on HamQTH
@@ -292,7 +301,7 @@ class HamQTH:
         if self.session:
             payload = {"id": self.session, "callsign": call, "prg": "not1mm"}
             try:
-                query_result = requests.get(self.url, params=payload, timeout=10.0)
+                query_result = self.http.get(self.url, params=payload, timeout=10.0)
             except (requests.exceptions.Timeout, requests.exceptions.ConnectionError):
                 self.error = True
                 return the_result
@@ -323,7 +332,19 @@ class HamQTH:
                 return the_result
             if the_result.get("error_text") == "Session does not exist or expired":
                 self.getsession()
-                query_result = requests.get(self.url, params=payload, timeout=10.0)
+                payload["id"] = self.session
+                try:
+                    query_result = self.http.get(
+                        self.url, params=payload, timeout=10.0
+                    )
+                    query_dict = xmltodict.parse(query_result.text)
+                except (
+                    requests.exceptions.Timeout,
+                    requests.exceptions.ConnectionError,
+                    xmltodict.expat.ExpatError,
+                ):
+                    self.error = True
+                    query_dict = {}
                 the_result["grid"] = (
                     query_dict.get("HamQTH", {}).get("search", {}).get("grid", False)
                 )
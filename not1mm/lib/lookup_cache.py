@@ -0,0 +1,98 @@
+"""
+Persistent cache of callsign lookup results.
+
+QRZ and HamQTH answers are kept in a small sqlite file keyed by provider and
+call, so a station worked again, in this contest or the next, does not cost
+another round trip. Entries older than ttl seconds are treated as missing,
+and once more than max_entries are stored the least recently used ones are
+evicted.
+"""
+
+import json
+import logging
+import sqlite3
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 30 * 24 * 3600  # seconds, a month
+MAX_ENTRIES = 20000
+
+
+class LookupCache:
+    """Lookup results by (provider, call), with expiry and LRU eviction."""
+
+    def __init__(
+        self,
+        path=":memory:",
+        ttl: float = DEFAULT_TTL,
+        max_entries: int = MAX_ENTRIES,
+        clock=time.time,
+    ) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self.conn = sqlite3.connect(str(path), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL;")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS lookups ("
+            "provider TEXT NOT NULL, "
+            "call TEXT NOT NULL, "
+            "result TEXT NOT NULL, "
+            "fetched REAL NOT NULL, "
+            "used REAL NOT NULL, "
+            "PRIMARY KEY (provider, call));"
+        )
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS lookups_used ON lookups (used);"
+        )
+        self.conn.commit()
+
+    def __len__(self) -> int:
+        return self.conn.execute("select count(*) from lookups;").fetchone()[0]
+
+    def get(self, provider: str, call: str) -> dict | None:
+        """The cached result for call, None if missing or expired."""
+        now = self.clock()
+        row = self.conn.execute(
+            "select result, fetched from lookups where provider = ? and call = ?;",
+            (provider, call),
+        ).fetchone()
+        if row is None:
+            return None
+        if now - row[1] > self.ttl:
+            self.conn.execute(
+                "delete from lookups where provider = ? and call = ?;",
+                (provider, call),
+            )
+            self.conn.commit()
+            return None
+        self.conn.execute(
+            "update lookups set used = ? where provider = ? and call = ?;",
+            (now, provider, call),
+        )
+        self.conn.commit()
+        try:
+            return json.loads(row[0])
+        except ValueError:
+            return None
+
+    def put(self, provider: str, call: str, result: dict) -> None:
+        """Store result for call, evicting the least recently used if full."""
+        now = self.clock()
+        self.conn.execute(
+            "insert or replace into lookups values (?, ?, ?, ?, ?);",
+            (provider, call, json.dumps(result, default=str), now, now),
+        )
+        excess = len(self) - self.max_entries
+        if excess > 0:
+            self.conn.execute(
+                "delete from lookups where rowid in "
+                "(select rowid from lookups order by used asc, rowid asc limit ?);",
+                (excess,),
+            )
+        self.conn.commit()
+
+    def close(self) -> None:
+        """Close the database."""
+        self.conn.close()
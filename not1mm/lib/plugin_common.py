@@ -3,19 +3,32 @@
 import datetime
 import logging
 import re
-import uuid
+import sqlite3
+from dataclasses import dataclass
 from decimal import Decimal
+from itertools import groupby, islice
 from pathlib import Path
+from typing import Callable
 
 import adif_io
 from PyQt6.QtCore import QCoreApplication, Qt
 from PyQt6.QtWidgets import QApplication, QDialog, QProgressDialog, QPushButton
 
-from not1mm.lib.ham_utility import get_adif_band, get_not1mm_band
+from not1mm.lib.adif_import import (
+    AdifImportError,
+    ascii_text,
+    contact_from_adif,
+    count_records,
+    read_records,
+)
+from not1mm.lib.ham_utility import get_adif_band
 from not1mm.lib.version import __version__
 
 logger = logging.getLogger(__name__)
 
+# Records checked and stored at a time by imp_adif, between progress updates.
+ADIF_IMPORT_CHUNK = 500
+
 # Prevents unused warnings
 assert QApplication
 assert QDialog
@@ -75,6 +88,87 @@ def online_score_xml(self):
     return the_xml
 
 
+@dataclass(frozen=True)
+class FirstWorked:
+    """
+    A multiplier flag that is set on the first contact of its key, the way
+    the "fetch_..._exists_before_me" queries do it.
+
+    key(contact) is what a contact marks as worked for the contacts after
+    it, None for nothing. probe(contact) is what the contact itself looks
+    up, None when it can not be a multiplier. probe defaults to key.
+    """
+
+    field: str
+    key: Callable
+    probe: Callable | None = None
+
+
+def recalculate_multipliers(
+    self, multipliers, points: Callable | None = None, since: str = ""
+) -> list:
+    """
+    Recalculate the multiplier flags, and the points if a points(self)
+    function is given, of the current contest in one ordered pass.
+
+    Every contact is flagged against the keys of the contacts logged
+    strictly before it, kept in one set per multiplier, instead of running
+    a count query per contact. When since is a time stamp, the contacts
+    before it only contribute their keys, they can not change.
+
+    Only the changed columns of changed contacts are written, in one
+    transaction. Returns the changed contacts.
+    """
+    seen = {multiplier.field: set() for multiplier in multipliers}
+    changed = []
+    saved_contact = getattr(self, "contact", None)
+    try:
+        contacts = self.database.fetch_all_contacts_asc()
+        # Contacts sharing a time stamp do not count as before each other.
+        for time_stamp, group in groupby(contacts, key=lambda item: item["TS"]):
+            group = list(group)
+            if not since or time_stamp >= since:
+                for contact in group:
+                    update = _recalculate_contact(
+                        self, contact, multipliers, points, seen
+                    )
+                    if update:
+                        contact.update(update)
+                        update["ID"] = contact["ID"]
+                        changed.append((contact, update))
+            for contact in group:
+                for multiplier in multipliers:
+                    key = multiplier.key(contact)
+                    if key is not None:
+                        seen[multiplier.field].add(key)
+    finally:
+        self.contact = saved_contact
+    if changed:
+        with self.database.transaction():
+            for _, update in changed:
+                self.database.change_contact(update)
+    logger.debug("recalculated multipliers, %d contacts changed", len(changed))
+    return [contact for contact, _ in changed]
+
+
+def _recalculate_contact(self, contact, multipliers, points, seen) -> dict:
+    """The columns of contact that need to change."""
+    update = {}
+    if points is not None:
+        self.contact = contact
+        new_points = points(self)
+        if new_points != contact.get("Points"):
+            update["Points"] = new_points
+            contact["Points"] = new_points
+    for multiplier in multipliers:
+        probe = multiplier.probe or multiplier.key
+        key = probe(contact)
+        flag = int(key is not None and key not in seen[multiplier.field])
+        if flag != contact.get(multiplier.field):
+            update[multiplier.field] = flag
+    return update
+
+
 def get_points(self):
     """Return raw points before mults"""
     result = self.database.fetch_points()
@@ -365,6 +459,10 @@ def gen_adif(self, cabrillo_name: str, contest_id=""):
 def imp_adif(self):
     """
     Imports an ADIF file into the current contest.
+
+    Records are read from the file as a stream and checked and stored
+    ADIF_IMPORT_CHUNK at a time, all in one transaction, so a record that
+    can not be imported, or Cancel, leaves the log as it was.
     """
 
     filename = self.filepicker("other")
@@ -380,310 +478,68 @@ def imp_adif(self):
         self.show_message_box(f"Error: {e}")
         return
 
-    # filter out anything beyond 7-bit ASCII
-    ascii_content = ""
-    for b in file_content:
-        if b < 128:
-            ascii_content = ascii_content + chr(b)
-
-    qsos_raw, _adif_header = adif_io.read_from_string(ascii_content)
-    qsos_sorted = sorted(qsos_raw, key=adif_io.time_on)
-
-    num_qsos = len(qsos_sorted)
+    adif_text = ascii_text(file_content)
+    num_qsos = count_records(adif_text)
     logger.debug(f"Found {num_qsos} QSOs to import")
     self.show_message_box(f"Found {num_qsos} QSOs in\n'{filename}'.")
     if num_qsos == 0:
         return
 
-    self.progress_dialog = QProgressDialog("Validating...", "Cancel", 0, num_qsos, self)
+    self.progress_dialog = QProgressDialog("Importing...", "Cancel", 0, num_qsos, self)
     self.progress_dialog.setWindowModality(Qt.WindowModality.WindowModal)
     # using .show() breaks modality - just start updating
 
-    q_num = 0
-    contacts = []
+    empty = dict(
+        self.database.get_empty(),
+        ContestName=self.contest.name,
+        ContestNR=self.pref.get("contest", "0"),
+    )
+    # Contacts already in the log, or earlier in the file, are dupes.
+    logged = self.database.fetch_call_time_stamps()
+    records = enumerate(read_records(adif_text), start=1)
     dupes = 0
+    saves = 0
+    try:
+        with self.database.transaction():
+            while chunk := list(islice(records, ADIF_IMPORT_CHUNK)):
+                contacts = []
+                for q_num, record in chunk:
+                    contact = contact_from_adif(record, empty, q_num)
+                    key = (contact["TS"], contact["Call"])
+                    if key in logged:
+                        dupes += 1
+                    else:
+                        logged.add(key)
+                        contacts.append(contact)
+                saves += self.database.log_contacts(contacts)
+                self.progress_dialog.setValue(q_num)
+                QCoreApplication.processEvents()
+                if self.progress_dialog.wasCanceled():
+                    raise AdifImportError("Cancelling import.")
+    except (AdifImportError, adif_io.AdifError) as error:
+        logger.debug("%s", error)
+        self.progress_dialog.close()
+        self.show_message_box(f"{error}")
+        return
+    except sqlite3.Error as error:
+        logger.error("%s", error)
+        self.progress_dialog.close()
+        self.show_message_box(f"Error importing ADIF, nothing was saved: {error}")
+        return
 
-    for q in qsos_sorted:
-        QCoreApplication.processEvents()
-        if self.progress_dialog.wasCanceled():
-            self.progress_dialog.close()
-            self.show_message_box("Cancelling import.")
-            return
-
-        this_contact = self.database.get_empty()
-
-        try:
-            temp = adif_io.time_on(q)
-            this_contact["TS"] = temp.strftime("%Y-%m-%d %H:%M:%S")
-        except KeyError:
-            logger.debug("Date/time not found in QSO #{q_num+1}")
-            self.progress_dialog.close()
-            self.show_message_box(
-                f"Date/time not found in QSO #{q_num + 1}.\nImport cancelled."
-            )
-            return
-
-        if q.get("CALL"):
-            this_contact["Call"] = q.get("CALL")
-        else:
-            logger.debug("Callsign not found in QSO #{q_num+1}")
-            self.progress_dialog.close()
-            self.show_message_box(
-                f"Callsign not found in QSO #{q_num + 1}.\nImport cancelled."
-            )
-            return
-
-        freq_mhz = None
-        if q.get("FREQ"):
-            freq_mhz = float(q.get("FREQ"))
-        elif q.get("BAND"):
-            band_str = str(q.get("BAND")).lower()
-            freq_mhz = get_not1mm_band(band_str)
-            if freq_mhz == 0.0:
-                freq_mhz = None
-
-        if freq_mhz is None:
-            logger.debug(f"Frequency not found in QSO #{q_num + 1}")
-            self.progress_dialog.close()
-            self.show_message_box(...)
-            return
-
-        this_contact["Freq"] = freq_mhz * 1000.0
-
-        # ADIF Band is in Meters (eg, "20m"), not1mm is in (float) MHz
-        # 1st attempt: ADIF style like "18m"
-        if band := get_not1mm_band(str(q.get("BAND")).lower()):
-            this_contact["Band"] = band
-        else:
-            # convert the QSO frequency to a not1mm band float (0.0 when invalid)
-            band_name = get_adif_band(Decimal(str(freq_mhz)))
-            this_contact["Band"] = get_not1mm_band(band_name)
-
-        if q.get("QSXFREQ"):
-            this_contact["QSXFreq"] = float(q.get("QSXFREQ")) * 1000.0
-        else:
-            this_contact["QSXFreq"] = 0.0
-
-        if q.get("MODE"):
-            this_contact["Mode"] = q.get("MODE")
-        elif q.get("SUBMODE"):
-            this_contact["Mode"] = q.get("SUBMODE")
-        else:
-            logger.debug("Mode not found in QSO #{q_num+1}")
-            self.progress_dialog.close()
-            self.show_message_box(
-                f"Valid Mode not found in QSO #{q_num + 1}.\nImport cancelled."
-            )
-            return
-
-        this_contact["ContestName"] = self.contest.name
-
-        if q.get("SNT"):
-            this_contact["SNT"] = q.get("SNT")
-        elif q.get("RST_SENT"):
-            this_contact["SNT"] = q.get("RST_SENT")
-
-        if q.get("RCV"):
-            this_contact["RCV"] = q.get("RCV")
-        elif q.get("RST_RCVD"):
-            this_contact["RCV"] = q.get("RST_RCVD")
-
-        if q.get("COUNTRYPREFIX"):
-            this_contact["CountryPrefix"] = q.get("COUNTRYPREFIX")
-        elif q.get("PFX"):
-            this_contact["CountryPrefix"] = q.get("PFX")
-
-        if q.get("STATIONPREFIX"):
-            this_contact["StationPrefix"] = q.get("STATIONPREFIX")
-
-        if q.get("QTH"):
-            this_contact["QTH"] = q.get("QTH")
-
-        if q.get("NAME"):
-            this_contact["Name"] = q.get("NAME")
-
-        if q.get("COMMENT"):
-            this_contact["Comment"] = q.get("COMMENT")
-
-        if q.get("NR"):
-            this_contact["NR"] = q.get("NR")
-        elif q.get("SRX_STRING"):
-            this_contact["NR"] = q.get("SRX_STRING")
-
-        if q.get("SECT"):
-            this_contact["Sect"] = q.get("SECT")
-        elif q.get("ARRL_SECT"):
-            this_contact["Sect"] = q.get("ARRL_SECT")
-
-        QCoreApplication.processEvents()
-
-        if q.get("PREC"):
-            this_contact["Prec"] = q.get("PREC")
-
-        if q.get("CK"):
-            this_contact["CK"] = q.get("CK")
-
-        if q.get("ZN"):
-            this_contact["ZN"] = q.get("ZN")
-        elif q.get("CQZ"):
-            this_contact["ZN"] = q.get("CQZ")
-
-        if q.get("SENTNR"):
-            this_contact["SentNr"] = q.get("SENTNR")
-        elif q.get("STX_STRING"):
-            this_contact["SentNr"] = q.get("STX_STRING")
-
-        if q.get("POINTS"):
-            this_contact["Points"] = q.get("POINTS")
-        elif q.get("APP_N1MM_POINTS"):
-            this_contact["Points"] = q.get("APP_N1MM_POINTS")
-
-        if q.get("APP_N1MM_MULT1"):
-            this_contact["IsMultiplier1"] = q.get("APP_N1MM_MULT1")
-
-        if q.get("APP_N1MM_MULT2"):
-            this_contact["IsMultiplier2"] = q.get("APP_N1MM_MULT2")
-
-        if q.get("POWER"):
-            this_contact["Power"] = q.get("POWER")
-        elif q.get("TX_PWR"):
-            this_contact["Power"] = q.get("TX_PWR")
-
-        if q.get("WPXPREFIX"):
-            this_contact["WPXPrefix"] = q.get("WPXPREFIX")
-
-        if q.get("EXCHANGE1"):
-            this_contact["Exchange1"] = q.get("EXCHANGE1")
-        elif q.get("CLASS"):
-            this_contact["Exchange1"] = q.get("CLASS")
-        elif q.get("APP_N1MM_EXCHANGE1"):
-            this_contact["Exchange1"] = q.get("APP_N1MM_EXCHANGE1")
-
-        if q.get("RADIONR"):
-            this_contact["RadioNR"] = q.get("RADIONR")
-        elif q.get("APP_N1MM_RADIONR"):
-            this_contact["RadioNR"] = q.get("APP_N1MM_RADIONR")
-        else:
-            this_contact["RadioNR"] = 1
-
-        this_contact["ContestNR"] = self.pref.get("contest", "0")
-
-        if q.get("ISMULTIPLIER3"):
-            this_contact["isMultiplier3"] = q.get("ISMULTIPLIER3")
-        elif q.get("APP_N1MM_MULT3"):
-            this_contact["isMultiplier3"] = q.get("APP_N1MM_MULT3")
-
-        if q.get("MISCTEXT"):
-            this_contact["MiscText"] = q.get("MISCTEXT")
-
-        if q.get("ISRUNQSO"):
-            this_contact["IsRunQSO"] = q.get("ISRUNQSO")
-
-        if q.get("CONTACTTYPE"):
-            this_contact["ContactType"] = q.get("CONTACTTYPE")
-
-        QCoreApplication.processEvents()
-
-        if q.get("RUN1RUN2"):
-            this_contact["Run1Run2"] = q.get("RUN1RUN2")
-        elif q.get("APP_N1MM_RUN1RUN2"):
-            this_contact["Run1Run2"] = q.get("APP_N1MM_RUN1RUN2")
-        else:
-            this_contact["Run1Run2"] = 1
-
-        if q.get("GRIDSQUARE"):
-            this_contact["GridSquare"] = q.get("GRIDSQUARE")
-
-        if q.get("OPERATOR"):
-            this_contact["Operator"] = q.get("OPERATOR")
-        elif q.get("STATION_CALLSIGN"):
-            this_contact["Operator"] = q.get("STATION_CALLSIGN")
-
-        if q.get("CONTINENT"):
-            this_contact["Continent"] = q.get("CONTINENT")
-        elif q.get("APP_N1MM_CONTINENT"):
-            this_contact["Continent"] = q.get("APP_N1MM_CONTINENT")
-
-        if q.get("ROVERLOCATION"):
-            this_contact["RoverLocation"] = q.get("ROVERLOCATION")
-
-        if q.get("RADIOINTERFACED"):
-            this_contact["RadioInterfaced"] = q.get("RADIOINTERFACED")
-        elif q.get("APP_N1MM_RADIOINTERFACED"):
-            this_contact["RadioInterfaced"] = q.get("APP_N1MM_RADIOINTERFACED")
-
-        if q.get("NETWORKEDCOMPNR"):
-            this_contact["NetworkedCompNr"] = q.get("NETWORKEDCOMPNR")
-
-        if q.get("NETBIOSNAME"):
-            this_contact["NetBiosName"] = q.get("NETBIOSNAME")
-        elif q.get("APP_N1MM_NETBIOSNAME"):
-            this_contact["NetBiosName"] = q.get("APP_N1MM_NETBIOSNAME")
-        elif q.get("N3FJP_COMPUTERNAME"):
-            this_contact["NetBiosName"] = q.get("N3FJP_COMPUTERNAME")
-
-        if q.get("ISORIGINAL"):
-            this_contact["IsOriginal"] = q.get("ISORIGINAL")
-        elif q.get("APP_N1MM_ISORIGINAL"):
-            this_contact["IsOriginal"] = q.get("APP_N1MM_ISORIGINAL")
-
-        this_contact["ID"] = uuid.uuid4().hex
-
-        if q.get("CLAIMEDQSO"):
-            this_contact["CLAIMEDQSO"] = q.get("CLAIMEDQSO")
-        elif q.get("APP_N1MM_CLAIMEDQSO"):
-            this_contact["CLAIMEDQSO"] = q.get("APP_N1MM_CLAIMEDQSO")
-
-        # is this record a dupe?
-        theTS = this_contact["TS"]
-        thecall = this_contact["Call"]
-        temp = self.database.exec_sql(
-            f"select count(*) as isdupe from dxlog where TS = '{theTS}' and call = '{thecall}'"
-        )
-        if temp["isdupe"] > 0:
-            dupes = dupes + 1
-        else:
-            contacts.append(this_contact.copy())
-
-        this_contact.clear()
-        q_num = q_num + 1
-        self.progress_dialog.setValue(q_num)
-        QCoreApplication.processEvents()
-
-    # All ADIF records have now been mapped.
-    # setting to max value forces progress_dialog to close
-    self.progress_dialog.setValue(num_qsos)
+    self.progress_dialog.setValue(num_qsos)  # forces close
 
     logger.debug(f"Found {dupes} duplicate records")
     if dupes > 0:
         self.show_message_box(
-            f"NOTE: Found {dupes} duplicate records, which will not be saved."
+            f"NOTE: Found {dupes} duplicate records, which were not saved."
         )
 
-    # open new progress_dialog for Save progress.
-    self.progress_dialog = QProgressDialog(
-        "Saving...", "Cancel", 0, len(contacts), self
-    )
-    self.progress_dialog.setWindowModality(Qt.WindowModality.WindowModal)
-
-    saves = 0
-    for my_contact in contacts:
-        QCoreApplication.processEvents()
-        if self.progress_dialog.wasCanceled():
-            self.progress_dialog.close()
-            self.show_message_box("Cancelling import in progress.")
-            return
-
-        self.database.log_contact(my_contact)
-
-        saves = saves + 1
-        self.progress_dialog.setValue(saves)
-        QCoreApplication.processEvents()
-
-    self.progress_dialog.setValue(len(contacts))  # forces close
     # update everything
-    self.contest.recalculate_mults(self)  # compute Points + IsMultiplier1 first
-    self.log_window.get_log()  # then refresh log display with correct data
+    with self.database.transaction():
+        self.contest.recalculate_mults(self)  # compute Points + IsMultiplier1 first
+    if self.log_window:
+        self.log_window.get_log()  # then refresh log display with correct data
 
     if self.actionStatistics.isChecked():
         self.statistics_window.get_run_and_total_qs()
@@ -0,0 +1,74 @@
+"""
+Change tracking and pacing for the radio poll loop.
+
+PollEngine compares each reading of the radio with the last one passed on
+and hands back only the fields that changed, so the main window hears from
+the radio when something happened rather than on every poll. It also picks
+the delay until the next poll: FAST_INTERVAL while the radio is changing,
+e.g. the VFO knob is being turned, then doubling on each quiet poll back to
+the configured idle interval.
+
+The time each poll took is kept for stats(), with the backends batching
+their reads that is one round trip to the radio control program per poll.
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+FAST_INTERVAL = 100  # ms, while the radio's state is changing
+FIELDS = ("vfoa", "mode", "bw", "online")
+
+
+class PollEngine:
+    """Last radio state passed on, the poll interval and poll timings."""
+
+    def __init__(self, idle_interval: int = 500, fast_interval=FAST_INTERVAL):
+        self.idle_interval = idle_interval
+        self.fast_interval = fast_interval
+        self.interval = idle_interval
+        self.state = {}
+        self.polls = 0
+        self.changes = 0
+        self.last_ms = 0.0
+        self.max_ms = 0.0
+        self.total_ms = 0.0
+
+    def wake(self) -> None:
+        """Something was sent to the radio, watch it closely for a while."""
+        self.interval = min(self.fast_interval, self.idle_interval)
+
+    def update(self, reading: dict, elapsed: float = 0.0) -> dict:
+        """
+        Record a reading taking elapsed seconds, returns the fields that
+        differ from the last reading, all of them the first time.
+        """
+        self.polls += 1
+        self.last_ms = elapsed * 1000
+        self.max_ms = max(self.max_ms, self.last_ms)
+        self.total_ms += self.last_ms
+        delta = {
+            field: reading[field]
+            for field in FIELDS
+            if field in reading
+            and (field not in self.state or self.state[field] != reading[field])
+        }
+        if delta:
+            self.changes += 1
+            self.state.update(delta)
+            self.wake()
+        else:
+            self.interval = min(self.interval * 2, self.idle_interval)
+        return delta
+
+    def stats(self) -> dict:
+        """Poll counters, times are in milliseconds."""
+        return {
+            "polls": self.polls,
+            "changes": self.changes,
+            "interval_ms": self.interval,
+            "last_poll_ms": self.last_ms,
+            "max_poll_ms": self.max_ms,
+            "mean_poll_ms": self.total_ms / self.polls if self.polls else 0.0,
+        }
+
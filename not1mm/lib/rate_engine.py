@@ -0,0 +1,141 @@
+"""
+In memory QSO rate figures for the rate window.
+
+RateEngine is seeded once from the log and then follows it through the
+contest state deltas. It keeps the contact times in a sorted list, for the
+last 10/100 and last hour rates, and run and S&P counts in one bucket per
+minute, for the current hour and for graphing. None of the figures need
+to look at more than the ends of the list or one hour of buckets, however
+long the log gets.
+"""
+
+import logging
+from bisect import bisect_left, bisect_right, insort
+from datetime import UTC, datetime
+
+logger = logging.getLogger(__name__)
+
+
+def ts_seconds(time_stamp: str) -> int | None:
+    """A DXLOG 'YYYY-MM-DD HH:MM:SS' UTC time stamp as epoch seconds."""
+    try:
+        when = datetime.fromisoformat(str(time_stamp)[:19])
+    except ValueError:
+        return None
+    return int(when.replace(tzinfo=UTC).timestamp())
+
+
+class RateEngine:
+    """Run and S&P counts by minute, plus the sorted contact times."""
+
+    def __init__(self) -> None:
+        self.clear()
+
+    def clear(self) -> None:
+        """Forget everything."""
+        self.contacts = {}
+        self.times = []
+        self.buckets = {}
+        self.runs = 0
+
+    def load(self, rows: list) -> None:
+        """Seed from rows holding ID, TS and IsRunQSO, like fetch_rate_rows."""
+        self.clear()
+        for row in rows:
+            self.add(row)
+
+    def _count(self, seconds: int, run: int, step: int) -> None:
+        minute = seconds // 60
+        bucket = self.buckets.setdefault(minute, [0, 0])
+        bucket[0] += run * step
+        bucket[1] += step
+        if bucket[1] <= 0:
+            del self.buckets[minute]
+        self.runs += run * step
+
+    def add(self, contact: dict) -> None:
+        """A contact was logged, or replaced by an edited version."""
+        self.remove(contact.get("ID", ""))
+        seconds = ts_seconds(contact.get("TS", ""))
+        if seconds is None:
+            return
+        try:
+            run = 1 if int(contact.get("IsRunQSO") or 0) else 0
+        except (TypeError, ValueError):
+            run = 0
+        self.contacts[contact.get("ID", "")] = (seconds, run)
+        insort(self.times, seconds)
+        self._count(seconds, run, 1)
+
+    def remove(self, unique_id: str) -> None:
+        """A contact was deleted."""
+        known = self.contacts.pop(unique_id, None)
+        if known is None:
+            return
+        seconds, run = known
+        del self.times[bisect_left(self.times, seconds)]
+        self._count(seconds, run, -1)
+
+    def apply_delta(self, delta: dict) -> None:
+        """Follow a ContestState delta."""
+        for contact in delta.get("removed", []):
+            self.remove(contact.get("ID", ""))
+        for contact in delta.get("added", []):
+            self.add(contact)
+
+    def total(self) -> int:
+        """Number of contacts."""
+        return len(self.times)
+
+    def run_count(self) -> int:
+        """Number of run contacts, the rest are S&P."""
+        return self.runs
+
+    def last_n(self, count: int) -> tuple:
+        """
+        (contacts, minutes) spanned by the latest count contacts. Fewer
+        contacts are returned if the log is shorter.
+        """
+        last = self.times[-count:]
+        if not last:
+            return (0, 0.0)
+        return (len(last), (last[-1] - last[0]) / 60)
+
+    def last_hour(self, now: datetime | None = None) -> tuple:
+        """
+        (contacts, minutes) for the contacts logged in the last 60 minutes,
+        minutes being the time between the first and the last of them.
+        """
+        now = now or datetime.now(UTC)
+        start = bisect_right(self.times, int(now.timestamp()) - 3600)
+        if start >= len(self.times):
+            return (0, 0.0)
+        return (len(self.times) - start, (self.times[-1] - self.times[start]) / 60)
+
+    def current_hour(self, now: datetime | None = None) -> tuple:
+        """(runs, contacts) since the top of the current UTC hour."""
+        now = now or datetime.now(UTC)
+        first_minute = int(now.timestamp()) // 3600 * 60
+        runs = 0
+        total = 0
+        for minute in range(first_minute, first_minute + 60):
+            bucket = self.buckets.get(minute)
+            if bucket:
+                runs += bucket[0]
+                total += bucket[1]
+        return (runs, total)
+
+    def series(self, start: datetime, end: datetime) -> list:
+        """
+        Per minute counts for graphing, as (minute start, runs, S&P) for
+        every minute from start to end inclusive.
+        """
+        first = int(start.timestamp()) // 60
+        last = int(end.timestamp()) // 60
+        result = []
+        for minute in range(first, last + 1):
+            runs, total = self.buckets.get(minute, (0, 0))
+            result.append(
+                (datetime.fromtimestamp(minute * 60, UTC), runs, total - runs)
+            )
+        return result
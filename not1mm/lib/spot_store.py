@@ -0,0 +1,266 @@
+"""
+In memory store for the bandmap's cluster spots.
+
+Spots are kept in one frequency sorted list per band, so the bandmap's
+range, next and previous queries are a bisect away. They are also filed
+into one bucket per minute of their time stamp, aging spots out pops the
+expired buckets instead of scanning the whole store. MARKED spots never
+expire and are not bucketed.
+
+Every change bumps version, the bandmap compares it to decide whether it
+needs to redraw at all.
+"""
+
+import heapq
+import logging
+import platform
+from bisect import bisect_left, bisect_right, insort
+from datetime import UTC, datetime, timedelta
+
+from not1mm.lib.ham_utility import band2banddef, khz2banddef
+
+logger = logging.getLogger(__name__)
+
+CLEAR_FREQ = 0.1  # 100 Hz
+
+
+def is_marked(spot: dict) -> bool:
+    """True for spots the user marked, these do not age out."""
+    return "MARKED" in (spot.get("comment") or "").upper()
+
+
+def utc_stamp(when: datetime) -> str:
+    """Time stamp in the format spots carry, 'YYYY-MM-DD HH:MM:SS'."""
+    return when.strftime("%Y-%m-%d %H:%M:%S")
+
+
+class SpotStore:
+    """Cluster spots by band, in frequency order."""
+
+    def __init__(self) -> None:
+        self.spots = {}
+        self.bands = {}
+        self.calls = {}
+        self.buckets = {}
+        self.bucket_heap = []
+        self.next_id = 0
+        self.version = 0
+
+    def __len__(self) -> int:
+        return len(self.spots)
+
+    def _insert(self, spot: dict, spot_id=None) -> int:
+        if spot_id is None:
+            spot_id = self.next_id
+            self.next_id += 1
+        spot["id"] = spot_id
+        band = khz2banddef(spot["freq"], unknown_band=True).name
+        spot["bandmap_band"] = band
+        self.spots[spot_id] = spot
+        insort(self.bands.setdefault(band, []), (spot["freq"], spot_id))
+        self.calls.setdefault(spot["callsign"], set()).add(spot_id)
+        if not is_marked(spot):
+            minute = spot["ts"][:16]
+            bucket = self.buckets.get(minute)
+            if bucket is None:
+                bucket = self.buckets[minute] = set()
+                heapq.heappush(self.bucket_heap, minute)
+            bucket.add(spot_id)
+        self.version += 1
+        return spot_id
+
+    def _remove(self, spot_id: int) -> dict | None:
+        spot = self.spots.pop(spot_id, None)
+        if spot is None:
+            return None
+        entries = self.bands[spot["bandmap_band"]]
+        del entries[bisect_left(entries, (spot["freq"], spot_id))]
+        if not entries:
+            del self.bands[spot["bandmap_band"]]
+        ids = self.calls[spot["callsign"]]
+        ids.discard(spot_id)
+        if not ids:
+            del self.calls[spot["callsign"]]
+        bucket = self.buckets.get(spot["ts"][:16])
+        if bucket is not None:
+            bucket.discard(spot_id)
+            if not bucket:
+                del self.buckets[spot["ts"][:16]]
+        self.version += 1
+        return spot
+
+    def _range_ids(self, start: float, end: float) -> list:
+        """Ids of the spots with start <= freq <= end, in frequency order."""
+        found = []
+        for entries in self.bands.values():
+            if not entries or entries[0][0] > end or entries[-1][0] < start:
+                continue
+            low = bisect_left(entries, (start, -1))
+            high = bisect_right(entries, (end, self.next_id))
+            found.extend(entries[low:high])
+        found.sort()
+        return [spot_id for _, spot_id in found]
+
+    def get_like_calls(self, call: str) -> list:
+        """
+        Distinct spotted callsigns containing call, like
+        [{'callsign': 'K5TUX'}, {'callsign': 'N2CQR'}]
+        """
+        call = call.upper()
+        return [
+            {"callsign": callsign}
+            for callsign in sorted(self.calls)
+            if call in callsign.upper()
+        ]
+
+    def addspot(self, spot: dict, clear_freq=False) -> None:
+        """
+        Add spot, replacing any previous spots with the same call on the
+        same band.
+
+        Parameters
+        ----------
+        spot: Dict
+        A dict of the form: {'ts': datetime, 'callsign': str, 'freq': float,
+        'band': str,'mode': str,'spotter': str, 'comment': str}
+
+        clear_freq: bool
+        If True, delete any previous spots around this frequency.
+
+        Returns
+        -------
+        Nothing.
+        """
+        if "band" in spot:
+            band = band2banddef(spot.get("band", ""), unknown_band=True)
+        else:
+            band = khz2banddef(spot.get("freq"), unknown_band=True)
+        marked = is_marked(spot)
+
+        for spot_id in list(self.calls.get(spot.get("callsign"), ())):
+            old = self.spots[spot_id]
+            if band.start <= old["freq"] <= band.end and (
+                marked or not is_marked(old)
+            ):
+                self._remove(spot_id)
+
+        if clear_freq:
+            for spot_id in self._range_ids(
+                spot.get("freq") - CLEAR_FREQ, spot.get("freq") + CLEAR_FREQ
+            ):
+                if marked or not is_marked(self.spots[spot_id]):
+                    self._remove(spot_id)
+
+        ts = spot.get(
+            "ts", datetime.now(UTC).replace(second=0, microsecond=0, tzinfo=None)
+        )
+        if isinstance(ts, datetime):
+            ts = utc_stamp(ts)
+        self._insert(
+            {
+                "callsign": spot["callsign"],
+                "ts": ts,
+                "freq": spot["freq"],
+                "mode": spot.get("mode", None),
+                "spotter": spot.get("spotter", platform.node()),
+                "comment": spot.get("comment", "") or "",
+            }
+        )
+
+    def markspot(self, spot: dict, clear_freq=False) -> None:
+        """Mark the spot with spot's call and freq, it will not age out."""
+        the_utc_time = datetime.now(UTC).isoformat(" ")[:19].split()[1]
+        for spot_id in list(self.calls.get(spot.get("callsign", ""), ())):
+            old = self.spots[spot_id]
+            if old["freq"] == spot.get("freq"):
+                self._remove(spot_id)
+                old["ts"] = "2099-01-01 " + the_utc_time
+                old["comment"] = spot.get("comment", "")
+                self._insert(old, spot_id)
+
+    def getspots(self) -> list:
+        """All spots, in ascending frequency order."""
+        return [self.spots[spot_id] for spot_id in self._range_ids(-1, float("inf"))]
+
+    def getspotsinband(self, start: float, end: float) -> list:
+        """
+        Spots with start <= freq <= end, in ascending frequency order.
+
+        Parameters
+        ----------
+        start : float
+        The start frequency.
+        end : float
+        The end frequency.
+
+        Returns
+        -------
+        A list of dicts.
+        """
+        return [self.spots[spot_id] for spot_id in self._range_ids(start, end)]
+
+    def get_next_spot(self, current: float, limit: float) -> dict | None:
+        """The lowest spot above current, up to and including limit."""
+        best = None
+        for entries in self.bands.values():
+            index = bisect_right(entries, (current, self.next_id))
+            if index < len(entries) and entries[index][0] <= limit:
+                if best is None or entries[index] < best:
+                    best = entries[index]
+        return self.spots[best[1]] if best else None
+
+    def get_prev_spot(self, current: float, limit: float) -> dict | None:
+        """The highest spot below current, down to and including limit."""
+        best = None
+        for entries in self.bands.values():
+            index = bisect_left(entries, (current, -1)) - 1
+            if index >= 0 and entries[index][0] >= limit:
+                if best is None or entries[index][0] > best[0]:
+                    best = entries[index]
+        return self.spots[best[1]] if best else None
+
+    def get_matching_spot(self, dx: str, start: float, end: float) -> dict | None:
+        """The lowest spot between start and end whose call contains dx."""
+        dx = dx.upper()
+        for spot_id in self._range_ids(start, end):
+            if dx in self.spots[spot_id]["callsign"].upper():
+                return self.spots[spot_id]
+        return None
+
+    def delete_spot(self, call: str, freq: float) -> None:
+        """Delete a spot identified by call and frequency."""
+        for spot_id in list(self.calls.get(call, ())):
+            if self.spots[spot_id]["freq"] == freq:
+                self._remove(spot_id)
+
+    def delete_spots(self, minutes: int) -> None:
+        """
+        Delete the unmarked spots older than minutes.
+
+        Parameters
+        ----------
+        minutes : int
+        The number of minutes to delete.
+
+        Returns
+        -------
+        None
+        """
+        cutoff = utc_stamp(datetime.now(UTC) - timedelta(minutes=minutes))
+        cutoff_minute = cutoff[:16]
+        while self.bucket_heap and self.bucket_heap[0] <= cutoff_minute:
+            minute = self.bucket_heap[0]
+            bucket = self.buckets.get(minute, set())
+            for spot_id in list(bucket):
+                if self.spots[spot_id]["ts"] < cutoff:
+                    self._remove(spot_id)
+            if minute == cutoff_minute and minute in self.buckets:
+                # Part of this minute is still young, look again next time.
+                break
+            heapq.heappop(self.bucket_heap)
+
+    def delete_marks(self) -> None:
+        """Delete the spots marked into the future by markspot or MARKDX."""
+        now = utc_stamp(datetime.now(UTC))
+        for spot_id in [key for key, spot in self.spots.items() if spot["ts"] > now]:
+            self._remove(spot_id)
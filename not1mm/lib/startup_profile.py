@@ -0,0 +1,51 @@
+"""
+Timing of the steps of starting up, written by not1mm --profile-startup.
+
+Each splash screen message starts a step, so the report reads like the
+splash screen, with what each step took.
+"""
+
+import logging
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class StartupProfile:
+    """The ms spent in each step since started, a perf_counter() value."""
+
+    def __init__(self, started: float, clock=time.perf_counter) -> None:
+        self.clock = clock
+        self.started = started
+        self.step = "Importing modules."
+        self.step_started = started
+        self.steps = []
+
+    def begin(self, step: str) -> None:
+        """End the current step and start step."""
+        now = self.clock()
+        self.steps.append((self.step, (now - self.step_started) * 1000))
+        self.step, self.step_started = step, now
+
+    def finish(self) -> None:
+        """End the last step."""
+        self.begin("")
+
+    def report(self, extra_lines=()) -> str:
+        """The steps, their total and extra_lines, as text."""
+        lines = [f"{'Step':<40}{'ms':>10}"]
+        lines.extend(f"{step:<40}{ms:>10.1f}" for step, ms in self.steps)
+        total = (self.step_started - self.started) * 1000
+        lines.append(f"{'Total':<40}{total:>10.1f}")
+        if extra_lines:
+            lines.append("")
+            lines.extend(extra_lines)
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: Path, extra_lines=()) -> str:
+        """Write the report to path, returning it."""
+        text = self.report(extra_lines)
+        path.write_text(text, encoding="utf-8")
+        logger.info("startup profile written to %s", path)
+        return text
@@ -2,14 +2,20 @@
 
 # pylint: disable=unused-argument
 
+import heapq
 import logging
+import os
+from bisect import bisect_left
 from functools import lru_cache
 from pathlib import Path
 
+import numpy as np
 import requests
-from rapidfuzz import fuzz, process
+from rapidfuzz import fuzz
 
 MASTER_SCP_URL = "https://www.supercheckpartial.com/MASTER.SCP"
+INDEX_SUFFIX = ".idx.npz"
+MAX_MATCHES = 20
 
 if __name__ == "__main__":
     print("I'm not the program you are looking for.")
@@ -37,6 +43,111 @@ def prefix_bias_score(query: str, candidate: str, **kwargs) -> int:
     return int(score * 0.8)
 
 
+class SCPIndex:
+    """
+    Character count (1-gram) index over the MASTER.SCP calls.
+
+    QRatio is 200 * LCS / (len(a) + len(b)), and the LCS can never be longer
+    than the number of characters the two strings have in common. The index
+    keeps a per call character count matrix so that bound can be computed
+    for every call at once with numpy, and only calls whose bound can still
+    beat the current top matches get scored by rapidfuzz.
+    """
+
+    def __init__(self, calls: list, alphabet: str, counts, order) -> None:
+        self.calls = calls
+        self.alphabet = alphabet
+        self.columns = {char: column for column, char in enumerate(alphabet)}
+        self.counts = counts
+        self.lengths = counts.sum(axis=1, dtype=np.float64)
+        self.order = order
+        self.sorted_calls = [calls[idx] for idx in order]
+
+    @classmethod
+    def build(cls, calls: list) -> "SCPIndex":
+        """Build the index from a list of calls."""
+        alphabet = "".join(sorted({char for call in calls for char in call}))
+        columns = {char: column for column, char in enumerate(alphabet)}
+        counts = np.zeros((len(calls), len(alphabet)), dtype=np.uint8)
+        for row, call in enumerate(calls):
+            for char in call:
+                counts[row, columns[char]] += 1
+        order = np.array(
+            sorted(range(len(calls)), key=calls.__getitem__), dtype=np.int32
+        )
+        return cls(calls, alphabet, counts, order)
+
+    @classmethod
+    def load(cls, filename: Path, calls: list, source_stat) -> "SCPIndex | None":
+        """Load a cached index, None if it is missing or stale."""
+        try:
+            with np.load(filename, allow_pickle=False) as cached:
+                if (
+                    int(cached["source_mtime"]) != source_stat.st_mtime_ns
+                    or int(cached["source_size"]) != source_stat.st_size
+                    or cached["counts"].shape[0] != len(calls)
+                ):
+                    return None
+                return cls(
+                    calls, str(cached["alphabet"]), cached["counts"], cached["order"]
+                )
+        except (OSError, KeyError, ValueError) as exception:
+            logger.debug("SCP index cache not used: %s", exception)
+        return None
+
+    def save(self, filename: Path, source_stat) -> None:
+        """Write the index next to the file it was built from."""
+        with open(filename, "wb") as file:
+            np.savez(
+                file,
+                alphabet=np.array(self.alphabet),
+                counts=self.counts,
+                order=self.order,
+                source_mtime=np.array(source_stat.st_mtime_ns, dtype=np.int64),
+                source_size=np.array(source_stat.st_size, dtype=np.int64),
+            )
+
+    def common_counts(self, query: str):
+        """Number of characters each call has in common with query."""
+        common = np.zeros(len(self.calls), dtype=np.int32)
+        for char in set(query):
+            column = self.columns.get(char)
+            if column is not None:
+                common += np.minimum(self.counts[:, column], query.count(char))
+        return common
+
+    def extend_common_counts(self, common, previous: str, query: str):
+        """
+        Update common_counts(previous) to common_counts(query) when query is
+        previous with one character appended. Only the column of the new
+        character can change.
+        """
+        char = query[-1]
+        column = self.columns.get(char)
+        if column is None:
+            return common
+        return common + (self.counts[:, column] > previous.count(char))
+
+    def prefix_indexes(self, query: str) -> list:
+        """Indexes of the calls starting with query."""
+        start = bisect_left(self.sorted_calls, query)
+        end = start
+        while end < len(self.sorted_calls) and self.sorted_calls[end].startswith(
+            query
+        ):
+            end += 1
+        return self.order[start:end]
+
+    def score_bounds(self, query: str, common):
+        """Upper bound of prefix_bias_score(query, call) for every call."""
+        bounds = 200.0 * common / (len(query) + self.lengths)
+        prefixed = self.prefix_indexes(query)
+        penalty = np.full(len(self.calls), 0.8)
+        penalty[prefixed] = 1.0
+        # Leave room for rounding differences against rapidfuzz.
+        return bounds * penalty + 1e-6
+
+
 class SCP:
     """Super check partial"""
 
@@ -44,8 +155,18 @@ class SCP:
         """initialize dialog"""
         self.scp = []
         self.app_data_path = app_data_path
+        self.index = None
+        self.scp_stat = None
+        self.last_query = ""
+        self.last_common = None
+        self.last_matches = []
         self.read_scp()
 
+    @property
+    def scp_path(self) -> Path:
+        """Location of MASTER.SCP"""
+        return Path(self.app_data_path) / "MASTER.SCP"
+
     def update_masterscp(self) -> None:
         """Update the MASTER.SCP file.
         - Returns True if successful
@@ -55,8 +176,9 @@ class SCP:
             with requests.Session() as session:
                 the_request = session.get(MASTER_SCP_URL)
                 if the_request.status_code == 200:
-                    with open(Path(self.app_data_path) / "MASTER.SCP", "wb+") as file:
+                    with open(self.scp_path, "wb+") as file:
                         file.write(the_request.content)
+                    self.read_scp()
                     return True
         except requests.exceptions.RequestException as exception:
             logger.critical("update_masterscp: %s", exception)
@@ -66,31 +188,106 @@ class SCP:
         """
         Reads in a list of known contesters into an internal dictionary
         """
+        self.index = None
+        self.last_query = ""
+        self.last_common = None
+        self.last_matches = []
         try:
-            with open(
-                Path(self.app_data_path) / "MASTER.SCP", "r", encoding="utf-8"
-            ) as file_descriptor:
+            with open(self.scp_path, "r", encoding="utf-8") as file_descriptor:
                 self.scp = file_descriptor.readlines()
                 self.scp = [x.strip() for x in self.scp]
                 self.scp = [x for x in self.scp if not x.startswith("#")]
+            self.scp_stat = os.stat(self.scp_path)
         except OSError as exception:
             logger.critical("read_scp: read error: %s", exception)
 
+    def load_index(self) -> None:
+        """
+        Load the search index from its cache next to MASTER.SCP, or build
+        it and try to cache it when the cache is missing or stale.
+        """
+        if self.scp_stat is None:
+            self.index = SCPIndex.build(self.scp)
+            return
+        cache_path = self.scp_path.with_name(self.scp_path.name + INDEX_SUFFIX)
+        self.index = SCPIndex.load(cache_path, self.scp, self.scp_stat)
+        if self.index is not None:
+            return
+        self.index = SCPIndex.build(self.scp)
+        try:
+            self.index.save(cache_path, self.scp_stat)
+        except OSError as exception:
+            logger.debug("could not cache SCP index: %s", exception)
+
+    def scp_changed(self) -> bool:
+        """True if MASTER.SCP changed on disk since it was read."""
+        try:
+            stat = os.stat(self.scp_path)
+        except OSError:
+            return False
+        return self.scp_stat is None or (
+            stat.st_mtime_ns != self.scp_stat.st_mtime_ns
+            or stat.st_size != self.scp_stat.st_size
+        )
+
     def super_check(self, acall: str) -> list:
+        """
+        Return up to 20 MASTER.SCP calls that best match acall, ordered by
+        prefix_bias_score then by file order.
+        """
+        if len(acall) <= 1:
+            self.last_query = ""
+            self.last_matches = []
+            return []
+
+        if self.scp_changed():
+            self.read_scp()
+        if self.index is None:
+            self.load_index()
+        index = self.index
 
-        if len(acall) > 1:
-            # Compute similarity scores between `acall` and all items in `self.scp`
-            similarity_scores = process.cdist(
-                [acall], self.scp, scorer=prefix_bias_score, workers=-1, score_cutoff=60
+        if (
+            self.last_common is not None
+            and len(acall) == len(self.last_query) + 1
+            and acall.startswith(self.last_query)
+        ):
+            common = index.extend_common_counts(
+                self.last_common, self.last_query, acall
             )
+        else:
+            common = index.common_counts(acall)
+        bounds = index.score_bounds(acall, common)
+
+        # The previous keystroke's matches are usually still good matches,
+        # scoring them first sets a high bar that prunes most candidates.
+        top = []
+        seen = set()
+        for idx in self.last_matches:
+            seen.add(idx)
+            self._push_match(top, acall, idx)
 
-            # Sort and retrieve the top 20 matches with their indices
-            top_matches = sorted(enumerate(similarity_scores[0]), key=lambda x: -x[1])[
-                :20
-            ]
+        threshold = top[0][0] if len(top) == MAX_MATCHES else 1e-6
+        candidates = np.flatnonzero(bounds >= threshold)
+        candidates = candidates[np.argsort(-bounds[candidates], kind="stable")]
+        for idx in candidates.tolist():
+            if len(top) == MAX_MATCHES and bounds[idx] < top[0][0]:
+                break
+            if idx not in seen:
+                self._push_match(top, acall, idx)
 
-            # Extract the corresponding strings from `self.scp`
-            matches = [self.scp[idx] for idx, score in top_matches if score > 0]
+        top.sort(reverse=True)
+        self.last_query = acall
+        self.last_common = common
+        self.last_matches = [-negative_idx for _, negative_idx in top]
+        return [self.scp[idx] for idx in self.last_matches]
 
-            return matches
-        return []
+    def _push_match(self, top: list, acall: str, idx: int) -> None:
+        """Keep the best MAX_MATCHES (score, -index) pairs in a min heap."""
+        score = prefix_bias_score(acall, self.scp[idx])
+        if score <= 0:
+            return
+        item = (score, -idx)
+        if len(top) < MAX_MATCHES:
+            heapq.heappush(top, item)
+        elif item > top[0]:
+            heapq.heapreplace(top, item)
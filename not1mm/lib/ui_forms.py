@@ -0,0 +1,118 @@
+"""
+Compiled forms for the Qt Designer .ui files.
+
+Parsing .ui XML with uic at runtime is slow, and the main window, every
+dock window and every dialog is built from one. Instead each .ui file is
+compiled once with uic.compileUi into a Python module in the user's data
+directory, named for a hash of the file's path and contents, and imported
+from there. Python keeps the bytecode of the module, so from the second
+start on a form costs an import. Editing a .ui file, or moving the
+install, changes the hash and the file is compiled afresh.
+
+python -m not1mm.lib.ui_forms compiles all the forms ahead of time.
+"""
+
+import hashlib
+import importlib.util
+import io
+import logging
+import sys
+from pathlib import Path
+
+from PyQt6 import QtCore, uic
+
+from not1mm import fsutils
+
+logger = logging.getLogger(__name__)
+
+CACHE_PATH = fsutils.USER_DATA_PATH / "ui_cache"
+
+# ui file path -> (mtime_ns, size, form class), for this run.
+_forms = {}
+
+
+def ui_hash(ui_file: Path) -> str:
+    """Hash of the .ui file's location, contents and the PyQt version."""
+    digest = hashlib.sha1(str(ui_file).encode())
+    digest.update(QtCore.PYQT_VERSION_STR.encode())
+    digest.update(ui_file.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def compile_source(ui_file: Path) -> str:
+    """The Python source uic generates for ui_file."""
+    source = io.StringIO()
+    uic.compileUi(str(ui_file), source)
+    return source.getvalue()
+
+
+def form_from_source(source: str, name: str):
+    """The form class defined by generated source that could not be cached."""
+    namespace = {}
+    exec(compile(source, name, "exec"), namespace)  # noqa: S102
+    return next(
+        value
+        for key, value in namespace.items()
+        if key.startswith("Ui_") and isinstance(value, type)
+    )
+
+
+def cached_module_path(ui_file: Path, cache_path: Path = None) -> Path:
+    """The compiled module for ui_file, compiling it when needed."""
+    cache_path = CACHE_PATH if cache_path is None else cache_path
+    module_path = cache_path / f"{ui_file.stem}_{ui_hash(ui_file)}.py"
+    if module_path.exists():
+        return module_path
+    cache_path.mkdir(parents=True, exist_ok=True)
+    for stale in cache_path.glob(f"**/{ui_file.stem}_{'[0-9a-f]' * 16}[.]*"):
+        stale.unlink(missing_ok=True)
+    source = compile_source(ui_file)
+    partial = module_path.with_suffix(".tmp")
+    partial.write_text(source, encoding="utf-8")
+    partial.replace(module_path)
+    logger.debug("compiled %s to %s", ui_file, module_path)
+    return module_path
+
+
+def import_form(module_path: Path):
+    """The form class of a compiled module."""
+    name = f"not1mm_ui_forms.{module_path.stem}"
+    spec = importlib.util.spec_from_file_location(name, module_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return next(
+        value
+        for key, value in vars(module).items()
+        if key.startswith("Ui_") and isinstance(value, type)
+    )
+
+
+def form_class(ui_file, cache_path: Path = None):
+    """
+    The compiled Ui_ class of ui_file. Its setupUi(widget) builds the form
+    on widget and retranslateUi(widget) applies the current language.
+    """
+    ui_file = Path(ui_file).resolve()
+    stat = ui_file.stat()
+    known = _forms.get(ui_file)
+    if known is not None and known[:2] == (stat.st_mtime_ns, stat.st_size):
+        return known[2]
+    try:
+        form = import_form(cached_module_path(ui_file, cache_path))
+    except OSError as exception:
+        logger.warning("can not cache %s: %s", ui_file, exception)
+        form = form_from_source(compile_source(ui_file), str(ui_file))
+    _forms[ui_file] = (stat.st_mtime_ns, stat.st_size, form)
+    return form
+
+
+def compile_all(data_path: Path = fsutils.APP_DATA_PATH) -> list:
+    """Compile every .ui file in data_path, returning the modules."""
+    return [
+        cached_module_path(ui_file.resolve()) for ui_file in data_path.glob("*.ui")
+    ]
+
+
+if __name__ == "__main__":
+    for path in compile_all(*(Path(arg) for arg in sys.argv[1:2])):
+        print(path)
@@ -0,0 +1,398 @@
+"""
+Decoding of the WSJT-X UDP messages.
+
+The messages are laid out as in WSJT-X's NetworkMessage.hpp: a magic
+number, schema, message type and client id, then the fields of the type in
+Qt's QDataStream encoding. The fixed width fields between two variable
+ones are read with one precompiled struct, so a Decode message costs a few
+unpack_from calls straight on the datagram, bytes or a memoryview, and no
+copies but its strings.
+
+Fields added by later schemas are left out of the result when an older
+WSJT-X does not send them.
+
+During a busy FT8 period hundreds of Decode messages arrive in a burst.
+DecodeQueue turns them into bandmap spots and holds them, newest per call,
+until they are taken in one batch.
+"""
+
+import logging
+import re
+import struct
+from datetime import UTC, date, datetime, time, timedelta
+
+logger = logging.getLogger(__name__)
+
+MAGIC = 0xADBCCBDA
+
+HEARTBEAT = 0
+STATUS = 1
+DECODE = 2
+CLEAR = 3
+REPLY = 4
+QSO_LOGGED = 5
+CLOSE = 6
+REPLAY = 7
+HALT_TX = 8
+FREE_TEXT = 9
+WSPR_DECODE = 10
+LOCATION = 11
+LOGGED_ADIF = 12
+HIGHLIGHT_CALLSIGN = 13
+SWITCH_CONFIGURATION = 14
+CONFIGURE = 15
+
+QUEUE_SIZE = 2000  # spots held before the oldest are dropped
+
+# The mode names of the symbols a Decode message gives its mode as.
+MODE_SYMBOLS = {
+    "~": "FT8",
+    "+": "FT4",
+    "`": "FST4",
+    "#": "JT65",
+    "@": "JT9",
+    ":": "Q65",
+    "&": "MSK144",
+}
+
+# Words that may follow CQ ahead of the calling station.
+CQ_WORDS = {"DX", "POTA", "SOTA", "TEST", "FD", "RU", "WW", "NA", "EU", "AS"}
+
+# Letters, digits and '/', with at least one letter and one digit.
+CALLSIGN = re.compile(r"(?=[A-Z0-9/]*\d)(?=[A-Z0-9/]*[A-Z])[A-Z0-9/]{3,}")
+
+# QDataStream encodings of the fixed width field kinds.
+FIXED = {
+    "bool": "?",
+    "u8": "B",
+    "u32": "I",
+    "i32": "i",
+    "u64": "Q",
+    "i64": "q",
+    "double": "d",
+    "qtime": "I",
+}
+
+HEADER = struct.Struct(">IIIi")
+U32 = struct.Struct(">I")
+QDATETIME = struct.Struct(">qIB")
+NULL_STRING = 0xFFFFFFFF
+JULIAN_ORDINAL = 1721425  # Julian day number less the proleptic ordinal
+
+# The fields of the messages WSJT-X sends, and of those it is sent.
+MESSAGES = {
+    HEARTBEAT: (
+        ("max_schema", "u32"),
+        ("version", "utf8"),
+        ("revision", "utf8"),
+    ),
+    STATUS: (
+        ("dial_frequency", "u64"),
+        ("mode", "utf8"),
+        ("dx_call", "utf8"),
+        ("report", "utf8"),
+        ("tx_mode", "utf8"),
+        ("tx_enabled", "bool"),
+        ("transmitting", "bool"),
+        ("decoding", "bool"),
+        ("rx_df", "u32"),
+        ("tx_df", "u32"),
+        ("de_call", "utf8"),
+        ("de_grid", "utf8"),
+        ("dx_grid", "utf8"),
+        ("tx_watchdog", "bool"),
+        ("sub_mode", "utf8"),
+        ("fast_mode", "bool"),
+        ("special_operation_mode", "u8"),
+        ("frequency_tolerance", "u32"),
+        ("tr_period", "u32"),
+        ("configuration_name", "utf8"),
+        ("tx_message", "utf8"),
+    ),
+    DECODE: (
+        ("new", "bool"),
+        ("time", "qtime"),
+        ("snr", "i32"),
+        ("delta_time", "double"),
+        ("delta_frequency", "u32"),
+        ("mode", "utf8"),
+        ("message", "utf8"),
+        ("low_confidence", "bool"),
+        ("off_air", "bool"),
+    ),
+    CLEAR: (("window", "u8"),),
+    REPLY: (
+        ("time", "qtime"),
+        ("snr", "i32"),
+        ("delta_time", "double"),
+        ("delta_frequency", "u32"),
+        ("mode", "utf8"),
+        ("message", "utf8"),
+        ("low_confidence", "bool"),
+        ("modifiers", "u8"),
+    ),
+    QSO_LOGGED: (
+        ("time_off", "qdatetime"),
+        ("dx_call", "utf8"),
+        ("dx_grid", "utf8"),
+        ("tx_frequency", "u64"),
+        ("mode", "utf8"),
+        ("report_sent", "utf8"),
+        ("report_received", "utf8"),
+        ("tx_power", "utf8"),
+        ("comments", "utf8"),
+        ("name", "utf8"),
+        ("time_on", "qdatetime"),
+        ("operator_call", "utf8"),
+        ("my_call", "utf8"),
+        ("my_grid", "utf8"),
+        ("exchange_sent", "utf8"),
+        ("exchange_received", "utf8"),
+        ("propagation_mode", "utf8"),
+    ),
+    CLOSE: (),
+    REPLAY: (),
+    HALT_TX: (("auto_tx_only", "bool"),),
+    FREE_TEXT: (("text", "utf8"), ("send", "bool")),
+    WSPR_DECODE: (
+        ("new", "bool"),
+        ("time", "qtime"),
+        ("snr", "i32"),
+        ("delta_time", "double"),
+        ("frequency", "u64"),
+        ("drift", "i32"),
+        ("callsign", "utf8"),
+        ("grid", "utf8"),
+        ("power", "i32"),
+        ("off_air", "bool"),
+    ),
+    LOCATION: (("location", "utf8"),),
+    LOGGED_ADIF: (("adif", "utf8"),),
+    HIGHLIGHT_CALLSIGN: (
+        ("callsign", "utf8"),
+        ("background", "qcolor"),
+        ("foreground", "qcolor"),
+        ("highlight_last", "bool"),
+    ),
+    SWITCH_CONFIGURATION: (("configuration_name", "utf8"),),
+    CONFIGURE: (
+        ("mode", "utf8"),
+        ("frequency_tolerance", "u32"),
+        ("sub_mode", "utf8"),
+        ("fast_mode", "bool"),
+        ("tr_period", "u32"),
+        ("rx_df", "u32"),
+        ("dx_call", "utf8"),
+        ("dx_grid", "utf8"),
+        ("generate_messages", "bool"),
+    ),
+}
+
+# A QColor: spec, alpha, red, green, blue and padding.
+QCOLOR = struct.Struct(">bHHHHH")
+
+
+def compile_layout(fields: tuple) -> tuple:
+    """
+    The steps reading fields: a struct with the names of the run of fixed
+    width fields it reads, or the kind and name of a variable one.
+    """
+    steps = []
+    names = []
+    formats = ""
+    for name, kind in fields:
+        if kind in FIXED:
+            names.append(name)
+            formats += FIXED[kind]
+            continue
+        if names:
+            steps.append((struct.Struct(">" + formats), tuple(names)))
+            names, formats = [], ""
+        steps.append((kind, name))
+    if names:
+        steps.append((struct.Struct(">" + formats), tuple(names)))
+    return tuple(steps)
+
+
+LAYOUTS = {kind: compile_layout(fields) for kind, fields in MESSAGES.items()}
+
+
+def read_utf8(data, offset: int) -> tuple:
+    """(string, offset past it) for the QByteArray at offset, null as ''."""
+    (length,) = U32.unpack_from(data, offset)
+    offset += 4
+    if length == NULL_STRING:
+        return "", offset
+    end = offset + length
+    if end > len(data):
+        raise struct.error("string runs past the end of the message")
+    return str(data[offset:end], "utf-8", "replace"), end
+
+
+def read_qdatetime(data, offset: int) -> tuple:
+    """(datetime, offset past it) for the QDateTime at offset."""
+    julian_day, msecs, timespec = QDATETIME.unpack_from(data, offset)
+    offset += QDATETIME.size
+    if timespec == 2:  # offset from UTC follows
+        offset += 4
+    if julian_day <= JULIAN_ORDINAL:
+        return None, offset
+    day = date.fromordinal(julian_day - JULIAN_ORDINAL)
+    return datetime.combine(day, time(), UTC) + timedelta(milliseconds=msecs), offset
+
+
+def decode_message(data) -> dict | None:
+    """
+    The fields of a WSJT-X datagram as a dict, with 'type', 'schema' and
+    'id' added. None if it is not a WSJT-X message or is cut short
+    before its fields.
+    """
+    try:
+        magic, schema, kind, id_length = HEADER.unpack_from(data, 0)
+    except struct.error:
+        return None
+    if magic != MAGIC:
+        return None
+    offset = HEADER.size
+    message = {"type": kind, "schema": schema, "id": ""}
+    if id_length > 0:
+        end = offset + id_length
+        message["id"] = str(data[offset:end], "utf-8", "replace")
+        offset = end
+    try:
+        for reader, names in LAYOUTS.get(kind, ()):
+            if reader == "utf8":
+                message[names], offset = read_utf8(data, offset)
+            elif reader == "qdatetime":
+                message[names], offset = read_qdatetime(data, offset)
+            elif reader == "qcolor":
+                message[names] = QCOLOR.unpack_from(data, offset)
+                offset += QCOLOR.size
+            else:
+                message.update(zip(names, reader.unpack_from(data, offset)))
+                offset += reader.size
+    except struct.error:
+        # An older schema stops short of the fields added since.
+        pass
+    return message
+
+
+def is_callsign(word: str) -> bool:
+    """Whether word looks like a callsign: letters and a digit, 3 or more long."""
+    return CALLSIGN.fullmatch(word) is not None
+
+
+def decode_caller(text: str) -> str:
+    """
+    The call of the station sending the decoded text, '' when there is
+    none to be had. 'CQ POTA K1ABC FN42' and 'W9XYZ K1ABC -12' were both
+    sent by K1ABC.
+    """
+    words = text.split()
+    if len(words) < 2:
+        return ""
+    if words[0] == "CQ":
+        if len(words) > 2 and (words[1] in CQ_WORDS or not is_callsign(words[1])):
+            caller = words[2]
+        else:
+            caller = words[1]
+    else:
+        caller = words[1]
+    caller = caller.strip("<>")
+    if not is_callsign(caller):
+        return ""
+    return caller
+
+
+class DecodeQueue:
+    """Spots made of Decode messages, held until they are taken in a batch."""
+
+    def __init__(self, limit: int = QUEUE_SIZE) -> None:
+        self.limit = limit
+        self.pending = {}
+        self.dial = {}
+        self.modes = {}
+        self.received = 0
+        self.dropped = 0
+        self.batches = 0
+
+    def __len__(self) -> int:
+        return len(self.pending)
+
+    def status(self, message: dict) -> None:
+        """Note the dial frequency and mode from a Status message."""
+        client = message["id"]
+        self.dial[client] = message.get("dial_frequency", 0)
+        if message.get("mode"):
+            self.modes[client] = message["mode"]
+
+    def push(self, message: dict) -> bool:
+        """
+        Queue a spot for a Decode message, False if it names no station or
+        comes from a recording rather than the air.
+        """
+        self.received += 1
+        if message.get("off_air"):
+            return False
+        call = decode_caller(message.get("message", ""))
+        if not call:
+            return False
+        client = message["id"]
+        dial = self.dial.get(client)
+        if not dial:
+            return False
+        mode = self.modes.get(client) or MODE_SYMBOLS.get(message.get("mode"), "")
+        text = message["message"]
+        spot = {
+            "dx": call,
+            "spotter": client,
+            "comment": f"{mode} {message.get('snr', 0):+d} dB {text}",
+            "freq": (dial + message.get("delta_frequency", 0)) / 1000,
+            "mode": mode,
+        }
+        if call in self.pending:
+            del self.pending[call]
+        elif len(self.pending) >= self.limit:
+            del self.pending[next(iter(self.pending))]
+            self.dropped += 1
+        self.pending[call] = spot
+        return True
+
+    def drain(self) -> list:
+        """The queued spots, oldest first, emptying the queue."""
+        if not self.pending:
+            return []
+        batch = list(self.pending.values())
+        self.pending = {}
+        now = datetime.now(UTC).isoformat(" ")[:19]
+        for spot in batch:
+            spot["ts"] = now
+        self.batches += 1
+        return batch
+
+    def stats(self) -> dict:
+        """Counters, for the debug log."""
+        return {
+            "received": self.received,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "queued": len(self.pending),
+        }
+
+
+def adif_fields(adif: str) -> dict | None:
+    """
+    The fields of a Logged ADIF message's record, upper cased, the way
+    contest plugins' ft8_handler expects them. None without a call.
+    """
+    gotcall = adif.find("<call:")
+    if gotcall == -1:
+        return None
+    datadict = {}
+    for data in adif[gotcall:].upper().split("<"):
+        if data:
+            tag = data.split(":")
+            if tag == ["EOR>"]:
+                break
+            datadict[tag[0]] = tag[1].split(">")[1].strip()
+    return datadict
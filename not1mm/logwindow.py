@@ -12,13 +12,15 @@ import math
 import queue
 
 from PyQt6 import QtCore, QtGui, QtWidgets
-from PyQt6.QtCore import QItemSelectionModel, Qt, pyqtSignal
+from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtWidgets import QDockWidget
 
 from not1mm import fsutils
 from not1mm.lib.database import DataBase
 from not1mm.lib.edit_contact import EditContact
 from not1mm.lib.i18n import load_ui
+from not1mm.lib.keystroke import KeystrokeWorker
+from not1mm.lib.log_model import COLUMNS, PAGE_SIZE, LogModel
 from not1mm.lib.n1mm import N1MM
 from not1mm.lib.preferences import Preferences
 
@@ -61,31 +63,6 @@ class LogWindow(QDockWidget):
     edit_contact_dialog = None
     current_palette = None
     pref = {}  # noqa: RUF012
-    columns = {  # noqa: RUF012
-        0: "YYYY-MM-DD HH:MM:SS",
-        1: "Call",
-        2: "Freq (KHz)",
-        3: "Mode",
-        4: "Snt",
-        5: "Rcv",
-        6: "SentNr",
-        7: "RcvNr",
-        8: "Exchange1",
-        9: "CK",
-        10: "Prec",
-        11: "Name",
-        12: "Sect",
-        13: "WPX",
-        14: "Power",
-        15: "M1",
-        16: "ZN",
-        17: "M2",
-        18: "PFX",
-        19: "PTS",
-        20: "Comment",
-        21: "UUID",
-        22: "Operator",
-    }
     logwindow_closed = pyqtSignal()
 
     def __init__(self, action):
@@ -104,14 +81,16 @@ class LogWindow(QDockWidget):
 
         self.database.current_contest = self.pref.get("contest", 0)
         self.contact = self.database.empty_contact
+        self.keystroke_seq = 0
+        self.worker = KeystrokeWorker()
+        self.worker.finished.connect(self.like_calls_found)
+        self.worker.start()
         load_ui(self, fsutils.APP_DATA_PATH / "logwindow.ui")
         self.setWindowTitle(
             f"QSO History - {self.pref.get('current_database', 'ham.db')}"
         )
         self.generalLog.setAlternatingRowColors(True)
         self.focusedLog.setAlternatingRowColors(True)
-        self.generalLog.setColumnCount(len(self.columns))
-        self.focusedLog.setColumnCount(len(self.columns))
 
         self.gcheckmark = QtGui.QPixmap(str(fsutils.APP_DATA_PATH / "check.png"))
         self.rcheckmark = QtGui.QPixmap(str(fsutils.APP_DATA_PATH / "rcheck.png"))
@@ -121,20 +100,19 @@ class LogWindow(QDockWidget):
             self.checkicon.addPixmap(self.gcheckmark)
         else:
             self.checkicon.addPixmap(self.rcheckmark)
+        self.general_model = LogModel(self.checkicon)
+        self.focused_model = LogModel(self.checkicon, paged=False)
+        self.generalLog.setModel(self.general_model)
+        self.focusedLog.setModel(self.focused_model)
+        for model in (self.general_model, self.focused_model):
+            model.contact_edited.connect(
+                self.contact_edited, Qt.ConnectionType.QueuedConnection
+            )
         self.generalLog.setContextMenuPolicy(
             QtCore.Qt.ContextMenuPolicy.CustomContextMenu
         )
         self.generalLog.customContextMenuRequested.connect(self.edit_contact_selected)
-        for column_number, column_name in self.columns.items():
-            self.generalLog.setHorizontalHeaderItem(
-                column_number, QtWidgets.QTableWidgetItem(column_name)
-            )
-            self.focusedLog.setHorizontalHeaderItem(
-                column_number, QtWidgets.QTableWidgetItem(column_name)
-            )
-
-        self.generalLog.cellDoubleClicked.connect(self.double_clicked)
-        self.generalLog.cellChanged.connect(self.cell_changed)
+        self.generalLog.doubleClicked.connect(self.double_clicked)
         self.generalLog.horizontalHeader().sectionResized.connect(
             self.resize_headers_to_match
         )
@@ -144,31 +122,14 @@ class LogWindow(QDockWidget):
         self.focusedLog.customContextMenuRequested.connect(
             self.edit_focused_contact_selected
         )
-        self.focusedLog.cellDoubleClicked.connect(self.double_clicked)
-        self.focusedLog.cellChanged.connect(self.focused_cell_changed)
+        self.focusedLog.doubleClicked.connect(self.double_clicked)
         self.generalLog.setSortingEnabled(True)
         for log in (self.generalLog, self.focusedLog):
-            log.setColumnWidth(self.get_column("YYYY-MM-DD HH:MM:SS"), 200)
-
-            log.setColumnWidth(self.get_column("Snt"), 50)
-            log.setColumnWidth(self.get_column("Rcv"), 50)
-            log.setColumnWidth(self.get_column("SentNr"), 75)
-            log.setColumnWidth(self.get_column("RcvNr"), 75)
-
-            log.setColumnWidth(self.get_column("WPX"), 50)
-            log.setColumnWidth(self.get_column("Power"), 50)
-            log.setColumnWidth(self.get_column("M1"), 50)
-            log.setColumnWidth(self.get_column("ZN"), 50)
-            log.setColumnWidth(self.get_column("PTS"), 50)
-            log.setColumnWidth(self.get_column("Name"), 75)
-            log.setColumnWidth(self.get_column("Comment"), 200)
-            log.setColumnHidden(self.get_column("UUID"), True)
-            log.setColumnWidth(self.get_column("Operator"), 50)
+            # Size columns by the rows of a page, not by fetching every row.
+            log.verticalHeader().setResizeContentsPrecision(PAGE_SIZE)
             log.verticalHeader().setVisible(False)
 
         self.get_log()
-        self.generalLog.resizeColumnsToContents()
-        self.generalLog.resizeRowsToContents()
         self.focusedLog.resizeColumnsToContents()
         self.focusedLog.resizeRowsToContents()
 
@@ -180,46 +141,30 @@ class LogWindow(QDockWidget):
         """Process messages from the main window."""
         if msg.get("cmd", "") == "UPDATELOG":
             logger.debug("External refresh command.")
-            self.get_log()
+            delta = msg.get("delta")
+            if delta:
+                self.apply_delta(delta)
+            else:
+                self.get_log()
         if msg.get("cmd", "") == "CALLCHANGED":
             call = msg.get("call", "")
             self.show_like_calls(call)
         if msg.get("cmd", "") == "NEWDB":
             self.load_new_db()
         if msg.get("cmd", "") == "SHOWCOLUMNS":
-            for column in range(len(self.columns)):
-                self.generalLog.setColumnHidden(column, True)
-                self.focusedLog.setColumnHidden(column, True)
-            columns_to_show = msg.get("COLUMNS", [])
-            for column in columns_to_show:
-                if column == "Freq":
-                    column = "Freq (KHz)"
-                self.generalLog.setColumnHidden(self.get_column(column), False)
-                self.focusedLog.setColumnHidden(self.get_column(column), False)
+            columns_to_show = [
+                "Freq (KHz)" if column == "Freq" else column
+                for column in msg.get("COLUMNS", [])
+            ]
+            for model in (self.general_model, self.focused_model):
+                model.set_visible(columns_to_show)
+            self.generalLog.resizeColumnsToContents()
 
     def resize_headers_to_match(self) -> None:
         """Resizes the focused log headers to the same size as the general log."""
-        for i in range(self.generalLog.columnCount()):
+        for i in range(self.general_model.columnCount()):
             self.focusedLog.setColumnWidth(i, self.generalLog.columnWidth(i))
 
-    def get_column(self, name: str) -> int:
-        """
-        Returns the column number of the given column name.
-
-        Parameters
-        ----------
-        name: str
-        The column name
-
-        Returns
-        -------
-        int
-        The column number
-        """
-        for key, value in self.columns.items():
-            if value == name:
-                return key
-
     def load_pref(self) -> None:
         """
         Loads the preferences from the config file into the self.pref dictionary.
@@ -273,16 +218,14 @@ class LogWindow(QDockWidget):
             f"Log Display - {self.pref.get('current_database', 'ham.db')}"
         )
 
-    def double_clicked(self, _row, _column) -> None:
+    def double_clicked(self, _index) -> None:
         """
         Slot for doubleclick event
 
         Parameters
         ----------
-        _row: int
-        The row number
-        _column: int
-        The column number
+        _index: QModelIndex
+        The cell double clicked
 
         Returns
         -------
@@ -292,68 +235,29 @@ class LogWindow(QDockWidget):
             return
         logger.debug("DoubleClicked")
 
-    def cell_changed(self, row, column) -> None:
+    def contact_edited(self, contact: dict) -> None:
         """
-        Slot for cell changed event.
-        If a cell is changed update the database record.
+        Slot for a cell edited in either log.
+        Update the database record with the contact as edited.
 
         Parameters
         ----------
-        row: int
-        The row number
-        column: int
-        The column number
+        contact: dict
+        The contact, the edited field changed
 
         Returns
         -------
         None
         """
         logger.debug("Cell Changed")
-        self.contact = self.database.fetch_contact_by_uuid(
-            self.generalLog.item(row, self.get_column("UUID")).text()
-        )
+        self.contact = self.database.fetch_contact_by_uuid(contact["ID"])
         try:
-            _ = float(self.generalLog.item(row, self.get_column("Freq (KHz)")).text())
-        except ValueError:
+            _ = float(contact.get("Freq", ""))
+        except (TypeError, ValueError):
             self.show_message_box("An invalid value has been entered for frequency.")
-            self.get_log()
-            self.generalLog.scrollToItem(self.generalLog.item(row, column))
             return
-        db_record = {
-            "TS": self.generalLog.item(
-                row, self.get_column("YYYY-MM-DD HH:MM:SS")
-            ).text(),
-            "Call": self.generalLog.item(row, self.get_column("Call")).text().upper(),
-            "Freq": self.generalLog.item(row, self.get_column("Freq (KHz)")).text(),
-            "Mode": self.generalLog.item(row, self.get_column("Mode")).text(),
-            "SNT": self.generalLog.item(row, self.get_column("Snt")).text(),
-            "RCV": self.generalLog.item(row, self.get_column("Rcv")).text(),
-            "SentNr": self.generalLog.item(row, self.get_column("SentNr")).text(),
-            "NR": self.generalLog.item(row, self.get_column("RcvNr")).text(),
-            "Exchange1": self.generalLog.item(row, self.get_column("Exchange1")).text(),
-            "CK": self.generalLog.item(row, self.get_column("CK")).text(),
-            "Prec": self.generalLog.item(row, self.get_column("Prec")).text(),
-            "Sect": self.generalLog.item(row, self.get_column("Sect")).text(),
-            "WPXPrefix": self.generalLog.item(row, self.get_column("WPX")).text(),
-            "Power": self.generalLog.item(row, self.get_column("Power")).text(),
-            "IsMultiplier1": int(
-                not bool(
-                    self.generalLog.item(row, self.get_column("M1")).icon().isNull()
-                )
-            ),
-            "ZN": self.generalLog.item(row, self.get_column("ZN")).text(),
-            "IsMultiplier2": int(
-                not bool(
-                    self.generalLog.item(row, self.get_column("M2")).icon().isNull()
-                )
-            ),
-            "CountryPrefix": self.generalLog.item(row, self.get_column("PFX")).text(),
-            "Points": self.generalLog.item(row, self.get_column("PTS")).text(),
-            "Name": self.generalLog.item(row, self.get_column("Name")).text(),
-            "Comment": self.generalLog.item(row, self.get_column("Comment")).text(),
-            "ID": self.generalLog.item(row, self.get_column("UUID")).text(),
-            "Operator": self.generalLog.item(row, self.get_column("Operator")).text(),
-        }
+        db_record = {field: contact.get(field, "") for _, field in COLUMNS}
+        db_record["ID"] = contact["ID"]
         self.database.change_contact(db_record)
 
         db_record["cmd"] = "CONTACTCHANGED"
@@ -402,123 +306,23 @@ class LogWindow(QDockWidget):
             self.n1mm.contact_info["operator"] = db_record["Operator"]
             self.n1mm.send_contactreplace()
 
-        self.get_log()
-        self.generalLog.scrollToItem(self.generalLog.item(row, column))
+        self.refresh_contacts([db_record["ID"]])
 
-    def focused_cell_changed(self, row, column) -> None:
+    def refresh_contacts(self, ids: list) -> None:
         """
-        This function is called when a cell in the log table is changed.
+        Reread changed contacts into both logs.
 
-        Parameters:
+        Parameters
         ----------
-        row: int
-        The row of the cell that has changed.
-        column: int
-        The column of the cell that has changed.
+        ids: list
+        The IDs of the contacts
 
-        Returns:
+        Returns
         -------
         None
         """
-        logger.debug("Cell Changed")
-        if self.focusedLog.item(row, self.get_column("UUID")) is None:
-            return
-        self.contact = self.database.fetch_contact_by_uuid(
-            self.focusedLog.item(row, self.get_column("UUID")).text()
-        )
-        try:
-            _ = float(self.focusedLog.item(row, self.get_column("Freq (KHz)")).text())
-        except ValueError:
-            self.show_message_box("An invalid value has been entered for frequency.")
-            self.get_log()
-            self.focusedLog.scrollToItem(self.focusedLog.item(row, column))
-            return
-        db_record = {
-            "TS": self.focusedLog.item(
-                row, self.get_column("YYYY-MM-DD HH:MM:SS")
-            ).text(),
-            "Call": self.focusedLog.item(row, self.get_column("Call")).text().upper(),
-            "Freq": self.focusedLog.item(row, self.get_column("Freq (KHz)")).text(),
-            "Mode": self.focusedLog.item(row, self.get_column("Mode")).text(),
-            "SNT": self.focusedLog.item(row, self.get_column("Snt")).text(),
-            "RCV": self.focusedLog.item(row, self.get_column("Rcv")).text(),
-            "SentNr": self.focusedLog.item(row, self.get_column("SentNr")).text(),
-            "NR": self.focusedLog.item(row, self.get_column("RcvNr")).text(),
-            "Exchange1": self.focusedLog.item(row, self.get_column("Exchange1")).text(),
-            "CK": self.focusedLog.item(row, self.get_column("CK")).text(),
-            "Prec": self.focusedLog.item(row, self.get_column("Prec")).text(),
-            "Sect": self.focusedLog.item(row, self.get_column("Sect")).text(),
-            "WPXPrefix": self.focusedLog.item(row, self.get_column("WPX")).text(),
-            "Power": self.focusedLog.item(row, self.get_column("Power")).text(),
-            "IsMultiplier1": int(
-                not bool(
-                    self.focusedLog.item(row, self.get_column("M1")).icon().isNull()
-                )
-            ),
-            "ZN": self.focusedLog.item(row, self.get_column("ZN")).text(),
-            "IsMultiplier2": int(
-                not bool(
-                    self.focusedLog.item(row, self.get_column("M2")).icon().isNull()
-                )
-            ),
-            "CountryPrefix": self.focusedLog.item(row, self.get_column("PFX")).text(),
-            "Points": self.focusedLog.item(row, self.get_column("PTS")).text(),
-            "Name": self.focusedLog.item(row, self.get_column("Name")).text(),
-            "Comment": self.focusedLog.item(row, self.get_column("Comment")).text(),
-            "ID": self.focusedLog.item(row, self.get_column("UUID")).text(),
-            "Operator": self.focusedLog.item(row, self.get_column("Operator")).text(),
-        }
-        self.database.change_contact(db_record)
-
-        db_record["cmd"] = "CONTACTCHANGED"
-        self.message.emit(db_record)
-
-        if self.n1mm.send_contact_packets:
-            self.n1mm.contact_info["timestamp"] = db_record["TS"]
-            self.n1mm.contact_info["contestname"] = self.contact["ContestName"].replace(
-                "-", ""
-            )
-            self.n1mm.contact_info["contestnr"] = self.contact["ContestNR"]
-            self.n1mm.contact_info["operator"] = self.contact["Operator"]
-            self.n1mm.contact_info["mycall"] = self.contact["Operator"]
-            # self.n1mm.contact_info[""] = self.contact[""]
-            self.n1mm.contact_info["band"] = self.contact["Band"]
-            self.n1mm.contact_info["mode"] = self.contact["Mode"]
-            self.n1mm.contact_info["stationprefix"] = self.contact["StationPrefix"]
-            self.n1mm.contact_info["continent"] = self.contact["Continent"]
-            self.n1mm.contact_info["gridsquare"] = self.contact["GridSquare"]
-            self.n1mm.contact_info["ismultiplier1"] = self.contact["IsMultiplier1"]
-            self.n1mm.contact_info["ismultiplier2"] = self.contact["IsMultiplier2"]
-            self.n1mm.contact_info["call"] = db_record["Call"]
-            self.n1mm.contact_info["oldcall"] = self.contact["Call"]
-            try:
-                floatable = float(db_record["Freq"])
-            except ValueError:
-                floatable = 0.0
-            self.n1mm.contact_info["rxfreq"] = self.n1mm.contact_info["txfreq"] = str(
-                int(floatable * 100)
-            )
-            self.n1mm.contact_info["snt"] = db_record["SNT"]
-            self.n1mm.contact_info["rcv"] = db_record["RCV"]
-            self.n1mm.contact_info["sntnr"] = db_record["SentNr"]
-            self.n1mm.contact_info["rcvnr"] = db_record["NR"]
-            self.n1mm.contact_info["exchange1"] = db_record.get("Exchange1", "")
-            self.n1mm.contact_info["ck"] = db_record["CK"]
-            self.n1mm.contact_info["prec"] = db_record["Prec"]
-            self.n1mm.contact_info["section"] = db_record["Sect"]
-            self.n1mm.contact_info["wpxprefix"] = db_record["WPXPrefix"]
-            self.n1mm.contact_info["power"] = db_record["Power"]
-            self.n1mm.contact_info["zone"] = db_record["ZN"]
-            self.n1mm.contact_info["countryprefix"] = db_record["CountryPrefix"]
-            self.n1mm.contact_info["points"] = db_record["Points"]
-            self.n1mm.contact_info["name"] = db_record["Name"]
-            self.n1mm.contact_info["misctext"] = db_record["Comment"]
-            self.n1mm.contact_info["ID"] = db_record["ID"]
-            self.n1mm.contact_info["operator"] = db_record["Operator"]
-            self.n1mm.send_contactreplace()
-
-        self.get_log()
-        self.focusedLog.scrollToItem(self.focusedLog.item(row, column))
+        self.general_model.refresh(ids)
+        self.focused_model.refresh(ids)
 
     def dummy(self):
         """the dummy"""
@@ -535,8 +339,8 @@ class LogWindow(QDockWidget):
 
         Parameters
         ----------
-        clicked_cell: QTableWidgetItem
-        The cell that was clicked.
+        clicked_cell: QPoint
+        Where the table was clicked.
 
         Returns
         -------
@@ -544,10 +348,9 @@ class LogWindow(QDockWidget):
         """
 
         logger.debug("Opening EditContact dialog")
-        item = self.focusedLog.itemAt(clicked_cell)
-        if item:
-            uuid = self.focusedLog.item(item.row(), self.get_column("UUID")).text()
-            self.edit_contact(uuid)
+        index = self.focusedLog.indexAt(clicked_cell)
+        if index.isValid():
+            self.edit_contact(self.focused_model.contact(index.row())["ID"])
 
     def edit_contact_selected(self, clicked_cell) -> None:
         """
@@ -555,18 +358,17 @@ class LogWindow(QDockWidget):
 
         Parameters
         ----------
-        clicked_cell: QTableWidgetItem
-        The cell that was clicked.
+        clicked_cell: QPoint
+        Where the table was clicked.
 
         Returns
         -------
         None
         """
         logger.debug("Opening EditContact dialog")
-        item = self.generalLog.itemAt(clicked_cell)
-        if item:
-            uuid = self.generalLog.item(item.row(), self.get_column("UUID")).text()
-            self.edit_contact(uuid)
+        index = self.generalLog.indexAt(clicked_cell)
+        if index.isValid():
+            self.edit_contact(self.general_model.contact(index.row())["ID"])
 
     def edit_contact(self, uuid) -> None:
         """
@@ -684,7 +486,7 @@ class LogWindow(QDockWidget):
         self.contact["MiscText"] = self.edit_contact_dialog.misc.text()
         self.contact["RoverLocation"] = self.edit_contact_dialog.rover_qth.text()
         self.database.change_contact(self.contact)
-        self.get_log()
+        self.refresh_contacts([self.contact.get("ID", "")])
         cmd = self.contact.copy()
         cmd["cmd"] = "CONTACTCHANGED"
         self.message.emit(cmd)
@@ -711,7 +513,8 @@ class LogWindow(QDockWidget):
             self.n1mm.contactdelete["ID"] = self.contact.get("ID", "")
             self.n1mm.send_contact_delete()
         self.edit_contact_dialog.close()
-        self.get_log()
+        for model in (self.general_model, self.focused_model):
+            model.remove_contacts([self.contact.get("ID", "")])
         cmd = {}
         cmd["cmd"] = "DELETED"
         cmd["ID"] = self.contact.get("ID", "")
@@ -720,7 +523,8 @@ class LogWindow(QDockWidget):
 
     def get_log(self) -> None:
         """
-        Get Log, Show it.
+        Get Log, Show it. Only the contact order is read here, the rows are
+        read a page at a time as they are scrolled into view.
 
         Parameters
         ----------
@@ -730,175 +534,41 @@ class LogWindow(QDockWidget):
         -------
         None
         """
+        logger.debug("Getting Log")
+        self.general_model.load(self.database)
+        self.focused_model.load(self.database)
+        self.generalLog.resizeColumnsToContents()
 
-        # The horizontal flags are:
-
-        # Constant	Value	Description
-        # Qt::AlignLeft	0x0001	Aligns with the left edge.
-        # Qt::AlignRight	0x0002	Aligns with the right edge.
-        # Qt::AlignHCenter	0x0004	Centers horizontally in the available space.
-        # Qt::AlignJustify	0x0008	Justifies the text in the available space.
-
-        # The vertical flags are:
-
-        # Constant	Value	Description
-        # Qt::AlignTop	0x0020	Aligns with the top.
-        # Qt::AlignBottom	0x0040	Aligns with the bottom.
-        # Qt::AlignVCenter	0x0080	Centers vertically in the available space.
-        # Qt::AlignBaseline	0x0100	Aligns with the baseline.
+    def apply_delta(self, delta: dict) -> None:
+        """
+        Show the contacts added, changed or removed by a logging change,
+        the rest of the log is left as it is. A newly logged contact is
+        scrolled into view.
 
-        logger.debug("Getting Log")
-        self.generalLog.blockSignals(True)
-        self.focusedLog.blockSignals(True)
-        current_log = self.database.fetch_all_contacts_asc()
-        self.generalLog.setRowCount(0)
-        for log_item in current_log:
-            number_of_rows = self.generalLog.rowCount()
-            self.generalLog.insertRow(number_of_rows)
-            time_stamp = log_item.get("TS", "YY-MM-DD HH:MM:SS")
-            first_item = QtWidgets.QTableWidgetItem(time_stamp)
-            self.generalLog.setItem(
-                number_of_rows, self.get_column("YYYY-MM-DD HH:MM:SS"), first_item
-            )
-            self.generalLog.setCurrentItem(
-                first_item, QItemSelectionModel.SelectionFlag.NoUpdate
-            )
-            self.generalLog.item(
-                number_of_rows, self.get_column("YYYY-MM-DD HH:MM:SS")
-            ).setTextAlignment(0x0004 | 0x0080)
-
-            self.generalLog.setItem(
-                number_of_rows,
-                self.get_column("Call"),
-                QtWidgets.QTableWidgetItem(str(log_item.get("Call", ""))),
-            )
-            freq = log_item.get("Freq", "")
-            try:
-                widget = QtWidgets.QTableWidgetItem(str(round(float(freq), 2)))
-            except ValueError:
-                widget = QtWidgets.QTableWidgetItem(str(round(0.0, 2)))
-            self.generalLog.setItem(
-                number_of_rows,
-                self.get_column("Freq (KHz)"),
-                widget,
-            )
-            self.generalLog.setItem(
-                number_of_rows,
-                self.get_column("Mode"),
-                QtWidgets.QTableWidgetItem(str(log_item.get("Mode", ""))),
-            )
-            self.generalLog.setItem(
-                number_of_rows,
-                self.get_column("Snt"),
-                QtWidgets.QTableWidgetItem(str(log_item.get("SNT", ""))),
-            )
-            self.generalLog.setItem(
-                number_of_rows,
-                self.get_column("Rcv"),
-                QtWidgets.QTableWidgetItem(str(log_item.get("RCV", ""))),
-            )
-            self.generalLog.setItem(
-                number_of_rows,
-                self.get_column("SentNr"),
-                QtWidgets.QTableWidgetItem(str(log_item.get("SentNr", ""))),
-            )
-            self.generalLog.setItem(
-                number_of_rows,
-                self.get_column("RcvNr"),
-                QtWidgets.QTableWidgetItem(str(log_item.get("NR", ""))),
-            )
-            self.generalLog.setItem(
-                number_of_rows,
-                self.get_column("Exchange1"),
-                QtWidgets.QTableWidgetItem(str(log_item.get("Exchange1", ""))),
-            )
-            self.generalLog.setItem(
-                number_of_rows,
-                self.get_column("CK"),
-                QtWidgets.QTableWidgetItem(str(log_item.get("CK", ""))),
-            )
-            self.generalLog.setItem(
-                number_of_rows,
-                self.get_column("Prec"),
-                QtWidgets.QTableWidgetItem(str(log_item.get("Prec", ""))),
-            )
-            self.generalLog.setItem(
-                number_of_rows,
-                self.get_column("Sect"),
-                QtWidgets.QTableWidgetItem(str(log_item.get("Sect", ""))),
-            )
-            self.generalLog.setItem(
-                number_of_rows,
-                self.get_column("WPX"),
-                QtWidgets.QTableWidgetItem(str(log_item.get("WPXPrefix", ""))),
-            )
-            self.generalLog.setItem(
-                number_of_rows,
-                self.get_column("Power"),
-                QtWidgets.QTableWidgetItem(str(log_item.get("Power", ""))),
-            )
-            item = QtWidgets.QTableWidgetItem()
-            if log_item.get("IsMultiplier1", False):
-                item.setIcon(self.checkicon)
-            self.generalLog.setItem(
-                number_of_rows,
-                self.get_column("M1"),
-                item,
-            )
-            self.generalLog.setItem(
-                number_of_rows,
-                self.get_column("ZN"),
-                QtWidgets.QTableWidgetItem(str(log_item.get("ZN", ""))),
-            )
-            item = QtWidgets.QTableWidgetItem()
-            if log_item.get("IsMultiplier2", False):
-                item.setIcon(self.checkicon)
-            self.generalLog.setItem(
-                number_of_rows,
-                self.get_column("M2"),
-                item,
-            )
-            self.generalLog.setItem(
-                number_of_rows,
-                self.get_column("PFX"),
-                QtWidgets.QTableWidgetItem(str(log_item.get("CountryPrefix", ""))),
-            )
-            self.generalLog.setItem(
-                number_of_rows,
-                self.get_column("PTS"),
-                QtWidgets.QTableWidgetItem(str(log_item.get("Points", ""))),
-            )
-            self.generalLog.setItem(
-                number_of_rows,
-                self.get_column("Name"),
-                QtWidgets.QTableWidgetItem(str(log_item.get("Name", ""))),
-            )
-            self.generalLog.setItem(
-                number_of_rows,
-                self.get_column("Comment"),
-                QtWidgets.QTableWidgetItem(str(log_item.get("Comment", ""))),
-            )
-            self.generalLog.setItem(
-                number_of_rows,
-                self.get_column("UUID"),
-                QtWidgets.QTableWidgetItem(str(log_item.get("ID", ""))),
-            )
-            self.generalLog.setItem(
-                number_of_rows,
-                self.get_column("Operator"),
-                QtWidgets.QTableWidgetItem(str(log_item.get("Operator", ""))),
-            )
+        Parameters
+        ----------
+        delta: dict
+        The contest state delta, see ContestState
 
-        self.generalLog.resizeColumnsToContents()
-        self.generalLog.resizeRowsToContents()
-        self.focusedLog.resizeColumnsToContents()
-        self.focusedLog.resizeRowsToContents()
-        self.generalLog.blockSignals(False)
-        self.focusedLog.blockSignals(False)
+        Returns
+        -------
+        None
+        """
+        if delta.get("reset"):
+            self.get_log()
+            return
+        self.general_model.apply_delta(delta)
+        self.focused_model.apply_delta(delta)
+        added = delta.get("added", [])
+        if len(added) == 1 and not delta.get("removed"):
+            row = self.general_model.row_of(added[0]["ID"])
+            if row != -1:
+                self.generalLog.scrollTo(self.general_model.index(row, 0))
 
     def show_like_calls(self, call: str) -> None:
         """
-        Show all log entries that match call.
+        Show all log entries that match call. The worker thread does the
+        query, the entries are shown by like_calls_found.
 
         Parameters
         ----------
@@ -909,157 +579,48 @@ class LogWindow(QDockWidget):
         -------
         None.
         """
-        self.focusedLog.blockSignals(True)
+        self.keystroke_seq += 1
         if call == "":
-            self.focusedLog.setRowCount(0)
-            self.focusedLog.blockSignals(False)
+            self.worker.cancel("like")
+            self.focused_model.set_contacts([])
             return
-        lines = self.database.fetch_like_calls(call)
-        debug_line = f"{lines}"
-        logger.debug(debug_line)
-        self.focusedLog.setRowCount(0)
-        for log_item in lines:
-            number_of_rows = self.focusedLog.rowCount()
-            self.focusedLog.insertRow(number_of_rows)
-            time_stamp = log_item.get("TS", "YY-MM-DD HH:MM:SS")
-            first_item = QtWidgets.QTableWidgetItem(time_stamp)
-            self.focusedLog.setItem(
-                number_of_rows, self.get_column("YYYY-MM-DD HH:MM:SS"), first_item
-            )
-            self.focusedLog.setCurrentItem(
-                first_item, QItemSelectionModel.SelectionFlag.NoUpdate
-            )
-            try:
-                self.focusedLog.item(
-                    number_of_rows, self.get_column("YYYY-MM-DD HH:MM:SS")
-                ).setTextAlignment(0x0004 | 0x0080)
-            except AttributeError:
-                ...
-            self.focusedLog.setItem(
-                number_of_rows,
-                self.get_column("Call"),
-                QtWidgets.QTableWidgetItem(str(log_item.get("Call", ""))),
-            )
-            freq = log_item.get("Freq", "")
-            try:
-                widget = QtWidgets.QTableWidgetItem(str(round(float(freq), 2)))
-            except ValueError:
-                widget = QtWidgets.QTableWidgetItem(str(round(0.0, 2)))
-            self.focusedLog.setItem(
-                number_of_rows,
-                self.get_column("Freq (KHz)"),
-                widget,
-            )
-            self.focusedLog.setItem(
-                number_of_rows,
-                self.get_column("Mode"),
-                QtWidgets.QTableWidgetItem(str(log_item.get("Mode", ""))),
-            )
-            self.focusedLog.setItem(
-                number_of_rows,
-                self.get_column("Snt"),
-                QtWidgets.QTableWidgetItem(str(log_item.get("SNT", ""))),
-            )
-            self.focusedLog.setItem(
-                number_of_rows,
-                self.get_column("Rcv"),
-                QtWidgets.QTableWidgetItem(str(log_item.get("RCV", ""))),
-            )
+        self.worker.submit(
+            "like",
+            self.keystroke_seq,
+            self.fetch_like_calls,
+            self.dbname,
+            self.database.current_contest,
+            call,
+        )
 
-            self.focusedLog.setItem(
-                number_of_rows,
-                self.get_column("SentNr"),
-                QtWidgets.QTableWidgetItem(str(log_item.get("SentNr", ""))),
-            )
-            self.focusedLog.setItem(
-                number_of_rows,
-                self.get_column("RcvNr"),
-                QtWidgets.QTableWidgetItem(str(log_item.get("NR", ""))),
-            )
-            self.focusedLog.setItem(
-                number_of_rows,
-                self.get_column("Exchange1"),
-                QtWidgets.QTableWidgetItem(str(log_item.get("Exchange1", ""))),
-            )
-            self.focusedLog.setItem(
-                number_of_rows,
-                self.get_column("CK"),
-                QtWidgets.QTableWidgetItem(str(log_item.get("CK", ""))),
-            )
-            self.focusedLog.setItem(
-                number_of_rows,
-                self.get_column("Prec"),
-                QtWidgets.QTableWidgetItem(str(log_item.get("Prec", ""))),
-            )
-            self.focusedLog.setItem(
-                number_of_rows,
-                self.get_column("Sect"),
-                QtWidgets.QTableWidgetItem(str(log_item.get("Sect", ""))),
-            )
-            self.focusedLog.setItem(
-                number_of_rows,
-                self.get_column("WPX"),
-                QtWidgets.QTableWidgetItem(str(log_item.get("WPXPrefix", ""))),
-            )
-            self.focusedLog.setItem(
-                number_of_rows,
-                self.get_column("Power"),
-                QtWidgets.QTableWidgetItem(str(log_item.get("Power", ""))),
-            )
-            item = QtWidgets.QTableWidgetItem()
-            if log_item.get("IsMultiplier1", False):
-                item.setIcon(self.checkicon)
-            self.focusedLog.setItem(
-                number_of_rows,
-                self.get_column("M1"),
-                item,
-            )
-            self.focusedLog.setItem(
-                number_of_rows,
-                self.get_column("ZN"),
-                QtWidgets.QTableWidgetItem(str(log_item.get("ZN", ""))),
-            )
-            item = QtWidgets.QTableWidgetItem()
-            if log_item.get("IsMultiplier2", False):
-                item.setIcon(self.checkicon)
-            self.focusedLog.setItem(
-                number_of_rows,
-                self.get_column("M2"),
-                item,
-            )
-            self.focusedLog.setItem(
-                number_of_rows,
-                self.get_column("PFX"),
-                QtWidgets.QTableWidgetItem(str(log_item.get("CountryPrefix", ""))),
-            )
-            self.focusedLog.setItem(
-                number_of_rows,
-                self.get_column("PTS"),
-                QtWidgets.QTableWidgetItem(str(log_item.get("Points", ""))),
-            )
-            self.focusedLog.setItem(
-                number_of_rows,
-                self.get_column("Name"),
-                QtWidgets.QTableWidgetItem(str(log_item.get("Name", ""))),
-            )
-            self.focusedLog.setItem(
-                number_of_rows,
-                self.get_column("Comment"),
-                QtWidgets.QTableWidgetItem(str(log_item.get("Comment", ""))),
-            )
-            self.focusedLog.setItem(
-                number_of_rows,
-                self.get_column("UUID"),
-                QtWidgets.QTableWidgetItem(str(log_item.get("ID", ""))),
-            )
-            self.focusedLog.setItem(
-                number_of_rows,
-                self.get_column("Operator"),
-                QtWidgets.QTableWidgetItem(str(log_item.get("Operator", ""))),
-            )
+    def fetch_like_calls(self, dbname, contest: int, call: str) -> list:
+        """Log entries like call. Runs on the worker thread."""
+        database = self.worker.database(dbname, fsutils.APP_DATA_PATH, contest)
+        return database.fetch_like_calls(call)
+
+    def like_calls_found(self, stage: str, seq: int, lines: list) -> None:
+        """
+        Fill the focused log with the entries the worker found, unless the
+        call has changed since.
+
+        Parameters
+        ----------
+        stage : str
+        The worker stage, "like"
+        seq : int
+        The keystroke the entries are for
+        lines : list
+        The matching log entries
+
+        Returns
+        -------
+        None.
+        """
+        if not self.worker.accept(stage, seq):
+            return
+        self.focused_model.set_contacts(lines)
         self.focusedLog.resizeColumnsToContents()
         self.focusedLog.resizeRowsToContents()
-        self.focusedLog.blockSignals(False)
 
     def show_message_box(self, message: str) -> None:
         """
@@ -8,53 +8,217 @@ Purpose: Lookup callsigns with online services.
 """
 
 import logging
+import threading
+import time
 
-from PyQt6.QtCore import pyqtSignal
-from PyQt6.QtWidgets import QDockWidget
+import requests
+import xmltodict
+from PyQt6.QtCore import QObject, QThread, pyqtSignal
+from PyQt6.QtWidgets import QApplication, QDockWidget
 
-from not1mm.lib.lookup import HamQTH, QRZlookup
+from not1mm import fsutils
+from not1mm.lib.lookup import HAMQTH_URL, QRZ_URL, HamQTH, QRZlookup
+from not1mm.lib.lookup_cache import LookupCache
 from not1mm.lib.preferences import Preferences
 
 logger = logging.getLogger(__name__)
 
+RESULT_FIELDS = ("grid", "name", "fname", "nickname")
+
+
+def cacheable(result: dict) -> bool:
+    """True for an answer worth keeping, not an error or an empty record."""
+    if not isinstance(result, dict) or result.get("error") or result.get("error_text"):
+        return False
+    return any(result.get(field) for field in RESULT_FIELDS)
+
+
+class LookupWorker(QObject):
+    """
+    Does the lookups on its own thread, so a slow or unreachable provider
+    never holds up the entry window.
+
+    Only the latest call asked for is kept waiting: calls typed over before
+    their turn came are dropped, and asking again for the call being looked
+    up joins that lookup, dropping any call asked for since.
+    """
+
+    result = pyqtSignal(str, dict)
+
+    def __init__(self, cache_path=None) -> None:
+        super().__init__()
+        self.cache_path = cache_path
+        self.cache = None
+        self.provider = None
+        self.provider_name = ""
+        self.http = None
+        self.lock = threading.Lock()
+        self.wanted = None
+        self.in_flight = None
+        self.stats = {
+            "requested": 0,
+            "coalesced": 0,
+            "dropped": 0,
+            "hits": 0,
+            "misses": 0,
+            "uncached": 0,
+            "lookup_ms": 0.0,
+        }
+
+    def request(self, call: str) -> bool:
+        """
+        Queue call, from any thread. Returns False when call is already
+        being looked up and no work needs scheduling.
+        """
+        with self.lock:
+            self.stats["requested"] += 1
+            if call == self.in_flight:
+                # The lookup under way answers it, anything typed since is
+                # stale.
+                if self.wanted is not None:
+                    self.stats["dropped"] += 1
+                self.wanted = None
+                self.stats["coalesced"] += 1
+                return False
+            if call == self.wanted:
+                self.stats["coalesced"] += 1
+                return False
+            if self.wanted is not None:
+                self.stats["dropped"] += 1
+            self.wanted = call
+            return True
+
+    def configure(self, settings: dict) -> None:
+        """(Re)create the provider from the lookup settings."""
+        if self.http is None:
+            self.http = requests.Session()
+        self.provider = None
+        self.provider_name = ""
+        username = settings.get("lookupusername", "")
+        password = settings.get("lookuppassword", "")
+        try:
+            if settings.get("useqrz"):
+                self.provider = QRZlookup(
+                    username,
+                    password,
+                    url=settings.get("qrzurl") or QRZ_URL,
+                    session=self.http,
+                )
+                self.provider_name = "qrz"
+            elif settings.get("usehamqth"):
+                self.provider = HamQTH(
+                    username,
+                    password,
+                    url=settings.get("hamqthurl") or HAMQTH_URL,
+                    session=self.http,
+                )
+                self.provider_name = "hamqth"
+        except requests.exceptions.RequestException as exception:
+            logger.warning("lookup provider unavailable: %s", exception)
+        if self.provider and self.cache is None and self.cache_path is not None:
+            self.cache = LookupCache(self.cache_path)
+
+    def work(self) -> None:
+        """Look up the call waiting, if any, and emit the result."""
+        with self.lock:
+            call = self.wanted
+            self.wanted = None
+            if call is None:
+                return
+            self.in_flight = call
+        try:
+            result = self.lookup(call)
+        finally:
+            with self.lock:
+                self.in_flight = None
+        self.result.emit(call, result)
+
+    def lookup(self, call: str) -> dict:
+        """The cached answer for call, else the provider's."""
+        if self.provider is None:
+            return {}
+        if self.cache is not None:
+            cached = self.cache.get(self.provider_name, call)
+            if cached is not None:
+                self.stats["hits"] += 1
+                return cached
+        self.stats["misses"] += 1
+        start = time.perf_counter()
+        try:
+            result = self.provider.lookup(call)
+        except (
+            requests.exceptions.RequestException,
+            xmltodict.expat.ExpatError,
+        ) as exception:
+            logger.warning("lookup of %s failed: %s", call, exception)
+            result = {}
+        elapsed = (time.perf_counter() - start) * 1000
+        self.stats["lookup_ms"] += elapsed
+        if cacheable(result):
+            if self.cache is not None:
+                self.cache.put(self.provider_name, call, result)
+        else:
+            self.stats["uncached"] += 1
+        logger.debug("lookup %s %.0fms %s", call, elapsed, self.stats)
+        return result if isinstance(result, dict) else {}
+
 
 class LookupService(QDockWidget):
     """The Lookup Service class."""
 
     message = pyqtSignal(dict)
+    configure_requested = pyqtSignal(dict)
+    lookup_requested = pyqtSignal()
 
-    def __init__(self):
+    def __init__(self, cache_path=None):
         super().__init__()
         self._udpwatch = None
-        self.look_up = None
         self.settings = Preferences.data()
+        if cache_path is None:
+            cache_path = fsutils.USER_DATA_PATH / "lookup_cache.db"
+        self.worker_thread = QThread()
+        self.worker = LookupWorker(cache_path)
+        self.worker.moveToThread(self.worker_thread)
+        self.configure_requested.connect(self.worker.configure)
+        self.lookup_requested.connect(self.worker.work)
+        self.worker.result.connect(self.lookup_done)
+        self.worker_thread.start()
+        if QApplication.instance():
+            QApplication.instance().aboutToQuit.connect(self.stop)
         self.setup()
 
     def setup(self):
-        self.look_up = None
-        if self.settings.get("useqrz"):
-            self.look_up = QRZlookup(
-                self.settings.get("lookupusername", ""),
-                self.settings.get("lookuppassword", ""),
-            )
-        elif self.settings.get("usehamqth"):
-            self.look_up = HamQTH(
-                self.settings.get("lookupusername", ""),
-                self.settings.get("lookuppassword", ""),
-            )
+        """Have the worker pick up the lookup settings."""
+        self.configure_requested.emit(dict(self.settings))
+
+    def lookup_done(self, call: str, result: dict) -> None:
+        """Pass a finished lookup on to the main window."""
+        cmd = {}
+        cmd["cmd"] = "LOOKUP_RESPONSE"
+        cmd["call"] = call
+        cmd["result"] = result
+        self.message.emit(cmd)
+
+    def stop(self) -> None:
+        """Stop the worker thread."""
+        if self.worker_thread.isRunning():
+            self.worker_thread.quit()
+            # Long enough for a lookup under way to time out.
+            self.worker_thread.wait(11000)
 
     def msg_from_main(self, packet):
         """Process messages from the main window."""
         if packet.get("cmd", "") == "LOOKUP_CALL":
-            if self.look_up:
-                call = packet.get("call", "")
-                if call:
-                    result = self.look_up.lookup(call)
-                    cmd = {}
-                    cmd["cmd"] = "LOOKUP_RESPONSE"
-                    cmd["result"] = result
-                    self.message.emit(cmd)
+            if self.settings.get("useqrz") or self.settings.get("usehamqth"):
+                call = packet.get("call", "").strip().upper()
+                if call and self.worker.request(call):
+                    self.lookup_requested.emit()
             return
 
         if packet.get("cmd", "") == "REFRESH_LOOKUP":
+            self.settings = Preferences.data()
             self.setup()
+            return
+
+        if packet.get("cmd", "") == "HALT":
+            self.stop()
@@ -10,7 +10,14 @@ from pathlib import Path
 
 from PyQt6 import QtWidgets
 
-from not1mm.lib.plugin_common import gen_adif, imp_adif, get_points, online_score_xml
+from not1mm.lib.plugin_common import (
+    gen_adif,
+    imp_adif,
+    get_points,
+    online_score_xml,
+    FirstWorked,
+    recalculate_multipliers,
+)
 from not1mm.lib.version import __version__
 
 logger = logging.getLogger(__name__)
@@ -399,40 +406,23 @@ def cabrillo(self, file_encoding):
         return
 
 
-def recalculate_mults(self):
+def recalculate_mults(self, since=""):
     """Recalculates multipliers after change in logged qso."""
+    mycountry = ""
+    location = self.cty_lookup(self.station.get("Call", ""))
+    if location is not None:
+        item = location.get(next(iter(location)))
+        mycountry = item.get("primary_pfx", "")
+    # W/VE work DX countries, DX works W/VE states and provinces.
+    field = "CountryPrefix" if mycountry in ["K", "VE"] else "NR"
 
-    all_contacts = self.database.fetch_all_contacts_asc()
-
-    for contact in all_contacts:
-        time_stamp = contact.get("TS", "")
-        # entity = contact.get("CountryPrefix", "")
-        location = self.cty_lookup(self.station.get("Call", ""))
-        if location is not None:
-            item = location.get(next(iter(location)))
-            mycountry = item.get("primary_pfx", "")
-            if mycountry in ["K", "VE"]:
-                query = (
-                    f"select count(*) as prefix_count from dxlog where TS < '{time_stamp}' "
-                    f"and CountryPrefix='{contact.get('CountryPrefix','')}' "
-                    f"and ContestNR = {self.pref.get('contest', '1')} and points = 3;"
-                )
-            else:
-                query = (
-                    f"select count(*) as prefix_count from dxlog where TS < '{time_stamp}' "
-                    f"and NR='{contact.get('NR','')}' "
-                    f"and ContestNR = {self.pref.get('contest', '1')} and points = 3;"
-                )
-        result = self.database.exec_sql(query)
-        logger.debug("contact: %s", contact)
-        logger.debug("query: %s", query)
-        logger.debug("result: %s", result)
-        count = int(result.get("prefix_count", 1))
-        if count == 0 and contact.get("Points", 0) == 3:
-            contact["IsMultiplier1"] = 1
-        else:
-            contact["IsMultiplier1"] = 0
-        self.database.change_contact(contact)
+    def mult_key(contact):
+        if contact.get("Points", 0) == 3:
+            return contact.get(field, "")
+        return None
+
+    multipliers = (FirstWorked("IsMultiplier1", mult_key),)
+    return recalculate_multipliers(self, multipliers, since=since)
 
 
 def process_esm(self, new_focused_widget=None, with_enter=False):
@@ -9,7 +9,13 @@ from pathlib import Path
 
 from PyQt6 import QtWidgets
 
-from not1mm.lib.plugin_common import gen_adif, imp_adif, online_score_xml
+from not1mm.lib.plugin_common import (
+    gen_adif,
+    imp_adif,
+    online_score_xml,
+    FirstWorked,
+    recalculate_multipliers,
+)
 from not1mm.lib.version import __version__
 
 logger = logging.getLogger(__name__)
@@ -408,19 +414,14 @@ def cabrillo(self, file_encoding):
         return
 
 
-def recalculate_mults(self):
+multipliers = (
+    FirstWorked("IsMultiplier1", lambda contact: contact.get("Sect", "")),
+)
+
+
+def recalculate_mults(self, since=""):
     """Recalculates multipliers after change in logged qso."""
-    all_contacts = self.database.fetch_all_contacts_asc()
-    for contact in all_contacts:
-        time_stamp = contact.get("TS", "")
-        sec = contact.get("Sect", "")
-        result = self.database.fetch_sect_exists_before_me(sec, time_stamp)
-        sect_count = result.get("sect_count", 1)
-        if sect_count == 0:
-            contact["IsMultiplier1"] = 1
-        else:
-            contact["IsMultiplier1"] = 0
-        self.database.change_contact(contact)
+    return recalculate_multipliers(self, multipliers, since=since)
 
 
 def parse_exchange(self):
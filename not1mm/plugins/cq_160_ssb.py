@@ -10,7 +10,12 @@ from pathlib import Path
 
 from PyQt6 import QtWidgets
 
-from not1mm.lib.plugin_common import gen_adif, imp_adif
+from not1mm.lib.plugin_common import (
+    gen_adif,
+    imp_adif,
+    FirstWorked,
+    recalculate_multipliers,
+)
 from not1mm.lib.version import __version__
 
 logger = logging.getLogger(__name__)
@@ -416,37 +421,20 @@ def trigger_update(self):
         self.log_window.msg_from_main(cmd)
 
 
-def recalculate_mults(self):
+def _mult_key(contact: dict) -> tuple:
+    """W/VE count each state/province once, everyone else each country."""
+    dxcc = contact.get("CountryPrefix", "")
+    if dxcc in ("K", "VE"):
+        return (dxcc, contact.get("Exchange1", ""))
+    return (dxcc, None)
+
+
+multipliers = (FirstWorked("IsMultiplier1", _mult_key),)
+
+
+def recalculate_mults(self, since=""):
     """Recalculates multipliers after change in logged qso."""
-    all_contacts = self.database.fetch_all_contacts_asc()
-    for contact in all_contacts:
-        time_stamp = contact.get("TS", "")
-        if contact.get("CountryPrefix", "") == "K":
-            query = f"select count(*) as count from dxlog where TS < '{time_stamp}' and CountryPrefix = 'K' and Exchange1 = '{contact.get('Exchange1', '')}' and ContestNR = '{self.pref.get('contest', '0')}'"
-            result = self.database.exec_sql(query)
-            if result.get("count", 0) == 0:
-                contact["IsMultiplier1"] = 1
-            else:
-                contact["IsMultiplier1"] = 0
-            self.database.change_contact(contact)
-            continue
-        if contact.get("CountryPrefix", "") == "VE":
-            query = f"select count(*) as count from dxlog where TS < '{time_stamp}' and CountryPrefix = 'VE' and Exchange1 = '{contact.get('Exchange1', '')}' and ContestNR = '{self.pref.get('contest', '0')}'"
-            result = self.database.exec_sql(query)
-            if result.get("count", 0) == 0:
-                contact["IsMultiplier1"] = 1
-            else:
-                contact["IsMultiplier1"] = 0
-            self.database.change_contact(contact)
-            continue
-        query = f"select count(*) as count from dxlog where TS < '{time_stamp}' and CountryPrefix = '{contact.get('CountryPrefix', '')}' and ContestNR = '{self.pref.get('contest', '0')}'"
-        result = self.database.exec_sql(query)
-        if result.get("count", 0) == 0:
-            contact["IsMultiplier1"] = 1
-        else:
-            contact["IsMultiplier1"] = 0
-        self.database.change_contact(contact)
-    trigger_update(self)
+    return recalculate_multipliers(self, multipliers, since=since)
 
 
 def process_esm(self, new_focused_widget=None, with_enter=False):
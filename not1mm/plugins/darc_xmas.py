@@ -32,7 +32,14 @@ from pathlib import Path
 
 from PyQt6 import QtWidgets
 
-from not1mm.lib.plugin_common import gen_adif, imp_adif, get_points, online_score_xml
+from not1mm.lib.plugin_common import (
+    gen_adif,
+    imp_adif,
+    get_points,
+    online_score_xml,
+    FirstWorked,
+    recalculate_multipliers,
+)
 from not1mm.lib.version import __version__
 
 logger = logging.getLogger(__name__)
@@ -426,41 +433,25 @@ def cabrillo(self, file_encoding):
         return
 
 
-def recalculate_mults(self):
-    """Recalculates multipliers after change in logged qso."""
+multipliers = (
+    FirstWorked("IsMultiplier1", lambda contact: contact.get("WPXPrefix", "")),
+    FirstWorked(
+        "IsMultiplier2",
+        lambda contact: (contact.get("NR", ""), contact.get("Band", "")),
+        lambda contact: (
+            (str(contact.get("NR", "")).upper(), contact.get("Band", ""))
+            if contact.get("CountryPrefix", "") == "DL"
+            and not isinstance(contact.get("NR", ""), int)
+            and str(contact.get("NR", "")).upper() != "NM"
+            else None
+        ),
+    ),
+)
 
-    all_contacts = self.database.fetch_all_contacts_asc()
-    for contact in all_contacts:
-
-        contact["IsMultiplier1"] = 0
-        contact["IsMultiplier2"] = 0
-
-        time_stamp = contact.get("TS", "")
-        dok = contact.get("NR", "")
-        dxcc = contact.get("CountryPrefix", "")
-        band = contact.get("Band", "")
-        wpx = contact.get("WPXPrefix", "")
-        result = self.database.fetch_wpx_exists_before_me(wpx, time_stamp)
-        wpx_count = result.get("wpx_count", 1)
-        if wpx_count == 0:
-            contact["IsMultiplier1"] = 1
-        else:
-            contact["IsMultiplier1"] = 0
-
-        if dxcc == "DL" and not isinstance(dok, int) and dok.upper() != "NM":
-            query = (
-                f"select count(*) as dok_count from dxlog where  TS < '{time_stamp}' "
-                f"and NR = '{dok.upper()}' "
-                f"and Band = '{band}' "
-                f"and ContestNR = {self.pref.get('contest', '1')};"
-            )
-            result = self.database.exec_sql(query)
-            count = int(result.get("dok_count", 0))
-            if count == 0:
-                contact["IsMultiplier2"] = 1
-            else:
-                contact["IsMultiplier2"] = 0
-        self.database.change_contact(contact)
+
+def recalculate_mults(self, since=""):
+    """Recalculates multipliers after change in logged qso."""
+    return recalculate_multipliers(self, multipliers, since=since)
 
 
 def process_esm(self, new_focused_widget=None, with_enter=False):
@@ -42,17 +42,18 @@ advance_on_space = [True, True, True, True, True]
 # 5 Contest specific dupe check.
 dupe_type = 5
 
+# constant to split the contest - correct ES Open Contest length is 4 hours
+CONTEST_LENGTH_IN_MINUTES = 60
+SPLIT_CONTEST_BY_MINUTES = 15
+
 
 def specific_contest_check_dupe(self, call):
     """"""
     # get mode from radio state
     mode = self.radio_state.get("mode", "")
     """Dupe checking specific to just this contest."""
-    # constant to split the contest - correct ES Open Contest length is 4 hours
-    contest_length_in_minutes = 60
-    split_contest_by_minutes = 15
 
-    period_count = int(contest_length_in_minutes / split_contest_by_minutes)
+    period_count = int(CONTEST_LENGTH_IN_MINUTES / SPLIT_CONTEST_BY_MINUTES)
 
     # think about generic solution by splitting the contest to n different periods
     start_date_init = self.contest_settings.get("StartDate", "")
@@ -61,7 +62,7 @@ def specific_contest_check_dupe(self, call):
     # Create time periods dynamically based on period count
     time_periods = []
     for i in range(period_count):
-        minutes_to_add = split_contest_by_minutes * (i + 1)
+        minutes_to_add = SPLIT_CONTEST_BY_MINUTES * (i + 1)
         time_period = start_date_init_date + timedelta(minutes=minutes_to_add)
         time_periods.append(time_period)
 
@@ -139,6 +140,25 @@ def specific_contest_check_dupe(self, call):
     )
 
 
+def dupe_key(self, contact):
+    """
+    Dupe key for the contest state: call, band and mode in the contest
+    period the contact was made in. None outside the periods, there
+    specific_contest_check_dupe decides.
+    """
+    try:
+        start = datetime.strptime(
+            self.contest_settings.get("StartDate", ""), "%Y-%m-%d %H:%M:%S"
+        )
+        logged = datetime.strptime(contact["TS"], "%Y-%m-%d %H:%M:%S")
+    except ValueError:
+        return None
+    period = (logged - start) // timedelta(minutes=SPLIT_CONTEST_BY_MINUTES)
+    if not 0 <= period < CONTEST_LENGTH_IN_MINUTES // SPLIT_CONTEST_BY_MINUTES:
+        return None
+    return (contact["Call"], contact["Band"], contact["Mode"], period)
+
+
 def init_contest(self):
     """setup plugin"""
     set_tab_next(self)
@@ -39,7 +39,14 @@ from pathlib import Path
 
 from PyQt6 import QtWidgets
 
-from not1mm.lib.plugin_common import gen_adif, imp_adif, get_points, online_score_xml
+from not1mm.lib.plugin_common import (
+    gen_adif,
+    imp_adif,
+    get_points,
+    online_score_xml,
+    FirstWorked,
+    recalculate_multipliers,
+)
 from not1mm.lib.version import __version__
 
 logger = logging.getLogger(__name__)
@@ -432,21 +439,14 @@ def cabrillo(self, file_encoding):
         return
 
 
-def recalculate_mults(self):
+multipliers = (
+    FirstWorked("IsMultiplier1", lambda contact: contact.get("CountryPrefix", "")),
+)
+
+
+def recalculate_mults(self, since=""):
     """Recalculates multipliers after change in logged qso."""
-    all_contacts = self.database.fetch_all_contacts_asc()
-    for contact in all_contacts:
-        self.contact = contact
-        contact["Points"] = points(self)
-        time_stamp = contact.get("TS", "")
-        dxcc = contact.get("CountryPrefix", "")
-        result = self.database.fetch_dxcc_exists_before_me(dxcc, time_stamp)
-        dxcc_count = result.get("dxcc_count", 1)
-        if dxcc_count == 0:
-            contact["IsMultiplier1"] = 1
-        else:
-            contact["IsMultiplier1"] = 0
-        self.database.change_contact(contact)
+    return recalculate_multipliers(self, multipliers, points=points, since=since)
 
 
 def process_esm(self, new_focused_widget=None, with_enter=False):
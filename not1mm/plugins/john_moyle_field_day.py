@@ -631,6 +631,24 @@ def specific_contest_check_dupe(self, call):
     return {"isdupe": False}
 
 
+def dupe_key(self, contact):
+    """
+    Dupe key for the contest state: call, band and mode group in the
+    3-hour block the contact was made in.
+    """
+    mode_group = _mode_group(contact["Mode"])
+    if mode_group == "OTHER":
+        return None
+    try:
+        logged = datetime.datetime.strptime(contact["TS"], "%Y-%m-%d %H:%M:%S")
+    except ValueError:
+        return None
+    block_start, block_end = _block_boundaries(logged)
+    if not block_start <= logged < block_end:
+        return None
+    return (contact["Call"], contact["Band"], mode_group, block_start)
+
+
 def process_esm(self, new_focused_widget=None, with_enter=False):
     """ESM State Machine"""
 
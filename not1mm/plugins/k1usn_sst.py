@@ -28,7 +28,14 @@ from pathlib import Path
 
 from PyQt6 import QtWidgets
 
-from not1mm.lib.plugin_common import gen_adif, imp_adif, get_points, online_score_xml
+from not1mm.lib.plugin_common import (
+    gen_adif,
+    imp_adif,
+    get_points,
+    online_score_xml,
+    FirstWorked,
+    recalculate_multipliers,
+)
 from not1mm.lib.version import __version__
 
 logger = logging.getLogger(__name__)
@@ -374,31 +381,22 @@ def cabrillo(self, file_encoding):
         return
 
 
-def recalculate_mults(self):
-    """Recalculates multipliers after change in logged qso."""
+multipliers = (
+    FirstWorked(
+        "IsMultiplier1",
+        lambda contact: (contact.get("Sect", ""), contact.get("Band", "")),
+        lambda contact: (
+            (contact.get("Sect", ""), contact.get("Band", ""))
+            if contact.get("Points", 0) == 1 and contact.get("Sect", "") != "DX"
+            else None
+        ),
+    ),
+)
 
-    all_contacts = self.database.fetch_all_contacts_asc()
-    for contact in all_contacts:
-        time_stamp = contact.get("TS", "")
-        sect = contact.get("Sect", "")
-        band = contact.get("Band", "")
-        query = (
-            f"select count(*) as sect_count from dxlog where  TS < '{time_stamp}' "
-            f"and Sect = '{sect}' "
-            f"and Band = '{band}' "
-            f"and ContestNR = {self.pref.get('contest', '1')};"
-        )
-        result = self.database.exec_sql(query)
-        count = result.get("sect_count", 1)
-        if count == 0 and contact.get("Points", 0) == 1 and sect != "DX":
-            contact["IsMultiplier1"] = 1
-        else:
-            contact["IsMultiplier1"] = 0
-        self.database.change_contact(contact)
-        cmd = {}
-        cmd["cmd"] = "UPDATELOG"
-        if self.log_window:
-            self.log_window.msg_from_main(cmd)
+
+def recalculate_mults(self, since=""):
+    """Recalculates multipliers after change in logged qso."""
+    return recalculate_multipliers(self, multipliers, since=since)
 
 
 def process_esm(self, new_focused_widget=None, with_enter=False):
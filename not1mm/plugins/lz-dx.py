@@ -38,7 +38,14 @@ from pathlib import Path
 
 from PyQt6 import QtWidgets
 
-from not1mm.lib.plugin_common import gen_adif, get_points, imp_adif, online_score_xml
+from not1mm.lib.plugin_common import (
+    gen_adif,
+    get_points,
+    imp_adif,
+    online_score_xml,
+    FirstWorked,
+    recalculate_multipliers,
+)
 from not1mm.lib.version import __version__
 
 assert online_score_xml
@@ -492,46 +499,32 @@ def calc_score(self):
     return 0
 
 
-def recalculate_mults(self):
+multipliers = (
+    FirstWorked(
+        "IsMultiplier1",
+        lambda contact: (contact.get("NR", ""), contact.get("Band", "")),
+        lambda contact: (
+            (str(contact.get("NR", "")).upper(), contact.get("Band", ""))
+            if contact.get("CountryPrefix", "") == "LZ"
+            and str(contact.get("NR", "")).isalpha()
+            else None
+        ),
+    ),
+    FirstWorked(
+        "IsMultiplier2",
+        lambda contact: (contact.get("CountryPrefix", ""), contact.get("Band", "")),
+        lambda contact: (
+            (contact.get("CountryPrefix", ""), contact.get("Band", ""))
+            if contact.get("CountryPrefix", "")
+            else None
+        ),
+    ),
+)
+
+
+def recalculate_mults(self, since=""):
     """Recalculates multipliers after change in logged qso."""
-
-    all_contacts = self.database.fetch_all_contacts_asc()
-    for contact in all_contacts:
-        contact["IsMultiplier1"] = 0
-        contact["IsMultiplier2"] = 0
-
-        time_stamp = contact.get("TS", "")
-        canton = contact.get("NR", "")
-        dxcc = contact.get("CountryPrefix", "")
-        band = contact.get("Band", "")
-        if dxcc == "LZ" and canton.isalpha():
-            query = (
-                f"select count(*) as canton_count from dxlog where  TS < '{time_stamp}' "
-                f"and NR = '{canton.upper()}' "
-                f"and Band = '{band}' "
-                f"and ContestNR = {self.pref.get('contest', '1')};"
-            )
-            result = self.database.exec_sql(query)
-            count = int(result.get("canton_count", 0))
-            if count == 0:
-                contact["IsMultiplier1"] = 1
-
-        if dxcc:
-            query = (
-                f"select count(*) as dxcc_count from dxlog where TS < '{time_stamp}' "
-                f"and CountryPrefix = '{dxcc}' "
-                f"and Band = '{band}' "
-                f"and ContestNR = {self.pref.get('contest', '1')};"
-            )
-            result = self.database.exec_sql(query)
-            if not result.get("dxcc_count", ""):
-                contact["IsMultiplier2"] = 1
-
-        self.database.change_contact(contact)
-    cmd = {}
-    cmd["cmd"] = "UPDATELOG"
-    if self.log_window:
-        self.log_window.msg_from_main(cmd)
+    return recalculate_multipliers(self, multipliers, since=since)
 
 
 def populate_history_info_line(self):
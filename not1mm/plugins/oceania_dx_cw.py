@@ -36,7 +36,14 @@ from pathlib import Path
 
 from PyQt6 import QtWidgets
 
-from not1mm.lib.plugin_common import gen_adif, get_points, imp_adif, online_score_xml
+from not1mm.lib.plugin_common import (
+    gen_adif,
+    get_points,
+    imp_adif,
+    online_score_xml,
+    FirstWorked,
+    recalculate_multipliers,
+)
 from not1mm.lib.version import __version__
 
 logger = logging.getLogger(__name__)
@@ -422,28 +429,24 @@ def cabrillo(self, file_encoding):
         return
 
 
-def recalculate_mults(self):
-    """Recalculates multipliers after change in logged qso."""
-
-    all_contacts = self.database.fetch_all_contacts_asc()
-    for contact in all_contacts:
-        self.contact = contact
-
-        contact["Points"] = points(self)
-        time_stamp = contact.get("TS", "")
-        wpx = contact.get("WPXPrefix", "")
-        band = contact.get("Band", "")
+multipliers = (
+    FirstWorked(
+        "IsMultiplier1",
+        lambda contact: (contact.get("WPXPrefix", ""), contact.get("Band", "")),
+        lambda contact: (
+            (contact.get("WPXPrefix", ""), contact.get("Band", ""))
+            if contact.get("WPXPrefix", "")
+            and contact.get("Points", 0) > 0
+            and (my_continent == "OC" or contact.get("Continent", "") == "OC")
+            else None
+        ),
+    ),
+)
 
-        result = fetch_wpx_exists_before_me(self, wpx, time_stamp, band)
-        if wpx and contact["Points"] > 0 and result.get("wpx_count", 1) == 0:
-            contact["IsMultiplier1"] = 1
-        else:
-            contact["IsMultiplier1"] = 0
 
-        if my_continent != "OC" and self.contact.get("Continent", "") != "OC":
-            contact["IsMultiplier1"] = 0
-
-        self.database.change_contact(contact)
+def recalculate_mults(self, since=""):
+    """Recalculates multipliers after change in logged qso."""
+    return recalculate_multipliers(self, multipliers, points=points, since=since)
 
 
 def fetch_wpx_exists_before_me(self, wpx, time_stamp, band) -> dict:
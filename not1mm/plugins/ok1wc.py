@@ -15,7 +15,14 @@ from pathlib import Path
 
 from PyQt6 import QtWidgets
 
-from not1mm.lib.plugin_common import gen_adif, imp_adif, get_points, online_score_xml
+from not1mm.lib.plugin_common import (
+    gen_adif,
+    imp_adif,
+    get_points,
+    online_score_xml,
+    FirstWorked,
+    recalculate_multipliers,
+)
 from not1mm.lib.version import __version__
 
 logger = logging.getLogger(__name__)
@@ -374,22 +381,17 @@ def cabrillo(self, file_encoding):
         return
 
 
-def recalculate_mults(self):
+multipliers = (
+    FirstWorked(
+        "IsMultiplier1",
+        lambda contact: (contact.get("Band", ""), contact.get("Call", "")[-1:]),
+    ),
+)
+
+
+def recalculate_mults(self, since=""):
     """Recalculates multipliers after change in logged qso."""
-    all_contacts = self.database.fetch_all_contacts_asc()
-    for contact in all_contacts:
-        self.contact = contact
-        contact["Points"] = points(self)
-        time_stamp = contact.get("TS", "")
-        result = self.database.fetch_band_lastletter_exists_before_me(
-            self.contact.get("Band", ""), self.contact.get("Call", ""), time_stamp
-        )
-        count = result.get("count", 1)
-        if count == 0:
-            contact["IsMultiplier1"] = 1
-        else:
-            contact["IsMultiplier1"] = 0
-        self.database.change_contact(contact)
+    return recalculate_multipliers(self, multipliers, points=points, since=since)
 
 
 def process_esm(self, new_focused_widget=None, with_enter=False):
@@ -38,7 +38,13 @@ from pathlib import Path
 
 from PyQt6 import QtWidgets
 
-from not1mm.lib.plugin_common import gen_adif, imp_adif, get_points
+from not1mm.lib.plugin_common import (
+    gen_adif,
+    imp_adif,
+    get_points,
+    FirstWorked,
+    recalculate_multipliers,
+)
 
 from not1mm.lib.version import __version__
 
@@ -213,32 +219,18 @@ def calc_score(self):
     return 0
 
 
-def recalculate_mults(self):
-    """Recalculates multipliers after change in logged qso."""
-
-    all_contacts = self.database.fetch_all_contacts_asc()
-    for contact in all_contacts:
-
-        contact["IsMultiplier1"] = 0
+multipliers = (
+    FirstWorked(
+        "IsMultiplier1",
+        lambda contact: contact.get("Exchange1", ""),
+        lambda contact: contact.get("Exchange1", "").upper(),
+    ),
+)
 
-        time_stamp = contact.get("TS", "")
-        county = contact.get("Exchange1", "")
-        query = (
-            f"select count(*) as county_count from dxlog where  TS < '{time_stamp}' "
-            f"and Exchange1 = '{county.upper()}' "
-            f"and ContestNR = {self.pref.get('contest', '1')};"
-        )
-        result = self.database.exec_sql(query)
-        count = int(result.get("county_count", 0))
-        if count == 0:
-            contact["IsMultiplier1"] = 1
-
-        self.database.change_contact(contact)
 
-    cmd = {}
-    cmd["cmd"] = "UPDATELOG"
-    if self.log_window:
-        self.log_window.msg_from_main(cmd)
+def recalculate_mults(self, since=""):
+    """Recalculates multipliers after change in logged qso."""
+    return recalculate_multipliers(self, multipliers, since=since)
 
 
 def adif(self):
@@ -13,7 +13,12 @@ from pathlib import Path
 
 from PyQt6 import QtWidgets
 
-from not1mm.lib.plugin_common import gen_adif, get_points
+from not1mm.lib.plugin_common import (
+    gen_adif,
+    get_points,
+    FirstWorked,
+    recalculate_multipliers,
+)
 from not1mm.lib.version import __version__
 
 logger = logging.getLogger(__name__)
@@ -427,23 +432,21 @@ def cabrillo(self, file_encoding):
         return
 
 
-def recalculate_mults(self):
-    """Walk all contacts and flag the first occurrence of each locator-prefix+Band as a mult"""
-    all_contacts = self.database.fetch_all_contacts_asc()
-    seen = set()
-    for contact in all_contacts:
-        exch = contact.get("Exchange1", "")
-        band = contact.get("Band", "")
-        if len(exch) >= 4:
-            key = exch[:4].upper() + ":" + band
-            if key not in seen:
-                seen.add(key)
-                contact["IsMultiplier1"] = 1
-            else:
-                contact["IsMultiplier1"] = 0
-        else:
-            contact["IsMultiplier1"] = 0
-        self.database.change_contact(contact)
+multipliers = (
+    FirstWorked(
+        "IsMultiplier1",
+        lambda contact: (
+            (contact.get("Exchange1", "")[:4].upper(), contact.get("Band", ""))
+            if len(contact.get("Exchange1", "")) >= 4
+            else None
+        ),
+    ),
+)
+
+
+def recalculate_mults(self, since=""):
+    """Recalculates multipliers after change in logged qso."""
+    return recalculate_multipliers(self, multipliers, since=since)
 
 
 def _validate_field(widget, valid):
@@ -204,10 +204,7 @@ def prefill(self):
     """Fill SentNR"""
     sent_sxchange_setting = self.contest_settings.get("SentExchange", "")
     if sent_sxchange_setting.strip() == "#":
-        result = self.database.get_serial()
-        serial_nr = str(result.get("serial_nr", "1")).zfill(3)
-        if serial_nr == "None":
-            serial_nr = "001"
+        serial_nr = str(self.contest_state.next_serial()).zfill(3)
         if len(self.other_1.text()) == 0:
             self.other_1.setText(serial_nr)
     else:
@@ -4,8 +4,8 @@ Email: michael.bridak@gmail.com
 GPL V3
 """
 
-import datetime
 import logging
+import time
 
 from PyQt6.QtCore import QEventLoop, QObject, QThread, pyqtSignal
 
@@ -13,21 +13,26 @@ from not1mm.lib.cat_fake import FakeCAT
 from not1mm.lib.cat_flrig import FlrigCAT
 from not1mm.lib.cat_rigctld import RigctldCAT
 from not1mm.lib.cat_tci import TciCAT
+from not1mm.lib.radio_state import PollEngine
 
 logger = logging.getLogger("radio")
 
 
 class Radio(QObject):
-    """Radio class"""
+    """
+    Radio class
+
+    poll_callback carries only the fields of
+    {"vfoa": str, "mode": str, "bw": str, "online": bool}
+    that changed since the last emit, all of them on the first one.
+    """
 
     poll_callback = pyqtSignal(dict)
     vfoa = "14030000"
     mode = "CW"
     bw = "500"
-    delta = 500
-    poll_time = datetime.datetime.now(datetime.UTC) + datetime.timedelta(
-        milliseconds=delta
-    )
+    delta = 500  # ms between polls while the radio is idle
+    next_poll = 0.0
     time_to_quit = False
     online = False
     interface = None
@@ -51,6 +56,7 @@ class Radio(QObject):
         self.interface = interface
         self.host = host
         self.port = port
+        self.engine = PollEngine()
         logger.debug("Using %s: %s %d", interface, host, port)
 
         try:
@@ -76,46 +82,61 @@ class Radio(QObject):
             ...
 
     def run(self):
+        self.engine.idle_interval = self.delta
         while not self.time_to_quit:
-            if datetime.datetime.now(datetime.UTC) > self.poll_time:
-                self.poll_time = datetime.datetime.now(
-                    datetime.UTC
-                ) + datetime.timedelta(milliseconds=self.delta)
-                vfoa = self.cat.get_vfo()
-                self.online = False
-                if vfoa:
-                    if not vfoa.isnumeric():
-                        logger.debug(f"Bad VFOA data {vfoa=}")
-                        continue
-                    self.vfoa = vfoa
-                    self.online = True
-                mode = self.cat.get_mode()
-                if mode:
-                    self.mode = mode
-                    self.store_last_data_mode(mode)
-                    self.online = True
-                bw = self.cat.get_bw()
-                if bw:
-                    self.bw = bw
-                    self.online = True
-                try:
-                    self.poll_callback.emit(
-                        {
-                            "vfoa": self.vfoa,
-                            "mode": self.mode,
-                            "bw": self.bw,
-                            "online": self.cat.online,
-                        }
-                    )
-                except QEventLoop:
-                    ...
-            QThread.msleep(100)
+            remaining = self.next_poll - time.monotonic()
+            if remaining <= 0:
+                self.poll()
+                remaining = self.engine.interval / 1000
+                self.next_poll = time.monotonic() + remaining
+            # Short naps, so quitting and set_vfo() are noticed quickly.
+            QThread.msleep(max(1, min(int(remaining * 1000), 100)))
         # Backends owning their own threads (TCI) must be torn down here, or
         # the app hangs on exit. The others have no close() and no-op.
         close = getattr(self.cat, "close", None)
         if close is not None:
             close()
 
+    def poll(self) -> None:
+        """Read the radio and emit what changed."""
+        start = time.perf_counter()
+        vfoa, mode, bw = self.cat.get_state()
+        elapsed = time.perf_counter() - start
+        self.online = False
+        if vfoa:
+            if not vfoa.isnumeric():
+                logger.debug(f"Bad VFOA data {vfoa=}")
+                return
+            self.vfoa = vfoa
+            self.online = True
+        if mode:
+            self.mode = mode
+            self.store_last_data_mode(mode)
+            self.online = True
+        if bw:
+            self.bw = bw
+            self.online = True
+        delta = self.engine.update(
+            {
+                "vfoa": self.vfoa,
+                "mode": self.mode,
+                "bw": self.bw,
+                "online": self.cat.online,
+            },
+            elapsed,
+        )
+        if not delta:
+            return
+        logger.debug("radio %s %s", delta, self.engine.stats())
+        try:
+            self.poll_callback.emit(delta)
+        except QEventLoop:
+            ...
+
+    def stats(self) -> dict:
+        """Poll timings and counters, see PollEngine.stats()."""
+        return self.engine.stats()
+
     def store_last_data_mode(self, the_mode: str = ""):
         """if the last mode is a data mode, save it."""
         # QMX ['CW-U', 'CW-L', 'DIGI-U', 'DIGI-L']
@@ -174,13 +195,15 @@ class Radio(QObject):
         if self.cat:
             self.cat.set_vfo(vfo)
 
-        self.poll_time = datetime.datetime.now(datetime.UTC)
+        self.engine.wake()
+        self.next_poll = 0.0
 
     def set_mode(self, mode):
         self.mode = mode
         if self.cat:
             self.cat.set_mode(mode)
-        self.poll_time = datetime.datetime.now(datetime.UTC)
+        self.engine.wake()
+        self.next_poll = 0.0
 
     def get_modes(self):
         """get list of modes"""
@@ -16,6 +16,7 @@ from not1mm import fsutils
 from not1mm.lib.database import DataBase
 from not1mm.lib.i18n import load_ui
 from not1mm.lib.preferences import Preferences
+from not1mm.lib.rate_engine import RateEngine
 
 logger = logging.getLogger(__name__)
 
@@ -41,6 +42,8 @@ class RateWindow(QDockWidget):
         )
         self.database = DataBase(self.dbname, fsutils.APP_DATA_PATH)
         self.database.current_contest = self.pref.get("contest", 0)
+        self.rates = RateEngine()
+        self.rates_loaded = False
         load_ui(self, fsutils.APP_DATA_PATH / "ratewindow.ui")
         self.timer = QTimer()
         self.timer.timeout.connect(self.get_run_and_total_qs)
@@ -56,7 +59,18 @@ class RateWindow(QDockWidget):
             )
             self.database = DataBase(self.dbname, fsutils.APP_DATA_PATH)
             self.database.current_contest = self.pref.get("contest", 0)
-        if packet.get("cmd", "") in ("CONTACTCHANGED", "UPDATELOG", "DELETE"):
+            self.rates_loaded = False
+        if packet.get("cmd", "") in (
+            "CONTACTCHANGED",
+            "UPDATELOG",
+            "DELETE",
+            "DELETED",
+        ):
+            delta = packet.get("delta")
+            if self.rates_loaded and delta and not delta.get("reset"):
+                self.rates.apply_delta(delta)
+            else:
+                self.rates_loaded = False
             self.get_run_and_total_qs()
 
     def setActive(self, mode: bool):
@@ -76,81 +90,65 @@ class RateWindow(QDockWidget):
         """
         self.pref = Preferences.data()
 
+    def load_rates(self) -> None:
+        """Seed the rate engine from the log."""
+        self.load_pref()
+        self.database.current_contest = self.pref.get("contest", 0)
+        self.rates.load(self.database.fetch_rate_rows())
+        self.rates_loaded = True
+
+    @staticmethod
+    def per_hour(items: int, minutes: float) -> str:
+        """Contacts over a span of minutes as a Q/h label."""
+        try:
+            return f"{(60.0 / minutes) * items:.2f} Q/h"
+        except ZeroDivisionError:
+            return "--- Q/h"
+
     def get_run_and_total_qs(self):
         """get numbers"""
 
         if not self.active or not self.isVisible():
             return
+        if not self.rates_loaded:
+            self.load_rates()
+        now = datetime.datetime.now(datetime.UTC)
+
         # Get Q's in the 60 Minutes
-        query = f"select (julianday(MAX(ts)) -  julianday(MIN(ts))) * 24 * 60 as timespan, count(*) as items from (select * from dxlog where ContestNR = {self.database.current_contest} and datetime(TS) > datetime(current_timestamp, '-60 minutes'));"
-        result = self.database.exec_sql(query)
-        if result.get("items", 0) < 1:
+        items, timespan = self.rates.last_hour(now)
+        if items < 1:
             self.last_hour.setText("--- Q/h")
-        elif result.get("items", 0) == 1:
+        elif items == 1:
             self.last_hour.setText("1 Q/h")
         else:
-            try:
-                perhour = (60.0 / result.get("timespan", 60)) * result.get("items", 0)
-                self.last_hour.setText(str(f"{perhour:.2f} Q/h"))
-            except (ZeroDivisionError, TypeError):
-                ...
+            self.last_hour.setText(self.per_hour(items, timespan))
 
         # Get Q's per hour rate of the last 10 QSO's
-        query = f"SELECT (julianday(MAX(ts)) -  julianday(MIN(ts))) * 24 * 60 as timespan, count(*) as items FROM ( select * from DXLOG where ContestNR = {self.database.current_contest} ORDER by ts DESC limit 10);"
-        result = self.database.exec_sql(query)
-        if result.get("items", 0) < 10:
+        items, timespan = self.rates.last_n(10)
+        if items < 10:
             self.ten_last_qso.setText("--- Q/h")
         else:
-            try:
-                perhour = (60.0 / result.get("timespan", 60)) * result.get("items", 0)
-                self.ten_last_qso.setText(str(f"{perhour:.2f} Q/h"))
-            except (ZeroDivisionError, TypeError):
-                ...
+            self.ten_last_qso.setText(self.per_hour(items, timespan))
 
         # Get Q's per hour rate of the last 100 QSO's
-        query = f"SELECT (julianday(MAX(ts)) -  julianday(MIN(ts))) * 24 * 60 as timespan, count(*) as items FROM (select * from DXLOG where ContestNR = {self.database.current_contest} ORDER by ts DESC limit 100);"
-        result = self.database.exec_sql(query)
-        if result.get("items", 0) < 100:
+        items, timespan = self.rates.last_n(100)
+        if items < 100:
             self.hundred_last_qso.setText("--- Q/h")
         else:
-            try:
-                perhour = (60.0 / result.get("timespan", 60)) * result.get("items", 0)
-                self.hundred_last_qso.setText(str(f"{perhour:.2f} Q/h"))
-            except (ZeroDivisionError, TypeError):
-                ...
+            self.hundred_last_qso.setText(self.per_hour(items, timespan))
 
         # Get rate for the current hour
-        query = f"SELECT strftime('%Y-%m-%d %H:00:00','now') as limit_stamp, strftime('%H00','now') as current_hour, count(*) as items FROM DXLOG where ContestNR = {self.database.current_contest} and datetime(TS) > limit_stamp;"
-        result = self.database.exec_sql(query)
-
-        self.since_lasthour_label.setText(
-            f"Since {result.get('current_hour', '0000')}z:"
-        )
-        self.since_lasthour.setText(f"{result.get('items', '0')} QSO")
+        runs, totalqs = self.rates.current_hour(now)
+        self.since_lasthour_label.setText(f"Since {now.strftime('%H00')}z:")
+        self.since_lasthour.setText(f"{totalqs} QSO")
 
         # Get Run QSO's and S&P QSO's
-        query = f"select sum(IsRunQSO) as runs, count(*) as totalqs from dxlog where ContestNR = {self.database.current_contest};"
-        result = self.database.exec_sql(query)
-        if result.get("runs") is None:
-            result["runs"] = 0
-        try:
-            sandp = result.get("totalqs", 0) - result.get("runs", 0)
-            self.run_qso.setText(f"{result.get('runs', 0)}")
-            self.sandp_qso.setText(f"{sandp}")
-        except TypeError:
-            ...
+        self.run_qso.setText(f"{self.rates.run_count()}")
+        self.sandp_qso.setText(f"{self.rates.total() - self.rates.run_count()}")
 
         # Get runs for the current hour
-        query = f"SELECT strftime('%Y-%m-%d %H:00:00','now') as limit_stamp, sum(IsRunQSO) as runs, count(*) as totalqs FROM DXLOG where ContestNR = {self.database.current_contest} and datetime(TS) > limit_stamp;"
-        result = self.database.exec_sql(query)
-        if result.get("runs") is None:
-            result["runs"] = 0
-        try:
-            sandp = result.get("totalqs", 0) - result.get("runs", 0)
-            self.hour_run_qso.setText(f"{result.get('runs', 0)}")
-            self.hour_sandp_qso.setText(f"{sandp}")
-        except TypeError:
-            ...
+        self.hour_run_qso.setText(f"{runs}")
+        self.hour_sandp_qso.setText(f"{totalqs - runs}")
 
     def closeEvent(self, event) -> None:
         self.action.setChecked(False)
@@ -2,7 +2,7 @@ import logging
 import math
 import os
 
-from PyQt6.QtCore import Qt, QTimer, pyqtSignal
+from PyQt6.QtCore import Qt, QThread, QTimer, pyqtSignal
 from PyQt6.QtGui import (
     QBrush,
     QColor,
@@ -15,6 +15,7 @@ from PyQt6.QtGui import (
     QShowEvent,
 )
 from PyQt6.QtWidgets import (
+    QApplication,
     QDockWidget,
     QGraphicsPathItem,
     QGraphicsPixmapItem,
@@ -22,6 +23,7 @@ from PyQt6.QtWidgets import (
 )
 
 from not1mm import fsutils
+from not1mm.lib.azimuthal import MapProjector
 from not1mm.lib.i18n import load_ui
 from not1mm.lib.rot_interface import RotatorInterface
 
@@ -35,7 +37,9 @@ class RotatorWindow(QDockWidget):
     GLOBE_RADIUS: float = 100.0
     requestedAzimuthNeedle: QGraphicsPathItem | None = None
     antennaNeedle: QGraphicsPathItem | None = None
+    mapItem: QGraphicsPixmapItem | None = None
     rotatorwindow_closed = pyqtSignal()
+    project_requested = pyqtSignal(str, str, float, float, int, str)
 
     def __init__(self, action, host: str = "127.0.0.1", port: int = 4533):
         super().__init__()
@@ -62,6 +66,15 @@ class RotatorWindow(QDockWidget):
         )  # right-click
         self.stop_button.clicked.connect(self.stop)
         self.park_button.clicked.connect(lambda x: self.rotator.send_command("K"))
+        self.pending_maps: set = set()
+        self.projector_thread = QThread()
+        self.projector = MapProjector()
+        self.projector.moveToThread(self.projector_thread)
+        self.project_requested.connect(self.projector.project)
+        self.projector.projected.connect(self.map_projected)
+        self.projector_thread.start()
+        if QApplication.instance() is not None:
+            QApplication.instance().aboutToQuit.connect(self.stop_projector)
         self.redrawMap()
         self.rotator: RotatorInterface = RotatorInterface(self.host, self.port)
         self.antennaAzimuth, _ = self.rotator.get_position()
@@ -183,25 +196,31 @@ class RotatorWindow(QDockWidget):
         self.compassScene: QGraphicsScene = QGraphicsScene()
         self.compassView.setScene(self.compassScene)
         self.compassView.setStyleSheet("background-color: transparent;")
-        file = fsutils.APP_DATA_PATH / "map3.png"
-        source: QImage = QImage()
-        source.load(str(file))
         the_map: QImage = QImage(
             self.MAP_RESOLUTION, self.MAP_RESOLUTION, QImage.Format.Format_ARGB32
         )
         the_map.fill(QColor(0, 0, 0, 0))
-        lat, lon = self.gridtolatlon(self.mygrid)
 
-        if os.path.exists(f"{fsutils.USER_DATA_PATH}/{self.mygrid}v2.png"):
-            the_map.load(f"{fsutils.USER_DATA_PATH}/{self.mygrid}v2.png")
-        else:
-            the_map = self.equirectangular_to_azimuthal_equidistant(
-                source, lat, lon, output_size=self.MAP_RESOLUTION
+        cache = f"{fsutils.USER_DATA_PATH}/{self.mygrid}v2.png"
+        if os.path.exists(cache):
+            the_map.load(cache)
+        elif self.mygrid not in self.pending_maps:
+            # The empty globe is shown until the projector thread is done.
+            lat, lon = self.gridtolatlon(self.mygrid)
+            self.pending_maps.add(self.mygrid)
+            self.project_requested.emit(
+                self.mygrid,
+                str(fsutils.APP_DATA_PATH / "map3.png"),
+                lat,
+                lon,
+                self.MAP_RESOLUTION,
+                cache,
             )
 
         pixMapItem: QGraphicsPixmapItem | None = self.compassScene.addPixmap(
             QPixmap.fromImage(the_map)
         )
+        self.mapItem = pixMapItem
         if pixMapItem is None:
             logger.error("Unable to add pixmap to scene")
         else:
@@ -297,79 +316,23 @@ class RotatorWindow(QDockWidget):
         except IndexError:
             return 0.0, 0.0
 
-    def equirectangular_to_azimuthal_equidistant(
-        self,
-        source_img: QImage,
-        center_lat_deg: float,
-        center_lon_deg: float,
-        output_size: int = 600,
-    ) -> QImage:
-        """This does some super magic"""
-
-        width, height = source_img.width(), source_img.height()
-        dest_img: QImage = QImage(output_size, output_size, QImage.Format.Format_ARGB32)
-
-        # Convert center point to radians
-        lat0: float = math.radians(center_lat_deg)
-        lon0: float = math.radians(center_lon_deg)
-
-        sin_lat: float = math.sin(lat0)
-        cos_lat: float = math.cos(lat0)
-
-        R: float = output_size / 2
-        for y in range(output_size):
-            for x in range(output_size):
-                # Convert pixel coordinate to normalized cartesian coordinate in range [-1, 1]
-                dx = (x - R) / R
-                dy = (R - y) / R  # Invert Y axis to have +Y upwards
-
-                rho = math.sqrt(dx * dx + dy * dy)
-                if rho > 1.0:
-                    # Outside the projection circle
-                    dest_img.setPixelColor(x, y, QColor(0, 0, 0, 0))
-                    continue
-
-                c = (
-                    rho * math.pi
-                )  # scale rho to angular distance (c = great-circle distance)
-
-                if rho == 0:
-                    lat = lat0
-                    lon = lon0
-                else:
-                    sin_c = math.sin(c)
-                    cos_c = math.cos(c)
-
-                    lat = math.asin(cos_c * sin_lat + (dy * sin_c * cos_lat / rho))
-
-                    lon = lon0 + math.atan2(
-                        dx * sin_c,
-                        rho * cos_lat * cos_c - dy * sin_lat * sin_c,
-                    )
-
-                # Map lat/lon to source image pixel coordinates (equirectangular)
-                lon_deg = math.degrees(lon)
-                lat_deg = math.degrees(lat)
-
-                # Wrap longitude to [-180, 180]
-                if lon_deg < -180:
-                    lon_deg += 360
-                elif lon_deg > 180:
-                    lon_deg -= 360
-
-                # Map to source image coordinates
-                src_x = int(((lon_deg + 180.0) / 360.0) * width)
-                src_y = int(((90 - lat_deg) / 180.0) * height)
-
-                # Clamp coordinates
-                src_x = max(0, min(width - 1, src_x))
-                src_y = max(0, min(height - 1, src_y))
-
-                color = source_img.pixelColor(src_x, src_y)
-                dest_img.setPixelColor(x, y, color)
-
-        dest_img.save(f"{fsutils.USER_DATA_PATH}/{self.mygrid}v2.png", "PNG")
-        return dest_img
+    def map_projected(self, grid: str, the_map: QImage) -> None:
+        """
+        Swap the placeholder for the map the projector thread built. A null
+        map means it failed, the placeholder stays and the next redraw of
+        the grid tries again.
+        """
+        self.pending_maps.discard(grid)
+        if the_map.isNull():
+            return
+        if grid == self.mygrid and self.mapItem is not None:
+            self.mapItem.setPixmap(QPixmap.fromImage(the_map))
+
+    def stop_projector(self) -> None:
+        """Stop the projector thread."""
+        if self.projector_thread.isRunning():
+            self.projector_thread.quit()
+            self.projector_thread.wait(5000)
 
     def showEvent(self, event: QShowEvent) -> None:
         """Make the globe fit in the widget when widget is shown."""
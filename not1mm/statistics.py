@@ -2,16 +2,67 @@ import datetime
 import logging
 
 from PyQt6 import QtWidgets
-from PyQt6.QtCore import Qt, pyqtSignal
-from PyQt6.QtWidgets import QDockWidget, QTableWidgetItem
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt, pyqtSignal
+from PyQt6.QtWidgets import QDockWidget
 
 from not1mm import fsutils
+from not1mm.lib.contest_state import BandSummary
 from not1mm.lib.database import DataBase
 from not1mm.lib.i18n import load_ui
 from not1mm.lib.preferences import Preferences
 
 logger = logging.getLogger(__name__)
 
+HEADERS = ["BAND", "QSO", "CALLS", "CW", "PH", "DI", "WPX", "PTS"]
+
+
+class StatsModel(QAbstractTableModel):
+    """Table model over BandSummary rows."""
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self.table = []
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.table)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return str(self.table[index.row()][index.column()])
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return Qt.AlignmentFlag.AlignRight
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if (
+            role == Qt.ItemDataRole.DisplayRole
+            and orientation == Qt.Orientation.Horizontal
+        ):
+            return HEADERS[section]
+        return None
+
+    def set_rows(self, rows: list) -> None:
+        """
+        Show rows. When the bands are unchanged only the cells that differ
+        are signalled, otherwise the model is reset.
+        """
+        if [row[0] for row in rows] != [row[0] for row in self.table]:
+            self.beginResetModel()
+            self.table = rows
+            self.endResetModel()
+            return
+        old, self.table = self.table, rows
+        for row_number, (old_row, new_row) in enumerate(zip(old, rows)):
+            for column, (before, after) in enumerate(zip(old_row, new_row)):
+                if before != after:
+                    cell = self.index(row_number, column)
+                    self.dataChanged.emit(cell, cell, [Qt.ItemDataRole.DisplayRole])
+
 
 class StatsWindow(QDockWidget):
     """The stats window. Shows something important."""
@@ -34,7 +85,20 @@ class StatsWindow(QDockWidget):
         )
         self.database: DataBase = DataBase(self.dbname, fsutils.APP_DATA_PATH)
         self.database.current_contest = self.pref.get("contest", 0)
+        self.summary = BandSummary()
+        self.summary_loaded = False
         load_ui(self, fsutils.APP_DATA_PATH / "statistics.ui")
+        self.model = StatsModel(self)
+        self.tableView.setModel(self.model)
+        self.tableView.setAlternatingRowColors(True)
+        self.tableView.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        self.tableView.verticalHeader().setVisible(False)
+        self.tableView.setEditTriggers(
+            QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers
+        )
+        self.tableView.setSelectionMode(
+            QtWidgets.QAbstractItemView.SelectionMode.NoSelection
+        )
 
     def msg_from_main(self, packet):
         """Process messages from the main window."""
@@ -45,8 +109,21 @@ class StatsWindow(QDockWidget):
             )
             self.database: DataBase = DataBase(self.dbname, fsutils.APP_DATA_PATH)
             self.database.current_contest = self.pref.get("contest", 0)
+            self.summary_loaded = False
             self.get_run_and_total_qs()
 
+        if packet.get("cmd", "") in (
+            "CONTACTCHANGED",
+            "UPDATELOG",
+            "DELETE",
+            "DELETED",
+        ):
+            delta = packet.get("delta")
+            if self.summary_loaded and delta and not delta.get("reset"):
+                self.summary.apply_delta(delta)
+            else:
+                self.summary_loaded = False
+
         if self.active is False:
             return
 
@@ -80,120 +157,14 @@ class StatsWindow(QDockWidget):
         """get numbers"""
         if self.active is False:
             return
-        self.tableWidget.clear()
-        self.tableWidget.setAlternatingRowColors(True)
-        self.tableWidget.setFocusPolicy(Qt.FocusPolicy.NoFocus)
-        self.tableWidget.setColumnCount(8)
-        self.tableWidget.setHorizontalHeaderLabels(
-            ["BAND", "QSO", "CALLS", "CW", "PH", "DI", "WPX", "PTS"]
-        )
-        self.tableWidget.verticalHeader().setVisible(False)
-        self.tableWidget.setEditTriggers(
-            QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers
-        )
-        self.tableWidget.setSelectionMode(
-            QtWidgets.QAbstractItemView.SelectionMode.NoSelection
-        )
-        query = f"select DISTINCT(Band) as band from DXLOG where ContestNR = {self.database.current_contest} ORDER BY band DESC;"
-        result = self.database.exec_sql_mult(query)
-        self.tableWidget.setRowCount(len(result) + 1)
-        row = 0
-        for band in result:
-            query = f"select count(*) as qs, count(DISTINCT(WPXPrefix)) as wpx, count(DISTINCT(Call)) as calls, sum(Points) as points from DXLOG where ContestNR = {self.database.current_contest} and Band = '{band['band']}';"
-            result = self.database.exec_sql(query)
-            item: QTableWidgetItem = QTableWidgetItem(
-                str(band.get("band", "")).replace("None", "")
-            )
-            item.setTextAlignment(0x0002)
-            self.tableWidget.setItem(row, 0, item)
-            item: QTableWidgetItem = QTableWidgetItem(
-                str(result.get("qs", "0")).replace("None", "0")
-            )
-            item.setTextAlignment(0x0002)
-            self.tableWidget.setItem(row, 1, item)
-            item: QTableWidgetItem = QTableWidgetItem(
-                str(result.get("calls", "0")).replace("None", "0")
-            )
-            item.setTextAlignment(0x0002)
-            self.tableWidget.setItem(row, 2, item)
-            item: QTableWidgetItem = QTableWidgetItem(
-                str(result.get("points", "0")).replace("None", "0")
-            )
-            item.setTextAlignment(0x0002)
-            self.tableWidget.setItem(row, 7, item)
-
-            item: QTableWidgetItem = QTableWidgetItem(
-                str(result.get("wpx", "0")).replace("None", "0")
-            )
-            item.setTextAlignment(0x0002)
-            self.tableWidget.setItem(row, 6, item)
-
-            query: str = f"select sum(sortedmode.mode == 'CW') as CW, sum(sortedmode.mode == 'PH') as PH, sum(sortedmode.mode == 'DI') as DI from (select CASE WHEN Mode IN ('LSB','USB','SSB','FM','AM') THEN 'PH' WHEN Mode IN ('CW', 'CW-U', 'CW-L', 'CW-R', 'CWR') THEN 'CW' WHEN Mode IN ('FT8','FT4','RTTY','PSK31','FSK441','MSK144','JT65','JT9','Q65') THEN 'DI' ELSE 'OTHER' END mode from DXLOG where ContestNR = {self.database.current_contest} and Band = '{band['band']}') as sortedmode;"
-            result: dict = self.database.exec_sql(query)
-            item: QTableWidgetItem = QTableWidgetItem(
-                str(result.get("CW", "0")).replace("None", "0")
-            )
-            item.setTextAlignment(0x0002)
-            self.tableWidget.setItem(row, 3, item)
-            item: QTableWidgetItem = QTableWidgetItem(
-                str(result.get("PH", "0")).replace("None", "0")
-            )
-            item.setTextAlignment(0x0002)
-            self.tableWidget.setItem(row, 4, item)
-            item: QTableWidgetItem = QTableWidgetItem(
-                str(result.get("DI", "0")).replace("None", "0")
-            )
-            item.setTextAlignment(0x0002)
-            self.tableWidget.setItem(row, 5, item)
-
-            row += 1
-        query: str = f"select count(*) as qs, count(DISTINCT(Call)) as calls, count(DISTINCT(WPXPrefix || ':' || Band)) as wpx, sum(Points) as points from DXLOG where ContestNR = {self.database.current_contest};"
-        result: dict = self.database.exec_sql(query)
-        item: QTableWidgetItem = QTableWidgetItem("TOTAL")
-        item.setTextAlignment(0x0002)
-        self.tableWidget.setItem(row, 0, item)
-        item: QTableWidgetItem = QTableWidgetItem(
-            str(result.get("qs", "0")).replace("None", "0")
-        )
-        item.setTextAlignment(0x0002)
-        self.tableWidget.setItem(row, 1, item)
-        item: QTableWidgetItem = QTableWidgetItem(
-            str(result.get("calls", "0")).replace("None", "0")
-        )
-        item.setTextAlignment(0x0002)
-        self.tableWidget.setItem(row, 2, item)
-
-        item: QTableWidgetItem = QTableWidgetItem(
-            str(result.get("wpx", "0")).replace("None", "0")
-        )
-        item.setTextAlignment(0x0002)
-        self.tableWidget.setItem(row, 6, item)
-
-        item: QTableWidgetItem = QTableWidgetItem(
-            str(result.get("points", "0")).replace("None", "0")
-        )
-        item.setTextAlignment(0x0002)
-        self.tableWidget.setItem(row, 7, item)
-
-        query: str = f"select sum(sortedmode.mode == 'CW') as CW, sum(sortedmode.mode == 'PH') as PH, sum(sortedmode.mode == 'DI') as DI from (select CASE WHEN Mode IN ('LSB','USB','SSB','FM','AM') THEN 'PH' WHEN Mode IN ('CW', 'CW-U', 'CW-L', 'CW-R', 'CWR') THEN 'CW' WHEN Mode In ('FT8','FT4','RTTY','PSK31','FSK441','MSK144','JT65','JT9','Q65') THEN 'DI' ELSE 'OTHER' END mode from DXLOG where ContestNR = {self.database.current_contest}) as sortedmode;"
-        result: dict = self.database.exec_sql(query)
-        item: QTableWidgetItem = QTableWidgetItem(
-            str(result.get("CW", "0")).replace("None", "0")
-        )
-        item.setTextAlignment(0x0002)
-        self.tableWidget.setItem(row, 3, item)
-        item: QTableWidgetItem = QTableWidgetItem(
-            str(result.get("PH", "0")).replace("None", "0")
-        )
-        item.setTextAlignment(0x0002)
-        self.tableWidget.setItem(row, 4, item)
-        item: QTableWidgetItem = QTableWidgetItem(
-            str(result.get("DI", "0")).replace("None", "0")
-        )
-        item.setTextAlignment(0x0002)
-        self.tableWidget.setItem(row, 5, item)
-        self.tableWidget.resizeColumnsToContents()
-        self.tableWidget.resizeRowsToContents()
+        if not self.summary_loaded:
+            self.load_pref()
+            self.database.current_contest = self.pref.get("contest", 0)
+            self.summary.load(self.database.fetch_band_summary())
+            self.summary_loaded = True
+        self.model.set_rows(self.summary.rows())
+        self.tableView.resizeColumnsToContents()
+        self.tableView.resizeRowsToContents()
 
     def closeEvent(self, event) -> None:
         self.action.setChecked(False)
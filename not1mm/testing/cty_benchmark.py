@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Benchmark CtyIndex against the old per-prefix dict scan.
+
+Resolves every call in MASTER.SCP with both lookups, checks they agree and
+prints the time each took.
+
+usage: python -m not1mm.testing.cty_benchmark [-c cty.json] [-s MASTER.SCP]
+"""
+
+import argparse
+import time
+from json import loads
+from pathlib import Path
+
+from not1mm.lib.cty_index import CtyIndex
+
+DATA_PATH = Path(__file__).parent.parent / "data"
+
+parser = argparse.ArgumentParser(description="Benchmark cty lookups.")
+parser.add_argument("-c", "--cty", type=str, default=str(DATA_PATH / "cty.json"))
+parser.add_argument("-s", "--scp", type=str, default=str(DATA_PATH / "MASTER.SCP"))
+parser.add_argument(
+    "-n", "--limit", type=int, default=0, help="Only use the first N calls"
+)
+args = parser.parse_args()
+
+
+def legacy_lookup(ctyfile: dict, callsign: str) -> dict:
+    """The lookup MainWindow.cty_lookup used to do."""
+    callsign = callsign.upper()
+    for count in reversed(range(len(callsign))):
+        searchitem = callsign[: count + 1]
+        result = {key: val for key, val in ctyfile.items() if key == searchitem}
+        if not result:
+            continue
+        if result.get(searchitem).get("exact_match"):
+            if searchitem == callsign:
+                return result
+            continue
+        return result
+
+
+with open(args.cty, "rt", encoding="utf-8") as c_file:
+    ctyfile = loads(c_file.read())
+with open(args.scp, "rt", encoding="utf-8") as scp_file:
+    calls = [x.strip() for x in scp_file if x.strip() and not x.startswith("#")]
+if args.limit:
+    calls = calls[: args.limit]
+
+print(f"{len(ctyfile)} cty entries, {len(calls)} calls")
+
+start = time.perf_counter()
+index = CtyIndex(ctyfile)
+build_time = time.perf_counter() - start
+
+start = time.perf_counter()
+new_results = [index.lookup(call) for call in calls]
+index_time = time.perf_counter() - start
+
+start = time.perf_counter()
+old_results = [legacy_lookup(ctyfile, call) for call in calls]
+legacy_time = time.perf_counter() - start
+
+mismatches = [
+    call for call, old, new in zip(calls, old_results, new_results) if old != new
+]
+
+print(f"index build:   {build_time * 1000:.2f} ms")
+print(
+    f"CtyIndex:      {index_time:.3f} s "
+    f"({index_time / len(calls) * 1e6:.2f} us/call)"
+)
+print(
+    f"legacy scan:   {legacy_time:.3f} s "
+    f"({legacy_time / len(calls) * 1e6:.2f} us/call)"
+)
+if index_time:
+    print(f"speedup:       {legacy_time / index_time:.0f}x")
+print(f"mismatches:    {len(mismatches)} {mismatches[:10]}")
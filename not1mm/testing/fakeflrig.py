@@ -1,88 +1,191 @@
-"""Main PC does not have radio attached. So we'll make a fake flrig server."""
+"""
+Main PC does not have radio attached. So we'll make a fake flrig server.
+
+Like flrig it keeps connections alive between requests and answers
+system.multicall, unless made with multicall=False to act like a server
+without it. Set delay to add that many seconds to every HTTP request, like
+a radio reached over a VPN. A multicall pays it once for all its calls.
+
+python -m not1mm.testing.fakeflrig [port] [delay seconds]
+"""
 
 import logging
-from xmlrpc.server import SimpleXMLRPCServer
-from xmlrpc.server import SimpleXMLRPCRequestHandler
+import sys
+import threading
+import time
+from socketserver import ThreadingMixIn
+from xmlrpc.server import SimpleXMLRPCRequestHandler, SimpleXMLRPCServer
 
-logging.basicConfig(level=logging.WARNING)
+MODES = ["LSB", "USB", "AM", "FM", "CW", "CW-R", "RTTY", "RTTY-R", "USB-D"]
 
-radio_state = {
+radio_defaults = {
     "freq": "14032000",
     "mode": "CW",
     "bw": "50",
     "ptt": 0,
+    "power": 5,
 }
 
 
 class RequestHandler(SimpleXMLRPCRequestHandler):
-    """Doc String"""
+    """Serves the requests of one connection, keeping it open between them."""
 
     rpc_paths = ("/RPC2",)
-
-
-def get_vfo():
-    """return frequency in hz"""
-    return str(int(radio_state["freq"]))
-
-
-def set_vfo(freq):
-    """set frequency in hz"""
-    logging.warning("%s", f"Frequency set to: {freq} {type(freq)}")
-    radio_state["freq"] = freq
-    return 0
-
-
-def set_frequency(freq):
-    """seturn frequency in hz"""
-    logging.warning("%s", f"Frequency set to: {freq} {type(freq)}")
-    radio_state["freq"] = freq
-    return 0
-
-
-def get_mode():
-    """return mode"""
-    return radio_state["mode"]
-
-
-def set_mode(mode):
-    """set frequency in hz"""
-    logging.warning("%s", f"Mode set to: {mode}")
-    radio_state["mode"] = mode
-    return 0
-
-
-def get_bw():
-    """return bandwidth"""
-    return [radio_state["bw"], ""]
-
-
-def set_bw(bandwidth):
-    """set bandwidth"""
-    radio_state["bw"] = bandwidth
-
-
-def get_version():
-    """return flrig version"""
-    return "1.4.8"
-
-
-print("Stupid server to fake an flrig CAT control server.")
-
-# Create server
-with SimpleXMLRPCServer(
-    ("0.0.0.0", 12345),
-    requestHandler=RequestHandler,
-    logRequests=False,
-    allow_none=True,
-) as server:
-    server.register_function(get_vfo, name="rig.get_vfo")
-    server.register_function(get_mode, name="rig.get_mode")
-    server.register_function(set_vfo, name="rig.set_vfo")
-    server.register_function(set_frequency, name="rig.set_frequency")
-    server.register_function(set_mode, name="rig.set_mode")
-    server.register_function(get_bw, name="rig.get_bw")
-    server.register_function(set_bw, name="rig.set_bw")
-    server.register_function(get_version, name="main.get_version")
-
-    server.register_introspection_functions()
-    server.serve_forever()
+    protocol_version = "HTTP/1.1"
+
+    def setup(self) -> None:
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_POST(self) -> None:
+        server = self.server
+        with server.lock:
+            server.round_trips += 1
+        if server.delay:
+            time.sleep(server.delay)
+        super().do_POST()
+
+
+class FakeFlrig(ThreadingMixIn, SimpleXMLRPCServer):
+    """The server, counting the connections, requests and calls it saw."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(
+        self, port: int = 0, delay: float = 0.0, multicall: bool = True
+    ) -> None:
+        super().__init__(
+            ("127.0.0.1", port),
+            requestHandler=RequestHandler,
+            logRequests=False,
+            allow_none=True,
+        )
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.round_trips = 0
+        self.calls = []
+        self.radio = dict(radio_defaults)
+        self.cw_text = ""
+        functions = {
+            "rig.get_vfo": self.get_vfo,
+            "rig.set_vfo": self.set_frequency,
+            "rig.set_frequency": self.set_frequency,
+            "rig.get_mode": self.get_mode,
+            "rig.set_mode": self.set_mode,
+            "rig.get_modes": self.get_modes,
+            "rig.get_bw": self.get_bw,
+            "rig.set_bw": self.set_bw,
+            "rig.get_ptt": self.get_ptt,
+            "rig.set_ptt": self.set_ptt,
+            "rig.get_power": self.get_power,
+            "rig.set_power": self.set_power,
+            "rig.cwio_text": self.cwio_text,
+            "rig.cwio_send": self.ignore,
+            "rig.cwio_set_wpm": self.ignore,
+            "main.get_version": self.get_version,
+        }
+        for name, function in functions.items():
+            self.register_function(function, name=name)
+        self.register_introspection_functions()
+        if multicall:
+            self.register_multicall_functions()
+
+    def _dispatch(self, method, params):
+        with self.lock:
+            self.calls.append(method)
+        return super()._dispatch(method, params)
+
+    @property
+    def port(self) -> int:
+        """The port listened on."""
+        return self.server_address[1]
+
+    def start(self) -> None:
+        """Serve from a background thread."""
+        threading.Thread(
+            target=self.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        ).start()
+
+    def get_vfo(self):
+        """return frequency in hz"""
+        return str(int(self.radio["freq"]))
+
+    def set_frequency(self, freq):
+        """set frequency in hz"""
+        logging.warning("%s", f"Frequency set to: {freq} {type(freq)}")
+        self.radio["freq"] = freq
+        return 0
+
+    def get_mode(self):
+        """return mode"""
+        return self.radio["mode"]
+
+    def set_mode(self, mode):
+        """set mode"""
+        logging.warning("%s", f"Mode set to: {mode}")
+        self.radio["mode"] = mode
+        return 0
+
+    def get_modes(self):
+        """return the modes of the radio"""
+        return MODES
+
+    def get_bw(self):
+        """return bandwidth"""
+        return [self.radio["bw"], ""]
+
+    def set_bw(self, bandwidth):
+        """set bandwidth"""
+        self.radio["bw"] = bandwidth
+
+    def get_ptt(self):
+        """return ptt state"""
+        return self.radio["ptt"]
+
+    def set_ptt(self, ptt):
+        """set ptt state"""
+        self.radio["ptt"] = ptt
+        return 0
+
+    def get_power(self):
+        """return power in watts"""
+        return self.radio["power"]
+
+    def set_power(self, power):
+        """set power in watts"""
+        self.radio["power"] = power
+        return 0
+
+    def cwio_text(self, text):
+        """add text to the cw buffer"""
+        self.cw_text += text
+        return 0
+
+    def ignore(self, _value):
+        """accept and ignore"""
+        return 0
+
+    def get_version(self):
+        """return flrig version"""
+        return "1.4.8"
+
+
+def main():
+    """Serve until interrupted."""
+    logging.basicConfig(level=logging.WARNING)
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 12345
+    delay = float(sys.argv[2]) if len(sys.argv) > 2 else 0.0
+    print("Stupid server to fake an flrig CAT control server.")
+    server = FakeFlrig(port, delay)
+    print(f"Fake flrig on 127.0.0.1:{server.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+A stand-in for the QRZ and HamQTH XML services, for trying lookups offline.
+
+Serves /qrz for QRZlookup and /hamqth for HamQTH on localhost. Any username
+and password get a session, every call is found, with a grid made up from
+the call. Set delay to see how the logger copes with a slow provider.
+
+python -m not1mm.testing.fakelookup [port] [delay seconds]
+
+and point the lookupservice at it with the qrzurl or hamqthurl preference,
+e.g. "qrzurl": "http://127.0.0.1:8088/qrz".
+"""
+
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+SESSION = "0123456789abcdef"
+
+QRZ_SESSION = """<?xml version="1.0" ?>
+<QRZDatabase version="1.34">
+<Session><Key>{key}</Key><Count>1</Count><SubExp>non-subscriber</SubExp></Session>
+</QRZDatabase>"""
+
+QRZ_CALLSIGN = """<?xml version="1.0" ?>
+<QRZDatabase version="1.34">
+<Callsign><call>{call}</call><fname>Fake</fname><name>{call}</name>
+<grid>{grid}</grid><nickname>Op</nickname></Callsign>
+<Session><Key>{key}</Key><Count>2</Count></Session>
+</QRZDatabase>"""
+
+HAMQTH_SESSION = """<?xml version="1.0"?>
+<HamQTH version="2.8"><session><session_id>{key}</session_id></session></HamQTH>"""
+
+HAMQTH_SEARCH = """<?xml version="1.0"?>
+<HamQTH version="2.8"><search><callsign>{call}</callsign><nick>Op</nick>
+<adr_name>{call}</adr_name><grid>{grid}</grid></search></HamQTH>"""
+
+
+def fake_grid(call: str) -> str:
+    """A stable, valid looking grid square for call."""
+    total = sum(ord(char) for char in call)
+    return (
+        chr(ord("A") + total % 18)
+        + chr(ord("A") + total // 18 % 18)
+        + str(total % 10)
+        + str(total // 10 % 10)
+    )
+
+
+class LookupHandler(BaseHTTPRequestHandler):
+    """Answers like QRZ on /qrz and like HamQTH on /hamqth."""
+
+    def do_GET(self) -> None:
+        """Handle one request."""
+        url = urlparse(self.path)
+        query = {key: value[0] for key, value in parse_qs(url.query).items()}
+        server = self.server
+        with server.lock:
+            server.requests.append((url.path, query))
+        if server.delay:
+            time.sleep(server.delay)
+        call = query.get("callsign", "").upper()
+        fields = {"key": SESSION, "call": call, "grid": fake_grid(call)}
+        if url.path == "/qrz":
+            body = QRZ_CALLSIGN if call else QRZ_SESSION
+        elif url.path == "/hamqth":
+            body = HAMQTH_SEARCH if call else HAMQTH_SESSION
+        else:
+            self.send_error(404)
+            return
+        data = body.format(**fields).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/xml")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args) -> None:
+        """Keep quiet."""
+
+
+class FakeLookupServer(ThreadingHTTPServer):
+    """The server, recording the requests it got."""
+
+    daemon_threads = True
+
+    def __init__(self, port: int = 0, delay: float = 0.0) -> None:
+        super().__init__(("127.0.0.1", port), LookupHandler)
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.requests = []
+
+    @property
+    def url(self) -> str:
+        """Base url, add /qrz or /hamqth."""
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def lookups(self) -> list:
+        """The calls looked up so far."""
+        with self.lock:
+            return [
+                query["callsign"] for _, query in self.requests if query.get("callsign")
+            ]
+
+    def start(self) -> None:
+        """Serve from a background thread."""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+
+def main():
+    """Serve until interrupted."""
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8088
+    delay = float(sys.argv[2]) if len(sys.argv) > 2 else 0.0
+    server = FakeLookupServer(port, delay)
+    print(f"Serving {server.url}/qrz and {server.url}/hamqth")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+A stand-in for rigctld, speaking the extended response protocol ("+"
+prefixed commands) the rigctld backend uses, for testing without a radio.
+
+Set delay to add that many seconds to every exchange, like a radio reached
+over a VPN. Each batch of commands arriving together pays it once, the way
+network latency is paid once per round trip. With dribble set, replies are
+sent a byte at a time.
+
+python -m not1mm.testing.fakerigctld [port] [delay seconds]
+"""
+
+import socketserver
+import sys
+import threading
+import time
+
+MODES = "AM CW USB LSB RTTY FM CWR RTTYR PKTLSB PKTUSB"
+
+radio_defaults = {
+    "vfo": "VFOA",
+    "freq": {"VFOA": "14032000", "VFOB": "7025000"},
+    "mode": {"VFOA": "CW", "VFOB": "LSB"},
+    "passband": {"VFOA": "500", "VFOB": "2400"},
+    "ptt": "0",
+    "power": "0.500000",
+}
+
+
+def reply(radio: dict, line: str) -> str:
+    """The extended protocol reply to one command line, without the '+'."""
+    command, *args = line.split()
+    vfo = args[0] if args and args[0].startswith("VFO") else radio["vfo"]
+    if command == "v":
+        return f"get_vfo:\nVFO: {radio['vfo']}\nRPRT 0\n"
+    if command == "V" and args:
+        radio["vfo"] = args[0]
+        return f"set_vfo: {args[0]}\nRPRT 0\n"
+    if command == "f":
+        return f"get_freq: {vfo}\nFrequency: {radio['freq'][vfo]}\nRPRT 0\n"
+    if command == "F" and len(args) == 2:
+        radio["freq"][vfo] = args[1]
+        return f"set_freq: {' '.join(args)}\nRPRT 0\n"
+    if command == "m":
+        return (
+            f"get_mode: {vfo}\nMode: {radio['mode'][vfo]}\n"
+            f"Passband: {radio['passband'][vfo]}\nRPRT 0\n"
+        )
+    if command == "M" and len(args) >= 2:
+        if args[1] == "?":
+            return f"set_mode: {vfo} ?\n{MODES}\nRPRT 0\n"
+        radio["mode"][vfo] = args[1]
+        return f"set_mode: {' '.join(args)}\nRPRT 0\n"
+    if command == "t":
+        return f"get_ptt: {vfo}\nPTT: {radio['ptt']}\nRPRT 0\n"
+    if command == "T" and len(args) == 2:
+        radio["ptt"] = args[1]
+        return f"set_ptt: {' '.join(args)}\nRPRT 0\n"
+    if command == "l" and args[1:] == ["RFPOWER"]:
+        return f"get_level: {vfo} RFPOWER\n{radio['power']}\nRPRT 0\n"
+    if command in ("L", "b", "w", "\\set_vfo_opt", "\\stop_morse", "\\set_func"):
+        name = command.lstrip("\\")
+        return f"{name}: {' '.join(args)}\nRPRT 0\n"
+    return "RPRT -1\n"
+
+
+class RigctldHandler(socketserver.StreamRequestHandler):
+    """Answers the commands of one client connection."""
+
+    def handle(self) -> None:
+        server = self.server
+        pending = b""
+        while True:
+            chunk = self.request.recv(4096)
+            if not chunk:
+                return
+            with server.lock:
+                server.round_trips += 1
+            if server.delay:
+                time.sleep(server.delay)
+            pending += chunk
+            *lines, pending = pending.split(b"\n")
+            answer = ""
+            for line in lines:
+                text = line.decode().strip().lstrip("+")
+                if text:
+                    with server.lock:
+                        server.commands.append(text)
+                        answer += reply(server.radio, text)
+            data = answer.encode()
+            if server.dribble:
+                for index in range(len(data)):
+                    self.request.sendall(data[index : index + 1])
+            else:
+                self.request.sendall(data)
+
+
+class FakeRigctld(socketserver.ThreadingTCPServer):
+    """The server, counting the exchanges and commands it saw."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, port: int = 0, delay: float = 0.0, dribble=False) -> None:
+        super().__init__(("127.0.0.1", port), RigctldHandler)
+        self.delay = delay
+        self.dribble = dribble
+        self.lock = threading.Lock()
+        self.round_trips = 0
+        self.commands = []
+        self.radio = {
+            key: dict(value) if isinstance(value, dict) else value
+            for key, value in radio_defaults.items()
+        }
+
+    @property
+    def port(self) -> int:
+        """The port listened on."""
+        return self.server_address[1]
+
+    def start(self) -> None:
+        """Serve from a background thread."""
+        threading.Thread(
+            target=self.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        ).start()
+
+
+def main():
+    """Serve until interrupted."""
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 4532
+    delay = float(sys.argv[2]) if len(sys.argv) > 2 else 0.0
+    server = FakeRigctld(port, delay)
+    print(f"Fake rigctld on 127.0.0.1:{server.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Benchmark the flrig poll against the old one request per call.
+
+Starts a fake flrig adding the given latency to every request, then times
+a number of poll cycles (vfo, mode and bandwidth) both ways: one multicall
+on a kept alive connection, and a request per call on a new connection
+each, as a plain ServerProxy talking to a server closing them does.
+
+usage: python -m not1mm.testing.flrig_benchmark [-d delay ms] [-n polls]
+"""
+
+import argparse
+import time
+import xmlrpc.client
+
+from not1mm.lib.cat_flrig import FlrigCAT
+from not1mm.testing.fakeflrig import FakeFlrig
+
+parser = argparse.ArgumentParser(description="Benchmark flrig polling.")
+parser.add_argument(
+    "-d", "--delay", type=float, default=20.0, help="Round trip time in ms"
+)
+parser.add_argument("-n", "--polls", type=int, default=50)
+args = parser.parse_args()
+
+
+def legacy_poll(proxy) -> tuple:
+    """The poll Radio.run used to make, each call a request of its own."""
+    with proxy as server:
+        vfo = server.rig.get_vfo()
+    with proxy as server:
+        mode = server.rig.get_mode()
+    with proxy as server:
+        bandwidth = server.rig.get_bw()[0]
+    return vfo, mode, bandwidth
+
+
+def measure(poll, cat, server: FakeFlrig) -> tuple:
+    """(results, ms per poll, requests per poll, connections) for the polls."""
+    server.round_trips = 0
+    server.connections = 0
+    timings = []
+    results = set()
+    for _ in range(args.polls):
+        start = time.perf_counter()
+        results.add(poll(cat))
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return (
+        results,
+        sum(timings) / args.polls * 1000,
+        timings[len(timings) // 2] * 1000,
+        server.round_trips / args.polls,
+        server.connections,
+    )
+
+
+def report(name: str, measured: tuple) -> None:
+    _, mean, median, trips, connections = measured
+    print(
+        f"{name:14} {mean:.2f} ms/poll (median {median:.2f}), "
+        f"{trips:.1f} requests/poll, {connections} connections"
+    )
+
+
+server = FakeFlrig(delay=args.delay / 1000)
+server.start()
+cat = FlrigCAT("127.0.0.1", server.port)
+proxy = xmlrpc.client.ServerProxy(f"http://127.0.0.1:{server.port}")
+
+new = measure(FlrigCAT.get_state, cat, server)
+old = measure(legacy_poll, proxy, server)
+
+print(f"{args.polls} polls, {args.delay:.1f} ms round trip")
+report("multicall:", new)
+report("one by one:", old)
+if new[1]:
+    print(f"speedup:       {old[1] / new[1]:.1f}x")
+print(f"same answers:  {new[0] == old[0]} {new[0]}")
+server.shutdown()
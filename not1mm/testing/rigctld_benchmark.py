@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""Benchmark the rigctld poll against the old one command per round trip.
+
+Starts a fake rigctld adding the given latency to every exchange, then
+times a number of poll cycles (vfo, mode and bandwidth) both ways.
+
+usage: python -m not1mm.testing.rigctld_benchmark [-d delay ms] [-n polls]
+"""
+
+import argparse
+import time
+
+from not1mm.lib.cat_rigctld import RigctldCAT
+from not1mm.testing.fakerigctld import FakeRigctld
+
+parser = argparse.ArgumentParser(description="Benchmark rigctld polling.")
+parser.add_argument(
+    "-d", "--delay", type=float, default=20.0, help="Round trip time in ms"
+)
+parser.add_argument("-n", "--polls", type=int, default=50)
+args = parser.parse_args()
+
+
+def legacy_poll(cat: RigctldCAT) -> tuple:
+    """The poll Radio.run used to make, each command a round trip of its own."""
+    vfo = cat.rigctld_parse(cat.rigctld_command("v")).get("VFO", "VFOA")
+    freq = cat.rigctld_parse(cat.rigctld_command(f"f {vfo}")).get("Frequency", "")
+    vfo = cat.rigctld_parse(cat.rigctld_command("v")).get("VFO", "VFOA")
+    report = cat.rigctld_parse(cat.rigctld_command(f"m {vfo}"))
+    return freq, report.get("Mode", ""), report.get("Passband", "0")
+
+
+def measure(poll, cat: RigctldCAT, server: FakeRigctld) -> tuple:
+    """(results, ms per poll, round trips per poll) for args.polls polls."""
+    server.round_trips = 0
+    start = time.perf_counter()
+    results = {poll(cat) for _ in range(args.polls)}
+    elapsed = time.perf_counter() - start
+    return (
+        results,
+        elapsed / args.polls * 1000,
+        server.round_trips / args.polls,
+    )
+
+
+server = FakeRigctld(delay=args.delay / 1000)
+server.start()
+cat = RigctldCAT("127.0.0.1", server.port)
+
+new_results, new_ms, new_trips = measure(RigctldCAT.get_state, cat, server)
+old_results, old_ms, old_trips = measure(legacy_poll, cat, server)
+
+print(f"{args.polls} polls, {args.delay:.1f} ms round trip")
+print(f"pipelined:     {new_ms:.2f} ms/poll, {new_trips:.1f} round trips/poll")
+print(f"one by one:    {old_ms:.2f} ms/poll, {old_trips:.1f} round trips/poll")
+if new_ms:
+    print(f"speedup:       {old_ms / new_ms:.1f}x")
+print(f"same answers:  {new_results == old_results} {new_results}")
+server.shutdown()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Benchmark building the forms of every .ui file, the old way and cached.
+
+For each .ui file in not1mm/data it times what load_ui used to do,
+uic.loadUi and then uic.loadUiType on the same file, against load_ui on a
+compiled form: the first start compiling it, a later start importing it,
+and a window opened again in the same run.
+
+usage: python -m not1mm.testing.ui_benchmark [-n repeats]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6 import QtWidgets, uic  # noqa: E402
+
+from not1mm import fsutils  # noqa: E402
+from not1mm.lib import i18n, ui_forms  # noqa: E402
+
+parser = argparse.ArgumentParser(description="Benchmark building .ui forms.")
+parser.add_argument("-n", "--repeats", type=int, default=3)
+args = parser.parse_args()
+
+# Startups after the first import the compiled forms' bytecode.
+sys.dont_write_bytecode = False
+
+
+def legacy_load(widget, ui_file: Path) -> None:
+    """What load_ui did before the forms were compiled."""
+    uic.loadUi(ui_file, widget)
+    uic.loadUiType(str(ui_file))
+
+
+def top_class(ui_file: Path):
+    """The widget class at the root of ui_file."""
+    return getattr(QtWidgets, ET.parse(ui_file).getroot().find("widget").get("class"))
+
+
+def timed(load, ui_file: Path) -> float:
+    """ms to build ui_file on a new widget with load."""
+    widget = top_class(ui_file)()
+    start = time.perf_counter()
+    load(widget, ui_file)
+    elapsed = time.perf_counter() - start
+    widget.deleteLater()
+    return elapsed * 1000
+
+
+app = QtWidgets.QApplication(sys.argv)
+ui_files = sorted(fsutils.APP_DATA_PATH.glob("*.ui"))
+totals = {"legacy": 0.0, "first": 0.0, "later": 0.0, "again": 0.0}
+print(f"{'form':20} {'legacy':>8} {'first':>8} {'later':>8} {'again':>8}  ms")
+for ui_file in ui_files:
+    best = dict.fromkeys(totals)
+    for _ in range(args.repeats):
+        cache = Path(tempfile.mkdtemp())
+        ui_forms.CACHE_PATH = cache
+        ui_forms._forms.clear()
+        runs = {"legacy": timed(legacy_load, ui_file)}
+        runs["first"] = timed(i18n.load_ui, ui_file)
+        ui_forms._forms.clear()
+        sys.modules.pop(f"not1mm_ui_forms.{ui_file.stem}", None)
+        runs["later"] = timed(i18n.load_ui, ui_file)
+        runs["again"] = timed(i18n.load_ui, ui_file)
+        shutil.rmtree(cache)
+        for key, value in runs.items():
+            best[key] = value if best[key] is None else min(best[key], value)
+    for key, value in best.items():
+        totals[key] += value
+    row = " ".join(f"{best[key]:8.2f}" for key in totals)
+    print(f"{ui_file.stem:20} {row}")
+row = " ".join(f"{totals[key]:8.2f}" for key in totals)
+print(f"{'all forms':20} {row}")
+print(f"later start speedup: {totals['legacy'] / totals['later']:.1f}x")
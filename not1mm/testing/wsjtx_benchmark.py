@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Benchmark decoding a replayed burst of WSJT-X Decode packets.
+
+Builds cycles of Decode packets with wsjtx_inject_udp, then times reading
+them field by field with byte slices, the way ft8_watcher read Status
+packets, against wsjtx.decode_message, and the whole path from datagram
+to a drained batch of bandmap spots.
+
+usage: python -m not1mm.testing.wsjtx_benchmark [-n decodes] [-c cycles]
+"""
+
+import argparse
+import struct
+import time
+
+from not1mm.lib import wsjtx
+from not1mm.testing.wsjtx_inject_udp import decode_cycle
+
+parser = argparse.ArgumentParser(description="Benchmark WSJT-X decoding.")
+parser.add_argument("-n", "--decodes", type=int, default=300, help="Per cycle")
+parser.add_argument("-c", "--cycles", type=int, default=20)
+args = parser.parse_args()
+
+
+def getint(bytestring):
+    return int.from_bytes(bytestring, byteorder="big", signed=True)
+
+
+def getuint(bytestring):
+    return int.from_bytes(bytestring, byteorder="big", signed=False)
+
+
+def legacy_decode(datagram: bytes) -> dict | None:
+    """A Decode packet read a field at a time from slices of the datagram."""
+    if datagram[0:4] != b"\xad\xbc\xcb\xda":
+        return None
+    uniquesize = getint(datagram[12:16])
+    message = {
+        "type": getuint(datagram[8:12]),
+        "id": datagram[16 : 16 + uniquesize].decode(),
+    }
+    payload = datagram[16 + uniquesize :]
+    message["new"] = bool(payload[0])
+    message["time"] = getuint(payload[1:5])
+    message["snr"] = getint(payload[5:9])
+    [message["delta_time"]] = struct.unpack(">d", payload[9:17])
+    message["delta_frequency"] = getuint(payload[17:21])
+    payload = payload[21:]
+    modelen = getint(payload[0:4])
+    message["mode"] = payload[4 : 4 + modelen].decode()
+    payload = payload[4 + modelen :]
+    textlen = getint(payload[0:4])
+    message["message"] = payload[4 : 4 + textlen].decode()
+    payload = payload[4 + textlen :]
+    message["low_confidence"] = bool(payload[0])
+    message["off_air"] = bool(payload[1])
+    return message
+
+
+def best_of(function, cycles: list, repeat: int = 3) -> float:
+    """Fastest time over repeat runs of function on every cycle, seconds."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for cycle in cycles:
+            function(cycle)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def slices(cycle: list) -> None:
+    for packet in cycle[1:]:
+        legacy_decode(packet)
+
+
+def structs(cycle: list) -> None:
+    for packet in cycle[1:]:
+        wsjtx.decode_message(packet)
+
+
+def pipeline(cycle: list) -> list:
+    queue = wsjtx.DecodeQueue()
+    for packet in cycle:
+        message = wsjtx.decode_message(packet)
+        if message["type"] == wsjtx.STATUS:
+            queue.status(message)
+        elif message["type"] == wsjtx.DECODE:
+            queue.push(message)
+    return queue.drain()
+
+
+cycles = [decode_cycle(args.decodes) for _ in range(args.cycles)]
+decodes = args.decodes * args.cycles
+same = all(
+    wsjtx.decode_message(packet) == dict(legacy_decode(packet), schema=2)
+    for cycle in cycles
+    for packet in cycle[1:]
+)
+old = best_of(slices, cycles)
+new = best_of(structs, cycles)
+whole = best_of(pipeline, cycles)
+spots = sum(len(pipeline(cycle)) for cycle in cycles)
+
+print(f"{args.cycles} cycles of {args.decodes} decodes")
+print(f"byte slices:   {old / decodes * 1e6:.2f} us/decode")
+print(f"structs:       {new / decodes * 1e6:.2f} us/decode")
+print(f"to spots:      {whole / decodes * 1e6:.2f} us/decode, {spots} spots")
+print(f"per cycle:     {whole / args.cycles * 1000:.2f} ms")
+print(f"same fields:   {same}")
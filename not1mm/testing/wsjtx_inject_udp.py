@@ -1,9 +1,15 @@
 #!/usr/bin/env python3
-"""Inject UDP test packet"""
+"""Inject UDP test packet
+
+python wsjtx_inject_udp.py          a Logged ADIF packet every 15 seconds
+python wsjtx_inject_udp.py decodes  a cycle of Decode packets every 15 seconds
+"""
 
 # pylint: disable=line-too-long
 import socket
 import random
+import struct
+import sys
 import time
 import datetime
 
@@ -119,6 +125,74 @@ def generate_section(call):
     return sections[random.randint(0, len(sections) - 1)]
 
 
+def qstring(text: str) -> bytes:
+    """A string the way Qt's QDataStream writes a QByteArray"""
+    data = text.encode()
+    return struct.pack(">I", len(data)) + data
+
+
+def message_packet(kind: int, payload: bytes) -> bytes:
+    """A schema 2 WSJT-X message of type kind from client WSJT-X"""
+    return b"\xad\xbc\xcb\xda\x00\x00\x00\x02" + struct.pack(">I", kind) + qstring("WSJT-X") + payload
+
+
+def status_packet(dial_hz: int, mode: str = "FT8") -> bytes:
+    """A Status packet, WSJT-X idle on dial_hz"""
+    payload = (
+        struct.pack(">Q", dial_hz)
+        + qstring(mode)
+        + qstring("")
+        + qstring("")
+        + qstring(mode)
+        + struct.pack(">???II", False, False, True, 1500, 1500)
+        + qstring("K6GTE")
+        + qstring("DM13")
+        + qstring("")
+        + struct.pack(">?", False)
+        + qstring("")
+        + struct.pack(">?BII", False, 0, 10, 15)
+        + qstring("Default")
+        + qstring("")
+    )
+    return message_packet(1, payload)
+
+
+def decode_packet(text: str, snr: int, delta_hz: int, mode: str = "~") -> bytes:
+    """A Decode packet of text heard delta_hz above the dial frequency"""
+    msecs = int(time.time() % 86400) * 1000
+    payload = (
+        struct.pack(">?IidI", True, msecs, snr, 0.1, delta_hz)
+        + qstring(mode)
+        + qstring(text)
+        + struct.pack(">??", False, False)
+    )
+    return message_packet(2, payload)
+
+
+def decode_cycle(count: int, dial_hz: int = 14074000) -> list:
+    """A Status packet and then count Decode packets, as in a busy FT8 period"""
+    packets = [status_packet(dial_hz)]
+    for _ in range(count):
+        call = generate_callsign()
+        text = random.choice(
+            [f"CQ {call} DM10", f"CQ FD {call} DM10", f"K6GTE {call} 1D UT", f"W1AW {call} RR73"]
+        )
+        packets.append(decode_packet(text, random.randint(-24, 10), random.randint(200, 2900)))
+    return packets
+
+
+def send_decodes():
+    """Send a cycle of decodes every 15 seconds"""
+    serverAddressPort = ("127.0.0.1", 2237)
+    UDPClientSocket = socket.socket(family=socket.AF_INET, type=socket.SOCK_DGRAM)
+    while True:
+        packets = decode_cycle(200)
+        for packet in packets:
+            UDPClientSocket.sendto(packet, serverAddressPort)
+        print(f"sent {len(packets)} packets")
+        time.sleep(15)
+
+
 def main():
     serverAddressPort = ("127.0.0.1", 2237)
     UDPClientSocket = socket.socket(family=socket.AF_INET, type=socket.SOCK_DGRAM)
@@ -140,4 +214,7 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    if "decodes" in sys.argv[1:]:
+        send_decodes()
+    else:
+        main()
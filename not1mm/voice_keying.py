@@ -8,8 +8,11 @@ Purpose: A voice keying class to handle playing soundfiles and activating PTT
 """
 
 import logging
+import os
 from pathlib import Path
 
+import numpy as np
+
 try:
     import sounddevice as sd
 except OSError as exception:
@@ -23,6 +26,10 @@ from not1mm.lib.preferences import Preferences
 
 logger = logging.getLogger("voice_keying")
 
+SAMPLE_RATE = 44100
+
+PHONETIC_CHARACTERS = "abcdefghijklmnopqrstuvwxyz 1234567890"
+
 
 def has_output_device(sounddevice_name="default") -> bool:
     """Return True when the selected output audio device is available."""
@@ -35,55 +42,156 @@ def has_output_device(sounddevice_name="default") -> bool:
     return True
 
 
+def macro_clips(the_string: str, op_path: Path) -> list:
+    """
+    The wav files voicing the_string: one per letter, digit and space,
+    and [name] for name.wav. Whether they exist is left to SampleCache.
+    """
+    clips = []
+    char_iterator = iter(the_string.lower())
+    for char in char_iterator:
+        if char == "[":
+            substring = ""
+            for sub_char in char_iterator:
+                if sub_char == "]":
+                    break
+                substring += sub_char
+            clips.append(op_path / f"{substring}.wav")
+        elif char in PHONETIC_CHARACTERS:
+            clips.append(op_path / f"{'space' if char == ' ' else char}.wav")
+    return clips
+
+
+class SampleCache:
+    """
+    Decoded wav files, mono float32 at SAMPLE_RATE, kept in memory so a
+    macro is voiced without reading or decoding files on the way to the
+    transmitter. A clip is decoded again when its file's mtime changes.
+    """
+
+    def __init__(self) -> None:
+        self.clips = {}
+        self.directory = None
+        self.decoded = 0
+
+    def preload(self, directory: Path) -> None:
+        """Decode every clip of directory, when it is not the one loaded."""
+        if directory == self.directory:
+            return
+        self.directory = directory
+        self.clips.clear()
+        if directory is not None and directory.is_dir():
+            for path in directory.glob("*.wav"):
+                self.load(path)
+        logger.debug("Preloaded %d clips from %s", len(self.clips), directory)
+
+    def load(self, path: Path):
+        """The samples of path, None when there is no such readable file."""
+        key = str(path)
+        try:
+            mtime = os.stat(key).st_mtime_ns
+        except OSError:
+            self.clips.pop(key, None)
+            return None
+        cached = self.clips.get(key)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        try:
+            data, samplerate = sf.read(key, dtype="float32", always_2d=True)
+        except RuntimeError as err:
+            logger.warning("%s: %s", key, err)
+            return None
+        samples = self.resample(data.mean(axis=1), samplerate)
+        self.clips[key] = (mtime, samples)
+        self.decoded += 1
+        return samples
+
+    @staticmethod
+    def resample(samples, samplerate: int):
+        """samples at samplerate, linearly interpolated to SAMPLE_RATE."""
+        if samplerate == SAMPLE_RATE or not len(samples):
+            return samples
+        length = round(len(samples) * SAMPLE_RATE / samplerate)
+        positions = np.arange(length) * (samplerate / SAMPLE_RATE)
+        return np.interp(positions, np.arange(len(samples)), samples).astype(
+            np.float32
+        )
+
+    def render(self, paths) -> np.ndarray:
+        """The clips of paths that exist, one after the other in one buffer."""
+        parts = [part for part in map(self.load, paths) if part is not None]
+        if not parts:
+            return np.zeros(0, dtype=np.float32)
+        return np.concatenate(parts)
+
+
 class Voice(QObject):
-    """Voice class"""
+    """
+    Voice class
+
+    voice_string queues the clips of a macro. The thread running run()
+    renders everything queued into one buffer from the sample cache and
+    plays it as a single stream, keying PTT around it.
+    """
 
     ptt_on = pyqtSignal()
     ptt_off = pyqtSignal()
     data_path = None
     sounddevice = None
-    nonblocking = False
     voicings = []  # noqa: RUF012
 
     def __init__(self) -> None:
         super().__init__()
         """setup interface"""
         self.pref = Preferences.data()
+        self.samples = SampleCache()
+        self.checked_device = None
+        self.device_available = False
+
+    def op_path(self):
+        """The current operator's directory of clips."""
+        if self.data_path is None:
+            return None
+        return self.data_path / self.pref.get("current_op", "").replace("/", "-")
+
+    def output_available(self) -> bool:
+        """has_output_device for sounddevice, asked again when it changes."""
+        if self.sounddevice != self.checked_device:
+            self.device_available = has_output_device(self.sounddevice)
+            self.checked_device = self.sounddevice
+        return self.device_available
 
     def run(self):
         while True:
-            keyed = False
+            self.samples.preload(self.op_path())
+            clips = []
             while len(self.voicings):
-                if not has_output_device(self.sounddevice):
-                    logger.warning("No available output sound device for voice keying.")
-                    self.voicings.clear()
-                    break
-                if not keyed:
-                    self.ptt_on.emit()
-                    keyed = True
-                filename = self.voicings.pop(0)
-                self.nonblocking = len(self.voicings)
-                if Path(filename).is_file():
-                    logger.debug("Voicing: %s", filename)
-                    data, _fs = sf.read(filename, dtype="float32")
-                    try:
-                        sd.default.device = self.sounddevice
-                        sd.default.samplerate = 44100.0
-                        sd.play(data, blocking=False)
-                        if self.nonblocking > 0:
-                            sd.wait()
-                        # https://snyk.io/advisor/python/sounddevice/functions/sounddevice.PortAudioError
-                    except sd.PortAudioError as err:
-                        logger.warning("%s", f"{err}")
-            try:
-                while sd.get_stream().active:
-                    QThread.msleep(100)
-            except (RuntimeError, AttributeError):
-                pass
-            if keyed:
-                self.ptt_off.emit()
+                clips += self.voicings.pop(0)
+            if clips:
+                self.play(self.samples.render(clips))
             QThread.msleep(100)
 
+    def play(self, buffer) -> None:
+        """Key up and play buffer, returning when it has been played."""
+        if not len(buffer):
+            return
+        if not self.output_available():
+            logger.warning("No available output sound device for voice keying.")
+            return
+        self.ptt_on.emit()
+        try:
+            sd.play(buffer, samplerate=SAMPLE_RATE, device=self.sounddevice)
+            # https://snyk.io/advisor/python/sounddevice/functions/sounddevice.PortAudioError
+        except sd.PortAudioError as err:
+            logger.warning("%s", f"{err}")
+            self.checked_device = None
+        try:
+            while sd.get_stream().active:
+                QThread.msleep(20)
+        except (RuntimeError, AttributeError):
+            pass
+        self.ptt_off.emit()
+
     def stop_voice(self) -> None:
         """
         empty the voicings list and call sd.stop().
@@ -96,8 +204,7 @@ class Voice(QObject):
         if sd is None:
             return
         self.voicings.clear()
-        if self.nonblocking == 0:
-            sd.stop()
+        sd.stop()
 
     def voice_string(self, the_string: str) -> None:
         """
@@ -117,27 +224,7 @@ class Voice(QObject):
         if sd is None:
             logger.warning("Sounddevice/portaudio not installed.")
             return
-        if not has_output_device(self.sounddevice):
+        if not self.output_available():
             logger.warning("No available output sound device for voice keying.")
             return
-        op_path = self.data_path / self.pref.get("current_op", "").replace("/", "-")
-
-        char_iterator = iter(the_string.lower())
-
-        for char in char_iterator:
-            if char == "[":
-                substring = ""
-                for sub_char in char_iterator:
-                    if sub_char == "]":
-                        break
-                    substring += sub_char
-                filename = f"{op_path!s}/{substring}.wav"
-                if Path(filename).is_file():
-                    self.voicings.append(filename)
-            if char in "abcdefghijklmnopqrstuvwxyz 1234567890[]":
-                if char == " ":
-                    char = "space"
-                filename = f"{op_path!s}/{char}.wav"
-                if Path(filename).is_file():
-                    logger.debug("Voicing: %s", filename)
-                    self.voicings.append(filename)
+        self.voicings.append(macro_clips(the_string, self.op_path()))
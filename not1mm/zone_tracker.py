@@ -6,6 +6,11 @@ from PyQt6.QtGui import QBrush, QColor
 from PyQt6.QtWidgets import QDockWidget
 
 from not1mm import fsutils
+from not1mm.lib.contest_state import (
+    apply_band_table_delta,
+    band_table_from_rows,
+    band_table_rows,
+)
 from not1mm.lib.database import DataBase
 from not1mm.lib.i18n import load_ui
 from not1mm.lib.preferences import Preferences
@@ -18,6 +23,7 @@ class ZoneWindow(QDockWidget):
     dbname = None
     db = None
     model = None
+    band_table = None
     pref = {}  # noqa: RUF012
     columns = {  # noqa: RUF012
         0: "Zone",
@@ -70,11 +76,15 @@ class ZoneWindow(QDockWidget):
         if not self.active:
             return
 
-        result = self.database.fetch_zone_by_band_count()
+        if self.band_table is None:
+            self.band_table = band_table_from_rows(
+                self.database.fetch_zone_by_band_count(), "ZN"
+            )
+        result = band_table_rows(self.band_table)
         self.zone_table.setRowCount(0)
         for row_number, row_data in enumerate(result):
             self.zone_table.insertRow(row_number)
-            for column, data in enumerate(row_data.values()):
+            for column, data in enumerate(row_data):
                 item = QtWidgets.QTableWidgetItem(str(data))
                 if column > 0 and column < 7:
                     if data == 0:
@@ -133,10 +143,25 @@ class ZoneWindow(QDockWidget):
         self.database = DataBase(self.dbname, fsutils.APP_DATA_PATH)
         self.database.current_contest = self.pref.get("contest", 0)
         self.contact = self.database.empty_contact
+        self.band_table = None
         self.get_log()
 
     def msg_from_main(self, msg):
         """Process messages from the main window."""
+        if msg.get("cmd", "") in (
+            "UPDATELOG",
+            "CONTACTCHANGED",
+            "DELETE",
+            "DELETED",
+        ):
+            delta = msg.get("delta")
+            if self.band_table is not None and delta and not delta.get("reset"):
+                apply_band_table_delta(self.band_table, "ZN", delta)
+            else:
+                self.band_table = None
+        if msg.get("cmd", "") == "NEWDB":
+            self.band_table = None
+
         if self.active is True and self.isVisible():
             if msg.get("cmd", "") in (
                 "UPDATELOG",
@@ -0,0 +1,127 @@
+import sqlite3
+from pathlib import Path
+
+import adif_io
+import pytest
+
+from not1mm.lib.adif_import import (
+    AdifImportError,
+    ascii_text,
+    contact_from_adif,
+    count_records,
+    read_records,
+)
+from not1mm.lib.database import DataBase
+
+APP_DATA = Path(__file__).parent.parent / "not1mm" / "data"
+
+ADIF = (
+    "Exported by a logger <PROGRAMID:6>N1MM+ <ADIF_VER:5>3.1.4 <EOH>\n"
+    "<CALL:5>K6GTE <QSO_DATE:8>20260101 <TIME_ON:6>120000 <FREQ:6>14.025 "
+    "<BAND:3>20m <MODE:2>CW <RST_SENT:3>599 <RST_RCVD:3>599 <STX_STRING:1>1 "
+    "<SRX_STRING:3>123 <NAME:4>Mïke <APP_N1MM_POINTS:1>3 <EOR>\n"
+    "<call:4>W1AW <qso_date:8>20260101 <time_on:4>1201 <band:3>40M "
+    "<mode:3>SSB <cqz:1>5 <class:2>1A <arrl_sect:2>CT <eor>\n"
+    "<CALL:6>DL1ABC <QSO_DATE:8>20260101 <TIME_ON:6>120200 <FREQ:5>3.525 "
+    "<SUBMODE:3>FT4 <APP_N1MM_RADIONR:1>2 <EOR>\n"
+)
+
+WHEN = "<QSO_DATE:8>20260101 <TIME_ON:4>1200"
+
+
+@pytest.fixture
+def database(tmp_path):
+    return DataBase(tmp_path / "test.db", APP_DATA, current_contest=1)
+
+
+def legacy_ascii(data: bytes) -> str:
+    """How imp_adif used to filter the file."""
+    ascii_content = ""
+    for b in data:
+        if b < 128:
+            ascii_content = ascii_content + chr(b)
+    return ascii_content
+
+
+def test_ascii_text_matches_legacy():
+    data = ADIF.encode("utf-8") + bytes(range(256))
+    assert ascii_text(data) == legacy_ascii(data)
+
+
+@pytest.mark.parametrize("text", [ADIF, ADIF[ADIF.index("<CALL") :], "<EOH>", ""])
+def test_read_records_matches_adif_io(text):
+    records = list(read_records(text))
+    if text:
+        assert records == adif_io.read_from_string(text)[0]
+    assert count_records(text) == len(records)
+
+
+def test_read_records_is_lazy():
+    records = read_records(ADIF + "<CALL:3>BAD<CALL:3>BAD<EOR>")
+    assert next(records)["CALL"] == "K6GTE"
+    assert len([next(records), next(records)]) == 2
+    with pytest.raises(adif_io.AdifDuplicateFieldError):
+        next(records)
+
+
+def test_contact_from_adif(database):
+    empty = database.get_empty()
+    first, second, third = [
+        contact_from_adif(record, empty, number)
+        for number, record in enumerate(read_records(ADIF), start=1)
+    ]
+    assert first["TS"] == "2026-01-01 12:00:00"
+    assert (first["Freq"], first["Band"], first["Mode"]) == (14025.0, 14.0, "CW")
+    assert (first["SNT"], first["SentNr"], first["NR"]) == ("599", "1", "123")
+    assert first["Points"] == "3"
+    assert first["RadioNR"] == first["Run1Run2"] == 1
+    assert second["TS"] == "2026-01-01 12:01:00"
+    assert (second["Freq"], second["Band"]) == (7000.0, 7.0)
+    assert (second["ZN"], second["Exchange1"], second["Sect"]) == ("5", "1A", "CT")
+    assert (third["Band"], third["Mode"], third["RadioNR"]) == (3.5, "FT4", "2")
+    assert len({first["ID"], second["ID"], third["ID"]}) == 3
+    assert empty["Call"] == ""
+
+
+@pytest.mark.parametrize(
+    "record, message",
+    [
+        ("<CALL:4>W1AW <MODE:2>CW <BAND:3>20m", "Date/time not found"),
+        (f"{WHEN} <MODE:2>CW <BAND:3>20m", "Callsign"),
+        (f"<CALL:4>W1AW {WHEN} <MODE:2>CW", "Frequency"),
+        (f"<CALL:4>W1AW {WHEN} <BAND:3>20m", "Mode"),
+    ],
+)
+def test_unusable_record(database, record, message):
+    (qso,) = read_records(f"{record} <EOR>")
+    with pytest.raises(AdifImportError, match=f"{message}.* QSO #7"):
+        contact_from_adif(qso, database.get_empty(), 7)
+
+
+def test_log_contacts(database):
+    empty = dict(database.get_empty(), ContestNR=1, ContestName="GENERAL")
+    contacts = [contact_from_adif(record, empty, 1) for record in read_records(ADIF)]
+    with database.transaction():
+        assert database.log_contacts(contacts) == 3
+    assert [contact["Call"] for contact in database.fetch_all_contacts_asc()] == [
+        "K6GTE",
+        "W1AW",
+        "DL1ABC",
+    ]
+    assert ("2026-01-01 12:01:00", "W1AW") in database.fetch_call_time_stamps()
+    assert database.log_contacts([]) == 0
+
+
+def test_failing_chunk_rolls_import_back(database):
+    empty = dict(database.get_empty(), ContestNR=1, ContestName="GENERAL")
+    contacts = [contact_from_adif(record, empty, 1) for record in read_records(ADIF)]
+    database.log_contacts(contacts[:1])
+    # The second row of the failing chunk can not be bound.
+    failing = [contacts[2], dict(contacts[1], Name={"not": "bindable"})]
+    with pytest.raises(sqlite3.Error):
+        with database.transaction():
+            assert database.log_contacts(contacts[1:2]) == 1
+            database.log_contacts(failing)
+    assert [contact["Call"] for contact in database.fetch_all_contacts_asc()] == [
+        "K6GTE"
+    ]
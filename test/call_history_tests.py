@@ -0,0 +1,105 @@
+import random
+from pathlib import Path
+
+import pytest
+
+from not1mm.lib.call_history import parse_call_history
+from not1mm.lib.database import DataBase
+
+APP_DATA = Path(__file__).parent.parent / "not1mm" / "data"
+
+HISTORY = """# CWT call history
+# !!Order!! in a comment is not the header
+!!Order!!,Call,Name,Exch1,UserText,
+K6GTE,MIKE,1234,
+N2CQR,BILL
+# a comment
+K5TUX,TUX,,penguin,extra
+
+,NOCALL,,
+K6GTE,MICHAEL,999,second entry
+"""
+
+
+def legacy_parse(lines):
+    """The parsing MainWindow.load_call_history did before the stream."""
+    found_index = -1
+    for index, item in enumerate(lines):
+        if "!!Order!!" in item and "#" not in item:
+            found_index = index
+            break
+    if found_index == -1:
+        return []
+    item_names = lines[found_index].strip().split(",")[1:]
+    group_list = []
+    for line in lines[found_index + 1 :]:
+        if line.startswith("#"):
+            continue
+        group = {}
+        fields = line.strip().split(",")
+        count = 0
+        for item in item_names:
+            if item == "":
+                continue
+            group[item] = fields[count] if count < len(fields) else ""
+            count += 1
+        group_list.append(group)
+    return group_list
+
+
+@pytest.fixture
+def database(tmp_path):
+    return DataBase(tmp_path / "test.db", APP_DATA, current_contest=1)
+
+
+def test_parse_matches_legacy():
+    lines = HISTORY.splitlines(keepends=True)
+    expected = [row for row in legacy_parse(lines) if row["Call"]]
+    assert list(parse_call_history(lines)) == expected
+    assert expected[1] == {"Call": "N2CQR", "Name": "BILL", "Exch1": "", "UserText": ""}
+
+
+def test_parse_without_header():
+    assert list(parse_call_history(["K6GTE,MIKE\n"])) == []
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 1000])
+def test_load_in_chunks(database, chunk_size):
+    rows = parse_call_history(HISTORY.splitlines())
+    assert database.load_callhistory(rows, chunk_size=chunk_size) == 4
+    assert database.exec_sql("select count(*) as n from CALLHISTORY;")["n"] == 4
+    # The first entry for a call wins, as the indexed query would return.
+    assert database.fetch_call_history("K6GTE")["Name"] == "MIKE"
+    assert database.fetch_call_history("K5TUX")["UserText"] == "penguin"
+    assert database.fetch_call_history("W1AW") is None
+
+
+def test_unknown_columns_are_dropped(database):
+    rows = [{"Call": "K6GTE", "Shoe": "10", "Name": "MIKE"}]
+    assert database.load_callhistory(rows) == 1
+    assert database.fetch_call_history("K6GTE")["Name"] == "MIKE"
+
+
+def test_map_follows_changes(tmp_path, database):
+    database.load_callhistory([{"Call": "K6GTE", "Name": "MIKE"}])
+    database.add_callhistory_item({"Call": "N2CQR", "Name": "BILL"})
+    assert database.fetch_call_history("N2CQR")["Name"] == "BILL"
+    database.delete_callhistory()
+    assert database.fetch_call_history("K6GTE") is None
+
+    database.load_callhistory([{"Call": "K5TUX", "Name": "TUX"}])
+    reopened = DataBase(tmp_path / "test.db", APP_DATA)
+    assert reopened.fetch_call_history("K5TUX")["Name"] == "TUX"
+
+
+def test_map_matches_query(database):
+    rng = random.Random(1)
+    calls = ["K6GTE", "N2CQR", "K5TUX", "W1AW", "DL1AA"]
+    database.load_callhistory(
+        {"Call": rng.choice(calls), "Name": str(number)} for number in range(200)
+    )
+    for call in calls + ["k6gte", ""]:
+        expected = database.exec_sql(
+            "select * from CALLHISTORY where call = ?;", (call,)
+        )
+        assert database.fetch_call_history(call) == expected
@@ -0,0 +1,85 @@
+import pytest
+
+from not1mm.lib.cat_flrig import FlrigCAT
+from not1mm.testing.fakeflrig import MODES, FakeFlrig
+
+
+def serve(**kwargs):
+    server = FakeFlrig(**kwargs)
+    server.start()
+    return server
+
+
+@pytest.fixture
+def server():
+    the_server = serve()
+    yield the_server
+    the_server.shutdown()
+    the_server.server_close()
+
+
+@pytest.fixture
+def rig(server):
+    cat = FlrigCAT("127.0.0.1", server.port)
+    assert cat.online
+    server.round_trips = 0
+    server.calls.clear()
+    return cat
+
+
+def test_state_in_one_request(server, rig):
+    assert rig.get_state() == ("14032000", "CW", "50")
+    assert server.round_trips == 1
+    assert server.calls == [
+        "system.multicall",
+        "rig.get_vfo",
+        "rig.get_mode",
+        "rig.get_bw",
+    ]
+
+
+def test_state_matches_separate_calls(server, rig):
+    server.radio.update(freq="7025000", mode="LSB", bw="2400")
+    assert rig.get_state() == (rig.get_vfo(), rig.get_mode(), rig.get_bw())
+
+
+def test_connection_kept_alive(server, rig):
+    for _ in range(5):
+        rig.get_state()
+    rig.set_vfo("14025000")
+    assert rig.get_vfo() == "14025000"
+    assert server.connections == 1
+    assert server.round_trips == 7
+
+
+def test_without_multicall():
+    server = serve(multicall=False)
+    try:
+        rig = FlrigCAT("127.0.0.1", server.port)
+        assert rig.get_state() == ("14032000", "CW", "50")
+        assert not rig.multicall
+        assert rig.online
+        server.calls.clear()
+        assert rig.get_state() == ("14032000", "CW", "50")
+        assert server.calls == ["rig.get_vfo", "rig.get_mode", "rig.get_bw"]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_mode_list_asked_once(server, rig):
+    assert rig.get_mode_list() == MODES
+    assert rig.get_mode_list() == MODES
+    assert server.calls == ["rig.get_modes"]
+
+
+def test_offline():
+    server = FakeFlrig()
+    port = server.port
+    server.server_close()
+    rig = FlrigCAT("127.0.0.1", port)
+    assert not rig.online
+    assert rig.get_state() == ("", "", "")
+    assert not rig.online
+    assert rig.multicall
+
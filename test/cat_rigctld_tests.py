@@ -0,0 +1,78 @@
+import pytest
+
+from not1mm.lib.cat_rigctld import RigctldCAT
+from not1mm.testing.fakerigctld import FakeRigctld
+
+
+@pytest.fixture
+def server():
+    the_server = FakeRigctld()
+    the_server.start()
+    yield the_server
+    the_server.shutdown()
+    the_server.server_close()
+
+
+@pytest.fixture
+def rig(server):
+    cat = RigctldCAT("127.0.0.1", server.port)
+    assert cat.online
+    server.round_trips = 0
+    server.commands.clear()
+    return cat
+
+
+def test_state_in_one_round_trip(server, rig):
+    assert rig.get_state() == ("14032000", "CW", "500")
+    assert server.round_trips == 1
+    assert server.commands == ["v", "f VFOA", "m VFOA"]
+
+
+def test_state_follows_vfo_switch(server, rig):
+    server.radio["vfo"] = "VFOB"
+    assert rig.get_state() == ("7025000", "LSB", "2400")
+    assert server.round_trips == 2
+    assert rig.current_vfo == "VFOB"
+    server.round_trips = 0
+    assert rig.get_vfo() == "7025000"
+    assert server.round_trips == 1
+
+
+def test_replies_matched_to_commands(rig):
+    replies = rig.rigctld_batch(["m VFOA", "bogus", "f VFOB", "t VFOA"])
+    assert [rig.rigctld_parse(reply).get("RPRT") for reply in replies] == [
+        "0",
+        "-1",
+        "0",
+        "0",
+    ]
+    assert rig.rigctld_parse(replies[0])["Mode"] == "CW"
+    assert rig.rigctld_parse(replies[2])["Frequency"] == "7025000"
+    assert rig.get_ptt() == "0"
+
+
+def test_replies_split_across_reads(server, rig):
+    server.dribble = True
+    assert rig.get_state() == ("14032000", "CW", "500")
+    assert rig.get_mode_list()[:3] == ["AM", "CW", "USB"]
+
+
+def test_setters(server, rig):
+    rig.set_vfo("14074000")
+    rig.set_mode("USB")
+    assert rig.get_state() == ("14074000", "USB", "500")
+    assert server.radio["freq"]["VFOA"] == "14074000"
+
+
+def test_reconnects_after_server_drops(server, rig):
+    rig.rigctrlsocket.close()
+    assert rig.get_state() == ("", "", "0")
+    assert not rig.online
+    assert rig.get_state() == ("14032000", "CW", "500")
+    assert rig.online
+
+
+def test_offline_without_server():
+    rig = RigctldCAT("127.0.0.1", 9)
+    assert not rig.online
+    assert rig.rigctld_batch(["v", "f VFOA"]) == ["", ""]
@@ -0,0 +1,98 @@
+import pytest
+
+from not1mm.lib.cluster_ingest import SpotIngest, parse_spot
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def spot(dx, freq):
+    return {"cmd": "DX", "dx": dx, "freq": freq, "spotter": "W3LPL-#:"}
+
+
+@pytest.mark.parametrize(
+    "line, expected",
+    [
+        (
+            "DX de W3LPL-#:   14025.0  K5TUX        CW 25 dB 23 WPM CQ     1530Z",
+            ("W3LPL-#:", 14025.0, "K5TUX", "CW 25 dB 23 WPM CQ"),
+        ),
+        (
+            "DX de VE7CC-1-#:14025.0  N2CQR  CW 25 dB    1530Z",
+            ("VE7CC-1-#:", 14025.0, "N2CQR", "CW 25 dB"),
+        ),
+        (
+            "DX de K1TTT:     7074.0  JA1XX  FT8 -12 dB   1530Z FN32",
+            ("K1TTT:", 7074.0, "JA1XX", "FT8 -12 dB"),
+        ),
+        ("DX de K1TTT:     7012.5  JA1XX  1530Z", ("K1TTT:", 7012.5, "JA1XX", "")),
+        (
+            "\x07DX de K1TTT: 3525 NE4RD  up 2  POTA 0012Z",
+            ("K1TTT:", 3525.0, "NE4RD", "up 2 POTA"),
+        ),
+        ("WWV de W0MU <18>:   SFI=150, A=5, K=1", None),
+        ("DX de K1TTT: is not a spot", None),
+    ],
+)
+def test_parse_spot(line, expected):
+    result = parse_spot(line)
+    if expected is None:
+        assert result is None
+        return
+    assert result["cmd"] == "DX"
+    assert (
+        result["spotter"],
+        result["freq"],
+        result["dx"],
+        result["comment"],
+    ) == expected
+
+
+def test_batch_keeps_newest_spot_per_call_and_band():
+    ingest = SpotIngest(clock=FakeClock())
+    assert ingest.push(spot("K5TUX", 14025.0))
+    assert ingest.push(spot("N2CQR", 14030.0))
+    assert ingest.push(spot("K5TUX", 14026.0))
+    assert ingest.push(spot("K5TUX", 7025.0))
+    batch = ingest.drain()
+    assert [(item["dx"], item["freq"]) for item in batch] == [
+        ("N2CQR", 14030.0),
+        ("K5TUX", 14026.0),
+        ("K5TUX", 7025.0),
+    ]
+    assert ingest.drain() == []
+    assert ingest.stats()["duplicates"] == 1
+
+
+def test_respots_dropped_within_window():
+    clock = FakeClock()
+    ingest = SpotIngest(dedupe_seconds=30, clock=clock)
+    ingest.push(spot("K5TUX", 14025.0))
+    ingest.drain()
+    clock.now += 10
+    assert not ingest.push(spot("K5TUX", 14025.05))
+    assert ingest.push(spot("K5TUX", 14027.0))
+    ingest.drain()
+    clock.now += 31
+    assert ingest.push(spot("K5TUX", 14027.0))
+    assert len(ingest) == 1
+
+
+def test_stats():
+    clock = FakeClock()
+    ingest = SpotIngest(clock=clock)
+    for count in range(20):
+        ingest.push(spot(f"K{count}ABC", 14000.0 + count))
+    clock.now += 0.05
+    ingest.drain()
+    stats = ingest.stats()
+    assert stats["received"] == 20
+    assert stats["passed"] == 20
+    assert stats["batches"] == 1
+    assert stats["spots_per_sec"] == pytest.approx(2.0)
+    assert stats["last_latency_ms"] == pytest.approx(50.0)
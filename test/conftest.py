@@ -0,0 +1,34 @@
+from pathlib import Path
+
+import pytest
+
+from not1mm.lib.database import DataBase
+
+APP_DATA = Path(__file__).parent.parent / "not1mm" / "data"
+
+
+def make_contact(database, number, call, band=14.0, mode="CW", **fields):
+    """
+    Contact number of contest 1, logged number seconds into 2026 with the ID
+    id and number in four digits. fields are set over the defaults.
+    """
+    contact = database.get_empty().copy()
+    contact.update(
+        {
+            "TS": f"2026-01-01 00:{number // 60:02d}:{number % 60:02d}",
+            "Call": call,
+            "Band": band,
+            "Mode": mode,
+            "ContestNR": 1,
+            "Run1Run2": 1,
+            "ID": f"id{number:04d}",
+        }
+    )
+    contact.update(fields)
+    return contact
+
+
+@pytest.fixture
+def database(tmp_path):
+    """An empty log for contest 1."""
+    return DataBase(tmp_path / "test.db", APP_DATA, current_contest=1)
@@ -0,0 +1,300 @@
+from types import SimpleNamespace
+
+import pytest
+from conftest import APP_DATA, make_contact
+
+from not1mm.lib.contest_state import (
+    DUPE_KEYS,
+    BandSummary,
+    ContestState,
+    apply_band_table_delta,
+    band_table_from_rows,
+    band_table_rows,
+)
+from not1mm.lib.database import DataBase
+from not1mm.plugins import es_open, john_moyle_field_day
+
+
+@pytest.fixture
+def database(database):
+    for number, call, band, mode, prefix, zone in (
+        (1, "K6GTE", 14.0, "CW", "K", 5),
+        (2, "K6GTE", 7.0, "USB", "K", 5),
+        (3, "DL1ABC", 14.0, "CW", "DL", 14),
+    ):
+        database.log_contact(
+            make_contact(
+                database, number, call, band, mode, CountryPrefix=prefix, ZN=zone
+            )
+        )
+    return database
+
+
+def test_load_matches_database(database):
+    state = ContestState()
+    state.load(database)
+    assert state.qso_count() == 3
+    worked = database.get_calls_and_bands()
+    assert state.worked_list().keys() == worked.keys()
+    for call, bands in state.worked_list().items():
+        assert sorted(bands) == sorted(worked[call])
+    assert state.distinct_count("CountryPrefix") == 2
+    assert (
+        state.distinct_count("CountryPrefix", per_band=True)
+        == database.fetch_country_band_count()["cb_count"]
+    )
+
+
+def test_dupe_keys(database):
+    state = ContestState()
+    state.load(database)
+    assert state.call_worked("K6GTE")
+    assert state.call_worked("K6GTE", "14.0")
+    assert not state.call_worked("K6GTE", 21.0)
+    assert state.call_worked("K6GTE", 7.0, "LSB")
+    assert not state.call_worked("K6GTE", 7.0, "CW")
+
+
+def legacy_is_dupe(database, dupe_type, call, band, mode) -> bool:
+    """What MainWindow.check_dupe used to ask the database."""
+    if dupe_type == 1:
+        result = database.check_dupe(call)
+    elif dupe_type == 2:
+        result = database.check_dupe_on_band(call, band)
+    else:
+        result = database.check_dupe_on_band_mode(call, band, mode)
+    return bool(result.get("isdupe"))
+
+
+@pytest.mark.parametrize("dupe_type", [1, 2, 3])
+def test_is_dupe_matches_queries(database, dupe_type):
+    state = ContestState()
+    state.set_dupe_key(DUPE_KEYS[dupe_type])
+    state.load(database)
+    new = make_contact(database, 4, "W1AW", 21.0, mode="RTTY")
+    database.log_contact(new)
+    state.add(new)
+    database.change_contact(dict(new, Band=14.0))
+    state.change(dict(new, Band=14.0))
+    database.delete_contact("id0002")
+    state.remove("id0002")
+    for call in ("K6GTE", "DL1ABC", "W1AW", "N2CQR"):
+        for band in (7.0, 14.0, 21.0):
+            for mode in ("CW", "USB", "FT8"):
+                contact = {"Call": call, "Band": band, "Mode": mode}
+                assert state.is_dupe(contact) is legacy_is_dupe(
+                    database, dupe_type, call, band, mode
+                ), (call, band, mode)
+
+
+def test_dupe_key_set_after_load(database):
+    state = ContestState()
+    state.load(database)
+    contact = {"Call": "K6GTE", "Band": 21.0, "Mode": "CW"}
+    assert state.is_dupe(contact) is None
+    state.set_dupe_key(DUPE_KEYS[1])
+    assert state.is_dupe(contact) is True
+    state.set_dupe_key(DUPE_KEYS[2])
+    assert state.is_dupe(contact) is False
+    state.set_dupe_key(None)
+    assert state.is_dupe(contact) is None
+
+
+def test_plugin_dupe_key_by_period(database):
+    main = SimpleNamespace(contest_settings={"StartDate": "2026-01-01 00:00:00"})
+    state = ContestState()
+    state.set_dupe_key(lambda contact: es_open.dupe_key(main, contact))
+    state.load(database)
+
+    def contact(time_stamp, mode="CW"):
+        return {"Call": "K6GTE", "Band": 14.0, "Mode": mode, "TS": time_stamp}
+
+    # The fixture's contacts were logged in the first hour.
+    assert state.is_dupe(contact("2026-01-01 00:59:59")) is True
+    assert state.is_dupe(contact("2026-01-01 00:30:00", mode="USB")) is False
+    assert state.is_dupe(contact("2026-01-01 01:00:00")) is False
+    # Outside the contest periods the plugin's own check decides.
+    assert state.is_dupe(contact("2026-01-01 04:00:00")) is None
+
+
+def test_plugin_dupe_key_by_block():
+    contact = {"Call": "K6GTE", "Band": 14.0, "Mode": "USB"}
+
+    def key(**fields):
+        return john_moyle_field_day.dupe_key(None, dict(contact, **fields))
+
+    first = key(TS="2026-03-14 01:00:00")
+    assert first == key(TS="2026-03-14 03:59:59")
+    assert first != key(TS="2026-03-14 04:00:00")
+    assert first[2] == "PH"
+    assert key(Mode="FT8") is None
+
+
+def serials_from_queries(database) -> tuple:
+    """What get_sn and process_macro used to ask the database."""
+    return (
+        database.get_last_serial().get("serial_nr"),
+        database.get_serial().get("serial_nr") or 1,
+    )
+
+
+def test_serials_match_queries(tmp_path):
+    database = DataBase(tmp_path / "test.db", APP_DATA, current_contest=1)
+    state = ContestState()
+    state.load(database)
+    assert (state.last_serial(), state.next_serial()) == (None, 1)
+    for number in range(1, 4):
+        contact = make_contact(database, number, "K6GTE", SentNr=number)
+        database.log_contact(contact)
+        state.add(contact)
+        assert (state.last_serial(), state.next_serial()) == serials_from_queries(
+            database
+        )
+    steps = [
+        lambda: (
+            "id0003",
+            dict(database.fetch_contact_by_uuid("id0003"), SentNr=10),
+        ),
+        lambda: ("id0003", None),
+        lambda: ("id0002", None),
+        lambda: (
+            "id0001",
+            dict(database.fetch_contact_by_uuid("id0001"), SentNr=0),
+        ),
+        lambda: ("id0001", None),
+    ]
+    for step in steps:
+        unique_id, changed = step()
+        if changed is None:
+            database.delete_contact(unique_id)
+            state.remove(unique_id)
+        else:
+            database.change_contact(changed)
+            state.change(database.fetch_contact_by_uuid(unique_id))
+        assert (state.last_serial(), state.next_serial()) == serials_from_queries(
+            database
+        )
+    assert state.next_serial() == 1
+
+
+def test_add_change_remove_produce_deltas(database):
+    state = ContestState()
+    state.load(database)
+    deltas = []
+    state.subscribe(deltas.append)
+
+    new = make_contact(database, 4, "W1AW", "21.0")
+    delta = state.add(new)
+    assert [c["Call"] for c in delta["added"]] == ["W1AW"]
+    assert delta["removed"] == []
+    assert state.worked_list()["W1AW"] == [21.0]
+
+    changed = dict(new, Call="W1AX")
+    delta = state.change(changed)
+    assert [c["Call"] for c in delta["removed"]] == ["W1AW"]
+    assert "W1AW" not in state.worked_list()
+    assert state.call_worked("W1AX", 21.0)
+
+    delta = state.remove("id0001")
+    assert [c["ID"] for c in delta["removed"]] == ["id0001"]
+    assert state.worked_list()["K6GTE"] == [7.0]
+    assert not state.call_worked("K6GTE", 14.0)
+    assert len(deltas) == 3
+
+
+def test_band_table_delta_matches_query(database):
+    table = band_table_from_rows(database.fetch_dxcc_by_band_count(), "CountryPrefix")
+    state = ContestState()
+    state.load(database)
+
+    contact = make_contact(database, 5, "G4ABC", 28.0, CountryPrefix="G")
+    database.log_contact(contact)
+    apply_band_table_delta(table, "CountryPrefix", state.add(contact))
+    database.delete_contact("id0003")
+    apply_band_table_delta(table, "CountryPrefix", state.remove("id0003"))
+
+    expected = band_table_from_rows(
+        database.fetch_dxcc_by_band_count(), "CountryPrefix"
+    )
+    assert band_table_rows(table) == band_table_rows(expected)
+
+
+def test_edit_of_country_keeps_tracker_counts(database):
+    table = band_table_from_rows(database.fetch_dxcc_by_band_count(), "CountryPrefix")
+    state = ContestState()
+    state.load(database)
+
+    def recalculate(since):
+        """Re-score every contact from since on, like recalculate_mults."""
+        delta = {"added": [], "removed": []}
+        for contact in database.fetch_all_contacts_asc():
+            if contact["TS"] >= since:
+                contact["IsMultiplier1"] = 1
+                database.change_contact(contact)
+                change = state.change(contact)
+                delta["added"] += change["added"]
+                delta["removed"] += change["removed"]
+        return delta
+
+    edited = dict(database.fetch_contact_by_uuid("id0001"), CountryPrefix="JA")
+    database.change_contact(edited)
+    for delta in state.edit("id0001", edited, recalculate):
+        apply_band_table_delta(table, "CountryPrefix", delta)
+    expected = band_table_from_rows(
+        database.fetch_dxcc_by_band_count(), "CountryPrefix"
+    )
+    assert band_table_rows(table) == band_table_rows(expected)
+    assert table["JA"][-1] == 1
+
+
+def legacy_stats_rows(database):
+    """The per band queries the statistics window used to run."""
+    contest = database.current_contest
+    modes = (
+        "sum(Mode like 'CW%') as cw, "
+        "sum(Mode in ('LSB','USB','SSB','FM','AM')) as ph, "
+        "sum(Mode in ('FT8','FT4','RTTY','PSK31','FSK441','MSK144','JT65',"
+        "'JT9','Q65','PKTUSB','PKTLSB')) as di"
+    )
+    rows = []
+    for band in database.exec_sql_mult(
+        f"select DISTINCT(Band) as band from DXLOG where ContestNR = {contest} "
+        "ORDER BY band DESC;"
+    ):
+        row = database.exec_sql(
+            "select count(*) as qs, count(DISTINCT(Call)) as calls, "
+            f"{modes}, count(DISTINCT(WPXPrefix)) as wpx, sum(Points) as pts "
+            "from DXLOG where ContestNR = ? and Band = ?;",
+            (contest, band["band"]),
+        )
+        rows.append([band["band"], *(value or 0 for value in row.values())])
+    row = database.exec_sql(
+        f"select count(*) as qs, count(DISTINCT(Call)) as calls, {modes}, "
+        "count(DISTINCT(WPXPrefix || ':' || Band)) as wpx, sum(Points) as pts "
+        "from DXLOG where ContestNR = ?;",
+        (contest,),
+    )
+    rows.append(["TOTAL", *(value or 0 for value in row.values())])
+    return rows
+
+
+def test_band_summary_matches_queries(database):
+    database.log_contact(
+        make_contact(database, 4, "W1AW", 14.0, WPXPrefix="W1", Points=3)
+    )
+    summary = BandSummary()
+    summary.load(database.fetch_band_summary())
+    assert summary.rows() == legacy_stats_rows(database)
+
+    state = ContestState()
+    state.load(database)
+    contact = make_contact(
+        database, 5, "K6GTE", 21.0, mode="FT8", WPXPrefix="K6", Points=2
+    )
+    database.log_contact(contact)
+    summary.apply_delta(state.add(contact))
+    database.change_contact(dict(contact, Band=7.0, Mode="LSB"))
+    summary.apply_delta(state.change(dict(contact, Band=7.0, Mode="LSB")))
+    database.delete_contact("id0001")
+    summary.apply_delta(state.remove("id0001"))
+    assert summary.rows() == legacy_stats_rows(database)
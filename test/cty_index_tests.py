@@ -0,0 +1,77 @@
+import json
+import os
+
+import pytest
+
+from not1mm.lib.cty_index import CtyIndex, load_cty_index
+
+CTY = {
+    "K": {"entity": "United States", "primary_pfx": "K", "exact_match": False},
+    "KH6": {"entity": "Hawaii", "primary_pfx": "KH6", "exact_match": False},
+    "KH6X": {"entity": "Hawaii X", "primary_pfx": "KH6", "exact_match": False},
+    "K6GTE": {"entity": "Exact", "primary_pfx": "KL", "exact_match": True},
+    "VE": {"entity": "Canada", "primary_pfx": "VE", "exact_match": False},
+}
+
+
+def legacy_lookup(ctyfile, callsign):
+    callsign = callsign.upper()
+    for count in reversed(range(len(callsign))):
+        searchitem = callsign[: count + 1]
+        result = {key: val for key, val in ctyfile.items() if key == searchitem}
+        if not result:
+            continue
+        if result.get(searchitem).get("exact_match"):
+            if searchitem == callsign:
+                return result
+            continue
+        return result
+
+
+@pytest.mark.parametrize(
+    "call, expected_key",
+    [
+        ("K6GTE", "K6GTE"),
+        ("k6gte", "K6GTE"),
+        ("K6GTEX", "K"),
+        ("KH6XYZ", "KH6X"),
+        ("KH6ABC", "KH6"),
+        ("VE3ABC", "VE"),
+        ("ZZ1ZZ", None),
+        ("", None),
+    ],
+)
+def test_lookup(call, expected_key):
+    result = CtyIndex(CTY).lookup(call)
+    if expected_key is None:
+        assert result is None
+    else:
+        assert list(result) == [expected_key]
+        assert result[expected_key] is CTY[expected_key]
+
+
+@pytest.mark.parametrize(
+    "call", ["K6GTE", "K6GTE/P", "KH6X", "KH6", "K", "VE3X", "W1AW", "KH6XX/7"]
+)
+def test_lookup_matches_legacy_scan(call):
+    assert CtyIndex(CTY).lookup(call) == legacy_lookup(CTY, call)
+
+
+def test_get_by_primary_prefix():
+    index = CtyIndex(CTY)
+    assert index.get("VE", {}).get("entity") == "Canada"
+    assert index.get("XX", {}) == {}
+
+
+def test_load_cty_index_is_shared_until_file_changes(tmp_path):
+    cty_path = tmp_path / "cty.json"
+    cty_path.write_text(json.dumps(CTY), encoding="utf-8")
+    first = load_cty_index(cty_path)
+    assert load_cty_index(cty_path) is first
+
+    cty_path.write_text(json.dumps({"G": CTY["VE"]}), encoding="utf-8")
+    stat = cty_path.stat()
+    os.utime(cty_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    second = load_cty_index(cty_path)
+    assert second is not first
+    assert list(second.lookup("G4ABC")) == ["G"]
@@ -0,0 +1,193 @@
+import sqlite3
+
+import pytest
+from conftest import APP_DATA, make_contact
+
+from not1mm.lib.database import DXLOG_INDEXES, DataBase, mode_class_sql
+from not1mm.lib.ham_utility import mode_class
+
+
+@pytest.fixture
+def database(database):
+    database.log_contact(make_contact(database, 1, "K6GTE"))
+    database.log_contact(make_contact(database, 2, "K6GTE", 7.0, "USB"))
+    return database
+
+
+def query_plan(database, query, params):
+    rows = database.exec_sql_mult(f"EXPLAIN QUERY PLAN {query}", params)
+    return " / ".join(row["detail"] for row in rows)
+
+
+HOT_QUERIES = [
+    (
+        "select ID, TS, IsRunQSO from dxlog where ContestNR = ? order by TS ASC;",
+        (1,),
+        "dxlog_ts",
+    ),
+    (
+        "select count(*) as isdupe from dxlog where Call = ? and ContestNR = ?;",
+        ("K6GTE", 1),
+        "dxlog_call_band_mode",
+    ),
+    (
+        "select count(*) as isdupe from dxlog where Call = ? and Band = ? and ContestNR = ?;",
+        ("K6GTE", 14.0, 1),
+        "dxlog_call_band_mode",
+    ),
+    (
+        "select count(*) as isdupe from dxlog where Call = ? and Band = ? and ModeClass = ? and ContestNR = ?;",
+        ("K6GTE", 14.0, "CW", 1),
+        "dxlog_call_band_mode",
+    ),
+    (
+        "select count(*) as wpx_count from dxlog where TS < ? and WPXPrefix = ? and ContestNR = ?;",
+        ("2026-01-01 00:00:00", "K6", 1),
+        "dxlog_wpx",
+    ),
+    (
+        "select count(*) as dxcc_count from dxlog where TS < ? and CountryPrefix = ? and ContestNR = ?;",
+        ("2026-01-01 00:00:00", "K", 1),
+        "dxlog_country",
+    ),
+    (
+        "select count(*) as sect_count from dxlog where Sect = ? and Band = ? and ContestNR = ?;",
+        ("ORG", 14.0, 1),
+        "dxlog_sect",
+    ),
+    (
+        "select count(*) as sect_count from dxlog where  TS < ? and Sect = ? and ContestNR = ?;",
+        ("2026-01-01 00:00:00", "ORG", 1),
+        "dxlog_sect",
+    ),
+    (
+        "select count(*) as nr_count from dxlog where TS < ? and NR = ? and ContestNR = ?;",
+        ("2026-01-01 00:00:00", 5, 1),
+        "dxlog_nr",
+    ),
+    (
+        "select count(*) as zn_count from dxlog where ZN = ? and ContestNR = ?;",
+        (5, 1),
+        "dxlog_zone",
+    ),
+    (
+        "select count(*) as count from dxlog where IsMultiplier1 = 1 and ContestNR = ?;",
+        (1,),
+        "dxlog_mult1",
+    ),
+    (
+        "select * from DXLOG where ContestNR = ? ORDER by ts DESC limit 10;",
+        (1,),
+        "dxlog_ts",
+    ),
+    (
+        "select sum(IsRunQSO) as runs, count(*) as totalqs from dxlog where ContestNR = ?;",
+        (1,),
+        "dxlog_ts",
+    ),
+    ("select * from dxlog where ID = ?;", ("id0001",), "dxlog_id"),
+    ("select * from CALLHISTORY where call = ?;", ("K6GTE",), "callhistory_call"),
+]
+
+
+@pytest.mark.parametrize("query,params,index", HOT_QUERIES)
+def test_hot_queries_use_indexes(database, query, params, index):
+    plan = query_plan(database, query, params)
+    assert f"INDEX {index}" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_schema_is_current(database):
+    assert database.schema_version() == len(DataBase.MIGRATIONS)
+    indexes = {
+        row["name"]
+        for row in database.exec_sql_mult(
+            "select name from sqlite_master where type = 'index' and tbl_name = 'DXLOG';"
+        )
+    }
+    assert {name for name, _ in DXLOG_INDEXES} <= indexes
+
+
+@pytest.mark.parametrize(
+    "mode", ["CW", "CW-R", "cw", "USB", "SSB", "FM", "FT8", "PKTUSB", "RTTY", "DV", ""]
+)
+def test_mode_class_sql_matches_python(mode):
+    conn = sqlite3.connect(":memory:")
+    result = conn.execute(
+        f"select {mode_class_sql()} from (select ? as Mode);", (mode,)
+    ).fetchone()[0]
+    assert result == mode_class(mode)
+
+
+def test_mode_class_follows_inserts_and_edits(database):
+    def stored(unique_id):
+        return database.fetch_contact_by_uuid(unique_id)["ModeClass"]
+
+    assert stored("id0001") == "CW"
+    assert stored("id0002") == "PH"
+    database.change_contact({"ID": "id0002", "Mode": "FT8"})
+    assert stored("id0002") == "DI"
+    assert database.check_dupe_on_band_mode("K6GTE", 7.0, "FT4")["isdupe"] == 1
+    assert database.check_dupe_on_band_mode("K6GTE", 7.0, "LSB")["isdupe"] == 0
+    assert database.check_dupe_on_band_mode("K6GTE", 14.0, "CW-U")["isdupe"] == 1
+
+
+def test_migrates_existing_database(tmp_path):
+    """A log from before the migrations, without Dirty or ModeClass."""
+    current = DataBase(tmp_path / "current.db", APP_DATA)
+    create_sql = current.exec_sql(
+        "select sql from sqlite_master where name = 'DXLOG';"
+    )["sql"]
+    filename = tmp_path / "old.db"
+    conn = sqlite3.connect(filename)
+    conn.execute(create_sql.replace("Dirty INTEGER DEFAULT 1,", ""))
+    conn.execute(
+        "insert into DXLOG (TS, Call, Mode, Band, ContestNR, Run1Run2, ID) "
+        "values ('2026-01-01 00:00:00', 'K6GTE', 'LSB', 3.5, 1, 1, 'x');"
+    )
+    conn.commit()
+    conn.close()
+
+    database = DataBase(filename, APP_DATA, current_contest=1)
+    assert database.schema_version() == len(DataBase.MIGRATIONS)
+    contact = database.fetch_contact_by_uuid("x")
+    assert contact["ModeClass"] == "PH"
+    assert contact["Dirty"] == 1
+    assert database.check_dupe_on_band_mode("K6GTE", 3.5, "USB")["isdupe"] == 1
+
+    # Opening it again is a no-op.
+    again = DataBase(filename, APP_DATA, current_contest=1)
+    assert again.schema_version() == len(DataBase.MIGRATIONS)
+
+
+def test_wal_journal(database):
+    assert database.exec_sql("PRAGMA journal_mode;")["journal_mode"] == "wal"
+    assert database.exec_sql("PRAGMA synchronous;")["synchronous"] == 1
+
+
+def test_row_factory_tracks_queries(database):
+    first = database.exec_sql_mult("select Call, Band from dxlog order by TS;")
+    second = database.exec_sql("select ID, Mode from dxlog where ID = 'id0001';")
+    assert first[0] == {"Call": "K6GTE", "Band": 14.0}
+    assert second == {"ID": "id0001", "Mode": "CW"}
+
+
+def test_transaction_commits_once(database, tmp_path):
+    reader = DataBase(tmp_path / "test.db", APP_DATA, current_contest=1)
+    with database.transaction():
+        database.log_contact(make_contact(database, 3, "W1AW", 14.0))
+        with database.transaction():
+            database.log_contact(make_contact(database, 4, "N2CQR", 14.0))
+        database.clear_dirty_flag("id0001")
+        assert reader.fetch_qso_count()["qsos"] == 2
+    assert reader.fetch_qso_count()["qsos"] == 4
+    assert reader.fetch_contact_by_uuid("id0001")["Dirty"] == 0
+
+
+def test_transaction_rolls_back_on_error(database):
+    with pytest.raises(RuntimeError):
+        with database.transaction():
+            database.log_contact(make_contact(database, 3, "W1AW", 14.0))
+            raise RuntimeError("import failed")
+    assert database.fetch_qso_count()["qsos"] == 2
+    assert database.transaction_depth == 0
@@ -0,0 +1,62 @@
+import importlib
+import itertools
+
+from not1mm.lib.dock_registry import DOCK_WINDOWS, DockRegistry, DockSpec
+from not1mm.lib.startup_profile import StartupProfile
+
+FRACTION = DockSpec(
+    "fraction_window",
+    "fractions",
+    "Fraction",
+    "actionFraction",
+    "fractionwindow",
+    None,
+    "fraction_closed",
+    "launch_fraction_window",
+)
+
+
+def ticking_clock(step=0.001):
+    """A clock advancing step seconds on every reading."""
+    ticks = itertools.count()
+    return lambda: next(ticks) * step
+
+
+def test_dock_windows_name_their_classes():
+    assert len({spec.name for spec in DOCK_WINDOWS}) == len(DOCK_WINDOWS)
+    for spec in DOCK_WINDOWS:
+        window_class = getattr(importlib.import_module(spec.module), spec.class_name)
+        assert hasattr(window_class, spec.closed)
+        assert spec.object_name == spec.name.replace("_", "-")
+
+
+def test_create_times_import_and_construction():
+    registry = DockRegistry((FRACTION,), clock=ticking_clock())
+    assert registry.timings == {}
+    window = registry.create("fraction_window", 1, denominator=3)
+    assert window == importlib.import_module("fractions").Fraction(1, 3)
+    assert registry.timings == {"fraction_window": (1.0, 1.0)}
+    assert registry.report()[1].split() == ["fraction_window", "1.0", "1.0"]
+
+
+def test_report_imports_deferred_windows():
+    registry = DockRegistry((FRACTION,), clock=ticking_clock())
+    assert registry.report()[1].split() == ["fraction_window", "1.0", "deferred"]
+    assert registry.timings == {}
+
+
+def test_startup_profile_steps():
+    clock = ticking_clock(0.5)
+    profile = StartupProfile(clock(), clock=clock)
+    profile.begin("Loading CTY file.")
+    profile.begin("Reading preferences.")
+    profile.finish()
+    lines = profile.report(["extra"]).splitlines()
+    assert [line.rsplit(None, 1)[1] for line in lines[1:5]] == [
+        "500.0",
+        "500.0",
+        "500.0",
+        "1500.0",
+    ]
+    assert lines[1].startswith("Importing modules.")
+    assert lines[-2:] == ["", "extra"]
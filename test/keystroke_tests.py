@@ -0,0 +1,122 @@
+import sys
+import threading
+import time
+
+import pytest
+from PyQt6.QtCore import QCoreApplication
+
+from not1mm.lib.keystroke import KeystrokeWorker, LatencyStats
+
+
+@pytest.fixture(scope="module")
+def qt_app():
+    app = QCoreApplication.instance()
+    if app is None:
+        app = QCoreApplication(sys.argv)
+    return app
+
+
+@pytest.fixture
+def worker():
+    """A worker whose jobs run only when the test calls run_pending."""
+    idle_worker = KeystrokeWorker()
+    results = []
+    idle_worker.finished.connect(
+        lambda stage, seq, result: results.append((stage, seq, result))
+    )
+    idle_worker.results = results
+    return idle_worker
+
+
+def test_latency_stats():
+    latency = LatencyStats()
+    latency.record("dupe", 2.0)
+    latency.record("dupe", 4.0)
+    with latency.measure("cty"):
+        time.sleep(0.01)
+    summary = latency.summary()
+    assert summary["dupe"] == {
+        "count": 2,
+        "last_ms": 4.0,
+        "max_ms": 4.0,
+        "mean_ms": 3.0,
+    }
+    assert summary["cty"]["count"] == 1
+    assert summary["cty"]["last_ms"] >= 10
+
+
+def test_newer_keystroke_cancels_waiting_job(worker):
+    calls = []
+    for seq, call in enumerate(["K5", "K5T", "K5TU"], start=1):
+        worker.submit("scp", seq, lambda text: calls.append(text) or text, call)
+    worker.run_pending()
+    assert calls == ["K5TU"]
+    assert worker.results == [("scp", 3, "K5TU")]
+    assert worker.accept("scp", 3)
+    assert worker.stats["cancelled"] == 2
+
+
+def test_result_overtaken_by_keystroke_is_stale(worker):
+    worker.submit("log", 1, str.lower, "K5")
+    worker.run_pending()
+    worker.submit("log", 2, str.lower, "K5T")
+    assert not worker.accept("log", 1)
+    worker.run_pending()
+    assert worker.accept("log", 2)
+    assert worker.results == [("log", 1, "k5"), ("log", 2, "k5t")]
+    assert worker.stats["stale"] == 1
+
+
+def test_jobs_run_oldest_keystroke_first(worker):
+    worker.submit("log", 1, str.lower, "K5")
+    worker.submit("scp", 2, str.lower, "K5T")
+    worker.submit("log", 3, str.lower, "K5TU")
+    worker.run_pending()
+    assert worker.results == [("scp", 2, "k5t"), ("log", 3, "k5tu")]
+
+
+def test_cancel(worker):
+    worker.submit("log", 1, str.lower, "K5")
+    worker.cancel("log")
+    worker.run_pending()
+    assert worker.results == []
+    worker.submit("scp", 2, str.lower, "K5T")
+    worker.run_pending()
+    worker.cancel("scp")
+    assert not worker.accept("scp", 2)
+
+
+def test_failed_job_is_skipped(worker):
+    worker.submit("scp", 1, int, "K5")
+    worker.submit("log", 2, str.lower, "K5")
+    worker.run_pending()
+    assert worker.results == [("log", 2, "k5")]
+
+
+def test_jobs_run_off_the_calling_thread(qt_app):
+    threaded = KeystrokeWorker()
+    delivered = []
+
+    def found(stage, seq, result):
+        if threaded.accept(stage, seq):
+            delivered.append(result)
+
+    def job(call):
+        time.sleep(0.02)
+        return call, threading.get_ident()
+
+    threaded.finished.connect(found)
+    threaded.start()
+    try:
+        for seq, call in enumerate(["K5", "K5T", "K5TU", "K5TUX"], start=1):
+            threaded.submit("scp", seq, job, call)
+        deadline = time.monotonic() + 5
+        while not delivered and time.monotonic() < deadline:
+            qt_app.processEvents()
+            time.sleep(0.005)
+    finally:
+        threaded.stop()
+    qt_app.processEvents()
+    assert [call for call, _ in delivered] == ["K5TUX"]
+    assert delivered[0][1] != threading.get_ident()
+    assert threaded.latency.summary()["scp"]["count"] == 1
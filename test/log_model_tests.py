@@ -0,0 +1,150 @@
+import sys
+
+import pytest
+from conftest import make_contact
+from PyQt6.QtCore import QCoreApplication, Qt
+
+from not1mm.lib import log_model
+from not1mm.lib.log_model import LogModel, display_text
+
+
+@pytest.fixture(scope="module")
+def qt_app():
+    app = QCoreApplication.instance()
+    if app is None:
+        app = QCoreApplication(sys.argv)
+    return app
+
+
+@pytest.fixture
+def database(database):
+    for number in range(450):
+        contact = make_contact(
+            database,
+            number,
+            f"K{number}ABC",
+            Freq=14025.123 + number,
+            IsMultiplier1=number % 2,
+        )
+        database.log_contact(contact)
+    return database
+
+
+def shown(model, column="Call") -> list:
+    column = model.column(column)
+    return [
+        model.data(model.index(row, column)) for row in range(model.rowCount())
+    ]
+
+
+def test_rows_match_database(qt_app, database):
+    model = LogModel()
+    model.load(database)
+    expected = database.fetch_all_contacts_asc()
+    assert model.rowCount() == len(expected)
+    for row in (0, 201, 449):
+        for header, field in log_model.COLUMNS:
+            index = model.index(row, model.column(header))
+            assert model.data(index) == display_text(field, expected[row][field])
+    assert model.data(model.index(0, model.column("Freq (KHz)"))) == "14025.12"
+    assert model.data(model.index(1, model.column("M1"))) == ""
+
+
+def test_only_visible_pages_fetched(qt_app, database):
+    model = LogModel()
+    model.load(database)
+    assert model.contacts == {}
+    model.data(model.index(5, 1))
+    model.data(model.index(150, 1))
+    assert model.pages_fetched == 1
+    assert len(model.contacts) == log_model.PAGE_SIZE
+    model.data(model.index(449, 1))
+    assert model.pages_fetched == 2
+
+
+def test_descending_sort(qt_app, database):
+    model = LogModel()
+    model.load(database)
+    model.sort(model.column("Call"), Qt.SortOrder.DescendingOrder)
+    calls = [contact["Call"] for contact in database.fetch_all_contacts_asc()]
+    assert shown(model) == sorted(calls, reverse=True)
+
+
+@pytest.mark.parametrize("order", list(Qt.SortOrder))
+def test_delta_adds_changes_and_removes_rows(qt_app, database, order):
+    model = LogModel()
+    model.load(database)
+    model.sort(0, order)
+    inserted = []
+    model.rowsInserted.connect(lambda _parent, first, last: inserted.append(first))
+    new = make_contact(database, 500, "N2CQR")
+    database.log_contact(new)
+    changed = database.fetch_contact_by_uuid("id0010")
+    changed["Call"] = "W1AW"
+    database.change_contact(changed)
+    database.delete_contact("id0020")
+    model.apply_delta(
+        {
+            "added": [{"ID": "id0500"}, {"ID": "id0010"}],
+            "removed": [{"ID": "id0010"}, {"ID": "id0020"}],
+        }
+    )
+    expected = [contact["Call"] for contact in database.fetch_all_contacts_asc()]
+    if order == Qt.SortOrder.DescendingOrder:
+        expected.reverse()
+    assert shown(model) == expected
+    assert inserted == [model.row_of("id0500")]
+    assert model.positions == {
+        unique_id: position for position, unique_id in enumerate(model.ids)
+    }
+    assert model.row_of("id0020") == -1
+
+
+def test_changed_sort_value_moves_row(qt_app, database):
+    model = LogModel()
+    model.load(database)
+    changed = database.fetch_contact_by_uuid("id0000")
+    changed["TS"] = "2026-01-02 00:00:00"
+    database.change_contact(changed)
+    model.refresh(["id0000"])
+    assert model.row_of("id0000") == model.rowCount() - 1
+    assert model.row_of("id0001") == 0
+    assert model.data(model.index(model.rowCount() - 1, 0)) == changed["TS"]
+
+
+def test_column_hiding(qt_app, database):
+    model = LogModel()
+    model.load(database)
+    model.set_visible(["Call", "YYYY-MM-DD HH:MM:SS", "PTS"])
+    assert model.columnCount() == 3
+    headers = [
+        model.headerData(column, Qt.Orientation.Horizontal)
+        for column in range(model.columnCount())
+    ]
+    assert headers == ["YYYY-MM-DD HH:MM:SS", "Call", "PTS"]
+    assert model.column("Freq (KHz)") == -1
+
+
+def test_edit_is_passed_on(qt_app, database):
+    model = LogModel()
+    model.load(database)
+    edited = []
+    model.contact_edited.connect(edited.append)
+    assert model.setData(model.index(3, model.column("Call")), "w1aw")
+    assert edited[0]["Call"] == "W1AW"
+    assert edited[0]["ID"] == "id0003"
+    assert shown(model)[3] == "K3ABC"
+    mult = model.index(3, model.column("M1"))
+    assert not model.flags(mult) & Qt.ItemFlag.ItemIsEditable
+
+
+def test_focused_log_keeps_given_contacts(qt_app, database):
+    model = LogModel(paged=False)
+    model.load(database)
+    assert model.rowCount() == 0
+    model.set_contacts(database.fetch_like_calls("K12"))
+    assert shown(model) == [f"K{number}ABC" for number in [12, *range(120, 130)]]
+    database.log_contact(make_contact(database, 600, "K12XYZ"))
+    model.refresh(["id0600", "id0012"])
+    assert model.row_of("id0600") == -1
+    assert model.pages_fetched == 0
@@ -0,0 +1,162 @@
+import threading
+import time
+
+import pytest
+from PyQt6.QtCore import Qt
+
+from not1mm.lib.lookup import HamQTH, QRZlookup
+from not1mm.lib.lookup_cache import LookupCache
+from not1mm.lookupservice import LookupWorker, cacheable
+from not1mm.testing.fakelookup import FakeLookupServer, fake_grid
+
+
+@pytest.fixture
+def server():
+    the_server = FakeLookupServer()
+    the_server.start()
+    yield the_server
+    the_server.shutdown()
+    the_server.server_close()
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def qrz_worker(server, cache_path=":memory:"):
+    worker = LookupWorker(cache_path)
+    worker.configure(
+        {
+            "useqrz": True,
+            "lookupusername": "k6gte",
+            "lookuppassword": "secret",
+            "qrzurl": server.url + "/qrz",
+        }
+    )
+    return worker
+
+
+def test_cache_expires_after_ttl():
+    clock = Clock()
+    cache = LookupCache(ttl=60, clock=clock)
+    cache.put("qrz", "K5TUX", {"grid": "EM10"})
+    clock.now += 59
+    assert cache.get("qrz", "K5TUX") == {"grid": "EM10"}
+    assert cache.get("hamqth", "K5TUX") is None
+    clock.now += 2
+    assert cache.get("qrz", "K5TUX") is None
+    assert len(cache) == 0
+
+
+def test_cache_evicts_least_recently_used():
+    clock = Clock()
+    cache = LookupCache(max_entries=2, clock=clock)
+    cache.put("qrz", "K5TUX", {"grid": "EM10"})
+    clock.now += 1
+    cache.put("qrz", "N2CQR", {"grid": "FN20"})
+    clock.now += 1
+    cache.get("qrz", "K5TUX")
+    clock.now += 1
+    cache.put("qrz", "W1AW", {"grid": "FN31"})
+    assert len(cache) == 2
+    assert cache.get("qrz", "N2CQR") is None
+    assert cache.get("qrz", "K5TUX") == {"grid": "EM10"}
+
+
+def test_cache_persists(tmp_path):
+    cache = LookupCache(tmp_path / "lookup_cache.db")
+    cache.put("qrz", "K5TUX", {"grid": "EM10", "name": "Tux"})
+    cache.close()
+    cache = LookupCache(tmp_path / "lookup_cache.db")
+    assert cache.get("qrz", "K5TUX") == {"grid": "EM10", "name": "Tux"}
+
+
+@pytest.mark.parametrize(
+    "result,expected",
+    [
+        ({"grid": "EM10"}, True),
+        ({"name": "Tux", "grid": False}, True),
+        ({}, False),
+        ({"error": "timeout"}, False),
+        ({"grid": False, "name": False, "error_text": "Callsign not found"}, False),
+    ],
+)
+def test_cacheable(result, expected):
+    assert cacheable(result) is expected
+
+
+def test_providers_against_fake_server(server):
+    qrz = QRZlookup("k6gte", "secret", url=server.url + "/qrz")
+    assert qrz.lookup("K5TUX")["grid"] == fake_grid("K5TUX")
+    hamqth = HamQTH("k6gte", "secret", url=server.url + "/hamqth")
+    assert hamqth.lookup("K5TUX")["grid"] == fake_grid("K5TUX")
+
+
+def test_worker_caches_lookups(server):
+    worker = qrz_worker(server)
+    for _ in range(3):
+        assert worker.lookup("K5TUX")["grid"] == fake_grid("K5TUX")
+    assert server.lookups() == ["K5TUX"]
+    assert worker.stats["hits"] == 2
+
+
+def test_worker_drops_calls_typed_over(server):
+    worker = qrz_worker(server)
+    results = []
+    worker.result.connect(lambda call, result: results.append(call))
+    assert worker.request("K5")
+    assert worker.request("K5TU")
+    assert worker.request("K5TUX")
+    assert not worker.request("K5TUX")
+    worker.work()
+    worker.work()
+    assert results == ["K5TUX"]
+    assert server.lookups() == ["K5TUX"]
+    assert worker.stats["dropped"] == 2
+    assert worker.stats["coalesced"] == 1
+
+
+def test_worker_joins_lookup_in_flight(server):
+    worker = qrz_worker(server)
+    server.delay = 0.3
+    assert worker.request("K5TUX")
+    busy = threading.Thread(target=worker.work)
+    busy.start()
+    while worker.in_flight is None and busy.is_alive():
+        time.sleep(0.01)
+    assert not worker.request("K5TUX")
+    busy.join()
+    assert server.lookups() == ["K5TUX"]
+
+
+def test_worker_drops_call_typed_over_back_to_lookup_in_flight(server):
+    worker = qrz_worker(server)
+    results = []
+    worker.result.connect(
+        lambda call, result: results.append(call), Qt.ConnectionType.DirectConnection
+    )
+    server.delay = 0.3
+    assert worker.request("K5TUX")
+    busy = threading.Thread(target=worker.work)
+    busy.start()
+    while worker.in_flight is None and busy.is_alive():
+        time.sleep(0.01)
+    assert worker.request("W1AW")
+    assert not worker.request("K5TUX")
+    busy.join()
+    worker.work()
+    assert results == ["K5TUX"]
+    assert server.lookups() == ["K5TUX"]
+    assert worker.stats["dropped"] == 1
+
+
+def test_worker_survives_dead_provider():
+    worker = LookupWorker(":memory:")
+    worker.configure({"usehamqth": True, "hamqthurl": "http://127.0.0.1:9/hamqth"})
+    assert worker.request("K5TUX")
+    worker.work()
+    assert worker.stats["uncached"] == 1
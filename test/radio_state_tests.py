@@ -0,0 +1,64 @@
+import pytest
+
+from not1mm.lib.radio_state import FAST_INTERVAL, PollEngine
+from not1mm.radio import Radio
+
+READING = {"vfoa": "14032000", "mode": "CW", "bw": "500", "online": True}
+
+
+def test_first_reading_is_passed_on_whole():
+    engine = PollEngine()
+    assert engine.update(READING) == READING
+    assert engine.update(dict(READING)) == {}
+
+
+@pytest.mark.parametrize(
+    "change", [{"vfoa": "14032100"}, {"mode": "USB", "bw": "2400"}, {"online": False}]
+)
+def test_only_changes_are_passed_on(change):
+    engine = PollEngine()
+    engine.update(READING)
+    assert engine.update({**READING, **change}) == change
+    assert engine.state == {**READING, **change}
+
+
+def test_interval_speeds_up_on_change_and_backs_off():
+    engine = PollEngine(idle_interval=555)
+    engine.update(READING)
+    assert engine.interval == FAST_INTERVAL
+    intervals = []
+    for _ in range(4):
+        engine.update(READING)
+        intervals.append(engine.interval)
+    assert intervals == [200, 400, 555, 555]
+    engine.update({**READING, "vfoa": "14032100"})
+    assert engine.interval == FAST_INTERVAL
+
+
+def test_fast_interval_never_slower_than_idle():
+    engine = PollEngine(idle_interval=50)
+    engine.wake()
+    assert engine.interval == 50
+
+
+def test_stats():
+    engine = PollEngine()
+    engine.update(READING, 0.010)
+    engine.update(READING, 0.030)
+    stats = engine.stats()
+    assert stats["polls"] == 2
+    assert stats["changes"] == 1
+    assert stats["max_poll_ms"] == pytest.approx(30)
+    assert stats["mean_poll_ms"] == pytest.approx(20)
+
+
+def test_radio_emits_deltas():
+    radio = Radio("fake", "127.0.0.1", 0)
+    emitted = []
+    radio.poll_callback.connect(emitted.append)
+    radio.poll()
+    radio.poll()
+    radio.cat.set_vfo("7025000")
+    radio.poll()
+    assert emitted == [READING, {"vfoa": "7025000"}]
+    assert radio.stats()["polls"] == 3
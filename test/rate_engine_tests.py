@@ -0,0 +1,128 @@
+import random
+import sqlite3
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from not1mm.lib.rate_engine import RateEngine
+
+NOW = datetime(2026, 3, 28, 14, 37, 20, tzinfo=UTC)
+
+
+def make_log(seed, count):
+    rng = random.Random(seed)
+    contacts = []
+    for number in range(count):
+        when = NOW - timedelta(seconds=rng.randrange(3 * 3600))
+        contacts.append(
+            {
+                "ID": f"id{number}",
+                "TS": when.strftime("%Y-%m-%d %H:%M:%S"),
+                "IsRunQSO": rng.choice((0, 1)),
+            }
+        )
+    return contacts
+
+
+def legacy_figures(contacts):
+    """The aggregate queries RateWindow used to run, pinned to NOW."""
+    db = sqlite3.connect(":memory:")
+    db.execute("create table dxlog (ID, TS, IsRunQSO)")
+    db.executemany(
+        "insert into dxlog values (?, ?, ?)",
+        [(item["ID"], item["TS"], item["IsRunQSO"]) for item in contacts],
+    )
+    now = NOW.strftime("%Y-%m-%d %H:%M:%S")
+    span = "(julianday(MAX(ts)) - julianday(MIN(ts))) * 24 * 60, count(*)"
+    last_hour = db.execute(
+        f"select {span} from (select * from dxlog "
+        "where datetime(TS) > datetime(?, '-60 minutes'))",
+        (now,),
+    ).fetchone()
+    last_10 = db.execute(
+        f"select {span} from (select * from dxlog order by ts desc limit 10)"
+    ).fetchone()
+    last_100 = db.execute(
+        f"select {span} from (select * from dxlog order by ts desc limit 100)"
+    ).fetchone()
+    hour = db.execute(
+        "select sum(IsRunQSO), count(*) from dxlog where TS >= ?",
+        (NOW.strftime("%Y-%m-%d %H:00:00"),),
+    ).fetchone()
+    totals = db.execute("select sum(IsRunQSO), count(*) from dxlog").fetchone()
+    return last_hour, last_10, last_100, hour, totals
+
+
+def engine_figures(engine):
+    def span(result):
+        count, minutes = result
+        return (minutes if count else None, count)
+
+    return (
+        span(engine.last_hour(NOW)),
+        span(engine.last_n(10)),
+        span(engine.last_n(100)),
+        engine.current_hour(NOW),
+        (engine.run_count(), engine.total()),
+    )
+
+
+def assert_same(engine, contacts):
+    expected = legacy_figures(contacts)
+    found = engine_figures(engine)
+    for (minutes, count), (legacy_minutes, legacy_count) in zip(
+        found[:3], expected[:3]
+    ):
+        assert count == legacy_count
+        if count:
+            assert minutes == pytest.approx(legacy_minutes, abs=1e-3)
+    assert found[3] == tuple(value or 0 for value in expected[3])
+    assert found[4] == tuple(value or 0 for value in expected[4])
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_matches_legacy_queries(seed):
+    contacts = make_log(seed, 250)
+    engine = RateEngine()
+    engine.load(contacts)
+    assert_same(engine, contacts)
+
+
+def test_follows_deltas():
+    contacts = make_log(7, 150)
+    engine = RateEngine()
+    engine.load(contacts[:100])
+    engine.apply_delta({"added": contacts[100:], "removed": []})
+    edited = dict(contacts[3], TS=NOW.strftime("%Y-%m-%d %H:%M:%S"), IsRunQSO=1)
+    engine.apply_delta({"added": [edited], "removed": [contacts[3]]})
+    engine.apply_delta({"added": [], "removed": [contacts[5]]})
+    contacts[3] = edited
+    del contacts[5]
+    assert_same(engine, contacts)
+
+
+def test_empty_log():
+    engine = RateEngine()
+    assert engine.last_hour(NOW) == (0, 0.0)
+    assert engine.last_n(10) == (0, 0.0)
+    assert engine.current_hour(NOW) == (0, 0)
+
+
+def test_series():
+    engine = RateEngine()
+    engine.load(
+        [
+            {"ID": "a", "TS": "2026-03-28 14:00:05", "IsRunQSO": 1},
+            {"ID": "b", "TS": "2026-03-28 14:00:50", "IsRunQSO": 0},
+            {"ID": "c", "TS": "2026-03-28 14:02:00", "IsRunQSO": 1},
+        ]
+    )
+    series = engine.series(
+        datetime(2026, 3, 28, 14, 0, tzinfo=UTC),
+        datetime(2026, 3, 28, 14, 2, tzinfo=UTC),
+    )
+    assert [(when.minute, runs, sandp) for when, runs, sandp in series] == [
+        (0, 1, 1),
+        (1, 0, 0),
+        (2, 1, 0),
+    ]
@@ -0,0 +1,99 @@
+import random
+from types import SimpleNamespace
+
+import pytest
+from conftest import make_contact
+
+from not1mm.lib.plugin_common import FirstWorked, recalculate_multipliers
+from not1mm.plugins import cq_wpx_ssb, naqp_cw
+
+
+@pytest.fixture
+def main(database):
+    rng = random.Random(7)
+    for number in range(300):
+        call = f"{rng.choice('KWN')}{rng.randint(1, 9)}{rng.choice('ABC')}XY"
+        contact = make_contact(
+            database,
+            number,
+            call,
+            rng.choice([7.0, 14.0]),
+            WPXPrefix=call[:3],
+            Sect=rng.choice(["ORG", "SCV", "DX"]),
+            Points=rng.choice([0, 1]),
+        )
+        database.log_contact(contact)
+    return SimpleNamespace(database=database, pref={"contest": 1}, contact={})
+
+
+def wpx_flags_by_query(database):
+    """What the old per contact fetch_wpx_exists_before_me loop computed."""
+    flags = {}
+    for contact in database.fetch_all_contacts_asc():
+        result = database.fetch_wpx_exists_before_me(
+            contact["WPXPrefix"], contact["TS"]
+        )
+        flags[contact["ID"]] = int(result["wpx_count"] == 0)
+    return flags
+
+
+def flags(database, field="IsMultiplier1"):
+    return {
+        contact["ID"]: contact[field] for contact in database.fetch_all_contacts_asc()
+    }
+
+
+def test_matches_before_me_queries(main):
+    changed = cq_wpx_ssb.recalculate_mults(main)
+    assert changed
+    assert flags(main.database) == wpx_flags_by_query(main.database)
+    assert cq_wpx_ssb.recalculate_mults(main) == []
+
+
+def test_naqp_eligibility(main):
+    naqp_cw.recalculate_mults(main)
+    seen = set()
+    for contact in main.database.fetch_all_contacts_asc():
+        key = (contact["Sect"], contact["Band"])
+        expected = int(
+            key not in seen and contact["Points"] == 1 and contact["Sect"] != "DX"
+        )
+        assert contact["IsMultiplier1"] == expected
+        seen.add(key)
+
+
+def test_same_time_stamp_is_not_before(main):
+    database = main.database
+    for call in ("K1ABC", "K1ABD"):
+        contact = make_contact(
+            database, 0, call, 21.0, ID=call, TS="2026-02-01 00:00:00"
+        )
+        database.log_contact(contact)
+    multipliers = (FirstWorked("IsMultiplier1", lambda contact: contact["Band"]),)
+    recalculate_multipliers(main, multipliers)
+    assert flags(database)["K1ABC"] == 1
+    assert flags(database)["K1ABD"] == 1
+
+
+def test_suffix_recalculation(main):
+    database = main.database
+    cq_wpx_ssb.recalculate_mults(main)
+    contacts = database.fetch_all_contacts_asc()
+    edited = contacts[100]
+    database.change_contact({"ID": edited["ID"], "WPXPrefix": "ZZ9"})
+    changed = cq_wpx_ssb.recalculate_mults(main, since=edited["TS"])
+    assert {contact["ID"] for contact in changed} >= {edited["ID"]}
+    assert all(contact["TS"] >= edited["TS"] for contact in changed)
+    assert flags(database) == wpx_flags_by_query(database)
+
+
+def test_points_and_contact_restored(main):
+    main.contact = {"Call": "IN PROGRESS"}
+
+    def points(self):
+        return 2 if self.contact["Band"] == 14.0 else 1
+
+    recalculate_multipliers(main, (), points=points)
+    assert main.contact == {"Call": "IN PROGRESS"}
+    for contact in main.database.fetch_all_contacts_asc():
+        assert contact["Points"] == (2 if contact["Band"] == 14.0 else 1)
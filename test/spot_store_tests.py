@@ -0,0 +1,172 @@
+import random
+import sqlite3
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from not1mm.lib.spot_store import SpotStore, utc_stamp
+
+
+def stamp(minutes_ago=0):
+    return utc_stamp(datetime.now(UTC) - timedelta(minutes=minutes_ago))
+
+
+def spot(call, freq, minutes_ago=0, comment=""):
+    return {
+        "callsign": call,
+        "freq": freq,
+        "ts": stamp(minutes_ago),
+        "mode": "CW",
+        "spotter": "K6GTE",
+        "comment": comment,
+    }
+
+
+def calls(spots):
+    return [item["callsign"] for item in spots]
+
+
+class LegacySpots:
+    """The sqlite queries the bandmap used before the spot store."""
+
+    def __init__(self):
+        self.db = sqlite3.connect(":memory:")
+        self.db.execute("create table spots (callsign, ts, freq, comment)")
+
+    def addspot(self, item, band_start, band_end):
+        marked = "MARKED" in item["comment"]
+        self.db.execute(
+            "delete from spots where callsign = ? and freq >= ? and freq <= ?"
+            + ("" if marked else " and comment not like '%MARKED%'"),
+            (item["callsign"], band_start, band_end),
+        )
+        self.db.execute(
+            "delete from spots where freq >= ? and freq <= ?"
+            + ("" if marked else " and comment not like '%MARKED%'"),
+            (item["freq"] - 0.1, item["freq"] + 0.1),
+        )
+        self.db.execute(
+            "insert into spots values (?, ?, ?, ?)",
+            (item["callsign"], item["ts"], item["freq"], item["comment"]),
+        )
+
+    def query(self, sql, *args):
+        return [row[0] for row in self.db.execute(sql, args).fetchall()]
+
+
+def test_same_call_replaced_within_band_only():
+    store = SpotStore()
+    store.addspot(spot("K5TUX", 14025.0))
+    store.addspot(spot("K5TUX", 14030.0))
+    store.addspot(spot("K5TUX", 7025.0))
+    assert [item["freq"] for item in store.getspots()] == [7025.0, 14030.0]
+
+
+def test_clear_freq_keeps_marked_spots():
+    store = SpotStore()
+    store.addspot(spot("K5TUX", 14025.0, comment="MARKED"))
+    store.addspot(spot("N2CQR", 14025.05))
+    store.addspot(spot("NE4RD", 14025.08), clear_freq=True)
+    assert calls(store.getspots()) == ["K5TUX", "NE4RD"]
+    store.addspot(spot("W1AW", 14025.0, comment="MARKED"), clear_freq=True)
+    assert calls(store.getspots()) == ["W1AW"]
+
+
+def test_next_and_prev_spot():
+    store = SpotStore()
+    for call, freq in (("A1A", 7010.0), ("B1B", 14010.0), ("C1C", 14020.0)):
+        store.addspot(spot(call, freq))
+    assert store.get_next_spot(14010.0, 14350.0)["callsign"] == "C1C"
+    assert store.get_next_spot(14020.0, 14350.0) is None
+    assert store.get_next_spot(14000.0, 14005.0) is None
+    assert store.get_prev_spot(14020.0, 14000.0)["callsign"] == "B1B"
+    assert store.get_prev_spot(14010.0, 14000.0) is None
+    assert store.get_prev_spot(14010.0, 7000.0)["callsign"] == "A1A"
+
+
+def test_expiry_spares_young_and_marked_spots():
+    store = SpotStore()
+    store.addspot(spot("OLD", 14010.0, minutes_ago=30))
+    store.addspot(spot("MARK", 14020.0, minutes_ago=30, comment="marked"))
+    store.addspot(spot("NEW", 14030.0, minutes_ago=2))
+    store.delete_spots(10)
+    assert calls(store.getspots()) == ["MARK", "NEW"]
+    store.delete_spots(0)
+    assert calls(store.getspots()) == ["MARK"]
+
+
+def test_markspot_survives_aging_until_marks_cleared():
+    store = SpotStore()
+    store.addspot(spot("K5TUX", 14025.0, minutes_ago=30))
+    store.markspot({"callsign": "K5TUX", "freq": 14025.0, "comment": " MARKED"})
+    store.delete_spots(0)
+    assert calls(store.getspots()) == ["K5TUX"]
+    store.delete_marks()
+    assert len(store) == 0
+
+
+def test_like_calls_and_matching_spot():
+    store = SpotStore()
+    for call, freq in (("N2CQR", 14010.0), ("K5TUX", 14020.0), ("K5TUX", 7020.0)):
+        store.addspot(spot(call, freq))
+    assert store.get_like_calls("5t") == [{"callsign": "K5TUX"}]
+    assert store.get_like_calls("") == [{"callsign": "K5TUX"}, {"callsign": "N2CQR"}]
+    assert store.get_matching_spot("TUX", 14000.0, 14350.0)["freq"] == 14020.0
+    assert store.get_matching_spot("W1AW", 14000.0, 14350.0) is None
+
+
+def test_version_moves_only_on_change():
+    store = SpotStore()
+    store.addspot(spot("K5TUX", 14025.0, minutes_ago=2))
+    version = store.version
+    store.delete_spots(10)
+    store.delete_spot("K5TUX", 7000.0)
+    assert store.version == version
+    store.delete_spot("K5TUX", 14025.0)
+    assert store.version > version
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_legacy_queries(seed):
+    rng = random.Random(seed)
+    store = SpotStore()
+    legacy = LegacySpots()
+    for _ in range(300):
+        item = spot(
+            rng.choice(("K5TUX", "N2CQR", "NE4RD", "W1AW", "DL1AA")),
+            round(14000.0 + rng.random() * 4, 2),
+            minutes_ago=rng.choice((0, 3, 8, 12, 19)),
+            comment=rng.choice(("", "", "CW", "MARKED")),
+        )
+        store.addspot(item, clear_freq=True)
+        legacy.addspot(item, 14000.0, 14350.0)
+
+    cutoff = stamp(10)
+    legacy.db.execute(
+        "delete from spots where ts < ? and comment not like '%MARKED%'", (cutoff,)
+    )
+    store.delete_spots(10)
+
+    assert [(item["freq"], item["callsign"]) for item in store.getspots()] == [
+        tuple(row)
+        for row in legacy.db.execute(
+            "select freq, callsign from spots order by freq"
+        ).fetchall()
+    ]
+    for current in (13999.0, 14001.0, 14002.5, 14004.0):
+        expected = legacy.query(
+            "select freq from spots where freq > ? and freq <= ? "
+            "order by freq asc limit 1",
+            current,
+            14350.0,
+        )
+        found = store.get_next_spot(current, 14350.0)
+        assert ([found["freq"]] if found else []) == expected
+        expected = legacy.query(
+            "select freq from spots where freq < ? and freq >= ? "
+            "order by freq desc limit 1",
+            current,
+            14000.0,
+        )
+        found = store.get_prev_spot(current, 14000.0)
+        assert ([found["freq"]] if found else []) == expected
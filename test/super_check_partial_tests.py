@@ -0,0 +1,55 @@
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+from rapidfuzz import process
+
+from not1mm.lib.super_check_partial import INDEX_SUFFIX, SCP, prefix_bias_score
+
+MASTER_SCP = Path(__file__).parent.parent / "not1mm" / "data" / "MASTER.SCP"
+
+
+def reference_super_check(scp: list, acall: str) -> list:
+    """Full cdist and sort, as super_check used to do it."""
+    scores = process.cdist([acall], scp, scorer=prefix_bias_score, workers=-1)
+    top = sorted(enumerate(scores[0]), key=lambda x: -x[1])[:20]
+    return [scp[idx] for idx, score in top if score > 0]
+
+
+@pytest.fixture(scope="module")
+def scp(tmp_path_factory):
+    data_path = tmp_path_factory.mktemp("scp")
+    shutil.copy(MASTER_SCP, data_path / "MASTER.SCP")
+    return SCP(data_path)
+
+
+@pytest.mark.parametrize("call", ["K6GTE", "W1AW/7", "XQ9Z", "ZZZZ", "DL1ABC"])
+def test_super_check_matches_full_scan_while_typing(scp, call):
+    for length in range(2, len(call) + 1):
+        partial = call[:length]
+        assert scp.super_check(partial) == reference_super_check(scp.scp, partial)
+
+
+def test_super_check_after_backspace(scp):
+    scp.super_check("K6GT")
+    assert scp.super_check("K6G") == reference_super_check(scp.scp, "K6G")
+
+
+def test_super_check_short_call(scp):
+    assert scp.super_check("K") == []
+
+
+def test_index_cache_is_written_and_invalidated(tmp_path):
+    scp_file = tmp_path / "MASTER.SCP"
+    scp_file.write_text("# comment\nK6GTE\nK6GT\nW1AW\n", encoding="utf-8")
+    cache_file = tmp_path / ("MASTER.SCP" + INDEX_SUFFIX)
+
+    scp = SCP(tmp_path)
+    assert scp.super_check("K6G")[:2] == ["K6GT", "K6GTE"]
+    assert cache_file.is_file()
+
+    scp_file.write_text("# comment\nK6GTX\nW1AW\n", encoding="utf-8")
+    stat = scp_file.stat()
+    os.utime(scp_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert scp.super_check("K6G") == ["K6GTX"]
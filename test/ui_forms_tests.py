@@ -0,0 +1,67 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+from not1mm.lib import ui_forms
+
+APP_DATA = Path(__file__).parent.parent / "not1mm" / "data"
+
+
+@pytest.fixture
+def ui_file(tmp_path):
+    copy = tmp_path / "forms" / "about.ui"
+    copy.parent.mkdir()
+    shutil.copy(APP_DATA / "about.ui", copy)
+    return copy
+
+
+@pytest.fixture(autouse=True)
+def forget_forms():
+    ui_forms._forms.clear()
+    yield
+    ui_forms._forms.clear()
+
+
+def test_compiled_once(tmp_path, ui_file):
+    cache = tmp_path / "cache"
+    form = ui_forms.form_class(ui_file, cache)
+    assert form.__name__ == "Ui_Dialog"
+    assert hasattr(form, "setupUi") and hasattr(form, "retranslateUi")
+    (module,) = cache.glob("*.py")
+    assert module.name == f"about_{ui_forms.ui_hash(ui_file.resolve())}.py"
+    assert ui_forms.form_class(ui_file, cache) is form
+    ui_forms._forms.clear()
+    stamp = module.stat().st_mtime_ns
+    ui_forms.form_class(ui_file, cache)
+    assert module.stat().st_mtime_ns == stamp
+
+
+def test_edited_file_compiled_again(tmp_path, ui_file):
+    cache = tmp_path / "cache"
+    ui_forms.form_class(ui_file, cache)
+    ui_file.write_text(ui_file.read_text().replace("<class>Dialog<", "<class>Info<"))
+    form = ui_forms.form_class(ui_file, cache)
+    (module,) = cache.glob("*.py")
+    assert module.name == f"about_{ui_forms.ui_hash(ui_file.resolve())}.py"
+    assert form.__name__ == "Ui_Info"
+
+
+def test_hash_follows_location(tmp_path, ui_file):
+    moved = tmp_path / "moved.ui"
+    shutil.copy(ui_file, moved)
+    assert ui_forms.ui_hash(moved) != ui_forms.ui_hash(ui_file)
+
+
+def test_unwritable_cache(tmp_path, ui_file):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    form = ui_forms.form_class(ui_file, blocker / "cache")
+    assert form.__name__ == "Ui_Dialog"
+
+
+def test_compile_all(tmp_path, monkeypatch):
+    monkeypatch.setattr(ui_forms, "CACHE_PATH", tmp_path)
+    modules = ui_forms.compile_all(APP_DATA)
+    assert len(modules) == len(list(APP_DATA.glob("*.ui")))
+    assert all(module.parent == tmp_path for module in modules)
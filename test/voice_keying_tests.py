@@ -0,0 +1,70 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from not1mm.voice_keying import SAMPLE_RATE, SampleCache, macro_clips
+
+PHONETICS = Path(__file__).parent.parent / "not1mm" / "data" / "phonetics"
+
+
+def write_clip(path, samples, samplerate=SAMPLE_RATE):
+    sf.write(str(path), np.asarray(samples, dtype=np.float32), samplerate)
+    return path
+
+
+def test_macro_clips(tmp_path):
+    assert macro_clips("K6 [CQ]", tmp_path) == [
+        tmp_path / "k.wav",
+        tmp_path / "6.wav",
+        tmp_path / "space.wav",
+        tmp_path / "cq.wav",
+    ]
+    assert macro_clips("?/", tmp_path) == []
+
+
+def test_preload_decodes_once(tmp_path):
+    write_clip(tmp_path / "a.wav", [0.5] * 100)
+    write_clip(tmp_path / "b.wav", [-0.5] * 50)
+    cache = SampleCache()
+    cache.preload(tmp_path)
+    cache.preload(tmp_path)
+    assert cache.decoded == 2
+    buffer = cache.render(macro_clips("ab[missing]a", tmp_path))
+    assert cache.decoded == 2
+    assert buffer.dtype == np.float32
+    assert len(buffer) == 250
+    assert buffer[100:150] == pytest.approx([-0.5] * 50, abs=1e-4)
+
+
+def test_changed_file_is_decoded_again(tmp_path):
+    clip = write_clip(tmp_path / "a.wav", [0.25] * 10)
+    cache = SampleCache()
+    assert len(cache.load(clip)) == 10
+    write_clip(clip, [0.25] * 20)
+    stat = clip.stat()
+    clip.touch()
+    if clip.stat().st_mtime_ns == stat.st_mtime_ns:
+        pytest.skip("file system mtime too coarse")
+    assert len(cache.load(clip)) == 20
+    clip.unlink()
+    assert cache.load(clip) is None
+    assert str(clip) not in cache.clips
+
+
+def test_clips_made_mono_at_one_rate(tmp_path):
+    stereo = np.array([[0.5, 0.0]] * 100, dtype=np.float32)
+    sf.write(str(tmp_path / "s.wav"), stereo, SAMPLE_RATE)
+    write_clip(tmp_path / "h.wav", [0.5] * 100, SAMPLE_RATE // 2)
+    cache = SampleCache()
+    assert cache.load(tmp_path / "s.wav") == pytest.approx([0.25] * 100, abs=1e-4)
+    assert len(cache.load(tmp_path / "h.wav")) == 200
+
+
+def test_shipped_phonetics_render():
+    cache = SampleCache()
+    cache.preload(PHONETICS)
+    buffer = cache.render(macro_clips("CQ TEST K6GTE", PHONETICS))
+    assert buffer.ndim == 1
+    assert len(buffer) > SAMPLE_RATE
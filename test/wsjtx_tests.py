@@ -0,0 +1,153 @@
+import struct
+from datetime import UTC, datetime
+from types import SimpleNamespace
+
+import pytest
+
+from not1mm.bandmap import BandMapWindow
+from not1mm.lib import wsjtx
+from not1mm.lib.spot_store import SpotStore
+from not1mm.testing.wsjtx_inject_udp import (
+    BYTES_TO_SEND,
+    decode_packet,
+    message_packet,
+    qstring,
+    status_packet,
+)
+
+
+def legacy_adif(datagram: bytes) -> dict:
+    """How ft8_watcher used to read a Logged ADIF packet."""
+    datadict = {}
+    datagram = datagram[datagram.find(b"<call:") :]
+    for data in datagram.decode().upper().split("<"):
+        if data:
+            tag = data.split(":")
+            if tag == ["EOR>"]:
+                break
+            datadict[tag[0]] = tag[1].split(">")[1].strip()
+    return datadict
+
+
+def test_decode():
+    packet = decode_packet("CQ K1ABC FN42", -12, 1234)
+    for data in (packet, memoryview(packet)):
+        message = wsjtx.decode_message(data)
+        assert message["type"] == wsjtx.DECODE
+        assert (message["schema"], message["id"]) == (2, "WSJT-X")
+        assert (message["snr"], message["delta_frequency"]) == (-12, 1234)
+        assert message["delta_time"] == pytest.approx(0.1)
+        assert (message["mode"], message["message"]) == ("~", "CQ K1ABC FN42")
+        assert message["new"] and not message["off_air"]
+
+
+def test_status():
+    message = wsjtx.decode_message(status_packet(7074000, "FT4"))
+    assert (message["dial_frequency"], message["mode"]) == (7074000, "FT4")
+    assert (message["de_call"], message["tr_period"]) == ("K6GTE", 15)
+    assert message["tx_message"] == ""
+
+
+def test_older_schema_stops_short():
+    payload = struct.pack(">Q", 14074000) + qstring("FT8") + qstring("W1AW")
+    message = wsjtx.decode_message(message_packet(wsjtx.STATUS, payload))
+    assert message["dx_call"] == "W1AW"
+    assert "report" not in message
+
+
+def test_heartbeat_and_null_string():
+    payload = struct.pack(">I", 3) + qstring("2.6.1") + struct.pack(">I", 0xFFFFFFFF)
+    message = wsjtx.decode_message(message_packet(wsjtx.HEARTBEAT, payload))
+    assert (message["max_schema"], message["version"]) == (3, "2.6.1")
+    assert message["revision"] == ""
+
+
+def test_qso_logged_times():
+    when = struct.pack(">qIB", 2460311, 12 * 3600 * 1000 + 500, 1)
+    payload = when + qstring("W1AW") + qstring("FN31") + struct.pack(">Q", 14074000)
+    message = wsjtx.decode_message(message_packet(wsjtx.QSO_LOGGED, payload))
+    assert message["time_off"] == datetime(2024, 1, 1, 12, 0, 0, 500000, tzinfo=UTC)
+    assert message["tx_frequency"] == 14074000
+
+
+@pytest.mark.parametrize("data", [b"", b"\xad\xbc\xcb", b"\x00" * 40, b"junk" * 8])
+def test_not_wsjtx(data):
+    assert wsjtx.decode_message(data) is None
+
+
+def test_logged_adif_matches_legacy():
+    message = wsjtx.decode_message(BYTES_TO_SEND)
+    assert message["type"] == wsjtx.LOGGED_ADIF
+    fields = wsjtx.adif_fields(message["adif"])
+    assert fields == legacy_adif(BYTES_TO_SEND)
+    assert (fields["CALL"], fields["CLASS"]) == ("KE0OG", "1D")
+    assert wsjtx.adif_fields("<EOH>") is None
+
+
+@pytest.mark.parametrize(
+    "text, caller",
+    [
+        ("CQ K1ABC FN42", "K1ABC"),
+        ("CQ POTA K1ABC FN42", "K1ABC"),
+        ("CQ 123 K1ABC", "K1ABC"),
+        ("CQ K1ABC/P", "K1ABC/P"),
+        ("W9XYZ K1ABC -12", "K1ABC"),
+        ("W9XYZ <K1ABC> RR73", "K1ABC"),
+        ("W9XYZ <...> RR73", ""),
+        ("TNX 73 GL", ""),
+        ("CQ", ""),
+    ],
+)
+def test_decode_caller(text, caller):
+    assert wsjtx.decode_caller(text) == caller
+
+
+def decode(text, snr=-5, delta_hz=1000, off_air=False):
+    message = wsjtx.decode_message(decode_packet(text, snr, delta_hz))
+    message["off_air"] = off_air
+    return message
+
+
+def test_queue_spots():
+    queue = wsjtx.DecodeQueue()
+    assert not queue.push(decode("CQ K1ABC FN42"))  # no dial frequency yet
+    queue.status(wsjtx.decode_message(status_packet(14074000)))
+    assert queue.push(decode("CQ K1ABC FN42", -12, 1500))
+    assert queue.push(decode("W9XYZ N2CQR R-05"))
+    assert not queue.push(decode("TNX 73 GL"))
+    assert not queue.push(decode("CQ W1AW FN31", off_air=True))
+    assert queue.push(decode("K6GTE K1ABC 1D UT", 3, 1600))
+    batch = queue.drain()
+    assert [spot["dx"] for spot in batch] == ["N2CQR", "K1ABC"]
+    assert batch[1]["freq"] == 14075.6
+    assert batch[1]["comment"] == "FT8 +3 dB K6GTE K1ABC 1D UT"
+    assert batch[1]["mode"] == "FT8"
+    assert batch[0]["ts"] == batch[1]["ts"]
+    assert queue.drain() == []
+    assert queue.stats() == {"received": 6, "dropped": 0, "batches": 1, "queued": 0}
+
+
+def test_close_decodes_all_reach_the_bandmap():
+    queue = wsjtx.DecodeQueue()
+    queue.status(wsjtx.decode_message(status_packet(14074000)))
+    calls = ("K1ABC", "N3AAA", "W1AW", "JA1ZZZ")
+    for call, offset in zip(calls, (600, 660, 720, 1500)):
+        queue.push(decode(f"CQ {call} FN42", -5, offset))
+    store = SpotStore()
+    store.addspot({"callsign": "DL1ABC", "freq": 14074.65, "ts": "2026-01-01"})
+    bandmap = SimpleNamespace(
+        active=True, isVisible=lambda: True, spots=store, update_stations=lambda: None
+    )
+    BandMapWindow.msg_from_main(
+        bandmap, {"cmd": "DXSPOTS", "spots": queue.drain(), "clear_freq": False}
+    )
+    assert {spot["callsign"] for spot in store.getspots()} == {"DL1ABC", *calls}
+
+
+def test_queue_is_bounded():
+    queue = wsjtx.DecodeQueue(limit=2)
+    queue.status(wsjtx.decode_message(status_packet(7074000)))
+    for call in ("K1ABC", "N2CQR", "W1AW"):
+        queue.push(decode(f"CQ {call} FN42"))
+    assert [spot["dx"] for spot in queue.drain()] == ["N2CQR", "W1AW"]
+    assert queue.dropped == 1